@@ -5,6 +5,10 @@
 from lionagi.libs.schema.as_readable import as_readable
 from lionagi.libs.schema.extract_code_block import extract_code_block
 from lionagi.libs.schema.function_to_schema import function_to_schema
+from lionagi.libs.schema.stream_json import (
+    StreamingJSONParser,
+    parse_json_stream,
+)
 from lionagi.libs.validate.fuzzy_match_keys import fuzzy_match_keys
 from lionagi.libs.validate.fuzzy_validate_mapping import fuzzy_validate_mapping
 from lionagi.libs.validate.string_similarity import string_similarity
@@ -27,4 +31,6 @@ __all__ = (
     "to_json",
     "to_num",
     "fuzzy_parse_json",
+    "StreamingJSONParser",
+    "parse_json_stream",
 )
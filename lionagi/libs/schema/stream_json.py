@@ -0,0 +1,354 @@
+# Copyright (c) 2023 - 2024, HaiyangLi <quantocean.li at gmail dot com>
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import re
+from collections.abc import Callable
+from typing import Any
+
+__all__ = (
+    "StreamingJSONParser",
+    "parse_json_stream",
+)
+
+_WHITESPACE = frozenset(" \t\n\r")
+_ATOM_CHARS = frozenset(
+    "0123456789+-.abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_"
+)
+_LITERALS = {
+    "true": True,
+    "false": False,
+    "null": None,
+    "True": True,
+    "False": False,
+    "None": None,
+}
+_ESCAPES = {
+    '"': '"',
+    "\\": "\\",
+    "/": "/",
+    "'": "'",
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+}
+_SURROGATE = re.compile("[\ud800-\udfff]")
+
+# frame states
+_KEY, _COLON, _VALUE, _NEXT = range(4)
+
+
+class _Frame:
+    __slots__ = ("container", "is_obj", "key", "state")
+
+    def __init__(self, container: dict | list) -> None:
+        self.container = container
+        self.is_obj = isinstance(container, dict)
+        self.key = None
+        self.state = _KEY if self.is_obj else _VALUE
+
+
+class StreamingJSONParser:
+    """Incremental parser for a JSON object or array arriving in pieces.
+
+    Text before the first `{` or `[` (prose, a ```json fence) and after
+    the closing bracket is ignored. Each delta passed to `feed` is parsed
+    in a single pass, and a top-level entry is reported through
+    `on_field` (and recorded in `fields`) as soon as its value is
+    complete, so a consumer can act on a structured response before the
+    model has finished writing it.
+
+    Common LLM slips are repaired as they are met (single-quoted
+    strings, bare keys, Python literals, trailing or missing commas) and
+    noted in `repairs`. Anything else raises `ValueError` at the offending
+    character, so malformed output is detected while it streams rather
+    than after the whole reply. `finish` closes whatever a truncated
+    reply left open.
+
+    Attributes:
+        fields (dict): Completed top-level entries (keys, or indices for
+            a top-level array).
+        repairs (list[str]): Descriptions of the repairs applied.
+        done (bool): True once the top-level value has been closed.
+        error (str | None): The error that stopped the parser, if any.
+    """
+
+    def __init__(
+        self,
+        on_field: Callable[[Any, Any], None] | None = None,
+        max_preamble: int | None = None,
+    ) -> None:
+        """Initializes the parser.
+
+        Args:
+            on_field: Called with `(key, value)` for each completed
+                top-level entry.
+            max_preamble (int | None): Fail if no `{` or `[` appears
+                within this many characters; None waits indefinitely.
+        """
+        self.on_field = on_field
+        self.max_preamble = max_preamble
+        self.fields: dict = {}
+        self.repairs: list[str] = []
+        self.done = False
+        self.error: str | None = None
+        self.root: dict | list | None = None
+        self._stack: list[_Frame] = []
+        self._consumed = 0
+        self._mode: str | None = None
+        self._buf: list[str] = []
+        self._quote = '"'
+        self._escape = False
+        self._unicode: str | None = None
+
+    @property
+    def started(self) -> bool:
+        """bool: True once the opening bracket has been seen."""
+        return self.root is not None
+
+    def feed(self, text: str) -> None:
+        """Consumes the next piece of the stream.
+
+        Raises:
+            ValueError: If the text cannot be part of a valid document.
+        """
+        if self.error is not None:
+            raise ValueError(self.error)
+        i, n = 0, len(text)
+        try:
+            while i < n and not self.done:
+                if self._mode == "string":
+                    i = self._scan_string(text, i)
+                    continue
+                c = text[i]
+                if self._mode == "atom":
+                    if c in _ATOM_CHARS:
+                        self._buf.append(c)
+                        i += 1
+                        continue
+                    self._end_atom()
+                    continue
+                if not self._stack:
+                    if c == "{" or c == "[":
+                        self._push({} if c == "{" else [])
+                    elif (
+                        self.max_preamble is not None
+                        and self._consumed + i >= self.max_preamble
+                    ):
+                        raise ValueError("no JSON value found")
+                    i += 1
+                    continue
+                if c not in _WHITESPACE:
+                    self._structural(c)
+                i += 1
+        except ValueError as e:
+            self.error = f"{e} at position {self._consumed + i}"
+            raise ValueError(self.error) from None
+        self._consumed += n
+
+    def finish(self) -> dict | list:
+        """Ends the stream, closing anything left open by truncation.
+
+        Returns:
+            dict | list: The parsed value.
+
+        Raises:
+            ValueError: If the stream held no JSON value or was malformed.
+        """
+        if self.error is not None:
+            raise ValueError(self.error)
+        if self.root is None:
+            raise ValueError("no JSON value found")
+        if self.done:
+            return self.root
+        if self._mode == "string":
+            self.repairs.append("closed unterminated string")
+            self._escape, self._unicode = False, None
+            self._end_string()
+        elif self._mode == "atom":
+            try:
+                self._end_atom()
+            except ValueError:
+                self.repairs.append("dropped truncated literal")
+                self._mode, self._buf = None, []
+        while self._stack:
+            self.repairs.append("closed unterminated container")
+            self._close()
+        return self.root
+
+    def _scan_string(self, text: str, i: int) -> int:
+        n = len(text)
+        while i < n:
+            if self._unicode is not None:
+                take = text[i : i + 4 - len(self._unicode)]
+                self._unicode += take
+                i += len(take)
+                if len(self._unicode) == 4:
+                    try:
+                        self._buf.append(chr(int(self._unicode, 16)))
+                    except ValueError:
+                        raise ValueError("invalid \\u escape") from None
+                    self._unicode = None
+                continue
+            if self._escape:
+                c = text[i]
+                i += 1
+                self._escape = False
+                if c == "u":
+                    self._unicode = ""
+                else:
+                    self._buf.append(_ESCAPES.get(c, c))
+                continue
+            q = text.find(self._quote, i)
+            b = text.find("\\", i, q if q != -1 else n)
+            if b != -1:
+                self._buf.append(text[i:b])
+                self._escape = True
+                i = b + 1
+                continue
+            if q == -1:
+                self._buf.append(text[i:])
+                return n
+            self._buf.append(text[i:q])
+            self._end_string()
+            return q + 1
+        return i
+
+    def _begin_string(self, quote: str) -> None:
+        if quote == "'":
+            self.repairs.append("single-quoted string")
+        self._mode, self._quote, self._buf = "string", quote, []
+
+    def _end_string(self) -> None:
+        value = "".join(self._buf)
+        if _SURROGATE.search(value):
+            value = value.encode("utf-16", "surrogatepass").decode("utf-16")
+        self._mode, self._buf = None, []
+        frame = self._stack[-1]
+        if frame.is_obj and frame.state == _KEY:
+            frame.key, frame.state = value, _COLON
+        else:
+            self._emit(value)
+
+    def _end_atom(self) -> None:
+        token = "".join(self._buf)
+        self._mode, self._buf = None, []
+        frame = self._stack[-1]
+        if frame.is_obj and frame.state == _KEY:
+            self.repairs.append(f"bare key {token!r}")
+            frame.key, frame.state = token, _COLON
+            return
+        if token in _LITERALS:
+            if token[0].isupper():
+                self.repairs.append(f"Python literal {token!r}")
+            self._emit(_LITERALS[token])
+            return
+        try:
+            self._emit(json.loads(token))
+        except ValueError:
+            raise ValueError(f"invalid literal {token!r}") from None
+
+    def _structural(self, c: str) -> None:
+        frame = self._stack[-1]
+        state = frame.state
+        if frame.is_obj:
+            if state == _KEY:
+                if c == '"' or c == "'":
+                    self._begin_string(c)
+                elif c == "}":
+                    self._close()
+                elif c in _ATOM_CHARS:
+                    self._mode, self._buf = "atom", [c]
+                else:
+                    raise ValueError(f"expected a key, got {c!r}")
+            elif state == _COLON:
+                if c != ":":
+                    raise ValueError(f"expected ':', got {c!r}")
+                frame.state = _VALUE
+            elif state == _NEXT:
+                if c == ",":
+                    frame.state = _KEY
+                elif c == "}":
+                    self._close()
+                elif c == '"' or c == "'":
+                    self.repairs.append("missing comma")
+                    frame.state = _KEY
+                    self._begin_string(c)
+                else:
+                    raise ValueError(f"expected ',' or '}}', got {c!r}")
+            else:
+                self._begin_value(c)
+        elif state == _NEXT:
+            if c == ",":
+                frame.state = _VALUE
+            elif c == "]":
+                self._close()
+            else:
+                raise ValueError(f"expected ',' or ']', got {c!r}")
+        elif c == "]":
+            self._close()
+        else:
+            self._begin_value(c)
+
+    def _begin_value(self, c: str) -> None:
+        if c == '"' or c == "'":
+            self._begin_string(c)
+        elif c == "{":
+            self._push({})
+        elif c == "[":
+            self._push([])
+        elif c in _ATOM_CHARS:
+            self._mode, self._buf = "atom", [c]
+        else:
+            raise ValueError(f"unexpected character {c!r}")
+
+    def _attach(self, value: Any) -> None:
+        frame = self._stack[-1]
+        if frame.is_obj:
+            frame.container[frame.key] = value
+        else:
+            frame.container.append(value)
+        frame.state = _NEXT
+
+    def _complete(self, value: Any) -> None:
+        frame = self._stack[-1]
+        key = frame.key if frame.is_obj else len(frame.container) - 1
+        self.fields[key] = value
+        if self.on_field is not None:
+            self.on_field(key, value)
+
+    def _emit(self, value: Any) -> None:
+        self._attach(value)
+        if len(self._stack) == 1:
+            self._complete(value)
+
+    def _push(self, container: dict | list) -> None:
+        if self._stack:
+            self._attach(container)
+        else:
+            self.root = container
+        self._stack.append(_Frame(container))
+
+    def _close(self) -> None:
+        frame = self._stack.pop()
+        if not self._stack:
+            self.done = True
+        elif len(self._stack) == 1:
+            self._complete(frame.container)
+
+
+def parse_json_stream(text: str) -> dict | list:
+    """Parses `text` in one pass with `StreamingJSONParser`'s repairs.
+
+    Useful as a single-pass fallback for replies that plain `json.loads`
+    rejects, including ones cut off mid-value.
+
+    Raises:
+        ValueError: If no JSON value can be recovered.
+    """
+    parser = StreamingJSONParser()
+    parser.feed(text)
+    return parser.finish()
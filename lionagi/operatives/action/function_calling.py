@@ -7,10 +7,10 @@ from typing import Any, Self
 
 from pydantic import Field, model_validator
 
-from lionagi.protocols.types import Event, EventStatus
-from lionagi.utils import is_coro_func
+from lionagi.protocols.types import Event, EventStatus, Tracer
 
 from .tool import Tool
+from .tool_runner import ToolRunner
 
 
 class FunctionCalling(Event):
@@ -30,6 +30,12 @@ class FunctionCalling(Event):
         ..., description="Dictionary of arguments to pass to the function"
     )
 
+    runner: ToolRunner | None = Field(
+        default=None,
+        description="Runs the call; defaults to the shared ToolRunner",
+        exclude=True,
+    )
+
     @model_validator(mode="after")
     def _validate_strict_tool(self) -> Self:
         if self.func_tool.strict_func_call is True:
@@ -54,56 +60,73 @@ class FunctionCalling(Event):
         """Execute the function call with pre/post processing.
 
         Handles both synchronous and asynchronous functions, including optional
-        preprocessing of arguments and postprocessing of results.
+        preprocessing of arguments and postprocessing of results. Synchronous
+        callables run where the tool's `execution_mode` says, under its
+        concurrency limit and timeout.
         """
         start = asyncio.get_event_loop().time()
-
-        async def _preprocess(kwargs):
-            if is_coro_func(self.func_tool.preprocessor):
-                return await self.func_tool.preprocessor(
-                    kwargs, **self.func_tool.preprocessor_kwargs
-                )
-            return self.func_tool.preprocessor(
-                kwargs, **self.func_tool.preprocessor_kwargs
-            )
-
-        async def _post_process(arg: Any):
-            if is_coro_func(self.func_tool.postprocessor):
-                return await self.func_tool.postprocessor(
-                    arg, **self.func_tool.postprocessor_kwargs
-                )
-            return self.func_tool.postprocessor(
-                arg, **self.func_tool.postprocessor_kwargs
-            )
+        tool = self.func_tool
+        runner = self.runner or ToolRunner.default()
+        side_mode = "inline" if tool.execution_mode == "inline" else "thread"
 
         async def _inner() -> Any:
             """Execute the function with pre/post processing.
 
+            Synchronous processors run in the thread pool unless the tool
+            is inline, since they are rarely picklable.
+
             Returns:
                 Function execution result after processing.
             """
-            response = None
-            if self.func_tool.preprocessor:
-                self.arguments = await _preprocess(self.arguments)
+            if tool.preprocessor:
+                self.arguments = await runner.call(
+                    tool.preprocessor,
+                    side_mode,
+                    self.arguments,
+                    **tool.preprocessor_kwargs,
+                )
 
-            if is_coro_func(self.func_tool.func_callable):
-                response = await self.func_tool.func_callable(**self.arguments)
-            else:
-                response = self.func_tool.func_callable(**self.arguments)
+            response = await runner.call(
+                tool.func_callable, tool.execution_mode, **self.arguments
+            )
 
-            if self.func_tool.postprocessor:
-                response = await _post_process(response)
+            if tool.postprocessor:
+                response = await runner.call(
+                    tool.postprocessor,
+                    side_mode,
+                    response,
+                    **tool.postprocessor_kwargs,
+                )
             return response
 
-        try:
-            response = await _inner()
-            self.execution.duration = asyncio.get_event_loop().time() - start
-            self.execution.status = EventStatus.COMPLETED
-            self.execution.response = response
-        except Exception as e:
-            self.execution.duration = asyncio.get_event_loop().time() - start
-            self.execution.status = EventStatus.FAILED
-            self.execution.error = str(e)
+        with Tracer.default().span(
+            "tool.invoke",
+            tool=tool.function,
+            execution_mode=tool.execution_mode,
+        ) as span:
+            try:
+                response = await runner.run(tool, _inner)
+                self.execution.duration = (
+                    asyncio.get_event_loop().time() - start
+                )
+                self.execution.status = EventStatus.COMPLETED
+                self.execution.response = response
+            except asyncio.TimeoutError:
+                self.execution.duration = (
+                    asyncio.get_event_loop().time() - start
+                )
+                self.execution.status = EventStatus.FAILED
+                self.execution.error = (
+                    f"{tool.function} timed out after {tool.timeout}s"
+                )
+            except Exception as e:
+                self.execution.duration = (
+                    asyncio.get_event_loop().time() - start
+                )
+                self.execution.status = EventStatus.FAILED
+                self.execution.error = str(e)
+            if self.execution.error:
+                span.record_error(self.execution.error)
 
     def __str__(self) -> str:
         """Returns a string representation of the function call.
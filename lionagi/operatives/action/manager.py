@@ -16,16 +16,31 @@ from lionagi.utils import to_list
 from .function_calling import FunctionCalling
 from .request_response_model import ActionRequestModel
 from .tool import FuncTool, FuncToolRef, Tool, ToolRef
+from .tool_runner import ToolRunner
 
 __all__ = ("ActionManager",)
 
 
 class ActionManager(Manager):
 
-    def __init__(self, *args: FuncTool, **kwargs) -> None:
+    def __init__(
+        self,
+        *args: FuncTool,
+        runner: ToolRunner | None = None,
+        **kwargs,
+    ) -> None:
+        """Initializes the manager and registers the given tools.
 
+        Args:
+            *args: Tools or callables to register.
+            runner (ToolRunner | None): Owns the thread/process pools and
+                per-tool concurrency limits used by this manager's calls.
+                A private runner is created if not given.
+            **kwargs: More tools, registered by value.
+        """
         super().__init__()
         self.registry: dict[str, Tool] = {}
+        self.runner = runner or ToolRunner()
 
         tools = []
         if args:
@@ -127,7 +142,9 @@ class ActionManager(Manager):
                 f"Function {action_request.function} is not registered."
             )
         return FunctionCalling(
-            func_tool=tool, arguments=action_request.arguments
+            func_tool=tool,
+            arguments=action_request.arguments,
+            runner=self.runner,
         )
 
     async def invoke(
@@ -164,6 +181,10 @@ class ActionManager(Manager):
         await function_calling.invoke()
         return function_calling
 
+    def shutdown(self, wait: bool = True) -> None:
+        """Shuts down the thread/process pools used to run tools."""
+        self.runner.shutdown(wait=wait)
+
     @property
     def schema_list(self) -> list[dict[str, Any]]:
         """List all tool schemas currently registered.
@@ -3,8 +3,9 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import inspect
+import pickle
 from collections.abc import Callable
-from typing import Any, Self, TypeAlias
+from typing import Any, Literal, Self, TypeAlias
 
 from pydantic import Field, field_validator, model_validator
 
@@ -13,6 +14,7 @@ from lionagi.libs.validate.common_field_validators import validate_callable
 from lionagi.protocols.types import Element
 
 __all__ = (
+    "ExecutionMode",
     "Tool",
     "func_to_tool",
     "FuncTool",
@@ -20,6 +22,8 @@ __all__ = (
     "ToolRef",
 )
 
+ExecutionMode: TypeAlias = Literal["inline", "thread", "process"]
+
 
 class Tool(Element):
     """A class for handling function calls with schema validation and processing.
@@ -68,6 +72,30 @@ class Tool(Element):
         description="Whether to enforce strict validation of function parameters",
     )
 
+    execution_mode: ExecutionMode = Field(
+        default="inline",
+        description=(
+            "Where a synchronous callable runs: on the event loop ('inline'), "
+            "in a thread pool ('thread') or in a process pool ('process', "
+            "requires a picklable callable and arguments)"
+        ),
+    )
+
+    max_concurrency: int | None = Field(
+        default=None,
+        ge=1,
+        description="Maximum number of concurrent calls, None for unbounded",
+    )
+
+    timeout: float | None = Field(
+        default=None,
+        gt=0,
+        description=(
+            "Seconds before a call fails; not enforceable for inline "
+            "synchronous callables"
+        ),
+    )
+
     @field_validator("func_callable", mode="before")
     def _validate_func_callable(cls, value: Any) -> Callable[..., Any]:
         return validate_callable(
@@ -80,6 +108,18 @@ class Tool(Element):
             self.tool_schema = function_to_schema(self.func_callable)
         return self
 
+    @model_validator(mode="after")
+    def _validate_execution_mode(self) -> Self:
+        if self.execution_mode == "process":
+            try:
+                pickle.dumps(self.func_callable)
+            except Exception as e:
+                raise ValueError(
+                    "Tools in 'process' mode need a picklable callable "
+                    f"(e.g. a module-level function): {e}"
+                ) from e
+        return self
+
     @property
     def function(self) -> str:
         """Get the name of the function from the schema.
@@ -0,0 +1,152 @@
+# Copyright (c) 2023 - 2024, HaiyangLi <quantocean.li at gmail dot com>
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from functools import partial
+from typing import Any
+
+from lionagi.utils import is_coro_func
+
+from .tool import ExecutionMode, Tool
+
+__all__ = ("ToolRunner",)
+
+
+class ToolRunner:
+    """Runs tool callables according to their declared execution mode.
+
+    Coroutine functions are always awaited on the event loop. Synchronous
+    callables run inline, in a shared thread pool, or in a shared process
+    pool, so blocking tools do not stall the loop. Pools are created
+    lazily on first use. Per-tool concurrency limits are enforced with a
+    semaphore keyed by tool id.
+
+    Attributes:
+        max_threads (int | None): Size of the thread pool.
+        max_processes (int | None): Size of the process pool.
+    """
+
+    _default: "ToolRunner | None" = None
+
+    def __init__(
+        self,
+        max_threads: int | None = None,
+        max_processes: int | None = None,
+    ) -> None:
+        """Initializes the runner.
+
+        Args:
+            max_threads (int | None): Thread pool size, defaults to the
+                `ThreadPoolExecutor` default.
+            max_processes (int | None): Process pool size, defaults to the
+                number of CPUs.
+        """
+        self.max_threads = max_threads
+        self.max_processes = max_processes
+        self._thread_pool: ThreadPoolExecutor | None = None
+        self._process_pool: ProcessPoolExecutor | None = None
+        self._limits: dict[Any, tuple[int, asyncio.Semaphore]] = {}
+
+    @classmethod
+    def default(cls) -> "ToolRunner":
+        """ToolRunner: The process-wide runner used when none is given."""
+        if cls._default is None:
+            cls._default = cls()
+        return cls._default
+
+    @property
+    def thread_pool(self) -> ThreadPoolExecutor:
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(
+                max_workers=self.max_threads,
+                thread_name_prefix="lionagi-tool",
+            )
+        return self._thread_pool
+
+    @property
+    def process_pool(self) -> ProcessPoolExecutor:
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=self.max_processes
+            )
+        return self._process_pool
+
+    def _pool(self, mode: ExecutionMode) -> Executor | None:
+        if mode == "thread":
+            return self.thread_pool
+        if mode == "process":
+            return self.process_pool
+        return None
+
+    def limiter(self, tool: Tool) -> asyncio.Semaphore | None:
+        """Returns the semaphore bounding concurrent calls of `tool`.
+
+        Returns:
+            asyncio.Semaphore | None: None when the tool is unbounded.
+        """
+        if not tool.max_concurrency:
+            return None
+        entry = self._limits.get(tool.id)
+        if entry is None or entry[0] != tool.max_concurrency:
+            entry = (
+                tool.max_concurrency,
+                asyncio.Semaphore(tool.max_concurrency),
+            )
+            self._limits[tool.id] = entry
+        return entry[1]
+
+    async def call(
+        self,
+        func: Callable[..., Any],
+        mode: ExecutionMode,
+        /,
+        *args: Any,
+        **kwargs: Any,
+    ) -> Any:
+        """Calls `func` with the given arguments under `mode`.
+
+        In process mode, `func` and all arguments must be picklable.
+        """
+        if is_coro_func(func):
+            return await func(*args, **kwargs)
+        pool = self._pool(mode)
+        if pool is None:
+            return func(*args, **kwargs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(pool, partial(func, *args, **kwargs))
+
+    async def run(
+        self, tool: Tool, pipeline: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Awaits `pipeline` under the concurrency limit and timeout of `tool`.
+
+        Raises:
+            asyncio.TimeoutError: If the call exceeds `tool.timeout`.
+        """
+
+        async def _timed() -> Any:
+            if tool.timeout is None:
+                return await pipeline()
+            return await asyncio.wait_for(pipeline(), tool.timeout)
+
+        semaphore = self.limiter(tool)
+        if semaphore is None:
+            return await _timed()
+        async with semaphore:
+            return await _timed()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shuts down any pools created by this runner."""
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=wait)
+            self._thread_pool = None
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=wait)
+            self._process_pool = None
@@ -2,13 +2,21 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 
-from typing import Self
+from typing import Annotated, Any, Self
 
-from pydantic import BaseModel, Field, PrivateAttr, model_validator
+from pydantic import (
+    BaseModel,
+    Field,
+    PrivateAttr,
+    TypeAdapter,
+    model_validator,
+)
 from pydantic.fields import FieldInfo
 
+from lionagi.libs.schema.stream_json import StreamingJSONParser
 from lionagi.libs.validate.fuzzy_match_keys import fuzzy_match_keys
 from lionagi.operatives.models.schema_model import SchemaModel
+from lionagi.protocols.types import Tracer
 from lionagi.utils import UNDEFINED, to_json
 
 from .models.model_params import FieldModel, ModelParams
@@ -31,6 +39,10 @@ class Operative(SchemaModel):
     max_retries: int = 3
     parse_kwargs: dict | None = None
     _should_retry: bool = PrivateAttr(default=None)
+    _stream_parser: StreamingJSONParser | None = PrivateAttr(default=None)
+    _partial: dict = PrivateAttr(default_factory=dict)
+    _truncated: bool = PrivateAttr(default=False)
+    _field_adapters: dict = PrivateAttr(default_factory=dict)
 
     @model_validator(mode="after")
     def _validate(self) -> Self:
@@ -50,7 +62,7 @@ class Operative(SchemaModel):
         Raises:
             Exception: If the validation fails.
         """
-        d_ = to_json(text, fuzzy_parse=True)
+        d_ = self._parse_text(text)
         if isinstance(d_, list | tuple) and len(d_) == 1:
             d_ = d_[0]
         try:
@@ -72,7 +84,7 @@ class Operative(SchemaModel):
         """
         d_ = text
         try:
-            d_ = to_json(text, fuzzy_parse=True)
+            d_ = self._parse_text(text)
             if isinstance(d_, list | tuple) and len(d_) == 1:
                 d_ = d_[0]
             d_ = fuzzy_match_keys(
@@ -86,6 +98,137 @@ class Operative(SchemaModel):
             self.response_model = None
             self._should_retry = True
 
+    def _parse_text(self, text: str) -> dict | list:
+        """Parses a reply, repairing it in one pass if `to_json` fails.
+
+        Raises:
+            ValueError: If the reply is malformed beyond repair, or was cut
+                off before its JSON value closed (see `truncated`).
+        """
+        self._truncated = False
+        try:
+            d_ = to_json(text, fuzzy_parse=True)
+        except ValueError:
+            d_ = []
+        if d_ == []:
+            # slightly malformed replies are repaired here instead of
+            # costing another model call; cut-off ones are not accepted
+            parser = StreamingJSONParser()
+            parser.feed(text)
+            if parser.started and not parser.done:
+                self._truncated = True
+                raise ValueError("Reply was truncated")
+            d_ = parser.finish()
+        return d_
+
+    @property
+    def truncated(self) -> bool:
+        """bool: True if the last reply was cut off before its JSON value
+        closed; it is kept in `response_str_dict` but not validated."""
+        return self._truncated
+
+    @property
+    def partial_response(self) -> dict[str, Any]:
+        """dict: Fields of the streamed response validated so far."""
+        return dict(self._partial)
+
+    def _field_adapter(self, key: str) -> tuple[str, TypeAdapter] | None:
+        if key in self._field_adapters:
+            return self._field_adapters[key]
+        fields = self.request_type.model_fields
+        name = key if key in fields else None
+        if name is None:
+            normalized = (
+                key.strip().lower().replace("-", "_").replace(" ", "_")
+            )
+            name = next((f for f in fields if f.lower() == normalized), None)
+        entry = None
+        if name is not None:
+            info = fields[name]
+            annotation = (
+                Annotated[(info.annotation, *info.metadata)]
+                if info.metadata
+                else info.annotation
+            )
+            entry = (name, TypeAdapter(annotation))
+        self._field_adapters[key] = entry
+        return entry
+
+    def feed(self, delta: str) -> dict[str, Any]:
+        """Consumes a streamed piece of the response text.
+
+        Top-level fields are validated against `request_type` as soon as
+        their values are complete; fields the model does not declare are
+        left for `finish_stream`.
+
+        Args:
+            delta (str): The next piece of the reply.
+
+        Returns:
+            dict[str, Any]: Fields completed and validated by this delta.
+
+        Raises:
+            ValueError: If the reply is malformed or a completed field
+                fails validation, so the caller can stop the stream early.
+        """
+        if self._stream_parser is None:
+            self._stream_parser = StreamingJSONParser()
+            self._partial = {}
+        completed = {}
+        self._stream_parser.on_field = lambda k, v: completed.__setitem__(k, v)
+        self._stream_parser.feed(delta)
+
+        validated = {}
+        for key, value in completed.items():
+            entry = self._field_adapter(str(key))
+            if entry is None:
+                continue
+            name, adapter = entry
+            validated[name] = adapter.validate_python(value)
+        self._partial.update(validated)
+        return validated
+
+    def finish_stream(self) -> BaseModel | dict | str | None:
+        """Completes a response fed through `feed`.
+
+        The document is validated as a whole, as `update_response_model`
+        would do with the text. A reply cut off before its JSON value
+        closed is not validated: it is returned as recovered so far, with
+        `truncated` set and a retry requested.
+
+        Returns:
+            BaseModel | dict | str | None: The response model, or the raw
+                data if it could not be validated.
+
+        Raises:
+            ValueError: If nothing was fed or no JSON value was recovered.
+        """
+        parser, self._stream_parser = self._stream_parser, None
+        if parser is None:
+            raise ValueError("No streamed response to finish.")
+        self._truncated = parser.started and not parser.done
+        d_ = parser.finish()
+        self.response_str_dict = d_
+        if self._truncated:
+            self.response_model = None
+            self._should_retry = True
+            return d_
+        for handle_unmatched in ("raise", "force"):
+            try:
+                data = fuzzy_match_keys(
+                    d_,
+                    self.request_type.model_fields,
+                    handle_unmatched=handle_unmatched,
+                )
+                data = {k: v for k, v in data.items() if v != UNDEFINED}
+                self.response_model = self.request_type.model_validate(data)
+                self._should_retry = False
+                break
+            except Exception:
+                self.response_model = None
+                self._should_retry = True
+        return self.response_model or self.response_str_dict
+
     def update_response_model(
         self, text: str | None = None, data: dict | None = None
     ) -> BaseModel | dict | str | None:
@@ -105,11 +248,17 @@ class Operative(SchemaModel):
             raise ValueError("Either text or data must be provided.")
 
         if text:
-            self.response_str_dict = text
-            try:
-                self.raise_validate_pydantic(text)
-            except Exception:
-                self.force_validate_pydantic(text)
+            with Tracer.default().span(
+                "operative.parse",
+                response_type=getattr(self.response_type, "__name__", None),
+            ) as span:
+                self.response_str_dict = text
+                try:
+                    self.raise_validate_pydantic(text)
+                except Exception:
+                    span.set_attribute("forced", True)
+                    self.force_validate_pydantic(text)
+                span.set_attribute("valid", self.response_model is not None)
 
         if data and self.response_type:
             d_ = self.response_model.model_dump()
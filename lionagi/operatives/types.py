@@ -9,6 +9,7 @@ from .action.request_response_model import (
     ActionResponseModel,
 )
 from .action.tool import FuncTool, FuncToolRef, Tool, ToolRef
+from .action.tool_runner import ToolRunner
 from .forms.base import BaseForm
 from .forms.form import Form
 from .forms.report import Report
@@ -61,6 +62,7 @@ __all__ = (
     "Step",
     "Tool",
     "ToolRef",
+    "ToolRunner",
     "ACTIONS_FIELD",
     "FieldModel",
     "FuncTool",
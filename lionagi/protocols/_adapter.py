@@ -90,6 +90,8 @@ class JsonAdapter(Adapter):
 
     @classmethod
     def to_obj(cls, subj: T) -> str:
+        if hasattr(subj, "to_json"):
+            return subj.to_json()
         return json.dumps(subj.to_dict())
 
 
@@ -109,8 +111,11 @@ class JsonFileAdapter(Adapter):
         /,
         fp: str | Path,
     ) -> None:
-        with open(fp, "w") as f:
-            json.dump(subj.to_dict(), f)
+        if hasattr(subj, "to_json"):
+            Path(fp).write_text(subj.to_json())
+        else:
+            with open(fp, "w") as f:
+                json.dump(subj.to_dict(), f)
         logging.info(f"Successfully saved data to {fp}")
 
 
@@ -199,6 +204,29 @@ class ExcelFileAdapter(Adapter):
         logging.info(f"Saved {subj.class_name()} to {fp}")
 
 
+class ParquetFileAdapter(Adapter):
+
+    obj_key = ".parquet"
+    alias = (".parquet", "parquet_file", "parquet")
+
+    @classmethod
+    def from_obj(
+        cls, subj_cls: type[T], obj: str | Path, /, **kwargs
+    ) -> list[dict]:
+        """kwargs are `ParquetScan` filters (lion_class, role, since, until)"""
+        from .generic.columnar import ParquetScan
+
+        return list(ParquetScan(obj, **kwargs))
+
+    @classmethod
+    def to_obj(cls, subj: list[T], /, fp: str | Path, **kwargs) -> None:
+        """kwargs for `to_parquet` (batch_size, compression)"""
+        from .generic.columnar import to_parquet
+
+        to_parquet(subj, fp, **kwargs)
+        logging.info(f"Successfully saved data to {fp}")
+
+
 NODE_ADAPTERS = [
     JsonAdapter,
     JsonFileAdapter,
@@ -216,6 +244,7 @@ PILE_ADAPTERS = [
     PandasDataFrameAdapter,
     CSVFileAdapter,
     ExcelFileAdapter,
+    ParquetFileAdapter,
 ]
 
 
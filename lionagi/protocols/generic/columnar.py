@@ -0,0 +1,245 @@
+# Copyright (c) 2023 - 2024, HaiyangLi <quantocean.li at gmail dot com>
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Columnar (Arrow/Parquet) export and lazy scans of elements.
+
+Elements are heterogeneous, so each one is stored as a row of a fixed
+schema: the fields worth filtering on (`id`, `lion_class`,
+`content_class`, `created_at`, `role`) as typed columns, and the full
+`to_dict()` as a JSON `data` column. Exports are written one record
+batch at a time, so memory stays bounded by `batch_size` rows however
+large the source. Scans push filters on the typed columns down to the
+Parquet reader, which skips row groups by their statistics and never
+decodes `data` for rows that do not match.
+
+Requires the `pyarrow` package.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timezone
+from itertools import islice
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .serialization import json_dumps, json_loads
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
+
+__all__ = (
+    "to_parquet",
+    "ParquetScan",
+)
+
+COLUMNS = ("id", "lion_class", "content_class", "created_at", "role", "data")
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError(
+            "Columnar export requires the `pyarrow` package. Install it "
+            "with `pip install 'lionagi[parquet]'`."
+        ) from e
+    return pa, pc, ds, pq
+
+
+def _schema(pa) -> pa.Schema:
+    return pa.schema(
+        [
+            ("id", pa.string()),
+            ("lion_class", pa.string()),
+            ("content_class", pa.string()),
+            ("created_at", pa.timestamp("us", tz="UTC")),
+            ("role", pa.string()),
+            ("data", pa.string()),
+        ]
+    )
+
+
+def _timestamp(value: Any) -> datetime | None:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    if isinstance(value, str):
+        return _timestamp(datetime.fromisoformat(value))
+    return datetime.fromtimestamp(float(value), tz=timezone.utc)
+
+
+def _lion_class(d: Any) -> str | None:
+    if isinstance(d, dict) and isinstance(d.get("metadata"), dict):
+        return d["metadata"].get("lion_class")
+    return None
+
+
+def _row(item: Any) -> dict:
+    d = item.to_dict() if hasattr(item, "to_dict") else item
+    content = d.get("content")
+    role = d.get("role")
+    if role is None and isinstance(content, dict):
+        # logs wrap the element they record
+        role = content.get("role")
+    return {
+        "id": str(d["id"]) if d.get("id") is not None else None,
+        "lion_class": _lion_class(d),
+        "content_class": _lion_class(content),
+        "created_at": _timestamp(d.get("created_at")),
+        "role": str(getattr(role, "value", role)) if role else None,
+        "data": json_dumps(d),
+    }
+
+
+def to_parquet(
+    items: Iterable[Any],
+    fp: str | Path,
+    /,
+    *,
+    batch_size: int = 1024,
+    compression: str = "zstd",
+) -> int:
+    """Streams elements (or their dicts) into a Parquet file.
+
+    Each batch of `batch_size` items becomes one row group, which is also
+    the granularity at which scans can skip data.
+
+    Args:
+        items: Elements, or dicts produced by `to_dict`.
+        fp: The file to write.
+        batch_size (int): Rows converted and written at a time.
+        compression (str): Parquet compression codec.
+
+    Returns:
+        int: The number of rows written.
+    """
+    pa, _, _, pq = _pyarrow()
+    schema = _schema(pa)
+    items = iter(items)
+    rows = 0
+    with pq.ParquetWriter(str(fp), schema, compression=compression) as w:
+        while chunk := list(islice(items, batch_size)):
+            batch = pa.RecordBatch.from_pylist(
+                [_row(i) for i in chunk], schema=schema
+            )
+            w.write_batch(batch, row_group_size=batch_size)
+            rows += batch.num_rows
+    return rows
+
+
+class ParquetScan:
+    """A lazy, filtered view over Parquet files written by `to_parquet`.
+
+    Nothing is read until the scan is iterated. Filters are combined with
+    AND; `lion_class` matches either the row's own class or, for logs,
+    the class of the element they wrap, by full path or by class name.
+
+    Example:
+        >>> scan = ParquetScan("logs/", role="assistant", since=yesterday)
+        >>> for message in scan:  # dicts, one batch in memory at a time
+        ...     ...
+    """
+
+    def __init__(
+        self,
+        source: str | Path | list[str | Path],
+        *,
+        lion_class: str | type | list[str | type] | None = None,
+        role: str | list[str] | None = None,
+        since: datetime | float | str | None = None,
+        until: datetime | float | str | None = None,
+        batch_size: int = 1024,
+    ) -> None:
+        """Initializes the scan.
+
+        Args:
+            source: A Parquet file, a directory of them, or a list of files.
+            lion_class: Class(es) to keep.
+            role: Message role(s) to keep.
+            since: Keep rows created at or after this time.
+            until: Keep rows created before this time.
+            batch_size (int): Rows decoded at a time.
+        """
+        pa, pc, ds, _ = _pyarrow()
+        self._pc = pc
+        if isinstance(source, list):
+            source = [str(s) for s in source]
+        else:
+            source = str(source)
+        # log dumps without a file prefix start with "_", which pyarrow
+        # would otherwise skip as metadata
+        self.dataset = ds.dataset(
+            source,
+            format="parquet",
+            schema=_schema(pa),
+            ignore_prefixes=["."],
+        )
+        self.batch_size = batch_size
+        self.filter = self._expression(lion_class, role, since, until)
+
+    def _expression(self, lion_class, role, since, until):
+        pc = self._pc
+        conditions = []
+        if lion_class is not None:
+            if not isinstance(lion_class, list | tuple | set):
+                lion_class = [lion_class]
+            match = None
+            for cls in lion_class:
+                if isinstance(cls, type):
+                    cls = f"{cls.__module__}.{cls.__name__}"
+                for col in ("lion_class", "content_class"):
+                    field = pc.field(col)
+                    cond = (
+                        field == cls
+                        if "." in cls
+                        else pc.ends_with(field, "." + cls)
+                    )
+                    match = cond if match is None else match | cond
+            conditions.append(match)
+        if role is not None:
+            roles = [role] if isinstance(role, str) else list(role)
+            conditions.append(pc.field("role").isin([str(r) for r in roles]))
+        if since is not None:
+            conditions.append(pc.field("created_at") >= _timestamp(since))
+        if until is not None:
+            conditions.append(pc.field("created_at") < _timestamp(until))
+
+        expression = None
+        for cond in conditions:
+            expression = cond if expression is None else expression & cond
+        return expression
+
+    def iter_batches(
+        self, columns: list[str] | None = None
+    ) -> Iterator[pa.RecordBatch]:
+        """Yields the matching rows as Arrow record batches."""
+        yield from self.dataset.to_batches(
+            columns=columns, filter=self.filter, batch_size=self.batch_size
+        )
+
+    def __iter__(self) -> Iterator[dict]:
+        """Yields the matching elements as dicts (their `to_dict` form)."""
+        for batch in self.iter_batches(columns=["data"]):
+            for data in batch.column(0).to_pylist():
+                yield json_loads(data)
+
+    def count(self) -> int:
+        """int: The number of matching rows."""
+        return self.dataset.count_rows(filter=self.filter)
+
+    def to_table(self, columns: list[str] | None = None) -> pa.Table:
+        """pa.Table: All matching rows."""
+        return self.dataset.to_table(columns=columns, filter=self.filter)
+
+    def to_pandas(self, columns: list[str] | None = None) -> pd.DataFrame:
+        """pd.DataFrame: All matching rows (the typed columns by default)."""
+        if columns is None:
+            columns = [c for c in COLUMNS if c != "data"]
+        return self.to_table(columns).to_pandas()
@@ -0,0 +1,301 @@
+# Copyright (c) 2023 - 2024, HaiyangLi <quantocean.li at gmail dot com>
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""A disk-backed mapping of elements for very large piles.
+
+A `Pile` keeps every item resident in its `collections` dict. A
+`DiskStore` can stand in for that dict: it keeps the most recently used
+items in memory (the hot tail) and pages the rest out to append-only
+segment files, read back through `mmap` with an in-memory id -> offset
+index. Paged-out items are stored as their `to_json` form, so what
+`to_dict` leaves out (Jinja template objects, request models) no longer
+costs memory; private attributes, such as a message's clone/load flag,
+stay in the index and are restored on page-in.
+
+Use it through `Pile.spill()`.
+"""
+
+from __future__ import annotations
+
+import mmap
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict
+from collections.abc import Iterator, MutableMapping
+from pathlib import Path
+from typing import Any
+
+from .element import Element, IDType, has_own_to_dict
+from .serialization import json_loads
+
+__all__ = ("DiskStore",)
+
+
+_DEFAULTED: dict[type, tuple[str, ...]] = {}
+
+
+def _defaulted_fields(cls: type[Element]) -> tuple[str, ...]:
+    """Fields with a non-None default (cached per class)."""
+    if (fields := _DEFAULTED.get(cls)) is None:
+        fields = _DEFAULTED[cls] = tuple(
+            k
+            for k, f in cls.model_fields.items()
+            if f.default_factory is None and f.default is not None
+        )
+    return fields
+
+
+_PRIVATE_DEFAULTS: dict[type, dict] = {}
+
+
+def _private_state(item: Element) -> dict | None:
+    """The item's private attributes, or None if all are defaults."""
+    private = item.__pydantic_private__
+    if not private:
+        return None
+    cls = type(item)
+    if (defaults := _PRIVATE_DEFAULTS.get(cls)) is None:
+        defaults = _PRIVATE_DEFAULTS[cls] = {
+            k: a.get_default() for k, a in cls.__private_attributes__.items()
+        }
+    return None if private == defaults else private
+
+
+class _Slot:
+    """Where a paged-out item lives and how to rebuild it."""
+
+    __slots__ = ("segment", "offset", "length", "cls", "private")
+
+    def __init__(self, segment, offset, length, cls, private) -> None:
+        self.segment = segment
+        self.offset = offset
+        self.length = length
+        self.cls = cls
+        self.private = private
+
+
+class DiskStore(MutableMapping[IDType, Element]):
+    """Maps ids to elements, keeping only the hot tail resident.
+
+    Items beyond the `hot_size` most recently used are serialized and
+    appended to the current segment file, which is sealed once it
+    reaches `segment_size` bytes. Reading a paged-out item decodes it
+    from the mapped segment and makes it hot again. An item is written
+    again on eviction only if its serialized form changed, so paging a
+    message in to read it costs no disk space.
+
+    Items whose class overrides `to_dict` cannot be rebuilt from it and
+    are always kept resident. A paged-out item that is still referenced
+    elsewhere is handed back as the same object rather than decoded
+    again, so identity and edits made through that reference survive
+    while it is held. Call `mark_dirty` (or `Pile.touch`) after such an
+    edit to save it; otherwise it is only written if the item is paged
+    in and evicted again.
+
+    Attributes:
+        directory (Path): Where the segment files are.
+        hot_size (int): Items kept resident.
+        page_ins (int): Items read back from disk so far.
+        page_outs (int): Items written to disk so far.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path | None = None,
+        *,
+        hot_size: int = 256,
+        segment_size: int = 64 * 1024 * 1024,
+    ) -> None:
+        """Initializes the store.
+
+        Args:
+            directory (str | Path | None): Where to write segments; a
+                temporary directory, removed with the store, if None.
+            hot_size (int): Items kept resident.
+            segment_size (int): Bytes per segment file before a new one
+                is started.
+        """
+        if hot_size < 1:
+            raise ValueError("hot_size must be at least 1.")
+        self._tmp = None
+        if directory is None:
+            self._tmp = tempfile.TemporaryDirectory(prefix="lionagi-store-")
+            directory = self._tmp.name
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.hot_size = hot_size
+        self.segment_size = segment_size
+        self.page_ins = 0
+        self.page_outs = 0
+        # every key, in insertion order; None until first paged out
+        self._slots: dict[IDType, _Slot | None] = {}
+        self._hot: OrderedDict[IDType, Element] = OrderedDict()
+        # paged-out items still referenced outside the store
+        self._live: weakref.WeakValueDictionary[IDType, Element] = (
+            weakref.WeakValueDictionary()
+        )
+        self._segments: list[Path] = []
+        self._maps: list[mmap.mmap | None] = []
+        self._file = None
+        self._size = 0
+        # reads reorder the hot tail, so readers need it too
+        self._lock = threading.RLock()
+
+    @property
+    def resident(self) -> int:
+        """int: Items currently in memory."""
+        return len(self._hot)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __iter__(self) -> Iterator[IDType]:
+        return iter(list(self._slots))
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._slots
+
+    def __getitem__(self, key: IDType) -> Element:
+        with self._lock:
+            if (item := self._hot.get(key)) is not None:
+                self._hot.move_to_end(key)
+                return item
+            slot = self._slots[key]
+            if slot is None:
+                raise KeyError(key)
+            if (item := self._live.pop(key, None)) is None:
+                item = self._load(slot)
+                self.page_ins += 1
+            self._hot[key] = item
+            self._evict()
+            return item
+
+    def __setitem__(self, key: IDType, item: Element) -> None:
+        with self._lock:
+            self._slots.setdefault(key, None)
+            self._hot[key] = item
+            self._hot.move_to_end(key)
+            self._evict()
+
+    def __delitem__(self, key: IDType) -> None:
+        with self._lock:
+            del self._slots[key]
+            self._hot.pop(key, None)
+            self._live.pop(key, None)
+
+    def mark_dirty(self, key: IDType) -> None:
+        """Saves again an item that was edited in place.
+
+        A resident item is written when it is evicted anyway; a paged-out
+        one still referenced elsewhere is written now.
+        """
+        with self._lock:
+            if key in self._hot:
+                return
+            if (item := self._live.get(key)) is not None:
+                self._page_out(key, item)
+
+    def clear(self) -> None:
+        """Removes every item; written segments are kept until close."""
+        with self._lock:
+            self._slots.clear()
+            self._hot.clear()
+            self._live.clear()
+
+    def _evict(self) -> None:
+        if len(self._hot) <= self.hot_size:
+            return
+        pinned = []
+        while len(self._hot) > self.hot_size:
+            key, item = self._hot.popitem(last=False)
+            if has_own_to_dict(type(item)):
+                pinned.append((key, item))
+                continue
+            self._page_out(key, item)
+        for key, item in reversed(pinned):
+            self._hot[key] = item
+            self._hot.move_to_end(key, last=False)
+
+    def _page_out(self, key: IDType, item: Element) -> None:
+        self._live[key] = item
+        data = item.to_json().encode()
+        slot = self._slots.get(key)
+        if (
+            slot is not None
+            and slot.length == len(data)
+            and self._read(slot) == data
+        ):
+            slot.private = _private_state(item)
+            return
+
+        if self._file is None or (
+            self._size and self._size + len(data) > self.segment_size
+        ):
+            self._new_segment()
+        self._file.write(data)
+        self._slots[key] = _Slot(
+            len(self._segments) - 1,
+            self._size,
+            len(data),
+            type(item),
+            _private_state(item),
+        )
+        self._size += len(data)
+        self.page_outs += 1
+
+    def _new_segment(self) -> None:
+        if self._file is not None:
+            self._file.close()
+        path = self.directory / f"segment_{len(self._segments):05d}.bin"
+        self._file = path.open("wb")
+        self._size = 0
+        self._segments.append(path)
+        self._maps.append(None)
+
+    def _read(self, slot: _Slot) -> bytes:
+        end = slot.offset + slot.length
+        m = self._maps[slot.segment]
+        if m is None or len(m) < end:
+            # the active segment grew since it was mapped
+            if slot.segment == len(self._segments) - 1:
+                self._file.flush()
+            if m is not None:
+                m.close()
+            with self._segments[slot.segment].open("rb") as f:
+                m = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[slot.segment] = m
+        return m[slot.offset : end]
+
+    def _load(self, slot: _Slot) -> Element:
+        data = json_loads(self._read(slot))
+        data["metadata"].pop("lion_class", None)
+        for k in _defaulted_fields(slot.cls):
+            # e.g. Jinja templates, which serialize to None: fall back to
+            # the class default, as `from_dict` does
+            if k in data and data[k] is None:
+                del data[k]
+        item = slot.cls.model_validate(data)
+        if slot.private is not None:
+            item.__pydantic_private__ = dict(slot.private)
+        return item
+
+    def close(self) -> None:
+        """Releases the files; the store must not be used afterwards."""
+        for m in self._maps:
+            if m is not None:
+                m.close()
+        self._maps = [None] * len(self._segments)
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._tmp is not None:
+            self._tmp.cleanup()
+            self._tmp = None
+
+    def __repr__(self) -> str:
+        return (
+            f"DiskStore(items={len(self)}, resident={self.resident}, "
+            f"directory={str(self.directory)!r})"
+        )
@@ -9,10 +9,12 @@ from datetime import datetime
 from typing import Any, Generic, TypeAlias, TypeVar
 from uuid import UUID, uuid4
 
+import pydantic_core
 from pydantic import (
     BaseModel,
     ConfigDict,
     Field,
+    SerializationInfo,
     field_serializer,
     field_validator,
 )
@@ -23,6 +25,7 @@ from lionagi.settings import Settings
 from lionagi.utils import UNDEFINED, time, to_dict
 
 from .._concepts import Collective, Observable, Ordering
+from .serialization import json_default
 
 __all__ = (
     "IDType",
@@ -31,6 +34,20 @@ __all__ = (
     "validate_order",
 )
 
+# per-class caches used when serializing
+_FULL_CLASS_NAMES: dict[type, str] = {}
+_OWN_TO_DICT: dict[type, bool] = {}
+
+# serialization context under which elements encode as their `to_dict`
+TO_DICT_CONTEXT = {"lionagi_to_dict": True}
+
+
+def has_own_to_dict(cls: type) -> bool:
+    """bool: Whether `cls` overrides `Element.to_dict` (cached)."""
+    if (own := _OWN_TO_DICT.get(cls)) is None:
+        own = _OWN_TO_DICT[cls] = cls.to_dict is not Element.to_dict
+    return own
+
 
 class IDType:
     """Represents a UUIDv4-based identifier.
@@ -43,7 +60,7 @@ class IDType:
         _id (UUID): The wrapped UUID object.
     """
 
-    __slots__ = ("_id",)
+    __slots__ = ("_id", "_str")
 
     def __init__(self, id: UUID) -> None:
         """Initializes an IDType instance.
@@ -52,6 +69,7 @@ class IDType:
             id (UUID): A UUID object (version 4 preferred).
         """
         self._id = id
+        self._str: str | None = None
 
     @classmethod
     def validate(cls, value: str | UUID | IDType) -> IDType:
@@ -90,7 +108,11 @@ class IDType:
         Returns:
             str: The string form of this IDType's UUID.
         """
-        return str(self._id)
+        # formatting a UUID is comparatively slow and ids are serialized
+        # over and over, so the string is computed once
+        if self._str is None:
+            self._str = str(self._id)
+        return self._str
 
     def __repr__(self) -> str:
         """Returns the unambiguous string representation of this IDType.
@@ -282,7 +304,9 @@ class Element(BaseModel, Observable):
             str: The class name or fully qualified name.
         """
         if full:
-            return str(cls).split("'")[1]
+            if (name := _FULL_CLASS_NAMES.get(cls)) is None:
+                name = _FULL_CLASS_NAMES[cls] = str(cls).split("'")[1]
+            return name
         return cls.__name__
 
     def to_dict(self) -> dict:
@@ -297,6 +321,52 @@ class Element(BaseModel, Observable):
         dict_["metadata"].update({"lion_class": self.class_name(full=True)})
         return {k: v for k, v in dict_.items() if v is not UNDEFINED}
 
+    def to_json(self, *, indent: bool = False) -> str:
+        """Converts this Element to JSON, equivalent to `to_dict`.
+
+        The whole tree, a Pile's items included, is encoded in one pass
+        of pydantic's serializer straight to JSON, without building the
+        intermediate dictionaries (classes that override `to_dict` are
+        encoded from its result).
+
+        Args:
+            indent (bool): Pretty-print with two-space indentation.
+
+        Returns:
+            str: The JSON document.
+        """
+        if has_own_to_dict(type(self)):
+            return pydantic_core.to_json(
+                self._to_json_data(),
+                indent=2 if indent else None,
+                context=TO_DICT_CONTEXT,
+                fallback=json_default,
+            ).decode()
+        return self.__pydantic_serializer__.to_json(
+            self,
+            indent=2 if indent else None,
+            context=TO_DICT_CONTEXT,
+            fallback=json_default,
+        ).decode()
+
+    def _to_json_data(self) -> dict:
+        """The data `to_json` encodes for classes that override `to_dict`.
+
+        Nested elements may be left as objects; they are encoded in the
+        same pass.
+        """
+        return self.to_dict()
+
+    @field_serializer("metadata")
+    def _serialize_metadata(self, value: dict, info: SerializationInfo):
+        return self._tag_lion_class(value, info)
+
+    def _tag_lion_class(self, metadata: dict, info: SerializationInfo) -> dict:
+        """Adds `lion_class` to serialized metadata under `to_json`."""
+        if info.context and info.context.get("lionagi_to_dict"):
+            return {**metadata, "lion_class": self.class_name(full=True)}
+        return metadata
+
     @classmethod
     def from_dict(cls, data: dict, /) -> Element:
         """Deserializes a dictionary into an Element or subclass of Element.
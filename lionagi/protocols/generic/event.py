@@ -2,6 +2,7 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 
+from collections.abc import Callable
 from enum import Enum
 from typing import Any
 
@@ -41,9 +42,13 @@ class Execution:
             if known.
         response (Any): The result or output of the execution, if any.
         error (str | None): An error message if the execution failed.
+
+    A single observer may be attached with `observe`; it is called as
+    `observer(old_status, new_status)` whenever the status changes. The
+    observer is not copied or pickled along with the execution.
     """
 
-    __slots__ = ("status", "duration", "response", "error")
+    __slots__ = ("_status", "duration", "response", "error", "_observer")
 
     def __init__(
         self,
@@ -60,11 +65,44 @@ class Execution:
             status (EventStatus): The current status (default is PENDING).
             error (str | None): An optional error message.
         """
-        self.status = status
+        self._observer: Callable[[EventStatus, EventStatus], None] | None = (
+            None
+        )
+        self._status = status
         self.duration = duration
         self.response = response
         self.error = error
 
+    @property
+    def status(self) -> EventStatus:
+        """EventStatus: The current status, reported to the observer."""
+        return self._status
+
+    @status.setter
+    def status(self, val: EventStatus) -> None:
+        old, self._status = self._status, val
+        if self._observer is not None and old != val:
+            self._observer(old, val)
+
+    def observe(
+        self, observer: Callable[[EventStatus, EventStatus], None] | None
+    ) -> None:
+        """Sets (or with None, clears) the status-change observer."""
+        self._observer = observer
+
+    def __getstate__(self) -> dict:
+        return {
+            "_status": self._status,
+            "duration": self.duration,
+            "response": self.response,
+            "error": self.error,
+        }
+
+    def __setstate__(self, state: dict) -> None:
+        self._observer = None
+        for k, v in state.items():
+            setattr(self, k, v)
+
     def __str__(self) -> str:
         """Returns a string representation of the execution state.
 
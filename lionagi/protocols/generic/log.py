@@ -4,10 +4,11 @@
 
 from __future__ import annotations
 
+import asyncio
 import atexit
 import logging
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal
 
 from pydantic import BaseModel, Field, PrivateAttr, field_validator
 
@@ -15,6 +16,7 @@ from lionagi.utils import create_path, to_dict
 
 from .._concepts import Manager
 from .element import Element
+from .log_sink import LogSink
 from .pile import Pile
 
 __all__ = (
@@ -34,6 +36,12 @@ class LogManagerConfig(BaseModel):
     hash_digits: int | None = Field(5, ge=0, le=10)
     auto_save_on_exit: bool = True
     clear_after_dump: bool = True
+    sink: Literal["jsonl", "binary"] | None = None
+    sink_queue_size: int = Field(10_000, gt=0)
+    sink_overflow: Literal["block", "drop"] = "block"
+    sink_max_bytes: int | None = 64 * 1024 * 1024
+    sink_max_age: float | None = None
+    sink_fsync_interval: float | None = 1.0
 
     @field_validator("capacity", "hash_digits", mode="before")
     def _validate_non_negative(cls, value):
@@ -48,8 +56,10 @@ class LogManagerConfig(BaseModel):
     def _ensure_dot_extension(cls, value):
         if not value.startswith("."):
             return "." + value
-        if value not in {".csv", ".json", ".jsonl"}:
-            raise ValueError("Extension must be '.csv', '.json' or '.jsonl'.")
+        if value not in {".csv", ".json", ".jsonl", ".parquet"}:
+            raise ValueError(
+                "Extension must be '.csv', '.json', '.jsonl' or '.parquet'."
+            )
         return value
 
 
@@ -105,6 +115,11 @@ class LogManager(Manager):
     """
     Manages a collection of logs, optionally auto-dumping them
     to CSV or JSON when capacity is reached or at program exit.
+
+    With `sink` set, every log is instead streamed to append-only files
+    by a background `LogSink` as it arrives, and `capacity` only bounds
+    how many recent logs stay in memory; nothing is rewritten on the
+    event loop.
     """
 
     def __init__(
@@ -121,11 +136,17 @@ class LogManager(Manager):
             subfolder: Subdirectory within `persist_dir`.
             file_prefix: Filename prefix for log files.
             capacity: Max number of logs before auto-dump. None = unlimited.
-            extension: File extension (".csv" or ".json").
+            extension: File extension (".csv", ".json" or ".parquet").
             use_timestamp: Whether to include timestamps in filenames.
             hash_digits: Random hash length in filenames.
             auto_save_on_exit: Auto-save logs at program exit.
             clear_after_dump: Whether to clear logs after saving.
+            sink: Stream logs to append-only files ("jsonl" or "binary").
+            sink_queue_size: Logs that may wait for the sink's writer.
+            sink_overflow: "block" or "drop" logs when that queue is full.
+            sink_max_bytes: Start a new sink file past this size.
+            sink_max_age: Start a new sink file after this many seconds.
+            sink_fsync_interval: Seconds between fsyncs (None: never).
         """
         if _config is None:
             _config = LogManagerConfig(**kwargs)
@@ -135,6 +156,22 @@ class LogManager(Manager):
         else:
             self.logs = Pile(collections=logs, item_type=Log, strict_type=True)
         self._config = _config
+        self.sink: LogSink | None = None
+        if _config.sink:
+            self.sink = LogSink(
+                self._persist_dir(),
+                file_prefix=_config.file_prefix,
+                format=_config.sink,
+                queue_size=_config.sink_queue_size,
+                overflow=_config.sink_overflow,
+                max_bytes=_config.sink_max_bytes,
+                max_age=_config.sink_max_age,
+                fsync_interval=_config.sink_fsync_interval,
+                use_timestamp=_config.use_timestamp,
+                hash_digits=_config.hash_digits or 0,
+            )
+            # queued logs are written out even without auto-save
+            atexit.register(self.sink.close)
 
         # Auto-dump on exit
         if self._config.auto_save_on_exit:
@@ -143,7 +180,16 @@ class LogManager(Manager):
     def log(self, log_: Log) -> None:
         """
         Add a log synchronously. If capacity is reached, auto-dump to file.
+
+        In sink mode the log is queued for the sink's writer instead, and
+        the oldest in-memory log is evicted once capacity is reached. If
+        the sink's queue is full, a call from a running event loop drops
+        the log rather than block the loop; use `alog` to wait for room.
         """
+        if self.sink is not None:
+            self.sink.write(log_)
+            self._retain(log_)
+            return
         if self._config.capacity and len(self.logs) >= self._config.capacity:
             try:
                 self.dump(clear=self._config.clear_after_dump)
@@ -154,19 +200,42 @@ class LogManager(Manager):
     async def alog(self, log_: Log) -> None:
         """
         Add a log asynchronously. If capacity is reached, auto-dump to file.
+
+        In sink mode this waits (off the event loop) for room in the
+        sink's queue rather than dropping the log.
         """
+        if self.sink is not None:
+            await self.sink.awrite(log_)
+            async with self.logs:
+                self._retain(log_)
+            return
         async with self.logs:
             self.log(log_)
 
+    def _retain(self, log_: Log) -> None:
+        # sink mode keeps only the most recent logs in memory
+        if self._config.capacity and len(self.logs) >= self._config.capacity:
+            self.logs.pop(0)
+        self.logs.include(log_)
+
     def dump(
         self,
         clear: bool | None = None,
         persist_path: str | Path | None = None,
     ) -> None:
         """
-        Dump the logs to a file (CSV or JSON). If file extension is
+        Dump the logs to a file (CSV, JSON or Parquet). If file extension is
         unsupported, raise ValueError. Optionally clear logs after.
+
+        In sink mode, without `persist_path`, this waits until the sink
+        has written and synced every queued log.
         """
+        if self.sink is not None and persist_path is None:
+            self.sink.flush()
+            if self._config.clear_after_dump if clear is None else clear:
+                self.logs.clear()
+            return
+
         if not self.logs:
             logging.debug("No logs to dump.")
             return
@@ -178,6 +247,8 @@ class LogManager(Manager):
                 self.logs.to_csv_file(fp)
             elif suffix == ".json":
                 self.logs.to_json_file(fp)
+            elif suffix == ".parquet":
+                self.logs.to_parquet_file(fp)
             else:
                 raise ValueError(f"Unsupported file extension: {suffix}")
 
@@ -197,19 +268,30 @@ class LogManager(Manager):
         persist_path: str | Path | None = None,
     ) -> None:
         """Asynchronously dump the logs to a file."""
+        if self.sink is not None and persist_path is None:
+            # the writer may need a while; wait for it off the loop
+            await asyncio.to_thread(self.sink.flush)
+            clear = self._config.clear_after_dump if clear is None else clear
+            if clear:
+                async with self.logs:
+                    self.logs.clear()
+            return
         async with self.logs:
             self.dump(clear=clear, persist_path=persist_path)
 
+    def _persist_dir(self) -> str:
+        path_str = str(self._config.persist_dir)
+        if self._config.subfolder:
+            path_str = f"{path_str}/{self._config.subfolder}"
+        return path_str
+
     def _create_path(self) -> Path:
         """
         Build a file path from the manager's config using
         `create_path`.
         """
-        path_str = str(self._config.persist_dir)
-        if self._config.subfolder:
-            path_str = f"{path_str}/{self._config.subfolder}"
         return create_path(
-            directory=path_str,
+            directory=self._persist_dir(),
             filename=self._config.file_prefix or "",
             extension=self._config.extension,
             timestamp=self._config.use_timestamp,
@@ -218,6 +300,9 @@ class LogManager(Manager):
 
     def save_at_exit(self) -> None:
         """Dump logs on program exit."""
+        if self.sink is not None:
+            self.sink.close()
+            return
         if self.logs:
             try:
                 self.dump(clear=self._config.clear_after_dump)
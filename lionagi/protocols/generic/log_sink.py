@@ -0,0 +1,356 @@
+# Copyright (c) 2023 - 2024, HaiyangLi <quantocean.li at gmail dot com>
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Append-only log files written from a background thread.
+
+`LogManager` buffers logs and periodically rewrites them through pandas
+or `json.dump`, which runs on the event loop and copies the whole buffer.
+A `LogSink` instead hands each log to a writer thread through a bounded
+queue; the thread serializes it, appends it to the current file, fsyncs
+in batches and rotates files by size or age. Callers only pay for a
+queue put, and never block an event loop on a full queue.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import queue
+import struct
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, Literal
+
+from lionagi.utils import create_path
+
+from .serialization import json_dumpb, json_loads
+
+__all__ = (
+    "LogSink",
+    "iter_log_file",
+)
+
+SinkFormat = Literal["jsonl", "binary"]
+
+_EXTENSIONS = {"jsonl": ".jsonl", "binary": ".bin"}
+# 4-byte big-endian payload length precedes each binary record
+_LENGTH = struct.Struct(">I")
+_STOP = object()
+
+
+def _encode(item: Any, format: SinkFormat) -> bytes:
+    if hasattr(item, "to_json"):
+        data = item.to_json().encode()
+    else:
+        data = json_dumpb(item.to_dict() if hasattr(item, "to_dict") else item)
+    if format == "binary":
+        return _LENGTH.pack(len(data)) + data
+    return data + b"\n"
+
+
+def _in_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def iter_log_file(path: str | Path) -> Iterator[dict]:
+    """Yields the records of a file written by `LogSink`.
+
+    The format follows the extension (`.bin` is length-prefixed, anything
+    else is JSON Lines). A truncated final record, left by a crash
+    mid-write, is skipped.
+    """
+    path = Path(path)
+    with path.open("rb") as f:
+        if path.suffix != _EXTENSIONS["binary"]:
+            for line in f:
+                if line.endswith(b"\n") and line.strip():
+                    yield json_loads(line)
+            return
+        while header := f.read(_LENGTH.size):
+            if len(header) < _LENGTH.size:
+                return
+            (size,) = _LENGTH.unpack(header)
+            data = f.read(size)
+            if len(data) < size:
+                return
+            yield json_loads(data)
+
+
+class LogSink:
+    """Streams logs to append-only files from a background thread.
+
+    Records are JSON Lines (`format="jsonl"`) or length-prefixed JSON
+    (`format="binary"`, which tolerates newlines in any encoding). The
+    writer drains the queue in batches, flushes after each batch and
+    fsyncs at most every `fsync_interval` seconds. A new file is started
+    once the current one would exceed `max_bytes` or is older than
+    `max_age` seconds.
+
+    Attributes:
+        files (list[Path]): Files written so far, oldest first.
+        written (int): Records written.
+        dropped (int): Records dropped because the queue was full.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        *,
+        file_prefix: str | None = None,
+        format: SinkFormat = "jsonl",
+        queue_size: int = 10_000,
+        overflow: Literal["block", "drop"] = "block",
+        batch_size: int = 256,
+        max_bytes: int | None = 64 * 1024 * 1024,
+        max_age: float | None = None,
+        fsync_interval: float | None = 1.0,
+        use_timestamp: bool = True,
+        hash_digits: int = 5,
+    ) -> None:
+        """Initializes the sink; the writer thread starts on first write.
+
+        Args:
+            directory (str | Path): Where log files are created.
+            file_prefix (str | None): File name prefix (default `"log"`).
+            format (str): `"jsonl"` or `"binary"`.
+            queue_size (int): Records that may wait for the writer.
+            overflow (str): With a full queue, `"block"` waits for room
+                and `"drop"` discards the record (counted in `dropped`).
+                `write` never blocks a thread running an event loop; it
+                drops there, and coroutines should use `awrite`.
+            batch_size (int): Records written per flush.
+            max_bytes (int | None): Rotate before a file grows past this.
+            max_age (float | None): Rotate files older than this (seconds).
+            fsync_interval (float | None): Seconds between fsyncs; None
+                leaves syncing to the OS.
+            use_timestamp (bool): Put a timestamp in file names.
+            hash_digits (int): Random hex digits in file names.
+        """
+        if format not in _EXTENSIONS:
+            raise ValueError(f"Unsupported log sink format: {format}")
+        self.directory = Path(directory)
+        self.file_prefix = file_prefix or "log"
+        self.format = format
+        self.overflow = overflow
+        self.batch_size = batch_size
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.fsync_interval = fsync_interval
+        self.use_timestamp = use_timestamp
+        self.hash_digits = hash_digits
+        self.files: list[Path] = []
+        self.written = 0
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+        self._closed = False
+        self._file = None
+        self._size = 0
+        self._opened_at = 0.0
+        self._synced_at = 0.0
+        self._dirty = False
+
+    @property
+    def path(self) -> Path | None:
+        """Path | None: The file currently written to."""
+        return self.files[-1] if self.files else None
+
+    @property
+    def pending(self) -> int:
+        """int: Records waiting for the writer."""
+        return self._queue.qsize()
+
+    def write(self, item: Any) -> None:
+        """Queues a log (or any JSON-serializable dict) for writing.
+
+        With `overflow="block"` and a full queue, this waits for the
+        writer, unless called from a running event loop: stalling the loop
+        on disk I/O would stall every task on it, so the record is dropped
+        instead. Use `awrite` from coroutines to wait without blocking.
+
+        Raises:
+            RuntimeError: If the sink has been closed.
+        """
+        if self._put_nowait(item):
+            return
+        if self.overflow == "drop" or _in_event_loop():
+            self.dropped += 1
+        else:
+            self._queue.put(item)
+
+    async def awrite(self, item: Any) -> None:
+        """Queues a log without blocking the event loop.
+
+        With `overflow="block"` and a full queue, a worker thread waits
+        for room while the loop keeps running.
+
+        Raises:
+            RuntimeError: If the sink has been closed.
+        """
+        if self._put_nowait(item):
+            return
+        if self.overflow == "drop":
+            self.dropped += 1
+        else:
+            await asyncio.to_thread(self._queue.put, item)
+
+    def _put_nowait(self, item: Any) -> bool:
+        if self._closed:
+            raise RuntimeError("Cannot write to a closed LogSink.")
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            return False
+        return True
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Blocks until every queued record is written and synced.
+
+        Returns:
+            bool: False if `timeout` expired first.
+        """
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self) -> None:
+        """Writes what is queued, then closes the file and the thread."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="lionagi-log-sink", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            timeout = None
+            if self._dirty and self.fsync_interval is not None:
+                timeout = max(
+                    0.0,
+                    self._synced_at + self.fsync_interval - time.monotonic(),
+                )
+            try:
+                batch = [self._queue.get(timeout=timeout)]
+            except queue.Empty:
+                self._sync()
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop, waiters = False, []
+            for item in batch:
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    self._append(item)
+
+            if self._file is not None:
+                self._file.flush()
+            if (
+                stop
+                or waiters
+                or (
+                    self.fsync_interval is not None
+                    and time.monotonic() - self._synced_at
+                    >= self.fsync_interval
+                )
+            ):
+                self._sync()
+            for waiter in waiters:
+                waiter.set()
+            if stop:
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                return
+
+    def _append(self, item: Any) -> None:
+        try:
+            data = _encode(item, self.format)
+        except Exception as e:
+            logging.error(f"Failed to serialize log record: {e}")
+            return
+        try:
+            if self._should_rotate(len(data)):
+                self._rotate()
+            self._file.write(data)
+        except OSError as e:
+            logging.error(f"Failed to write log record: {e}")
+            return
+        self._size += len(data)
+        self._dirty = True
+        self.written += 1
+
+    def _should_rotate(self, incoming: int) -> bool:
+        if self._file is None:
+            return True
+        if (
+            self.max_bytes
+            and self._size
+            and self._size + incoming > (self.max_bytes)
+        ):
+            return True
+        return bool(
+            self.max_age and time.monotonic() - self._opened_at >= self.max_age
+        )
+
+    def _rotate(self) -> None:
+        if self._file is not None:
+            self._sync()
+            self._file.close()
+        name = self.file_prefix
+        if not self.use_timestamp and not self.hash_digits:
+            name = f"{name}_{len(self.files):05d}"
+        path = create_path(
+            directory=self.directory,
+            filename=name,
+            extension=_EXTENSIONS[self.format],
+            timestamp=self.use_timestamp,
+            timestamp_format="%Y%m%d%H%M%S%f",
+            random_hash_digits=self.hash_digits,
+            file_exist_ok=True,
+        )
+        self._file = path.open("ab")
+        self._size = self._file.tell()
+        self._opened_at = time.monotonic()
+        self.files.append(path)
+
+    def _sync(self) -> None:
+        if self._file is not None and self._dirty:
+            try:
+                self._file.flush()
+                if self.fsync_interval is not None:
+                    os.fsync(self._file.fileno())
+            except OSError as e:
+                logging.error(f"Failed to sync log file: {e}")
+        self._dirty = False
+        self._synced_at = time.monotonic()
@@ -12,24 +12,36 @@ from collections.abc import (
     AsyncIterator,
     Callable,
     Generator,
+    Iterable,
     Iterator,
     Sequence,
 )
-from functools import wraps
+from contextlib import asynccontextmanager, contextmanager
+from functools import lru_cache, wraps
 from pathlib import Path
 from typing import Any, ClassVar, Generic, Self, TypeVar
 
 import pandas as pd
-from pydantic import Field, field_serializer
+from pydantic import Field, SerializationInfo, field_serializer
 from pydantic.fields import FieldInfo
 from typing_extensions import override
 
+from lionagi._class_registry import get_class
 from lionagi._errors import ItemExistsError, ItemNotFoundError
 from lionagi.utils import UNDEFINED, is_same_dtype, to_list
 
 from .._adapter import Adapter, AdapterRegistry, PileAdapterRegistry
 from .._concepts import Observable
-from .element import ID, Collective, E, Element, IDType, validate_order
+from .disk_store import DiskStore
+from .element import (
+    ID,
+    Collective,
+    E,
+    Element,
+    IDType,
+    has_own_to_dict,
+    validate_order,
+)
 from .progression import Progression
 
 D = TypeVar("D")
@@ -42,6 +54,151 @@ __all__ = (
 )
 
 
+class RWLock:
+    """Readers-writer lock for threads.
+
+    Any number of readers may hold the lock together, a writer holds it
+    alone, and waiting writers keep new readers out so they are not
+    starved. The write side is reentrant, and the thread holding it may
+    also read. Using the lock directly (`with lock:`) takes the write
+    side, so it can stand in for a `threading.Lock`.
+    """
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer: int | None = None
+        self._depth = 0
+        self._waiting_writers = 0
+
+    def acquire_read(self) -> None:
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                self._depth += 1
+                return
+            while self._writer is not None or self._waiting_writers:
+                self._cond.wait()
+            self._readers += 1
+
+    def release_read(self) -> None:
+        with self._cond:
+            if self._writer == threading.get_ident():
+                self._depth -= 1
+                return
+            self._readers -= 1
+            if not self._readers:
+                self._cond.notify_all()
+
+    def acquire_write(self) -> None:
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                self._depth += 1
+                return
+            self._waiting_writers += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._cond.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = me
+            self._depth = 1
+
+    def release_write(self) -> None:
+        with self._cond:
+            self._depth -= 1
+            if not self._depth:
+                self._writer = None
+                self._cond.notify_all()
+
+    @contextmanager
+    def read(self):
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self):
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+    def __enter__(self) -> RWLock:
+        self.acquire_write()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.release_write()
+
+
+class AsyncRWLock:
+    """Readers-writer lock for coroutines.
+
+    Same policy as `RWLock` without reentrancy (like `asyncio.Lock`).
+    `acquire` / `release` and `async with lock:` take the write side.
+    """
+
+    def __init__(self) -> None:
+        self._cond = asyncio.Condition()
+        self._readers = 0
+        self._writing = False
+        self._waiting_writers = 0
+
+    def _can_read(self) -> bool:
+        return not self._writing and not self._waiting_writers
+
+    def _can_write(self) -> bool:
+        return not self._writing and not self._readers
+
+    async def acquire_read(self) -> None:
+        async with self._cond:
+            await self._cond.wait_for(self._can_read)
+            self._readers += 1
+
+    async def release_read(self) -> None:
+        async with self._cond:
+            self._readers -= 1
+            if not self._readers:
+                self._cond.notify_all()
+
+    async def acquire(self) -> None:
+        async with self._cond:
+            self._waiting_writers += 1
+            try:
+                await self._cond.wait_for(self._can_write)
+            finally:
+                self._waiting_writers -= 1
+            self._writing = True
+
+    async def release(self) -> None:
+        async with self._cond:
+            self._writing = False
+            self._cond.notify_all()
+
+    def locked(self) -> bool:
+        return self._writing
+
+    @asynccontextmanager
+    async def read(self):
+        await self.acquire_read()
+        try:
+            yield
+        finally:
+            await self.release_read()
+
+    async def __aenter__(self) -> AsyncRWLock:
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.release()
+
+
 def synchronized(func: Callable):
     @wraps(func)
     def wrapper(self: Pile, *args, **kwargs):
@@ -51,6 +208,15 @@ def synchronized(func: Callable):
     return wrapper
 
 
+def shared(func: Callable):
+    @wraps(func)
+    def wrapper(self: Pile, *args, **kwargs):
+        with self.lock.read():
+            return func(self, *args, **kwargs)
+
+    return wrapper
+
+
 def async_synchronized(func: Callable):
     @wraps(func)
     async def wrapper(self: Pile, *args, **kwargs):
@@ -60,6 +226,15 @@ def async_synchronized(func: Callable):
     return wrapper
 
 
+def async_shared(func: Callable):
+    @wraps(func)
+    async def wrapper(self: Pile, *args, **kwargs):
+        async with self.async_lock.read():
+            return await func(self, *args, **kwargs)
+
+    return wrapper
+
+
 class Pile(Element, Collective[E], Generic[E]):
     """Thread-safe async-compatible, ordered collection of elements.
 
@@ -69,6 +244,12 @@ class Pile(Element, Collective[E], Generic[E]):
     - Format adapters (JSON, CSV, Excel)
     - Memory efficient storage
 
+    Writes take the write side of a readers-writer lock (`RWLock` for
+    threads, `AsyncRWLock` for coroutines; the two do not block each
+    other), while `get` / `aget` only take the read side. Iteration does
+    not lock at all: it walks an immutable snapshot that is shared by
+    all readers and rebuilt only after a write (copy-on-write).
+
     Attributes:
         pile_ (dict[str, T]): Internal storage mapping IDs to elements
         item_type (set[type[T]] | None): Allowed element types
@@ -97,7 +278,7 @@ class Pile(Element, Collective[E], Generic[E]):
 
     def __pydantic_extra__(self) -> dict[str, FieldInfo]:
         return {
-            "_lock": Field(default_factory=threading.Lock),
+            "_lock": Field(default_factory=RWLock),
             "_async": Field(default_factory=asyncio.Lock),
         }
 
@@ -158,9 +339,38 @@ class Pile(Element, Collective[E], Generic[E]):
             ValueError: If the dictionary format is invalid.
         """
         items = data.pop("collections", [])
-        items = [Element.from_dict(i) for i in items]
-        return cls(collections=items, **data)
+        return cls.bulk_load(items, **data)
 
+    @classmethod
+    def bulk_load(
+        cls,
+        items: Iterable[T | dict],
+        /,
+        *,
+        item_type: set[type[T]] = None,
+        strict_type: bool = False,
+        construct: bool = False,
+        **kwargs,
+    ) -> Pile:
+        """Create a Pile from many items in a single pass.
+
+        See `extend_trusted` for how items are checked and deserialized.
+
+        Args:
+            items: Elements or dictionaries produced by `to_dict`.
+            item_type: Allowed types for items in the pile.
+            strict_type: If True, enforce strict type checking.
+            construct: Build dictionaries without field validation.
+            **kwargs: `id` / `created_at` of the new pile.
+
+        Returns:
+            A new Pile instance holding `items` in order.
+        """
+        pile_ = cls(item_type=item_type, strict_type=strict_type, **kwargs)
+        pile_.extend_trusted(items, construct=construct)
+        return pile_
+
+    @synchronized
     def __setitem__(
         self,
         key: ID.Ref | ID.RefSeq | int | slice,
@@ -199,6 +409,7 @@ class Pile(Element, Collective[E], Generic[E]):
         """
         return self._pop(key, default)
 
+    @synchronized
     def remove(
         self,
         item: T,
@@ -214,6 +425,7 @@ class Pile(Element, Collective[E], Generic[E]):
         """
         self._remove(item)
 
+    @synchronized
     def include(
         self,
         item: ID.ItemSeq | ID.Item,
@@ -229,6 +441,7 @@ class Pile(Element, Collective[E], Generic[E]):
         """
         self._include(item)
 
+    @synchronized
     def exclude(
         self,
         item: ID.ItemSeq | ID.Item,
@@ -246,6 +459,7 @@ class Pile(Element, Collective[E], Generic[E]):
         """Remove all items."""
         self._clear()
 
+    @synchronized
     def update(
         self,
         other: ID.Item | ID.ItemSeq,
@@ -288,6 +502,54 @@ class Pile(Element, Collective[E], Generic[E]):
         self.update(item)
 
     @synchronized
+    def extend_trusted(
+        self,
+        items: Iterable[T | dict],
+        /,
+        *,
+        construct: bool = False,
+    ) -> None:
+        """Append many items in a single pass.
+
+        Items are not normalized one by one as in `include`: the type
+        check runs once per item class, and `collections` and
+        `progression` are each updated once at the end. Dictionaries are
+        deserialized by the `from_dict` of the class named in their
+        metadata (resolved once per class), or by its `model_construct`
+        if `construct` is True,
+        which skips field validation (only the `id` is parsed). Use
+        `construct` only on data this library serialized itself.
+
+        Args:
+            items: Elements or dictionaries produced by `to_dict`.
+            construct: Build dictionaries without field validation.
+
+        Raises:
+            TypeError: If an item type is not allowed.
+            ItemExistsError: If an item is already in the pile (nothing
+                is added in that case).
+        """
+        collections = self.collections
+        checked: set[type] = set()
+        result: dict[IDType, T] = {}
+
+        for i in items:
+            if isinstance(i, dict):
+                i = _load_element(i, construct)
+            if (t := type(i)) not in checked:
+                self._check_item_type(t)
+                checked.add(t)
+            if i.id in collections or i.id in result:
+                raise ItemExistsError(
+                    f"item {i.id} already exists in the pile"
+                )
+            result[i.id] = i
+
+        collections.update(result)
+        self.progression.append(list(result))
+        self._invalidate()
+
+    @shared
     def get(
         self,
         key: ID.Ref | ID.RefSeq | int | slice,
@@ -325,13 +587,39 @@ class Pile(Element, Collective[E], Generic[E]):
         """Get number of items."""
         return len(self.progression)
 
+    def snapshot(self) -> tuple[T, ...]:
+        """Get an immutable copy of the items, in order.
+
+        The copy is shared by every reader until the next write, so
+        taking it again is free and never blocks on other readers.
+        """
+        snap = self.__dict__.get("_snapshot")
+        if snap is None or len(snap) != len(self.progression):
+            with self.lock.read():
+                snap = tuple(self.collections[k] for k in self.progression)
+            if isinstance(self.collections, dict):
+                # a pile spilled to disk is not pinned in memory
+                self.__dict__["_snapshot"] = snap
+        return snap
+
+    def _invalidate(self) -> None:
+        self.__dict__["_snapshot"] = None
+
     def __iter__(self) -> Iterator[T]:
-        """Iterate over items safely."""
-        with self.lock:
-            current_order = list(self.progression)
+        """Iterate over a snapshot of the items, without locking.
 
-        for key in current_order:
-            yield self.collections[key]
+        A pile spilled to disk is iterated lazily instead, over a copy
+        of its order, so only the hot tail is resident at any time.
+        """
+        if not isinstance(self.collections, dict):
+            return self._iter_paged()
+        return iter(self.snapshot())
+
+    def _iter_paged(self) -> Iterator[T]:
+        for key in list(self.progression):
+            item = self.collections.get(key)
+            if item is not None:
+                yield item
 
     def __next__(self) -> T:
         """Get next item."""
@@ -485,26 +773,27 @@ class Pile(Element, Collective[E], Generic[E]):
         state = self.__dict__.copy()
         state["_lock"] = None
         state["_async_lock"] = None
+        state["_snapshot"] = None
         return state
 
     def __setstate__(self, state):
         """Restore after unpickling."""
         self.__dict__.update(state)
-        self._lock = threading.Lock()
-        self._async_lock = asyncio.Lock()
+        self._lock = RWLock()
+        self._async_lock = AsyncRWLock()
 
     @property
-    def lock(self):
-        """Thread lock."""
+    def lock(self) -> RWLock:
+        """Thread readers-writer lock."""
         if not hasattr(self, "_lock") or self._lock is None:
-            self._lock = threading.Lock()
+            self._lock = RWLock()
         return self._lock
 
     @property
-    def async_lock(self):
-        """Async lock."""
+    def async_lock(self) -> AsyncRWLock:
+        """Async readers-writer lock."""
         if not hasattr(self, "_async_lock") or self._async_lock is None:
-            self._async_lock = asyncio.Lock()
+            self._async_lock = AsyncRWLock()
         return self._async_lock
 
     # Async Interface methods
@@ -571,7 +860,7 @@ class Pile(Element, Collective[E], Generic[E]):
         """Async update with items."""
         self._update(other)
 
-    @async_synchronized
+    @async_shared
     async def aget(
         self,
         key: Any,
@@ -582,12 +871,9 @@ class Pile(Element, Collective[E], Generic[E]):
         return self._get(key, default)
 
     async def __aiter__(self) -> AsyncIterator[T]:
-        """Async iterate over items."""
-        async with self.async_lock:
-            current_order = list(self.progression)
-
-        for key in current_order:
-            yield self.collections[key]
+        """Async iterate over a snapshot of the items, without locking."""
+        for item in self.snapshot():
+            yield item
             await asyncio.sleep(0)  # Yield control to the event loop
 
     async def __anext__(self) -> T:
@@ -662,6 +948,7 @@ class Pile(Element, Collective[E], Generic[E]):
                 for i in to_list(delete_order, flatten=True):
                     self.collections.pop(i)
                 self.collections.update(item_dict)
+                self._invalidate()
             except Exception as e:
                 raise ValueError(f"Failed to set pile. Error: {e}")
         else:
@@ -680,6 +967,7 @@ class Pile(Element, Collective[E], Generic[E]):
                     )
             self.progression += key
             self.collections.update(item_dict)
+            self._invalidate()
 
     def _get(self, key: Any, default: D = UNDEFINED) -> T | Pile | D:
         if isinstance(key, int | slice):
@@ -727,6 +1015,7 @@ class Pile(Element, Collective[E], Generic[E]):
                 for i in pops:
                     self.progression.remove(i)
                     result.append(self.collections.pop(i))
+                self._invalidate()
                 result = (
                     self.__class__(items=result, item_type=self.item_type)
                     if len(result) > 1
@@ -744,6 +1033,7 @@ class Pile(Element, Collective[E], Generic[E]):
                 for k in key:
                     self.progression.remove(k)
                     result.append(self.collections.pop(k))
+                self._invalidate()
                 if len(result) == 0:
                     raise ItemNotFoundError(f"key {key} item not found")
                 elif len(result) == 1:
@@ -774,6 +1064,7 @@ class Pile(Element, Collective[E], Generic[E]):
 
         self.progression.append(item_order)
         self.collections.update(item_dict)
+        self._invalidate()
 
     def _exclude(self, item: ID.Ref | ID.RefSeq):
         item = to_list_type(item)
@@ -787,6 +1078,7 @@ class Pile(Element, Collective[E], Generic[E]):
     def _clear(self) -> None:
         self.collections.clear()
         self.progression.clear()
+        self._invalidate()
 
     def _update(self, other: ID.ItemSeq | ID.Item):
         others = self._validate_pile(other)
@@ -795,6 +1087,7 @@ class Pile(Element, Collective[E], Generic[E]):
                 self.collections[i] = others[i]
             else:
                 self.include(others[i])
+        self._invalidate()
 
     def _validate_item_type(self, value) -> set[type[T]] | None:
         if value is None:
@@ -823,31 +1116,36 @@ class Pile(Element, Collective[E], Generic[E]):
         value = to_list_type(value)
 
         result = {}
+        checked: set[type] = set()
         for i in value:
             if isinstance(i, dict):
                 i = Element.from_dict(i)
 
-            if self.item_type:
-                if self.strict_type:
-                    if type(i) not in self.item_type:
-                        raise TypeError(
-                            "Invalid item type in pile."
-                            f" Expected {self.item_type}",
-                        )
-                else:
-                    if not any(issubclass(type(i), t) for t in self.item_type):
-                        raise TypeError(
-                            "Invalid item type in pile. Expected "
-                            f"{self.item_type} or the subclasses",
-                        )
-            else:
-                if not isinstance(i, Observable):
-                    raise ValueError(f"Invalid pile item {i}")
+            if (t := type(i)) not in checked:
+                self._check_item_type(t, i)
+                checked.add(t)
 
             result[i.id] = i
 
         return result
 
+    def _check_item_type(self, t: type, item: Any = None) -> None:
+        if self.item_type:
+            if self.strict_type:
+                if t not in self.item_type:
+                    raise TypeError(
+                        "Invalid item type in pile."
+                        f" Expected {self.item_type}",
+                    )
+            else:
+                if not any(issubclass(t, i) for i in self.item_type):
+                    raise TypeError(
+                        "Invalid item type in pile. Expected "
+                        f"{self.item_type} or the subclasses",
+                    )
+        elif not issubclass(t, Observable):
+            raise ValueError(f"Invalid pile item {item if item else t}")
+
     def _validate_order(self, value: Any) -> Progression:
         if not value:
             return self.progression.__class__(
@@ -885,9 +1183,17 @@ class Pile(Element, Collective[E], Generic[E]):
             item_order.append(i)
         self.progression.insert(index, item_order)
         self.collections.update(item_dict)
+        self._invalidate()
 
     @field_serializer("collections")
-    def _(self, value: dict[str, T]):
+    def _(self, value: dict[str, T], info: SerializationInfo):
+        if info.context and info.context.get("lionagi_to_dict"):
+            # `to_json`: the items are encoded by their own serializers
+            # in the same pass instead of through their dicts
+            return [
+                i._to_json_data() if has_own_to_dict(type(i)) else i
+                for i in value.values()
+            ]
         return [i.to_dict() for i in value.values()]
 
     class AsyncPileIterator:
@@ -918,7 +1224,7 @@ class Pile(Element, Collective[E], Generic[E]):
         exc_tb: Any,
     ) -> None:
         """Exit async context."""
-        self.async_lock.release()
+        await self.async_lock.release()
 
     def is_homogenous(self) -> bool:
         """Check if all items are same type."""
@@ -968,6 +1274,59 @@ class Pile(Element, Collective[E], Generic[E]):
         """Save to CSV file."""
         self.adapt_to(".csv", fp=fp, **kwargs)
 
+    def to_parquet_file(self, fp: str | Path, **kwargs: Any) -> None:
+        """Stream to a Parquet file, one record batch at a time.
+
+        Read it back lazily, with filters, through `ParquetScan`.
+        """
+        self.adapt_to(".parquet", fp=fp, **kwargs)
+
+    @synchronized
+    def spill(
+        self,
+        directory: str | Path | None = None,
+        *,
+        hot_size: int = 256,
+        segment_size: int = 64 * 1024 * 1024,
+    ) -> DiskStore:
+        """Move the items to disk, keeping only the hot tail resident.
+
+        The pile behaves as before; items that are not among the
+        `hot_size` most recently used are paged in from disk on access.
+
+        Args:
+            directory: Where to keep the data (a temporary directory,
+                removed with the store, by default).
+            hot_size: Items kept in memory.
+            segment_size: Bytes per segment file.
+
+        Returns:
+            DiskStore: The store now backing `collections`.
+        """
+        if isinstance(self.collections, DiskStore):
+            return self.collections
+        store = DiskStore(
+            directory, hot_size=hot_size, segment_size=segment_size
+        )
+        for key in self.progression:
+            store[key] = self.collections[key]
+        self.collections = store
+        self._invalidate()
+        return store
+
+    def touch(self, key: ID.Ref) -> None:
+        """Record that an item was edited in place.
+
+        Only a pile spilled to disk needs to know: a paged-out item
+        edited through an outside reference is saved again, so the edit
+        outlives that reference.
+
+        Args:
+            key: The edited item or its ID.
+        """
+        if isinstance(self.collections, DiskStore):
+            self.collections.mark_dirty(ID.get_id(key))
+
     def to_json_file(
         self,
         path_or_buf,
@@ -989,9 +1348,13 @@ class Pile(Element, Collective[E], Generic[E]):
 
         if use_pd:
             return self.to_df().to_json(mode=mode, **kwargs)
-        dict_ = self.to_dict()
-        with open(path_or_buf, mode) as f:
-            json.dump(dict_, f, **kwargs)
+        if kwargs:
+            dict_ = self.to_dict()
+            with open(path_or_buf, mode) as f:
+                json.dump(dict_, f, **kwargs)
+        else:
+            with open(path_or_buf, mode) as f:
+                f.write(self.to_json())
 
         if verbose:
             print(f"Saved Pile to {path_or_buf}")
@@ -1040,6 +1403,31 @@ def pile(
     )
 
 
+@lru_cache(maxsize=None)
+def _lion_class(path: str) -> type[Element]:
+    """Resolve the class named by a `lion_class` metadata entry."""
+    from lionagi.libs.package.imports import import_module
+
+    try:
+        mod, imp = path.rsplit(".", 1)
+        return import_module(mod, import_name=imp)
+    except Exception:
+        return get_class(path.split(".")[-1])
+
+
+def _load_element(data: dict, construct: bool = False, /) -> Element:
+    """Build an element from `to_dict` output, resolving its class once."""
+    data = dict(data)
+    metadata = dict(data.get("metadata") or {})
+    subcls = _lion_class(metadata.pop("lion_class", Element.class_name(True)))
+    data["metadata"] = metadata
+    if not construct:
+        return subcls.from_dict(data)
+    if "id" in data:
+        data["id"] = IDType.validate(data["id"])
+    return subcls.model_construct(**data)
+
+
 def to_list_type(value: Any, /) -> list[Any]:
     """Convert input to a list format"""
     if value is None:
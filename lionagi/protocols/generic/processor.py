@@ -3,10 +3,14 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import asyncio
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import KeysView
 from typing import Any, ClassVar
 
 from .._concepts import Observer
-from .element import ID
+from .element import ID, IDType
 from .event import Event, EventStatus
 from .pile import Pile
 from .progression import Progression
@@ -14,8 +18,11 @@ from .progression import Progression
 __all__ = (
     "Processor",
     "Executor",
+    "EventStore",
 )
 
+FINISHED_STATUSES = frozenset({EventStatus.COMPLETED, EventStatus.FAILED})
+
 
 class Processor(Observer):
     """Manages a queue of events with capacity-limited, async processing.
@@ -31,6 +38,7 @@ class Processor(Observer):
         self,
         queue_capacity: int,
         capacity_refresh_time: float,
+        num_workers: int | None = None,
     ) -> None:
         """Initializes a Processor instance.
 
@@ -39,16 +47,23 @@ class Processor(Observer):
                 The maximum number of events processed in one batch.
             capacity_refresh_time (float):
                 The time in seconds after which processing capacity is reset.
+            num_workers (int | None):
+                If set, the processor runs in worker-pool mode: this many
+                long-lived consumer tasks pull events from the queue as
+                soon as permission is granted, instead of processing the
+                queue in batches.
 
         Raises:
-            ValueError: If `queue_capacity` < 1, or
-                `capacity_refresh_time` <= 0.
+            ValueError: If `queue_capacity` < 1,
+                `capacity_refresh_time` <= 0, or `num_workers` < 1.
         """
         super().__init__()
         if queue_capacity < 1:
             raise ValueError("Queue capacity must be greater than 0.")
         if capacity_refresh_time <= 0:
             raise ValueError("Capacity refresh time must be larger than 0.")
+        if num_workers is not None and num_workers < 1:
+            raise ValueError("Number of workers must be greater than 0.")
 
         self.queue_capacity = queue_capacity
         self.capacity_refresh_time = capacity_refresh_time
@@ -56,6 +71,10 @@ class Processor(Observer):
         self._available_capacity = queue_capacity
         self._execution_mode = False
         self._stop_event = asyncio.Event()
+        self.num_workers = num_workers
+        self._workers: list[asyncio.Task] = []
+        self._capacity_changed = asyncio.Condition()
+        self._waiters: dict[ID.ID, asyncio.Future] = {}
 
     @property
     def available_capacity(self) -> int:
@@ -75,12 +94,24 @@ class Processor(Observer):
     def execution_mode(self, value: bool) -> None:
         self._execution_mode = value
 
+    @property
+    def worker_mode(self) -> bool:
+        """bool: True if events are consumed by a pool of worker tasks."""
+        return self.num_workers is not None
+
     async def enqueue(self, event: Event) -> None:
         """Adds an event to the queue asynchronously.
 
+        In worker-pool mode, a completion future is registered so callers
+        can `wait_for` this particular event.
+
         Args:
             event (Event): The event to enqueue.
         """
+        if self.worker_mode and event.id not in self._waiters:
+            self._waiters[event.id] = (
+                asyncio.get_running_loop().create_future()
+            )
         await self.queue.put(event)
 
     async def dequeue(self) -> Event:
@@ -96,12 +127,27 @@ class Processor(Observer):
         await self.queue.join()
 
     async def stop(self) -> None:
-        """Signals the processor to stop processing events."""
+        """Signals the processor to stop processing events.
+
+        In worker-pool mode the worker tasks are cancelled and awaited.
+        """
         self._stop_event.set()
+        workers, self._workers = self._workers, []
+        for task in workers:
+            task.cancel()
+        if workers:
+            await asyncio.gather(*workers, return_exceptions=True)
 
     async def start(self) -> None:
-        """Clears the stop signal, allowing event processing to resume."""
+        """Clears the stop signal, allowing event processing to resume.
+
+        In worker-pool mode this also spawns any missing worker tasks.
+        """
         self._stop_event.clear()
+        if self.worker_mode:
+            self._workers = [t for t in self._workers if not t.done()]
+            for _ in range(self.num_workers - len(self._workers)):
+                self._workers.append(asyncio.create_task(self._worker()))
 
     def is_stopped(self) -> bool:
         """Checks whether the processor is in a stopped state.
@@ -127,34 +173,111 @@ class Processor(Observer):
     async def process(self) -> None:
         """Dequeues and processes events up to the available capacity.
 
-        Marks events as PROCESSING, invokes them asynchronously, and waits
-        for tasks to complete. Resets capacity afterward if any events
-        were processed.
+        Waits for permission on each event, marks it as PROCESSING, invokes
+        it asynchronously, and waits for the batch to complete. Resets
+        capacity afterward if any events were processed.
         """
         tasks = set()
-        prev_event: Event | None = None
 
         while self.available_capacity > 0 and not self.queue.empty():
-            next_event = None
-            if prev_event and prev_event.status == EventStatus.PENDING:
-                # Wait if previous event is still pending
-                await asyncio.sleep(self.capacity_refresh_time)
-                next_event = prev_event
-            else:
-                next_event = await self.dequeue()
-
-            if await self.request_permission(**next_event.request):
-                next_event.status = EventStatus.PROCESSING
-                task = asyncio.create_task(next_event.invoke())
-                tasks.add(task)
-
-            prev_event = next_event
+            next_event = await self.dequeue()
+            await self.acquire_permission(next_event)
+            next_event.status = EventStatus.PROCESSING
+            task = asyncio.create_task(self.process_event(next_event))
+            tasks.add(task)
             self._available_capacity -= 1
 
         if tasks:
             await asyncio.wait(tasks)
             self.available_capacity = self.queue_capacity
 
+    async def _worker(self) -> None:
+        """Consumes events from the queue until the processor is stopped."""
+        while not self.is_stopped():
+            event = await self.dequeue()
+            try:
+                await self.acquire_permission(event)
+                event.status = EventStatus.PROCESSING
+                await self.process_event(event)
+            except asyncio.CancelledError:
+                self._resolve(event)
+                raise
+            except Exception as e:
+                logging.error(f"Worker failed to process {event.id}: {e}")
+            finally:
+                self.queue.task_done()
+            self._resolve(event)
+            await self.notify_capacity()
+
+    def _resolve(self, event: Event) -> None:
+        """Completes the waiter future registered for `event`, if any."""
+        future = self._waiters.pop(event.id, None)
+        if future is not None and not future.done():
+            future.set_result(event)
+
+    async def wait_for(self, event: Event) -> None:
+        """Waits until a specific event has been processed.
+
+        Returns immediately if no waiter is registered for the event
+        (e.g., in batch mode, where `process()` already awaits it).
+
+        Args:
+            event (Event): The event to wait for.
+        """
+        future = self._waiters.get(event.id)
+        if future is not None:
+            await asyncio.shield(future)
+
+    async def acquire_permission(self, event: Event) -> None:
+        """Waits until `request_permission` grants the event.
+
+        Between attempts, waits on a condition that is notified whenever
+        capacity may have been freed, bounded by `permission_wait_time`.
+
+        Args:
+            event (Event): The event requesting permission.
+        """
+        request = event.request
+        while not await self.request_permission(**request):
+            timeout = self.permission_wait_time(**request)
+            async with self._capacity_changed:
+                try:
+                    await asyncio.wait_for(
+                        self._capacity_changed.wait(), timeout=timeout
+                    )
+                except TimeoutError:
+                    pass
+
+    def permission_wait_time(self, **kwargs: Any) -> float:
+        """Maximum time to wait before re-checking a denied permission.
+
+        Override this method to return a precise estimate (e.g., the time
+        until a rate limit has recovered enough budget).
+
+        Args:
+            **kwargs: The request parameters of the waiting event.
+
+        Returns:
+            float: Seconds to wait; defaults to `capacity_refresh_time`.
+        """
+        return self.capacity_refresh_time
+
+    async def notify_capacity(self) -> None:
+        """Wakes up all events waiting for permission."""
+        async with self._capacity_changed:
+            self._capacity_changed.notify_all()
+
+    async def process_event(self, event: Event) -> None:
+        """Invokes a single event that has been granted permission.
+
+        Override this method to add bookkeeping around each invocation
+        (e.g., settling rate-limit reservations).
+
+        Args:
+            event (Event): The event to invoke.
+        """
+        await event.invoke()
+
     async def request_permission(self, **kwargs: Any) -> bool:
         """Determines if an event may proceed.
 
@@ -172,11 +295,15 @@ class Processor(Observer):
     async def execute(self) -> None:
         """Continuously processes events until `stop()` is called.
 
-        Respects the capacity refresh time between processing cycles.
+        Respects the capacity refresh time between processing cycles. In
+        worker-pool mode, the workers consume the queue and this method
+        simply waits for the stop signal.
         """
         self.execution_mode = True
         await self.start()
 
+        if self.worker_mode:
+            await self._stop_event.wait()
         while not self.is_stopped():
             await self.process()
             await asyncio.sleep(self.capacity_refresh_time)
@@ -184,6 +311,122 @@ class Processor(Observer):
         self.execution_mode = False
 
 
+class EventStore:
+    """Holds an executor's events, indexed by status.
+
+    Each stored event reports its status transitions to the store (see
+    `Execution.observe`), which moves it between per-status indexes, so
+    membership and per-status listings never scan the whole history.
+
+    Finished (completed or failed) events are retained up to
+    `max_finished` and for at most `finished_ttl` seconds, whichever
+    comes first; the oldest are evicted as new events finish or when
+    the store is queried.
+
+    Attributes:
+        pile (Pile[Event]): The retained events, in insertion order.
+        max_finished (int | None): Finished events to keep, None for all.
+        finished_ttl (float | None): Seconds to keep a finished event.
+    """
+
+    def __init__(
+        self,
+        pile: Pile[Event],
+        max_finished: int | None = None,
+        finished_ttl: float | None = None,
+    ) -> None:
+        if max_finished is not None and max_finished < 0:
+            raise ValueError("max_finished must be non-negative.")
+        self.pile = pile
+        self.max_finished = max_finished
+        self.finished_ttl = finished_ttl
+        self._by_status: dict[EventStatus, dict[IDType, Event]] = {
+            s: {} for s in EventStatus
+        }
+        self._finished: OrderedDict[IDType, float] = OrderedDict()
+
+    def add(self, event: Event) -> None:
+        """Stores `event` and starts tracking its status."""
+        self.pile.include(event)
+        self._by_status[event.status][event.id] = event
+        event.execution.observe(
+            lambda old, new, e=event: self._transition(e, old, new)
+        )
+        if event.status in FINISHED_STATUSES:
+            self._finished[event.id] = time.monotonic()
+        self.evict()
+
+    def remove(self, ref: ID[Event].Ref) -> Event:
+        """Removes and returns an event.
+
+        Raises:
+            ItemNotFoundError: If the event is not in the store.
+        """
+        event: Event = self.pile.pop(ref)
+        self._forget(event)
+        return event
+
+    def _forget(self, event: Event) -> None:
+        event.execution.observe(None)
+        self._by_status[event.status].pop(event.id, None)
+        self._finished.pop(event.id, None)
+
+    def _evict_oldest(self) -> None:
+        id_ = next(iter(self._finished))
+        event = self.pile.pop(id_, None)
+        if event is None:  # already taken out of the pile directly
+            self._finished.pop(id_)
+            for index in self._by_status.values():
+                index.pop(id_, None)
+        else:
+            self._forget(event)
+
+    def _transition(
+        self, event: Event, old: EventStatus, new: EventStatus
+    ) -> None:
+        self._by_status[old].pop(event.id, None)
+        self._by_status[new][event.id] = event
+        if new in FINISHED_STATUSES:
+            self._finished[event.id] = time.monotonic()
+            self.evict()
+        else:
+            self._finished.pop(event.id, None)
+
+    def evict(self) -> None:
+        """Drops finished events beyond the retention limits."""
+        if self.max_finished is not None:
+            while len(self._finished) > self.max_finished:
+                self._evict_oldest()
+        if self.finished_ttl is not None:
+            cutoff = time.monotonic() - self.finished_ttl
+            while self._finished:
+                if next(iter(self._finished.values())) > cutoff:
+                    break
+                self._evict_oldest()
+
+    def ids(self, status: EventStatus) -> KeysView[IDType]:
+        """Returns a live view of the IDs of events in `status`."""
+        if self.finished_ttl is not None:
+            self.evict()
+        return self._by_status[status].keys()
+
+    def events(self, status: EventStatus) -> list[Event]:
+        """Returns the events in `status`, oldest first."""
+        if self.finished_ttl is not None:
+            self.evict()
+        return list(self._by_status[status].values())
+
+    def count(self, status: EventStatus) -> int:
+        """Returns the number of events in `status`."""
+        return len(self.ids(status))
+
+    def __contains__(self, ref: ID[Event].Ref) -> bool:
+        return ref in self.pile
+
+    def __len__(self) -> int:
+        return len(self.pile)
+
+
 class Executor(Observer):
     """Manages events via a Processor and stores them in a `Pile`.
 
@@ -199,6 +442,8 @@ class Executor(Observer):
         self,
         processor_config: dict[str, Any] | None = None,
         strict_event_type: bool = False,
+        max_finished_events: int | None = None,
+        finished_event_ttl: float | None = None,
     ) -> None:
         """Initializes the Executor.
 
@@ -208,6 +453,10 @@ class Executor(Observer):
             strict_event_type (bool):
                 If True, the underlying Pile enforces exact type matching
                 for Event objects.
+            max_finished_events (int | None):
+                Completed/failed events to retain; None keeps them all.
+            finished_event_ttl (float | None):
+                Seconds to retain a completed/failed event.
         """
         self.processor_config = processor_config or {}
         self.pending = Progression()
@@ -216,6 +465,11 @@ class Executor(Observer):
             item_type=self.processor_type.event_type,
             strict_type=strict_event_type,
         )
+        self.store = EventStore(
+            self.pile,
+            max_finished=max_finished_events,
+            finished_ttl=finished_event_ttl,
+        )
 
     @property
     def event_type(self) -> type[Event]:
@@ -231,14 +485,27 @@ class Executor(Observer):
         """Forwards all pending events from the pile to the processor.
 
         After all events are enqueued, it calls `processor.process()` for
-        immediate handling.
+        immediate handling. In worker-pool mode the running workers pick
+        the events up instead; use `wait_for` to await a specific one.
         """
         while len(self.pending) > 0:
             id_ = self.pending.popleft()
+            if id_ not in self.pile:
+                continue
             event = self.pile[id_]
             await self.processor.enqueue(event)
 
-        await self.processor.process()
+        if not self.processor.worker_mode:
+            await self.processor.process()
+
+    async def wait_for(self, event: Event) -> None:
+        """Waits until a forwarded event has been processed.
+
+        Args:
+            event (Event): The event to wait for.
+        """
+        if self.processor:
+            await self.processor.wait_for(event)
 
     async def start(self) -> None:
         """Initializes and starts the processor if it has not been created."""
@@ -264,41 +531,41 @@ class Executor(Observer):
             event (Event): The event to add.
         """
         async with self.pile:
-            self.pile.include(event)
+            self.store.add(event)
             self.pending.include(event)
 
+    def pop(self, ref: ID[Event].Ref) -> Event:
+        """Removes an event from the executor and returns it.
+
+        Args:
+            ref (ID[Event].Ref): The event or its ID.
+
+        Raises:
+            ItemNotFoundError: If the event is not held by the executor.
+        """
+        return self.store.remove(ref)
+
+    def _events_pile(self, status: EventStatus) -> Pile[Event]:
+        return Pile.bulk_load(
+            self.store.events(status),
+            item_type={self.processor_type.event_type},
+            strict_type=self.strict_event_type,
+        )
+
     @property
     def completed_events(self) -> Pile[Event]:
         """Pile[Event]: All events in COMPLETED status."""
-        return Pile(
-            collections=[
-                e for e in self.pile if e.status == EventStatus.COMPLETED
-            ],
-            item_type=self.processor_type.event_type,
-            strict_type=self.strict_event_type,
-        )
+        return self._events_pile(EventStatus.COMPLETED)
 
     @property
     def pending_events(self) -> Pile[Event]:
         """Pile[Event]: All events currently in PENDING status."""
-        return Pile(
-            collections=[
-                e for e in self.pile if e.status == EventStatus.PENDING
-            ],
-            item_type=self.processor_type.event_type,
-            strict_type=self.strict_event_type,
-        )
+        return self._events_pile(EventStatus.PENDING)
 
     @property
     def failed_events(self) -> Pile[Event]:
         """Pile[Event]: All events whose status is FAILED."""
-        return Pile(
-            collections=[
-                e for e in self.pile if e.status == EventStatus.FAILED
-            ],
-            item_type=self.processor_type.event_type,
-            strict_type=self.strict_event_type,
-        )
+        return self._events_pile(EventStatus.FAILED)
 
     def __contains__(self, ref: ID[Event].Ref) -> bool:
         """Checks if a given Event or ID reference is present in the pile.
@@ -6,7 +6,7 @@ from __future__ import annotations
 
 from typing import Any, Generic, Self, TypeVar
 
-from pydantic import Field, field_serializer, field_validator
+from pydantic import Field, PrivateAttr, field_serializer, field_validator
 
 from lionagi._errors import ItemNotFoundError
 
@@ -22,6 +22,84 @@ __all__ = (
 )
 
 
+class _OrderIndex:
+    """Occurrence counts and first positions of the IDs in an order list.
+
+    `positions` is built lazily and dropped (set to None) whenever an
+    operation shifts positions; removing from the front only bumps
+    `offset`, which is subtracted from every stored position.
+    """
+
+    __slots__ = ("counts", "positions", "offset", "source", "size")
+
+    def __init__(self) -> None:
+        self.counts: dict[IDType, int] = {}
+        self.positions: dict[IDType, int] | None = None
+        self.offset = 0
+        self.source: list | None = None
+        self.size = 0
+
+    def sync(self, order: list[IDType]) -> _OrderIndex:
+        if self.source is not order or self.size != len(order):
+            counts: dict[IDType, int] = {}
+            for ref in order:
+                counts[ref] = counts.get(ref, 0) + 1
+            self.counts = counts
+            self.positions = None
+            self.offset = 0
+            self.source = order
+            self.size = len(order)
+        return self
+
+    def added(self, ref: IDType) -> None:
+        """Records `ref` as just appended to the end of the order."""
+        self.counts[ref] = self.counts.get(ref, 0) + 1
+        self.size += 1
+        if self.positions is not None and ref not in self.positions:
+            self.positions[ref] = self.offset + self.size - 1
+
+    def removed(self, ref: IDType) -> int:
+        """Records one occurrence of `ref` as removed.
+
+        Returns:
+            int: The number of occurrences left.
+        """
+        left = self.counts[ref] - 1
+        if left:
+            self.counts[ref] = left
+        else:
+            del self.counts[ref]
+        self.size -= 1
+        return left
+
+    def position(self, ref: IDType) -> int | None:
+        """Returns the position of the first occurrence of `ref`."""
+        if self.positions is None:
+            positions: dict[IDType, int] = {}
+            for i, x in enumerate(self.source):
+                if x not in positions:
+                    positions[x] = i
+            self.positions = positions
+            self.offset = 0
+        pos = self.positions.get(ref)
+        return None if pos is None else pos - self.offset
+
+    def discard(self, refs: set[IDType]) -> None:
+        """Removes every occurrence of `refs` (all known to be present)."""
+        order = self.source
+        if len(refs) == 1:
+            ref = next(iter(refs))
+            if self.counts[ref] == 1:
+                del order[order.index(ref)]
+                self.removed(ref)
+                self.positions = None
+                return
+        order[:] = [x for x in order if x not in refs]
+        for ref in refs:
+            self.size -= self.counts.pop(ref)
+        self.positions = None
+
+
 class Progression(Element, Ordering[E], Generic[E]):
     """Tracks an ordered sequence of item IDs, with optional naming.
 
@@ -31,6 +109,13 @@ class Progression(Element, Ordering[E], Generic[E]):
     `order`, which is a simple list of IDs, and an optional `name`
     attribute can be assigned for identification.
 
+    Alongside `order`, a private index maps every ID to its number of
+    occurrences, and the position of its first occurrence (built lazily
+    and discarded whenever positions shift). Membership, `include`,
+    `count` and `index` are therefore hash lookups rather than scans of
+    `order`. The index is rebuilt automatically if `order` is replaced
+    or resized from outside the class.
+
     Attributes:
         order (list[ID[E].ID]):
             The sequence of item IDs representing the progression.
@@ -49,6 +134,8 @@ class Progression(Element, Ordering[E], Generic[E]):
         description="A human-readable identifier for the progression.",
     )
 
+    _index: _OrderIndex = PrivateAttr(default_factory=_OrderIndex)
+
     @field_validator("order", mode="before")
     def _validate_ordering(cls, value: Any) -> list[IDType]:
         """Ensures `order` is a valid list of IDTypes.
@@ -73,6 +160,10 @@ class Progression(Element, Ordering[E], Generic[E]):
         """
         return [str(x) for x in self.order]
 
+    def _sync(self) -> _OrderIndex:
+        """Returns the index of `order`, rebuilding it if `order` changed."""
+        return self._index.sync(self.order)
+
     def __len__(self) -> int:
         """Returns the number of items in this progression."""
         return len(self.order)
@@ -92,9 +183,14 @@ class Progression(Element, Ordering[E], Generic[E]):
             bool: True if all IDs in `item` exist in this progression;
                 otherwise False.
         """
+        if isinstance(item, IDType):
+            return item in self._sync().counts
+        if isinstance(item, Element):
+            return item.id in self._sync().counts
         try:
             refs = validate_order(item)
-            return all(ref in self.order for ref in refs)
+            counts = self._sync().counts
+            return all(ref in counts for ref in refs)
         except Exception:
             return False
 
@@ -145,12 +241,18 @@ class Progression(Element, Ordering[E], Generic[E]):
         refs = validate_order(value)
         if isinstance(key, slice):
             self.order[key] = refs
+            self._index.source = None
         else:
+            index = self._sync()
             try:
+                old = self.order[key]
                 self.order[key] = refs[0]
+                index.removed(old)
             except IndexError:
                 # If key is out of range, insertion occurs
                 self.order.insert(key, refs[0])
+            index.added(refs[0])
+            index.positions = None
 
     def __delitem__(self, key: int | slice) -> None:
         """Deletes item(s) by index or slice.
@@ -158,7 +260,15 @@ class Progression(Element, Ordering[E], Generic[E]):
         Args:
             key (int | slice): The position(s) to delete.
         """
+        if isinstance(key, slice):
+            del self.order[key]
+            self._index.source = None
+            return
+        index = self._sync()
+        ref = self.order[key]
         del self.order[key]
+        index.removed(ref)
+        index.positions = None
 
     def __iter__(self):
         """Iterates over the IDs in this progression.
@@ -193,6 +303,7 @@ class Progression(Element, Ordering[E], Generic[E]):
     def clear(self) -> None:
         """Removes all items from the progression."""
         self.order.clear()
+        self._sync()
 
     def include(self, item: Any, /) -> bool:
         """Adds new IDs at the end if they are not already present.
@@ -212,12 +323,12 @@ class Progression(Element, Ordering[E], Generic[E]):
         if not refs:
             return True
 
-        existing = set(self.order)
+        index = self._sync()
         appended = False
         for ref in refs:
-            if ref not in existing:
+            if ref not in index.counts:
                 self.order.append(ref)
-                existing.add(ref)
+                index.added(ref)
                 appended = True
         return appended
 
@@ -238,10 +349,12 @@ class Progression(Element, Ordering[E], Generic[E]):
         if not refs:
             return True
 
-        before = len(self.order)
-        rset = set(refs)
-        self.order = [x for x in self.order if x not in rset]
-        return len(self.order) < before
+        index = self._sync()
+        present = {ref for ref in refs if ref in index.counts}
+        if not present:
+            return False
+        index.discard(present)
+        return True
 
     def append(self, item: Any, /) -> None:
         """Appends one or more IDs at the end of the progression.
@@ -250,11 +363,15 @@ class Progression(Element, Ordering[E], Generic[E]):
             item (Any):
                 A single ID/Element or multiple items.
         """
+        index = self._sync()
         if isinstance(item, Element):
             self.order.append(item.id)
+            index.added(item.id)
             return
         refs = validate_order(item)
         self.order.extend(refs)
+        for ref in refs:
+            index.added(ref)
 
     def pop(self, index: int = -1) -> IDType:
         """Removes and returns one ID by index.
@@ -269,10 +386,19 @@ class Progression(Element, Ordering[E], Generic[E]):
         Raises:
             ItemNotFoundError: If the index is invalid or out of range.
         """
+        index_ = self._sync()
         try:
-            return self.order.pop(index)
+            ref = self.order.pop(index)
         except Exception as e:
             raise ItemNotFoundError(str(e)) from e
+        left = index_.removed(ref)
+        if index_.positions is not None:
+            if not left:
+                index_.positions.pop(ref, None)
+            if index not in (-1, index_.size):
+                # later positions shifted; rebuild lazily on next lookup
+                index_.positions = None
+        return ref
 
     def popleft(self) -> IDType:
         """Removes and returns the first ID.
@@ -285,7 +411,17 @@ class Progression(Element, Ordering[E], Generic[E]):
         """
         if not self.order:
             raise ItemNotFoundError("No items in progression.")
-        return self.order.pop(0)
+        index = self._sync()
+        ref = self.order.pop(0)
+        left = index.removed(ref)
+        if index.positions is not None:
+            if left:
+                index.positions = None
+            else:
+                # every remaining position moved down by one
+                del index.positions[ref]
+                index.offset += 1
+        return ref
 
     def remove(self, item: Any, /) -> None:
         """Removes the first occurrence of each specified ID.
@@ -305,10 +441,11 @@ class Progression(Element, Ordering[E], Generic[E]):
 
         if not refs:
             return
-        missing = [r for r in refs if r not in self.order]
+        index = self._sync()
+        missing = [r for r in refs if r not in index.counts]
         if missing:
             raise ItemNotFoundError(str(missing))
-        self.order = [x for x in self.order if x not in refs]
+        index.discard(set(refs))
 
     def count(self, item: Any, /) -> int:
         """Counts the number of occurrences of an ID.
@@ -320,7 +457,7 @@ class Progression(Element, Ordering[E], Generic[E]):
             int: Number of times the ID occurs in the progression.
         """
         ref = ID.get_id(item)
-        return self.order.count(ref)
+        return self._sync().counts.get(ref, 0)
 
     def index(self, item: Any, start: int = 0, end: int | None = None) -> int:
         """Finds the index of the first occurrence of an ID.
@@ -340,6 +477,11 @@ class Progression(Element, Ordering[E], Generic[E]):
             ValueError: If the item is not found in that range.
         """
         ref = ID.get_id(item)
+        if start == 0 and end is None:
+            pos = self._sync().position(ref)
+            if pos is None:
+                raise ValueError(f"{ref} is not in progression")
+            return pos
         if end is not None:
             return self.order.index(ref, start, end)
         return self.order.index(ref, start)
@@ -355,7 +497,11 @@ class Progression(Element, Ordering[E], Generic[E]):
         """
         if not isinstance(other, Progression):
             raise ValueError("Can only extend with another Progression.")
-        self.order.extend(other.order)
+        index = self._sync()
+        refs = list(other.order)
+        self.order.extend(refs)
+        for ref in refs:
+            index.added(ref)
 
     def __add__(self, other: Any) -> Progression[E]:
         """Returns a new Progression with IDs from both this and `other`.
@@ -431,8 +577,12 @@ class Progression(Element, Ordering[E], Generic[E]):
                 One or more items to validate as IDs and insert.
         """
         item_ = validate_order(item)
+        index_ = self._sync()
         for i in reversed(item_):
-            self.order.insert(index, ID.get_id(i))
+            ref = ID.get_id(i)
+            self.order.insert(index, ref)
+            index_.added(ref)
+        index_.positions = None
 
     def __reverse__(self) -> Progression[E]:
         """Returns a new reversed Progression.
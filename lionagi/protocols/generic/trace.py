@@ -0,0 +1,364 @@
+# Copyright (c) 2023 - 2024, HaiyangLi <quantocean.li at gmail dot com>
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Span-based tracing with OpenTelemetry-compatible identifiers.
+
+Spans form a tree per request (Branch -> iModel -> APICalling -> HTTP
+attempt) through a context variable, so nested `with Tracer.span(...)`
+blocks, including those in tasks spawned inside them, are parented
+automatically. Work that crosses tasks (such as an event waiting in a
+processor queue) passes its parent explicitly.
+
+Tracing is off until an exporter is added; until then `span` returns a
+shared no-op object, so instrumented hot paths cost one attribute check.
+"""
+
+import random
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from contextvars import ContextVar
+from typing import Any
+
+__all__ = (
+    "Span",
+    "SpanExporter",
+    "InMemorySpanExporter",
+    "OpenTelemetryExporter",
+    "Tracer",
+)
+
+_current: ContextVar["Span | None"] = ContextVar(
+    "lionagi_current_span", default=None
+)
+
+
+class Span:
+    """A timed operation with attributes.
+
+    Attributes:
+        name (str): What the span measures, e.g. `"api.attempt"`.
+        trace_id (int): 128-bit id shared by all spans of one request.
+        span_id (int): 64-bit id of this span.
+        parent_id (int | None): `span_id` of the parent span.
+        start_ns (int): Start time, `time.time_ns()`.
+        end_ns (int | None): End time, once ended.
+        attributes (dict): Key/value details (model, tokens, ...).
+        status (str): `"unset"`, `"ok"` or `"error"`.
+        error (str | None): The recorded error message.
+    """
+
+    __slots__ = (
+        "name",
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "start_ns",
+        "end_ns",
+        "attributes",
+        "status",
+        "error",
+        "_tracer",
+        "_token",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        parent: "Span | None" = None,
+        attributes: dict | None = None,
+        start_ns: int | None = None,
+        tracer: "Tracer | None" = None,
+    ) -> None:
+        self.name = name
+        self.trace_id = (
+            parent.trace_id if parent is not None else random.getrandbits(128)
+        )
+        self.span_id = random.getrandbits(64)
+        self.parent_id = parent.span_id if parent is not None else None
+        self.start_ns = time.time_ns() if start_ns is None else start_ns
+        self.end_ns: int | None = None
+        self.attributes = dict(attributes or {})
+        self.status = "unset"
+        self.error: str | None = None
+        self._tracer = tracer
+        self._token = None
+
+    @property
+    def duration(self) -> float | None:
+        """float | None: Seconds between start and end, once ended."""
+        if self.end_ns is None:
+            return None
+        return (self.end_ns - self.start_ns) / 1e9
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        if value is not None:
+            self.attributes[key] = value
+
+    def set_attributes(self, **attributes: Any) -> None:
+        for k, v in attributes.items():
+            self.set_attribute(k, v)
+
+    def record_error(self, error: BaseException | str) -> None:
+        """Marks the span as failed."""
+        self.status = "error"
+        self.error = str(error) or type(error).__name__
+
+    def end(self, end_ns: int | None = None) -> None:
+        """Ends the span and hands it to the exporters (once)."""
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns() if end_ns is None else end_ns
+        if self.status == "unset":
+            self.status = "ok"
+        if self._tracer is not None:
+            self._tracer._finish(self)
+
+    def __enter__(self) -> "Span":
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc is not None:
+            self.record_error(exc)
+        _current.reset(self._token)
+        self.end()
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "trace_id": f"{self.trace_id:032x}",
+            "span_id": f"{self.span_id:016x}",
+            "parent_id": (
+                f"{self.parent_id:016x}"
+                if self.parent_id is not None
+                else None
+            ),
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration": self.duration,
+            "status": self.status,
+            "error": self.error,
+            "attributes": dict(self.attributes),
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"Span(name={self.name!r}, duration={self.duration}, "
+            f"status={self.status!r}, attributes={self.attributes})"
+        )
+
+
+class _NoopSpan:
+    """Stand-in returned while tracing is disabled."""
+
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, **attributes: Any) -> None:
+        pass
+
+    def record_error(self, error: BaseException | str) -> None:
+        pass
+
+    def end(self, end_ns: int | None = None) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+    def __bool__(self) -> bool:
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class SpanExporter(ABC):
+    """Receives spans from a `Tracer`."""
+
+    def on_start(self, span: Span) -> None:
+        """Called when a span starts; most exporters only need `export`."""
+
+    @abstractmethod
+    def export(self, span: Span) -> None:
+        """Called once with each ended span."""
+
+    def shutdown(self) -> None:
+        """Flushes and releases resources."""
+
+
+class InMemorySpanExporter(SpanExporter):
+    """Keeps the most recent ended spans in memory for inspection.
+
+    Attributes:
+        spans (deque[Span]): Ended spans, oldest first.
+    """
+
+    def __init__(self, max_spans: int | None = 10_000) -> None:
+        self.spans: deque[Span] = deque(maxlen=max_spans)
+
+    def export(self, span: Span) -> None:
+        self.spans.append(span)
+
+    def clear(self) -> None:
+        self.spans.clear()
+
+    def find(self, name: str) -> list[Span]:
+        """list[Span]: Ended spans called `name`."""
+        return [s for s in self.spans if s.name == name]
+
+    def children(self, span: Span) -> list[Span]:
+        """list[Span]: Ended spans whose parent is `span`."""
+        return [s for s in self.spans if s.parent_id == span.span_id]
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """Aggregates durations per span name.
+
+        Returns:
+            dict: `{name: {"count", "total", "mean", "max"}}` in seconds.
+        """
+        out: dict[str, dict[str, float]] = {}
+        for span in self.spans:
+            stats = out.setdefault(
+                span.name, {"count": 0, "total": 0.0, "max": 0.0}
+            )
+            stats["count"] += 1
+            stats["total"] += span.duration
+            stats["max"] = max(stats["max"], span.duration)
+        for stats in out.values():
+            stats["mean"] = stats["total"] / stats["count"]
+        return out
+
+
+class OpenTelemetryExporter(SpanExporter):
+    """Mirrors spans into an OpenTelemetry tracer.
+
+    Each span is started on the OpenTelemetry tracer when it starts (under
+    its parent's OpenTelemetry span) and ended with the same timestamps,
+    attributes and status, so traces show up in any configured
+    OpenTelemetry backend. Requires the `lionagi[otel]` extra.
+    """
+
+    def __init__(self, tracer: Any = None) -> None:
+        """Initializes the exporter.
+
+        Args:
+            tracer: An OpenTelemetry tracer; defaults to
+                `trace.get_tracer("lionagi")`.
+        """
+        try:
+            from opentelemetry import trace
+        except ImportError as e:
+            raise ImportError(
+                "OpenTelemetryExporter requires the `opentelemetry-api` "
+                "package. Install it with `pip install 'lionagi[otel]'`."
+            ) from e
+        self._otel = trace
+        self.tracer = tracer or self._otel.get_tracer("lionagi")
+        self._live: dict[int, Any] = {}
+
+    def on_start(self, span: Span) -> None:
+        context = None
+        parent = self._live.get(span.parent_id)
+        if parent is not None:
+            context = self._otel.set_span_in_context(parent)
+        self._live[span.span_id] = self.tracer.start_span(
+            span.name, context=context, start_time=span.start_ns
+        )
+
+    def export(self, span: Span) -> None:
+        otel_span = self._live.pop(span.span_id, None)
+        if otel_span is None:
+            return
+        for k, v in span.attributes.items():
+            if not isinstance(v, str | bool | int | float):
+                v = str(v)
+            otel_span.set_attribute(k, v)
+        if span.status == "error":
+            otel_span.set_status(
+                self._otel.Status(self._otel.StatusCode.ERROR, span.error)
+            )
+        otel_span.end(end_time=span.end_ns)
+
+
+class Tracer:
+    """Creates spans and dispatches them to exporters.
+
+    Attributes:
+        exporters (list[SpanExporter]): Where ended spans go; tracing is
+            disabled while this is empty.
+    """
+
+    _default: "Tracer | None" = None
+
+    def __init__(self, *exporters: SpanExporter) -> None:
+        self.exporters: list[SpanExporter] = list(exporters)
+
+    @classmethod
+    def default(cls) -> "Tracer":
+        """Tracer: The process-wide tracer used by the instrumentation."""
+        if cls._default is None:
+            cls._default = cls()
+        return cls._default
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.exporters)
+
+    def add_exporter(self, exporter: SpanExporter) -> SpanExporter:
+        self.exporters.append(exporter)
+        return exporter
+
+    def remove_exporter(self, exporter: SpanExporter) -> None:
+        if exporter in self.exporters:
+            self.exporters.remove(exporter)
+            exporter.shutdown()
+
+    @staticmethod
+    def current() -> Span | None:
+        """Span | None: The innermost active span in this context."""
+        return _current.get()
+
+    def span(
+        self,
+        name: str,
+        parent: Span | None = None,
+        start_ns: int | None = None,
+        **attributes: Any,
+    ) -> Span | _NoopSpan:
+        """Starts a span; use it as a context manager or call `end()`.
+
+        Args:
+            name (str): The operation measured.
+            parent (Span | None): Explicit parent; defaults to the active
+                span of the current context.
+            start_ns (int | None): Start time (`time.time_ns()`) for spans
+                recorded after the fact; defaults to now.
+            **attributes: Initial attributes (None values are dropped).
+
+        Returns:
+            Span: The started span, or a no-op span if tracing is off.
+        """
+        if not self.exporters:
+            return NOOP_SPAN
+        span = Span(
+            name,
+            parent=parent if parent is not None else _current.get(),
+            attributes={k: v for k, v in attributes.items() if v is not None},
+            start_ns=start_ns,
+            tracer=self,
+        )
+        for exporter in self.exporters:
+            exporter.on_start(span)
+        return span
+
+    def _finish(self, span: Span) -> None:
+        for exporter in self.exporters:
+            exporter.export(span)
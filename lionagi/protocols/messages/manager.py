@@ -2,12 +2,17 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 
+from collections import deque
+from itertools import islice
 from typing import Any, Literal
 
 from jinja2 import Template
 from pydantic import BaseModel, JsonValue
 
+from lionagi.utils import copy
+
 from .._concepts import Manager
+from ..generic.element import IDType, validate_order
 from ..generic.log import Log
 from ..generic.pile import Pile
 from ..generic.progression import Progression
@@ -21,8 +26,126 @@ from .system import System
 DEFAULT_SYSTEM = "You are a helpful AI assistant. Let's think step by step."
 
 
+class RenderedHistory:
+    """Chat-ready view of a message progression, maintained incrementally.
+
+    Past instructions and assistant responses are copied and rendered
+    once, when they are first seen, and later turns only process the
+    messages appended since. The view applies the same rules the chat
+    payload has always used:
+
+    - instructions are stripped of tool schemas and response formats;
+    - action responses are folded into the context of the next
+      instruction (or stay `pending` if none follows yet);
+    - consecutive assistant responses are merged into one;
+    - an instruction that directly follows another is dropped;
+    - system messages and action requests are not included.
+
+    If the progression changes other than by appending (any id already
+    rendered is removed, replaced or moved), the view is rebuilt from
+    scratch on the next `sync`.
+
+    Attributes:
+        ids (list[IDType]): The ids rendered so far, in order.
+        entries (list[RoledMessage]): The (copied) messages of the view.
+        chat_msgs (list[dict]): The rendered `chat_msg` of each entry.
+        pending (dict[IDType, ActionResponse]): Action responses not yet
+            attached to an instruction.
+    """
+
+    __slots__ = ("ids", "entries", "chat_msgs", "pending")
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        """Discards the cached view."""
+        self.entries: list[RoledMessage] = []
+        self.chat_msgs: list[dict] = []
+        self.ids: list[IDType] = []
+        self.pending: dict[IDType, ActionResponse] = {}
+
+    def sync(
+        self,
+        progression: Progression | list[IDType],
+        messages: Pile[RoledMessage],
+    ) -> None:
+        """Brings the view up to date with `progression`.
+
+        Args:
+            progression (Progression | list[IDType]): The message order
+                to render, as a progression or any sequence of ids.
+            messages (Pile[RoledMessage]): Where the messages are stored.
+        """
+        if isinstance(progression, Progression):
+            order = progression.order
+        else:
+            order = validate_order(progression)
+
+        # the rendered prefix must be unchanged; comparing the shared id
+        # objects is a single C-level pass
+        size = len(self.ids)
+        if order[:size] != self.ids:
+            self.reset()
+            size = 0
+
+        for id_ in order[size:]:
+            self._append(messages[id_])
+            self.ids.append(id_)
+
+    def _append(self, msg: RoledMessage) -> None:
+        if isinstance(msg, ActionResponse):
+            self.pending[msg.id] = msg
+        if isinstance(msg, AssistantResponse):
+            self._push(
+                AssistantResponse(
+                    role=msg.role,
+                    content=copy(msg.content),
+                    sender=msg.sender,
+                    recipient=msg.recipient,
+                    template=msg.template,
+                )
+            )
+        if isinstance(msg, Instruction):
+            j = Instruction(
+                role=msg.role,
+                content=copy(msg.content),
+                sender=msg.sender,
+                recipient=msg.recipient,
+                template=msg.template,
+            )
+            j.tool_schemas = None
+            j.respond_schema_info = None
+            j.request_response_format = None
+
+            if self.pending:
+                for z in (k.content for k in self.pending.values()):
+                    if z not in j.context:
+                        j.context.append(z)
+                self.pending = {}
+            self._push(j)
+
+    def _push(self, msg: RoledMessage) -> None:
+        last = self.entries[-1] if self.entries else None
+        if last is None:
+            self.entries.append(msg)
+            self.chat_msgs.append(msg.chat_msg)
+        elif isinstance(msg, AssistantResponse):
+            if isinstance(last, AssistantResponse):
+                last.response = f"{last.response}\n\n{msg.response}"
+                self.chat_msgs[-1] = last.chat_msg
+            else:
+                self.entries.append(msg)
+                self.chat_msgs.append(msg.chat_msg)
+        elif isinstance(last, AssistantResponse):
+            self.entries.append(msg)
+            self.chat_msgs.append(msg.chat_msg)
+
+
 class MessageManager(Manager):
 
+    max_edits: int = 1024
+
     def __init__(
         self,
         messages: list[RoledMessage] | None = None,
@@ -49,6 +172,11 @@ class MessageManager(Manager):
         if system and not isinstance(system, System):
             raise ValueError("System message must be a System instance.")
         self.system = system  # system must be the first message
+        self._rendered_history = RenderedHistory()
+        # ids of the latest messages updated in place by `add_message`;
+        # snapshot checkpoints read them through `edits_since`
+        self.edited: deque[IDType] = deque(maxlen=self.max_edits)
+        self.edit_count = 0
         if self.system:
             self.add_message(system=self.system)
 
@@ -63,6 +191,7 @@ class MessageManager(Manager):
         Args:
             system: The new system message to set
         """
+        self.invalidate_rendered_history()
         if not self.system:
             self.system = system
             self.messages.insert(0, self.system)
@@ -283,6 +412,9 @@ class MessageManager(Manager):
                 sender=sender,
                 recipient=recipient,
             )
+            if action_request in self.messages:
+                # the request was just linked to the response
+                self.messages.touch(action_request)
 
         elif action_request or (action_function and action_arguments):
             _msg = self.create_action_request(
@@ -325,6 +457,9 @@ class MessageManager(Manager):
             _msg.metadata["extra"].update(metadata)
 
         if _msg in self.messages:
+            self.invalidate_rendered_history()
+            self.edited.append(_msg.id)
+            self.edit_count += 1
             idx = self.messages.progression.index(_msg.id)
             self.messages.exclude(_msg.id)
             self.messages.insert(idx, _msg)
@@ -334,6 +469,7 @@ class MessageManager(Manager):
         return _msg
 
     def clear_messages(self):
+        self.invalidate_rendered_history()
         self.messages.clear()
         if self.system:
             self.messages.insert(0, self.system)
@@ -422,6 +558,52 @@ class MessageManager(Manager):
                 "Invalid progress, not all requested messages are in the message pile"
             ) from e
 
+    def rendered_history(
+        self, progression: Progression | list[IDType] | None = None
+    ) -> RenderedHistory:
+        """Returns the chat-ready view of a progression.
+
+        The view of the manager's own progression is cached and only the
+        messages added since the previous call are processed. Any other
+        progression is rendered from scratch.
+
+        Args:
+            progression (Progression | list[IDType] | None): Defaults to
+                all messages.
+
+        Returns:
+            RenderedHistory: The up-to-date view.
+        """
+        if progression is None or progression is self.progression:
+            self._rendered_history.sync(self.progression, self.messages)
+            return self._rendered_history
+        history = RenderedHistory()
+        history.sync(progression, self.messages)
+        return history
+
+    def edits_since(self, count: int) -> list[IDType] | None:
+        """Returns the ids of messages edited after the first `count` edits.
+
+        Only the latest `max_edits` edits are kept; if some of the ones
+        asked for were dropped, returns None and the caller must treat
+        every message as possibly edited.
+
+        Args:
+            count (int): A previous value of `edit_count`.
+        """
+        missed = self.edit_count - count
+        if missed > len(self.edited):
+            return None
+        return list(islice(self.edited, len(self.edited) - missed, None))
+
+    def invalidate_rendered_history(self) -> None:
+        """Forces the cached rendered history to be rebuilt.
+
+        Call this after editing a message that is already in the
+        progression without going through `add_message`.
+        """
+        self._rendered_history.reset()
+
     def __bool__(self):
         return bool(self.messages)
 
@@ -7,7 +7,7 @@ from pathlib import Path
 from typing import Any
 
 from jinja2 import Environment, FileSystemLoader, Template
-from pydantic import Field, PrivateAttr, field_serializer
+from pydantic import Field, PrivateAttr, SerializationInfo, field_serializer
 
 from .._concepts import Sendable
 from ..generic.element import Element, IDType
@@ -167,7 +167,7 @@ class RoledMessage(Node, Sendable):
         return str(value)
 
     @field_serializer("metadata")
-    def _serialize_metadata(self, value: dict):
+    def _serialize_metadata(self, value: dict, info: SerializationInfo):
         if "clone_from" in value:
             origin_obj: RoledMessage = value.pop("clone_from")
             origin_info = origin_obj.to_dict()
@@ -183,7 +183,7 @@ class RoledMessage(Node, Sendable):
                     "original_role": origin_info["role"],
                 }
             }
-        return value
+        return self._tag_lion_class(value, info)
 
     @field_serializer("template")
     def _serialize_template(self, value: Template | str):
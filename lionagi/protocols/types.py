@@ -14,12 +14,22 @@ from ._concepts import (
     Relational,
     Sendable,
 )
+from .generic.columnar import ParquetScan
+from .generic.disk_store import DiskStore
 from .generic.element import ID, Element, IDError, IDType, validate_order
 from .generic.event import Event, EventStatus, Execution
 from .generic.log import Log, LogManager, LogManagerConfig
+from .generic.log_sink import LogSink
 from .generic.pile import Pile, pile, to_list_type
 from .generic.processor import Executor, Processor
 from .generic.progression import Progression, prog
+from .generic.trace import (
+    InMemorySpanExporter,
+    OpenTelemetryExporter,
+    Span,
+    SpanExporter,
+    Tracer,
+)
 from .graph.edge import EdgeCondition
 from .graph.graph import Edge, Graph, Node
 from .mail.exchange import Exchange, Mail, Mailbox, Package, PackageCategory
@@ -62,12 +72,20 @@ __all__ = (
     "Log",
     "LogManager",
     "LogManagerConfig",
+    "LogSink",
     "Pile",
     "pile",
+    "DiskStore",
+    "ParquetScan",
     "Processor",
     "Executor",
     "Progression",
     "prog",
+    "Span",
+    "SpanExporter",
+    "InMemorySpanExporter",
+    "OpenTelemetryExporter",
+    "Tracer",
     "Graph",
     "Node",
     "Edge",
@@ -3,12 +3,16 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from .endpoints.base import APICalling, EndPoint
+from .endpoints.response_cache import ResponseCache
 from .imodel import iModel
 from .manager import iModelManager
+from .pool import iModelPool
 
 __all__ = (
     "iModel",
     "iModelManager",
+    "iModelPool",
     "EndPoint",
     "APICalling",
+    "ResponseCache",
 )
@@ -3,21 +3,52 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import asyncio
+import contextlib
 import logging
 from abc import ABC
+from collections.abc import Awaitable, Callable
 from typing import Any, Literal
 
 import aiohttp
-from aiocache import cached
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 
 from lionagi._errors import ExecutionError, RateLimitError
-from lionagi.protocols.types import Event, EventStatus
-from lionagi.settings import Settings
-
+from lionagi.protocols.types import Event, EventStatus, Tracer
+from lionagi.utils import UNDEFINED
+
+from .deadline import DeadlineExceeded, time_left
+from .flow_control import (
+    AdaptiveLimiter,
+    RateLimitInfo,
+    backoff_delay,
+    classify_error,
+    error_headers,
+    response_headers,
+)
+from .response_cache import ResponseCache
+from .streaming import ChunkAssembler, buffered, until_deadline
 from .token_calculator import TokenCalculator
 
 
+def _field(obj: Any, key: str) -> Any:
+    """Reads `key` from a dict or an attribute of an object."""
+    if obj is None:
+        return None
+    if isinstance(obj, dict):
+        return obj.get(key)
+    return getattr(obj, key, None)
+
+
+# closes of sessions from finished event loops, kept until they are done
+_closing: set[asyncio.Task] = set()
+
+
+async def _close_stale_session(session: aiohttp.ClientSession) -> None:
+    # transports already torn down with the old loop may fail to close
+    with contextlib.suppress(Exception):
+        await session.close()
+
+
 class EndpointConfig(BaseModel):
     """Represents configuration data for an API endpoint.
 
@@ -52,6 +83,40 @@ class EndpointConfig(BaseModel):
         allowed_roles (list[str] | None):
             If set, only these roles are allowed in message or conversation
             data.
+        connection_limit (int):
+            Maximum number of simultaneous connections in the endpoint's
+            HTTP connection pool (0 means unlimited).
+        connection_limit_per_host (int):
+            Maximum number of simultaneous connections to one host
+            (0 means unlimited).
+        dns_cache_ttl (int | None):
+            Seconds to cache resolved DNS entries (None caches forever).
+        keepalive_timeout (float):
+            Seconds an idle keep-alive connection is kept in the pool.
+        prompt_caching (bool):
+            Whether payloads are prepared for the provider's prompt cache
+            (a `prompt_caching` request kwarg overrides it per call).
+        prompt_cache_min_tokens (int):
+            Smallest estimated prefix worth marking as cacheable.
+        cache_reads_count_toward_limit (bool):
+            Whether tokens read from the prompt cache count against the
+            provider's token rate limit.
+        max_retries (int):
+            Retries after a throttled or transient failure.
+        retry_base_delay (float):
+            Base of the jittered exponential retry backoff, in seconds.
+        retry_max_delay (float):
+            Longest wait between retries, in seconds.
+        initial_concurrency (int | None):
+            Starting concurrency limit of the endpoint's adaptive limiter;
+            `iModel` sets it to its `queue_capacity` if None, so the
+            limit only shrinks once the provider throttles.
+        max_concurrency (int):
+            Ceiling for the adaptive concurrency limit.
+        circuit_failure_threshold (int):
+            Consecutive transient failures that open the circuit.
+        circuit_recovery_time (float):
+            Seconds an open circuit rejects calls before probing again.
     """
 
     model_config = ConfigDict(
@@ -75,6 +140,20 @@ class EndpointConfig(BaseModel):
     requires_tokens: bool = False
     api_version: str | None = None
     allowed_roles: list[str] | None = None
+    connection_limit: int = 100
+    connection_limit_per_host: int = 0
+    dns_cache_ttl: int | None = 300
+    keepalive_timeout: float = 30
+    prompt_caching: bool = False
+    prompt_cache_min_tokens: int = 1024
+    cache_reads_count_toward_limit: bool = True
+    max_retries: int = 3
+    retry_base_delay: float = 0.5
+    retry_max_delay: float = 60
+    initial_concurrency: int | None = None
+    max_concurrency: int = 256
+    circuit_failure_threshold: int = 5
+    circuit_recovery_time: float = 30
 
 
 class EndPoint(ABC):
@@ -84,6 +163,12 @@ class EndPoint(ABC):
     invoking API payloads, optionally with caching or streaming. Concrete
     implementations should override `_invoke` and `_stream` to perform actual
     HTTP requests.
+
+    Direct HTTP calls share one pooled `aiohttp.ClientSession` per
+    endpoint, so concurrent requests reuse keep-alive connections instead
+    of opening a new TCP/TLS connection each time. Calls also share one
+    `AdaptiveLimiter` (`flow`), which adapts concurrency to throttling and
+    stops calling a failing provider.
     """
 
     def __init__(self, config: dict) -> None:
@@ -94,11 +179,73 @@ class EndPoint(ABC):
                 schema.
         """
         self.config = EndpointConfig(**config)
+        self._session: aiohttp.ClientSession | None = None
+        self._session_loop: asyncio.AbstractEventLoop | None = None
+        self._flow: AdaptiveLimiter | None = None
+
+    @property
+    def flow(self) -> AdaptiveLimiter:
+        """AdaptiveLimiter: Concurrency and circuit state shared by every
+        call to this endpoint."""
+        if self._flow is None:
+            self._flow = AdaptiveLimiter.from_config(self.config)
+        return self._flow
+
+    def get_session(self) -> aiohttp.ClientSession:
+        """Returns the pooled HTTP session, creating it if necessary.
+
+        A session is bound to the event loop it was created in; a new one
+        is created if the previous session was closed or belongs to
+        another loop, in which case the old session is closed.
+
+        Returns:
+            aiohttp.ClientSession: The shared session for this endpoint.
+        """
+        loop = asyncio.get_running_loop()
+        if (
+            self._session is None
+            or self._session.closed
+            or self._session_loop is not loop
+        ):
+            self._discard_session(loop)
+            connector = aiohttp.TCPConnector(
+                limit=self.config.connection_limit,
+                limit_per_host=self.config.connection_limit_per_host,
+                ttl_dns_cache=self.config.dns_cache_ttl,
+                use_dns_cache=True,
+                keepalive_timeout=self.config.keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._session_loop = loop
+        return self._session
+
+    def _discard_session(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Closes a session left behind by another event loop."""
+        session, old_loop = self._session, self._session_loop
+        if session is None or session.closed:
+            return
+        if old_loop is not None and old_loop.is_running():
+            # still running in another thread, which must close it
+            asyncio.run_coroutine_threadsafe(session.close(), old_loop)
+            return
+        # its loop has stopped, so there is nothing left to wait for:
+        # closing marks the connector (and its connections) closed
+        task = loop.create_task(_close_stale_session(session))
+        _closing.add(task)
+        task.add_done_callback(_closing.discard)
+
+    async def close(self) -> None:
+        """Closes the pooled HTTP session and its open connections."""
+        session, self._session = self._session, None
+        self._session_loop = None
+        if session is not None and not session.closed:
+            await session.close()
 
     def update_config(self, **kwargs):
         config = self.config.model_dump()
         config.update(kwargs)
         self.config = EndpointConfig(**config)
+        self._flow = None
 
     @property
     def is_streamable(self) -> bool:
@@ -273,9 +420,27 @@ class EndPoint(ABC):
         """
         raise NotImplementedError
 
-    @cached(**Settings.API.CACHED_CONFIG)
+    def cache_key(self, payload: dict, headers: dict | None = None) -> str:
+        """Builds a deterministic response-cache key for a request.
+
+        Auth headers are ignored, so the same request made with different
+        API keys maps to the same entry.
+
+        Args:
+            payload (dict): The request data.
+            headers (dict | None): The request headers.
+
+        Returns:
+            str: The canonical hash of the request.
+        """
+        scope = (
+            f"{self.config.provider}:{self.config.base_url}/"
+            f"{self.config.endpoint}"
+        )
+        return ResponseCache.make_key(scope, payload, headers)
+
     async def _cached_invoke(self, payload: dict, headers: dict, **kwargs):
-        """Cached version of `_invoke` using aiocache.
+        """Cached version of `_invoke` using the default `ResponseCache`.
 
         Args:
             payload (dict): The data to send in the request.
@@ -285,7 +450,13 @@ class EndPoint(ABC):
         Returns:
             Any: Cached or newly obtained response data.
         """
-        return await self._invoke(payload, headers, **kwargs)
+        cache = ResponseCache.default()
+        key = self.cache_key(payload, headers)
+        response = await cache.get(key)
+        if response is UNDEFINED:
+            response = await self._invoke(payload, headers, **kwargs)
+            await cache.set(key, response)
+        return response
 
     def calculate_tokens(self, payload: dict) -> int:
         """Calculates the number of tokens needed for a request.
@@ -300,14 +471,18 @@ class EndPoint(ABC):
         Returns:
             int: The estimated number of tokens used.
         """
-        if self.requires_tokens:
+        if not self.requires_tokens:
+            return 0
+        with Tracer.default().span("endpoint.count_tokens") as span:
+            tokens = 0
             if "messages" in payload:
-                return TokenCalculator.calculate_message_tokens(
+                tokens = TokenCalculator.calculate_message_tokens(
                     payload["messages"]
                 )
-            if "embed" in self.full_url:
-                return TokenCalculator.calcualte_embed_token(**payload)
-        return 0
+            elif "embed" in self.full_url:
+                tokens = TokenCalculator.calcualte_embed_token(**payload)
+            span.set_attribute("tokens", tokens)
+            return tokens
 
 
 class APICalling(Event):
@@ -326,22 +501,135 @@ class APICalling(Event):
             The endpoint to which this request will be sent.
         is_cached (bool):
             Whether to use cached responses.
+        cache (ResponseCache | None):
+            The cache to use; None means `ResponseCache.default()`.
+        cache_ttl (float | None):
+            Time-to-live for this response; None uses the cache default.
         should_invoke_endpoint (bool):
             If False, the request may not actually call the API.
+        deadline (float | None):
+            `time.monotonic()` time by which the call must finish; it fails
+            with `DeadlineExceeded` (without being sent, if still queued)
+            once this passes.
+        retry_throttled (bool):
+            Whether throttled attempts are retried; False fails the call
+            at the first throttle, e.g. so a pool can fail over at once.
     """
 
     payload: dict
     headers: dict = Field(exclude=True)
     endpoint: EndPoint = Field(exclude=True)
     is_cached: bool = Field(default=False, exclude=True)
+    cache: ResponseCache | None = Field(default=None, exclude=True)
+    cache_ttl: float | None = Field(default=None, exclude=True)
     should_invoke_endpoint: bool = Field(default=True, exclude=True)
+    deadline: float | None = Field(default=None, exclude=True)
+    retry_throttled: bool = Field(default=True, exclude=True)
+
+    _required_tokens: Any = PrivateAttr(UNDEFINED)
+    _rate_limit: RateLimitInfo | None = PrivateAttr(None)
+    _response_headers: Any = PrivateAttr(None)
+    _abort: Any = PrivateAttr(None)
+    _abort_reason: str | None = PrivateAttr(None)
+    _deadline_exceeded: bool = PrivateAttr(False)
+    _error_kind: str | None = PrivateAttr(None)
+
+    @property
+    def rate_limit(self) -> RateLimitInfo | None:
+        """RateLimitInfo | None: Rate-limit headers of the last response."""
+        return self._rate_limit
 
     @property
     def required_tokens(self) -> int | None:
-        """int | None: The number of tokens required for this request."""
-        if self.endpoint.requires_tokens:
-            return self.endpoint.calculate_tokens(self.payload)
-        return None
+        """int | None: The number of tokens required for this request.
+
+        Computed on first access and cached, since the rate limiter reads
+        it both when granting permission and when settling usage.
+        """
+        if self._required_tokens is UNDEFINED:
+            self._required_tokens = (
+                self.endpoint.calculate_tokens(self.payload)
+                if self.endpoint.requires_tokens
+                else None
+            )
+        return self._required_tokens
+
+    @property
+    def used_tokens(self) -> int | None:
+        """int | None: Total tokens reported by the provider, if any.
+
+        Read from the `usage` section of the response, which may be a
+        dict (raw HTTP JSON) or an object (e.g., a litellm response).
+        """
+        response = self.execution.response
+        if response is None:
+            return None
+        usage = (
+            response.get("usage")
+            if isinstance(response, dict)
+            else getattr(response, "usage", None)
+        )
+        if usage is None:
+            return None
+        total = (
+            usage.get("total_tokens")
+            if isinstance(usage, dict)
+            else getattr(usage, "total_tokens", None)
+        )
+        if total is None:
+            prompt, completion = (
+                (usage.get("input_tokens"), usage.get("output_tokens"))
+                if isinstance(usage, dict)
+                else (
+                    getattr(usage, "input_tokens", None),
+                    getattr(usage, "output_tokens", None),
+                )
+            )
+            if prompt is None and completion is None:
+                return None
+            total = (prompt or 0) + (completion or 0)
+        return int(total)
+
+    @property
+    def cached_tokens(self) -> int | None:
+        """int | None: Prompt tokens the provider served from its cache.
+
+        Read from Anthropic's `cache_read_input_tokens` or OpenAI's
+        `prompt_tokens_details.cached_tokens`.
+        """
+        usage = _field(self.execution.response, "usage")
+        if usage is None:
+            return None
+        cached = _field(usage, "cache_read_input_tokens")
+        if cached is None:
+            cached = _field(
+                _field(usage, "prompt_tokens_details"), "cached_tokens"
+            )
+        return int(cached) if cached is not None else None
+
+    @property
+    def rate_limited_tokens(self) -> int | None:
+        """int | None: Used tokens that count against the rate limit.
+
+        With OpenAI-style usage, `total_tokens` includes cache reads, which
+        are subtracted when the endpoint's provider does not count them.
+        Anthropic's `input_tokens` excludes both cache writes and reads:
+        writes (`cache_creation_input_tokens`) are always added back, and
+        reads only when the provider counts them.
+        """
+        used = self.used_tokens
+        if used is None:
+            return None
+        counts_reads = self.endpoint.config.cache_reads_count_toward_limit
+        usage = _field(self.execution.response, "usage")
+        if _field(usage, "total_tokens") is None:
+            used += int(_field(usage, "cache_creation_input_tokens") or 0)
+            if counts_reads:
+                used += self.cached_tokens or 0
+            return used
+        if counts_reads:
+            return used
+        return max(0, used - (self.cached_tokens or 0))
 
     async def _inner(self, **kwargs) -> Any:
         """Performs a direct HTTP call using aiohttp, ignoring caching logic.
@@ -372,69 +660,131 @@ class APICalling(Event):
             if k not in self.endpoint.acceptable_kwargs:
                 self.payload.pop(k)
 
-        async def retry_in():
-            async with aiohttp.ClientSession() as session:
-                try:
-                    if (
-                        _m := getattr(session, self.endpoint.method, None)
-                    ) is not None:
-                        async with _m(
-                            self.endpoint.full_url, **kwargs
-                        ) as response:
-                            response_json = await response.json()
-                            if "error" not in response_json:
-                                return response_json
-                            if "Rate limit" in response_json["error"].get(
-                                "message", ""
-                            ):
-                                await asyncio.sleep(5)
-                                raise RateLimitError(
-                                    f"Rate limit exceeded. Error: {response_json['error']}"
-                                )
-                            raise ExecutionError(
-                                "API call failed with error: ",
-                                response_json["error"],
-                            )
-                    else:
-                        raise ValueError(
-                            f"Invalid HTTP method: {self.endpoint.method}"
-                        )
-                except aiohttp.ClientError as e:
-                    logging.error(
-                        f"API call to {self.endpoint.full_url} failed: {e}"
-                    )
-                    return None
-
-        for i in range(3):
-            try:
-                return await retry_in()
-            except RateLimitError | ExecutionError as e:
-                if i == 2:
-                    raise e
-                else:
-                    wait = 2 ** (i + 1) * 0.5
-                    logging.warning(
-                        f"API call to {self.endpoint.full_url} failed: {e}"
-                        f"retrying in {wait} seconds."
-                    )
-                    await asyncio.sleep(wait)
+        session = self.endpoint.get_session()
+        if (_m := getattr(session, self.endpoint.method, None)) is None:
+            raise ValueError(f"Invalid HTTP method: {self.endpoint.method}")
+
+        async with _m(self.endpoint.full_url, **kwargs) as response:
+            self._response_headers = response.headers
+            if response.status == 429 or response.status >= 500:
+                error = (
+                    RateLimitError
+                    if response.status == 429
+                    else ExecutionError
+                )(
+                    f"API call failed with status {response.status}: "
+                    f"{await response.text()}"
+                )
+                error.status_code = response.status
+                error.headers = response.headers
+                raise error
+            response_json = await response.json()
+            if "error" not in response_json:
+                return response_json
+            if "Rate limit" in response_json["error"].get("message", ""):
+                error = RateLimitError(
+                    f"Rate limit exceeded. Error: {response_json['error']}"
+                )
+                error.headers = response.headers
+                raise error
+            raise ExecutionError(
+                "API call failed with error: ",
+                response_json["error"],
+            )
 
-    @cached(**Settings.API.CACHED_CONFIG)
-    async def _cached_inner(self, **kwargs) -> Any:
-        """Cached version of `_inner` using aiocache.
+    def _record_failure(
+        self,
+        flow: AdaptiveLimiter,
+        error: Exception,
+        probe: object | None = None,
+    ) -> tuple[str, RateLimitInfo]:
+        """Reports a failed attempt (holding the `probe` token, if any) to
+        `flow`; returns its kind and the rate-limit headers that came with
+        it."""
+        kind = classify_error(error)
+        info = RateLimitInfo.from_headers(
+            error_headers(error) or self._response_headers
+        )
+        if kind == "throttle":
+            flow.throttle(info, probe)
+        elif kind == "transient":
+            flow.failure(probe)
+        return kind, info
+
+    async def _send(self, request: Callable[[], Awaitable[Any]]) -> Any:
+        """Runs one request attempt after another until one succeeds.
+
+        Each attempt is traced as an `api.attempt` span and holds a slot
+        of the endpoint's `AdaptiveLimiter`, so concurrency adapts to
+        throttling across all calls to the endpoint, and the provider's
+        rate-limit headers are fed back to it (and kept in `rate_limit`).
+        Throttled and transient failures are retried up to
+        `config.max_retries` times with jittered exponential backoff,
+        honoring `Retry-After`; other errors are raised at once.
 
         Args:
-            **kwargs: Passed to `_inner`.
+            request: Performs one attempt and returns the response.
 
         Returns:
-            Any: The result of `_inner`, possibly from cache.
+            Any: The response of the first successful attempt.
         """
-        return await self._inner(**kwargs)
+        flow = self.endpoint.flow
+        config = self.endpoint.config
+        tracer = Tracer.default()
+        attempt = 0
+        while True:
+            self._response_headers = None
+            with tracer.span("api.attempt", attempt=attempt) as span:
+                async with flow.slot() as probe:
+                    try:
+                        response = await request()
+                    except Exception as e:
+                        error = e
+                        kind, info = self._record_failure(flow, e, probe)
+                        span.set_attribute("error.kind", kind)
+                        if (
+                            kind == "fatal"
+                            or attempt >= config.max_retries
+                            or (
+                                kind == "throttle" and not self.retry_throttled
+                            )
+                        ):
+                            raise
+                        span.record_error(e)
+                    else:
+                        self._rate_limit = RateLimitInfo.from_headers(
+                            self._response_headers
+                            or response_headers(response)
+                        )
+                        flow.success(self._rate_limit, probe)
+                        return response
+
+            self._rate_limit = info
+            wait = backoff_delay(
+                attempt,
+                base=config.retry_base_delay,
+                cap=config.retry_max_delay,
+                retry_after=info.retry_after,
+            )
+            logging.warning(
+                f"API call to {self.endpoint.full_url} failed: {error}; "
+                f"retrying in {wait:.2f} seconds."
+            )
+            await asyncio.sleep(wait)
+            attempt += 1
 
-    async def stream(self, **kwargs):
+    async def stream(self, buffer_size: int | None = None, **kwargs):
         """Performs a streaming request, if supported by the endpoint.
 
+        Chunks are yielded as they arrive and folded into a single
+        chat-completion response on the way through, so once the stream
+        ends `execution.response` holds the assembled message rather than
+        every chunk.
+
         Args:
+            buffer_size (int | None): If set, up to this many chunks are
+                read ahead of the consumer; otherwise each chunk is read
+                only when the consumer asks for it.
             **kwargs: Additional parameters for the streaming call.
 
         Yields:
@@ -442,25 +792,51 @@ class APICalling(Event):
 
         Raises:
             ValueError: If the endpoint does not support streaming.
+            DeadlineExceeded: If `deadline` passes before the stream ends.
         """
         start = asyncio.get_event_loop().time()
-        response = []
         if not self.endpoint.is_streamable:
             raise ValueError(
                 f"Endpoint {self.endpoint.endpoint} is not streamable."
             )
 
-        async for i in self.endpoint._stream(
-            self.payload, self.headers, **kwargs
-        ):
-            content = i.choices[0].delta.content
-            if content is not None:
-                print(content, end="", flush=True)
-            response.append(i)
-            yield i
+        assembler = ChunkAssembler()
+        chunks = self.endpoint._stream(self.payload, self.headers, **kwargs)
+        if buffer_size:
+            chunks = buffered(chunks, buffer_size)
+        if self.deadline is not None:
+            chunks = until_deadline(chunks, self.deadline)
+
+        flow = self.endpoint.flow
+        self.execution.status = EventStatus.PROCESSING
+        try:
+            async with flow.slot() as probe:
+                try:
+                    async for i in chunks:
+                        assembler.add(i)
+                        yield i
+                except DeadlineExceeded:
+                    raise
+                except Exception as e:
+                    self._record_failure(flow, e, probe)
+                    raise
+                flow.success(probe=probe)
+        except Exception as e:
+            self._deadline_exceeded = isinstance(e, DeadlineExceeded)
+            self._error_kind = classify_error(e)
+            self.execution.duration = asyncio.get_event_loop().time() - start
+            self.execution.error = str(e)
+            self.execution.status = EventStatus.FAILED
+            raise
+        except (GeneratorExit, asyncio.CancelledError):
+            # the consumer stopped early (break, aclose or cancellation)
+            self.execution.duration = asyncio.get_event_loop().time() - start
+            self.execution.error = "Stream closed before completion"
+            self.execution.status = EventStatus.FAILED
+            raise
 
         self.execution.duration = asyncio.get_event_loop().time() - start
-        self.execution.response = response
+        self.execution.response = assembler.to_response()
         self.execution.status = EventStatus.COMPLETED
 
     async def invoke(self) -> None:
@@ -474,28 +850,110 @@ class APICalling(Event):
         kwargs = {"headers": self.headers, "json": self.payload}
 
         try:
-            response = None
-            if self.should_invoke_endpoint and self.endpoint.is_invokeable:
-                response = await self.endpoint.invoke(
-                    payload=self.payload,
-                    headers=self.headers,
-                    is_cached=self.is_cached,
-                )
-            else:
-                if self.is_cached:
-                    response = await self._cached_inner(**kwargs)
+            cache, key, response = None, None, UNDEFINED
+            if self.is_cached:
+                cache = self.cache or ResponseCache.default()
+                key = self.endpoint.cache_key(self.payload, self.headers)
+                response = await cache.get(key)
+
+            if response is UNDEFINED:
+                if self.should_invoke_endpoint and self.endpoint.is_invokeable:
+                    # endpoints may consume auth headers, so each attempt
+                    # gets its own copy
+                    response = await self._bounded(
+                        self._send(
+                            lambda: self.endpoint.invoke(
+                                payload=self.payload,
+                                headers=dict(self.headers),
+                            )
+                        )
+                    )
                 else:
-                    response = await self._inner(**kwargs)
+                    response = await self._bounded(
+                        self._send(lambda: self._inner(**kwargs))
+                    )
+                if cache is not None and response is not None:
+                    await cache.set(key, response, ttl=self.cache_ttl)
 
             self.execution.duration = asyncio.get_event_loop().time() - start
             self.execution.response = response
             self.execution.status = EventStatus.COMPLETED
         except Exception as e:
+            self._deadline_exceeded = isinstance(e, DeadlineExceeded)
+            self._error_kind = classify_error(e)
             self.execution.duration = asyncio.get_event_loop().time() - start
             self.execution.error = str(e)
             self.execution.status = EventStatus.FAILED
             logging.error(f"API call to {self.endpoint.full_url} failed: {e}")
 
+    @property
+    def aborted(self) -> asyncio.Future:
+        """asyncio.Future: Resolved once `abort` has been called."""
+        loop = asyncio.get_running_loop()
+        if self._abort is None or self._abort.get_loop() is not loop:
+            self._abort = loop.create_future()
+            if self._abort_reason is not None:
+                self._abort.set_result(self._abort_reason)
+        return self._abort
+
+    @property
+    def deadline_exceeded(self) -> bool:
+        """bool: True if the call failed because its deadline passed."""
+        return self._deadline_exceeded
+
+    @property
+    def throttled(self) -> bool:
+        """bool: True if the call failed because the provider throttled
+        it (a `RateLimitError` or HTTP 429)."""
+        return self._error_kind == "throttle"
+
+    def abort(self, reason: str = "API call aborted") -> None:
+        """Stops the call without waiting for it.
+
+        A running request is cancelled, and a call that has not started
+        fails as soon as it is invoked, so it spends no rate budget.
+
+        Args:
+            reason (str): The error recorded on the call.
+        """
+        self._abort_reason = reason
+        if self._abort is not None and not self._abort.done():
+            self._abort.set_result(reason)
+
+    async def _bounded(self, send: Awaitable[Any]) -> Any:
+        """Awaits `send` until it finishes, the deadline passes or the call
+        is aborted, cancelling it in the latter two cases.
+
+        Raises:
+            DeadlineExceeded: If `deadline` passed first.
+            ExecutionError: If the call was aborted.
+        """
+        remaining = time_left(self.deadline)
+        if self._abort_reason is not None or remaining == 0:
+            send.close()
+            if self._abort_reason is not None:
+                raise ExecutionError(self._abort_reason)
+            raise DeadlineExceeded("Deadline exceeded before the call started")
+
+        task = asyncio.ensure_future(send)
+        aborted = self.aborted
+        try:
+            await asyncio.wait(
+                {task, aborted},
+                timeout=remaining,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+        finally:
+            if not task.done():
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+        if not task.cancelled():
+            return task.result()
+        if aborted.done():
+            raise ExecutionError(self._abort_reason)
+        raise DeadlineExceeded(f"Deadline exceeded after {remaining:.2f}s")
+
     def __str__(self) -> str:
         return (
             f"APICalling(id={self.id}, status={self.status}, duration="
@@ -0,0 +1,363 @@
+# Copyright (c) 2023 - 2024, HaiyangLi <quantocean.li at gmail dot com>
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import contextlib
+import json
+import time
+from abc import ABC, abstractmethod
+from typing import Any
+from urllib.parse import urlparse
+
+import aiohttp
+
+from lionagi._errors import ExecutionError
+from lionagi.protocols.types import EventStatus
+
+from .base import APICalling, EndPoint
+
+__all__ = (
+    "BatchBackend",
+    "OpenAIBatchBackend",
+    "AnthropicBatchBackend",
+    "BatchRunner",
+    "match_batch_backend",
+)
+
+
+class BatchBackend(ABC):
+    """Client for a provider's asynchronous batch API.
+
+    A backend turns `APICalling` payloads into the provider's batch
+    request format, submits them, reports the job's progress and fetches
+    the results keyed by `custom_id` (the id of the originating call).
+
+    Attributes:
+        endpoint (EndPoint): Supplies the base URL, headers and the pooled
+            HTTP session.
+        max_requests (int): Most requests the provider accepts per batch.
+    """
+
+    max_requests: int = 50_000
+
+    def __init__(self, endpoint: EndPoint, headers: dict | None = None):
+        """Initializes the backend.
+
+        Args:
+            endpoint (EndPoint): The endpoint the calls were created for.
+            headers (dict | None): Auth headers; defaults to those the
+                endpoint puts on a request.
+        """
+        self.endpoint = endpoint
+        self.headers = {
+            k: v
+            for k, v in (headers or {}).items()
+            if k.lower() != "content-type"
+        }
+
+    @property
+    def base_url(self) -> str:
+        return self.endpoint.config.base_url.rstrip("/")
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        return self.endpoint.get_session()
+
+    async def _request(self, method: str, url: str, **kwargs) -> Any:
+        async with self.session.request(
+            method, url, headers=self.headers, **kwargs
+        ) as response:
+            if response.status >= 400:
+                raise ExecutionError(
+                    f"Batch API {method} {url} failed with "
+                    f"{response.status}: {await response.text()}"
+                )
+            if response.content_type == "application/json":
+                return await response.json()
+            return await response.text()
+
+    @staticmethod
+    def _jsonl(text: str) -> list[dict]:
+        return [json.loads(line) for line in text.splitlines() if line]
+
+    @abstractmethod
+    def format_request(self, api_call: APICalling) -> dict:
+        """dict: One entry of the batch request file."""
+
+    @abstractmethod
+    async def submit(self, api_calls: list[APICalling]) -> str:
+        """Submits a batch and returns its id."""
+
+    @abstractmethod
+    async def poll(self, batch_id: str) -> tuple[bool, dict]:
+        """Returns whether the batch has finished, and its status body."""
+
+    @abstractmethod
+    async def results(self, status: dict) -> dict[str, tuple[Any, str]]:
+        """Maps `custom_id` to `(response, error)` for a finished batch."""
+
+    @abstractmethod
+    async def cancel(self, batch_id: str) -> None:
+        """Asks the provider to stop processing (and billing) a batch."""
+
+
+class OpenAIBatchBackend(BatchBackend):
+    """OpenAI Batch API: upload a JSONL file, then create a batch on it."""
+
+    max_requests = 50_000
+    terminal = frozenset({"completed", "failed", "expired", "cancelled"})
+
+    def __init__(
+        self,
+        endpoint: EndPoint,
+        headers: dict | None = None,
+        completion_window: str = "24h",
+    ):
+        super().__init__(endpoint, headers)
+        self.completion_window = completion_window
+
+    @property
+    def url_path(self) -> str:
+        """str: The request path in batch form, e.g. /v1/chat/completions."""
+        prefix = urlparse(self.base_url).path.rstrip("/")
+        return f"{prefix}/{self.endpoint.endpoint.lstrip('/')}"
+
+    def format_request(self, api_call: APICalling) -> dict:
+        body = {k: v for k, v in api_call.payload.items() if k != "stream"}
+        return {
+            "custom_id": str(api_call.id),
+            "method": "POST",
+            "url": self.url_path,
+            "body": body,
+        }
+
+    def to_jsonl(self, api_calls: list[APICalling]) -> bytes:
+        """bytes: The batch input file for `api_calls`."""
+        return "\n".join(
+            json.dumps(self.format_request(c), separators=(",", ":"))
+            for c in api_calls
+        ).encode()
+
+    async def submit(self, api_calls: list[APICalling]) -> str:
+        form = aiohttp.FormData()
+        form.add_field("purpose", "batch")
+        form.add_field(
+            "file",
+            self.to_jsonl(api_calls),
+            filename="batch.jsonl",
+            content_type="application/jsonl",
+        )
+        file = await self._request("POST", f"{self.base_url}/files", data=form)
+        batch = await self._request(
+            "POST",
+            f"{self.base_url}/batches",
+            json={
+                "input_file_id": file["id"],
+                "endpoint": self.url_path,
+                "completion_window": self.completion_window,
+            },
+        )
+        return batch["id"]
+
+    async def poll(self, batch_id: str) -> tuple[bool, dict]:
+        status = await self._request(
+            "GET", f"{self.base_url}/batches/{batch_id}"
+        )
+        return status["status"] in self.terminal, status
+
+    async def cancel(self, batch_id: str) -> None:
+        await self._request(
+            "POST", f"{self.base_url}/batches/{batch_id}/cancel"
+        )
+
+    async def results(self, status: dict) -> dict[str, tuple[Any, str]]:
+        out = {}
+        for key in ("output_file_id", "error_file_id"):
+            if not status.get(key):
+                continue
+            text = await self._request(
+                "GET", f"{self.base_url}/files/{status[key]}/content"
+            )
+            for line in self._jsonl(text):
+                response = line.get("response") or {}
+                if (
+                    line.get("error")
+                    or response.get("status_code", 200) >= 400
+                ):
+                    error = line.get("error") or response.get("body")
+                    out[line["custom_id"]] = (None, json.dumps(error))
+                else:
+                    out[line["custom_id"]] = (response.get("body"), None)
+        return out
+
+
+class AnthropicBatchBackend(BatchBackend):
+    """Anthropic Message Batches API; results use the chat-completion shape."""
+
+    max_requests = 100_000
+
+    def format_request(self, api_call: APICalling) -> dict:
+        params = {k: v for k, v in api_call.payload.items() if k != "stream"}
+        return {"custom_id": str(api_call.id), "params": params}
+
+    async def submit(self, api_calls: list[APICalling]) -> str:
+        batch = await self._request(
+            "POST",
+            f"{self.base_url}/messages/batches",
+            json={"requests": [self.format_request(c) for c in api_calls]},
+        )
+        return batch["id"]
+
+    async def poll(self, batch_id: str) -> tuple[bool, dict]:
+        status = await self._request(
+            "GET", f"{self.base_url}/messages/batches/{batch_id}"
+        )
+        return status["processing_status"] == "ended", status
+
+    async def cancel(self, batch_id: str) -> None:
+        await self._request(
+            "POST", f"{self.base_url}/messages/batches/{batch_id}/cancel"
+        )
+
+    @staticmethod
+    def to_chat_completion(message: dict) -> dict:
+        """Converts a Messages API reply to the chat-completion layout the
+        rest of the pipeline (e.g. `AssistantResponse`) expects."""
+        text = "".join(
+            block.get("text", "")
+            for block in message.get("content", [])
+            if block.get("type") == "text"
+        )
+        usage = dict(message.get("usage") or {})
+        prompt = usage.get("input_tokens", 0)
+        completion = usage.get("output_tokens", 0)
+        usage.update(
+            prompt_tokens=prompt,
+            completion_tokens=completion,
+            total_tokens=prompt + completion,
+        )
+        return {
+            "id": message.get("id"),
+            "object": "chat.completion",
+            "model": message.get("model"),
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": text},
+                    "finish_reason": message.get("stop_reason"),
+                }
+            ],
+            "usage": usage,
+        }
+
+    async def results(self, status: dict) -> dict[str, tuple[Any, str]]:
+        if not status.get("results_url"):
+            return {}
+        out = {}
+        text = await self._request("GET", status["results_url"])
+        for line in self._jsonl(text):
+            result = line.get("result") or {}
+            if result.get("type") == "succeeded":
+                out[line["custom_id"]] = (
+                    self.to_chat_completion(result["message"]),
+                    None,
+                )
+            else:
+                error = result.get("error") or result.get("type")
+                out[line["custom_id"]] = (None, json.dumps(error))
+        return out
+
+
+def match_batch_backend(
+    endpoint: EndPoint, headers: dict | None = None
+) -> BatchBackend:
+    """Returns the batch backend for the endpoint's provider.
+
+    Raises:
+        ValueError: If the provider has no supported batch API.
+    """
+    match endpoint.config.provider:
+        case "openai":
+            return OpenAIBatchBackend(endpoint, headers)
+        case "anthropic":
+            return AnthropicBatchBackend(endpoint, headers)
+    raise ValueError(
+        f"Provider {endpoint.config.provider!r} has no supported batch API."
+    )
+
+
+class BatchRunner:
+    """Runs `APICalling` events through a batch backend.
+
+    Calls are split into batches of at most `backend.max_requests`, which
+    are submitted and polled concurrently. Each call's `execution` is
+    filled in from its result, exactly as if it had been invoked.
+    """
+
+    def __init__(
+        self,
+        backend: BatchBackend,
+        poll_interval: float = 30,
+        timeout: float | None = None,
+    ) -> None:
+        """Initializes the runner.
+
+        Args:
+            backend (BatchBackend): The provider client.
+            poll_interval (float): Seconds between status checks.
+            timeout (float | None): Give up after this many seconds,
+                cancelling the provider-side batch and marking unfinished
+                calls as failed; None waits indefinitely.
+        """
+        self.backend = backend
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+
+    async def run(self, api_calls: list[APICalling]) -> list[APICalling]:
+        """Executes `api_calls`, returning them in the same order."""
+        size = self.backend.max_requests
+        chunks = [
+            api_calls[i : i + size] for i in range(0, len(api_calls), size)
+        ]
+        await asyncio.gather(*(self._run_one(c) for c in chunks))
+        return api_calls
+
+    async def _run_one(self, api_calls: list[APICalling]) -> None:
+        start = time.monotonic()
+        for call in api_calls:
+            call.execution.status = EventStatus.PROCESSING
+        try:
+            batch_id = await self.backend.submit(api_calls)
+            while True:
+                finished, status = await self.backend.poll(batch_id)
+                if finished:
+                    break
+                if (
+                    self.timeout is not None
+                    and time.monotonic() - start > self.timeout
+                ):
+                    # best effort: the timeout is reported either way
+                    with contextlib.suppress(Exception):
+                        await self.backend.cancel(batch_id)
+                    raise TimeoutError(
+                        f"Batch {batch_id} did not finish in {self.timeout}s"
+                    )
+                await asyncio.sleep(self.poll_interval)
+            results = await self.backend.results(status)
+        except Exception as e:
+            results = {}
+            missing = str(e)
+        else:
+            missing = f"No result for this call in batch {batch_id}"
+
+        duration = time.monotonic() - start
+        for call in api_calls:
+            response, error = results.get(str(call.id), (None, missing))
+            call.execution.duration = duration
+            if error is None:
+                call.execution.response = response
+                call.execution.status = EventStatus.COMPLETED
+            else:
+                call.execution.error = error
+                call.execution.status = EventStatus.FAILED
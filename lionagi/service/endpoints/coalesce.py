@@ -0,0 +1,132 @@
+# Copyright (c) 2023 - 2024, HaiyangLi <quantocean.li at gmail dot com>
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from copy import deepcopy
+
+from lionagi.protocols.types import EventStatus
+
+from .base import APICalling
+from .deadline import time_left
+
+__all__ = ("RequestCoalescer",)
+
+
+class RequestCoalescer:
+    """Single-flight registry for identical in-flight API calls.
+
+    The first call for a key (the leader) is executed; calls with the same
+    key that arrive while it is in flight wait for it and receive a copy of
+    its outcome in their own `APICalling` record, without being queued or
+    counted against the rate limit. A follower waits no longer than its
+    own deadline, and sends the call itself if the leader was cancelled,
+    aborted or ran out of its (possibly shorter) deadline.
+
+    Keys come from `iModel.coalesce_key` (the endpoint's canonical request
+    hash, scoped to the API key), so the registry can be shared between
+    iModels.
+
+    Attributes:
+        coalesced (int): Calls served from another call's flight.
+    """
+
+    _default: "RequestCoalescer | None" = None
+
+    def __init__(self) -> None:
+        self._inflight: dict[str, asyncio.Future] = {}
+        self.coalesced = 0
+
+    @classmethod
+    def default(cls) -> "RequestCoalescer":
+        """RequestCoalescer: The process-wide registry used by iModel."""
+        if cls._default is None:
+            cls._default = cls()
+        return cls._default
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._inflight
+
+    def _leader(self, key: str) -> asyncio.Future | None:
+        future = self._inflight.get(key)
+        if future is None or future.done():
+            return None
+        if future.get_loop() is not asyncio.get_running_loop():
+            return None
+        return future
+
+    async def run(
+        self,
+        key: str,
+        api_call: APICalling,
+        invoke: Callable[[APICalling], Awaitable[APICalling | None]],
+    ) -> APICalling | None:
+        """Runs `invoke(api_call)` unless an identical call is in flight.
+
+        Args:
+            key (str): Canonical hash of the request.
+            api_call (APICalling): The caller's own record.
+            invoke: Executes a call, returning it on success or None.
+
+        Returns:
+            APICalling | None: `api_call`, completed with the (possibly
+                shared) outcome, or None if the call failed.
+        """
+        leader = self._leader(key)
+        if leader is not None:
+            self.coalesced += 1
+            return await self._follow(api_call, leader, invoke)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        finished = False
+        try:
+            result = await invoke(api_call)
+            finished = True
+            return result
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+            # followers re-run the call themselves if the leader was
+            # cancelled or raised
+            future.set_result(api_call if finished else None)
+
+    @staticmethod
+    async def _follow(
+        api_call: APICalling,
+        leader: asyncio.Future,
+        invoke: Callable[[APICalling], Awaitable[APICalling | None]],
+    ) -> APICalling | None:
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        try:
+            source: APICalling | None = await asyncio.wait_for(
+                asyncio.shield(leader), time_left(api_call.deadline)
+            )
+        except asyncio.TimeoutError:
+            # the leader keeps running for its own callers
+            api_call._deadline_exceeded = True
+            api_call.execution.error = "Deadline exceeded while coalesced"
+            api_call.execution.duration = loop.time() - start
+            api_call.execution.status = EventStatus.FAILED
+            return None
+
+        if source is None or (
+            source.execution.status != EventStatus.COMPLETED
+            and (source.deadline_exceeded or source.aborted.done())
+        ):
+            # the leader's deadline or abort does not apply to this call
+            return await invoke(api_call)
+
+        execution = api_call.execution
+        execution.response = deepcopy(source.execution.response)
+        execution.error = source.execution.error
+        execution.duration = loop.time() - start
+        execution.status = source.execution.status
+        if execution.status == EventStatus.COMPLETED:
+            return api_call
+        return None
@@ -0,0 +1,93 @@
+# Copyright (c) 2023 - 2024, HaiyangLi <quantocean.li at gmail dot com>
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Deadlines that propagate from an operation down to its API calls.
+
+A deadline is an absolute `time.monotonic()` timestamp held in a context
+variable, so every `iModel.invoke` made while an operation runs (the chat
+call, parse retries, nested operations, tasks it spawns) is bounded by
+the operation's overall budget. Nested scopes can only shorten it.
+"""
+
+import contextlib
+import functools
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from contextvars import ContextVar
+from typing import ParamSpec, TypeVar
+
+__all__ = (
+    "DeadlineExceeded",
+    "current_deadline",
+    "resolve_deadline",
+    "time_left",
+    "deadline_scope",
+    "with_deadline",
+)
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+_deadline: ContextVar[float | None] = ContextVar(
+    "lionagi_deadline", default=None
+)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when an operation runs past its deadline."""
+
+
+def current_deadline() -> float | None:
+    """float | None: The deadline of the enclosing scope, if any."""
+    return _deadline.get()
+
+
+def resolve_deadline(timeout: float | None = None) -> float | None:
+    """Combines `timeout` (seconds from now) with the enclosing deadline.
+
+    Returns:
+        float | None: The earlier of the two, or None if neither is set.
+    """
+    deadline = _deadline.get()
+    if timeout is not None:
+        own = time.monotonic() + timeout
+        deadline = own if deadline is None else min(deadline, own)
+    return deadline
+
+
+def time_left(deadline: float | None) -> float | None:
+    """float | None: Seconds until `deadline` (never negative)."""
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+@contextlib.contextmanager
+def deadline_scope(timeout: float | None) -> Iterator[float | None]:
+    """Bounds everything run inside the block by `timeout` seconds.
+
+    Yields:
+        float | None: The effective deadline.
+    """
+    if timeout is None:
+        yield _deadline.get()
+        return
+    token = _deadline.set(resolve_deadline(timeout))
+    try:
+        yield _deadline.get()
+    finally:
+        _deadline.reset(token)
+
+
+def with_deadline(
+    func: Callable[P, Awaitable[R]],
+) -> Callable[P, Awaitable[R]]:
+    """Adds a `timeout` keyword that runs `func` in a `deadline_scope`."""
+
+    @functools.wraps(func)
+    async def wrapper(*args, timeout: float | None = None, **kwargs):
+        with deadline_scope(timeout):
+            return await func(*args, **kwargs)
+
+    return wrapper
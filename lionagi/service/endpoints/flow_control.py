@@ -0,0 +1,424 @@
+# Copyright (c) 2023 - 2024, HaiyangLi <quantocean.li at gmail dot com>
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Endpoint-wide flow control: rate-limit headers, AIMD concurrency,
+jittered retry delays and a circuit breaker."""
+
+import asyncio
+import contextlib
+import random
+import re
+import time
+from collections.abc import AsyncIterator, Mapping
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Literal
+
+import aiohttp
+
+from lionagi._errors import CircuitOpenError, RateLimitError
+
+__all__ = (
+    "RateLimitInfo",
+    "AdaptiveLimiter",
+    "backoff_delay",
+    "classify_error",
+    "error_headers",
+    "response_headers",
+)
+
+ErrorKind = Literal["throttle", "transient", "fatal"]
+
+_DURATION = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+# litellm prefixes the provider's headers it passes through
+_PASSTHROUGH_PREFIX = "llm_provider-"
+
+
+def _seconds(value: str | None) -> float | None:
+    """Parses a reset/retry value: seconds, `6m0s`-style durations, an
+    RFC 3339 timestamp or an HTTP date."""
+    if value is None:
+        return None
+    value = str(value).strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    if parts := _DURATION.findall(value):
+        if "".join(n + u for n, u in parts) == value:
+            return sum(float(n) * _UNITS[u] for n, u in parts)
+    try:
+        when = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def _int(value: str | None) -> int | None:
+    try:
+        return int(float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+class RateLimitInfo:
+    """Rate-limit state reported by a provider's response headers.
+
+    Understands `Retry-After`/`retry-after-ms`, OpenAI-style
+    `x-ratelimit-{remaining,reset}-{requests,tokens}` and Anthropic's
+    `anthropic-ratelimit-{requests,tokens}-{remaining,reset}`. Reset times
+    are converted to seconds from now.
+
+    Attributes:
+        retry_after (float | None): Seconds the provider asks to wait.
+        remaining_requests (int | None): Requests left in the window.
+        remaining_tokens (int | None): Tokens left in the window.
+        reset_requests (float | None): Seconds until the request budget
+            resets.
+        reset_tokens (float | None): Seconds until the token budget resets.
+    """
+
+    __slots__ = (
+        "retry_after",
+        "remaining_requests",
+        "remaining_tokens",
+        "reset_requests",
+        "reset_tokens",
+    )
+
+    def __init__(
+        self,
+        retry_after: float | None = None,
+        remaining_requests: int | None = None,
+        remaining_tokens: int | None = None,
+        reset_requests: float | None = None,
+        reset_tokens: float | None = None,
+    ) -> None:
+        self.retry_after = retry_after
+        self.remaining_requests = remaining_requests
+        self.remaining_tokens = remaining_tokens
+        self.reset_requests = reset_requests
+        self.reset_tokens = reset_tokens
+
+    @classmethod
+    def from_headers(cls, headers: Mapping | None) -> "RateLimitInfo":
+        """RateLimitInfo: The state found in `headers` (fields the
+        provider did not send are None)."""
+        h = {}
+        for k, v in (headers or {}).items():
+            k = str(k).lower()
+            if k.startswith(_PASSTHROUGH_PREFIX):
+                k = k[len(_PASSTHROUGH_PREFIX) :]
+            h[k] = v
+
+        retry_after = None
+        if (ms := h.get("retry-after-ms")) is not None:
+            retry_after = (_int(ms) or 0) / 1000
+        elif (value := h.get("retry-after")) is not None:
+            retry_after = _seconds(value)
+
+        def pick(kind: str, field: str) -> str | None:
+            return h.get(f"x-ratelimit-{field}-{kind}") or h.get(
+                f"anthropic-ratelimit-{kind}-{field}"
+            )
+
+        return cls(
+            retry_after=retry_after,
+            remaining_requests=_int(pick("requests", "remaining")),
+            remaining_tokens=_int(pick("tokens", "remaining")),
+            reset_requests=_seconds(pick("requests", "reset")),
+            reset_tokens=_seconds(pick("tokens", "reset")),
+        )
+
+    @property
+    def exhausted_for(self) -> float:
+        """float: Seconds until a depleted budget resets (0 if none is)."""
+        wait = 0.0
+        if self.remaining_requests == 0 and self.reset_requests:
+            wait = self.reset_requests
+        if self.remaining_tokens == 0 and self.reset_tokens:
+            wait = max(wait, self.reset_tokens)
+        return wait
+
+    def __bool__(self) -> bool:
+        return any(getattr(self, k) is not None for k in self.__slots__)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(
+            f"{k}={getattr(self, k)}"
+            for k in self.__slots__
+            if getattr(self, k) is not None
+        )
+        return f"RateLimitInfo({fields})"
+
+
+def response_headers(response: Any) -> Mapping | None:
+    """Returns the HTTP headers behind a provider response, if exposed
+    (litellm keeps them in `_hidden_params`)."""
+    if (headers := getattr(response, "_response_headers", None)) is not None:
+        return headers
+    hidden = getattr(response, "_hidden_params", None)
+    if isinstance(hidden, dict):
+        return hidden.get("additional_headers")
+    return None
+
+
+def error_headers(error: BaseException) -> Mapping | None:
+    """Returns the HTTP headers of the failed response behind `error`."""
+    for attr in ("headers", "litellm_response_headers"):
+        if (headers := getattr(error, attr, None)) is not None:
+            return headers
+    return getattr(getattr(error, "response", None), "headers", None)
+
+
+def classify_error(error: BaseException) -> ErrorKind:
+    """Decides how a failed attempt is handled.
+
+    Returns:
+        str: `"throttle"` for rate limiting (HTTP 429), `"transient"` for
+            server errors, timeouts and connection failures (retried and
+            counted by the circuit breaker), `"fatal"` otherwise.
+    """
+    if isinstance(error, CircuitOpenError):
+        return "fatal"
+    status = getattr(error, "status_code", None) or getattr(
+        error, "status", None
+    )
+    if (
+        isinstance(error, RateLimitError)
+        or status == 429
+        or "RateLimit" in type(error).__name__
+    ):
+        return "throttle"
+    if isinstance(status, int) and status >= 500:
+        return "transient"
+    if isinstance(
+        error,
+        aiohttp.ClientError | asyncio.TimeoutError | ConnectionError,
+    ):
+        return "transient"
+    name = type(error).__name__
+    if any(
+        k in name
+        for k in ("Timeout", "Connection", "ServiceUnavailable", "Server")
+    ):
+        return "transient"
+    return "fatal"
+
+
+def backoff_delay(
+    attempt: int,
+    base: float = 0.5,
+    cap: float = 60,
+    retry_after: float | None = None,
+) -> float:
+    """Seconds to wait before retry number `attempt + 1`.
+
+    Uses "full jitter" exponential backoff, a random delay between 0 and
+    `base * 2**attempt` (at most `cap`), so callers that failed together
+    do not retry together. A provider's `Retry-After` takes precedence,
+    with up to `base` seconds of jitter added.
+    """
+    if retry_after is not None:
+        return min(cap, retry_after) + random.uniform(0, base)
+    return random.uniform(0, min(cap, base * 2**attempt))
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit and circuit breaker shared by an endpoint.
+
+    Every request to the endpoint holds a `slot()`. The number of slots
+    grows by one per window of successful requests (additive increase)
+    and is halved when the provider throttles (multiplicative decrease),
+    so concurrency settles just under the provider's quota instead of
+    overshooting into a burst of 429s. Rate-limit headers pause new
+    requests until the `Retry-After` time, or until a depleted budget
+    resets.
+
+    After `failure_threshold` consecutive transient failures the circuit
+    opens and requests fail fast with `CircuitOpenError` for
+    `recovery_time` seconds; then a single probe is let through, whose
+    outcome closes or re-opens the circuit. `slot()` hands the probe a
+    token to pass to `success`, `throttle` or `failure`; outcomes of
+    requests sent before the circuit opened do not decide it.
+
+    Attributes:
+        limit (float): Current concurrency limit.
+        inflight (int): Requests holding a slot.
+        resume_at (float): Monotonic time before which no request starts.
+        throttled (int): Throttle responses seen.
+        last_info (RateLimitInfo | None): The latest header state.
+    """
+
+    def __init__(
+        self,
+        initial: int = 8,
+        minimum: int = 1,
+        maximum: int = 256,
+        decrease: float = 0.5,
+        failure_threshold: int = 5,
+        recovery_time: float = 30,
+    ) -> None:
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.decrease = decrease
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.inflight = 0
+        self.resume_at = 0.0
+        self.throttled = 0
+        self.failures = 0
+        self.last_info: RateLimitInfo | None = None
+        self._opened_at: float | None = None
+        self._probe: object | None = None
+        self._cond: asyncio.Condition | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @classmethod
+    def from_config(cls, config: Any) -> "AdaptiveLimiter":
+        """AdaptiveLimiter: A limiter set up from an `EndpointConfig`."""
+        initial = config.initial_concurrency or config.max_concurrency
+        return cls(
+            initial=min(initial, config.max_concurrency),
+            maximum=config.max_concurrency,
+            failure_threshold=config.circuit_failure_threshold,
+            recovery_time=config.circuit_recovery_time,
+        )
+
+    @property
+    def state(self) -> Literal["closed", "open", "half_open"]:
+        """str: The circuit state."""
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at < self.recovery_time:
+            return "open"
+        return "half_open"
+
+    def _condition(self) -> asyncio.Condition:
+        loop = asyncio.get_running_loop()
+        if self._cond is None or self._loop is not loop:
+            self._cond = asyncio.Condition()
+            self._loop = loop
+        return self._cond
+
+    @contextlib.asynccontextmanager
+    async def slot(self) -> AsyncIterator[object | None]:
+        """Holds one concurrency slot for the duration of a request.
+
+        Yields:
+            object | None: The probe token if this request is the
+                half-open probe, else None; pass it on to the outcome.
+
+        Raises:
+            CircuitOpenError: If the circuit is open.
+        """
+        probe = self._admit()
+        cond = self._condition()
+        acquired = False
+        try:
+            async with cond:
+                while True:
+                    delay = self.resume_at - time.monotonic()
+                    if delay <= 0 and self.inflight < max(1, int(self.limit)):
+                        break
+                    with contextlib.suppress(asyncio.TimeoutError):
+                        await asyncio.wait_for(
+                            cond.wait(), delay if delay > 0 else None
+                        )
+                self.inflight += 1
+                acquired = True
+            yield probe
+        finally:
+            # a probe that ended without a verdict (or was cancelled while
+            # waiting for its slot) frees the next probe
+            self._release(probe)
+            if acquired:
+                async with cond:
+                    self.inflight -= 1
+                    cond.notify_all()
+
+    def _admit(self) -> object | None:
+        """Checks the circuit; returns a token if this request is the
+        probe."""
+        state = self.state
+        if state == "open" or (
+            state == "half_open" and self._probe is not None
+        ):
+            wait = self.recovery_time - (time.monotonic() - self._opened_at)
+            raise CircuitOpenError(
+                "Circuit open after repeated failures; retry in "
+                f"{wait:.1f}s"
+            )
+        if state == "half_open":
+            self._probe = object()
+            return self._probe
+        return None
+
+    def _release(self, probe: object | None) -> bool:
+        """Ends the probe if `probe` is its token; returns whether it was."""
+        if probe is None or probe is not self._probe:
+            return False
+        self._probe = None
+        return True
+
+    def _pause(self, seconds: float) -> None:
+        if seconds > 0:
+            self.resume_at = max(self.resume_at, time.monotonic() + seconds)
+
+    def observe(self, info: RateLimitInfo | None) -> None:
+        """Applies rate-limit headers from any response."""
+        if not info:
+            return
+        self.last_info = info
+        self._pause(info.exhausted_for)
+        if info.retry_after:
+            self._pause(info.retry_after)
+
+    def success(
+        self, info: RateLimitInfo | None = None, probe: object | None = None
+    ) -> None:
+        """Records a successful request (additive increase).
+
+        Only the probe (identified by the token from `slot()`) closes an
+        opened circuit.
+        """
+        self.observe(info)
+        if self._release(probe) or self._opened_at is None:
+            self.failures = 0
+            self._opened_at = None
+        self.limit = min(self.maximum, self.limit + 1 / self.limit)
+
+    def throttle(
+        self, info: RateLimitInfo | None = None, probe: object | None = None
+    ) -> None:
+        """Records a rate-limit response (multiplicative decrease).
+
+        Throttles arriving while requests are already paused belong to the
+        same congestion event and do not shrink the limit again. A
+        throttled probe frees the next probe.
+        """
+        self.throttled += 1
+        self._release(probe)
+        if time.monotonic() >= self.resume_at:
+            self.limit = max(self.minimum, self.limit * self.decrease)
+        self.observe(info)
+
+    def failure(self, probe: object | None = None) -> None:
+        """Records a transient failure, opening the circuit if needed.
+
+        A failed probe re-opens the circuit; other failures only open a
+        closed one.
+        """
+        self.failures += 1
+        if self._release(probe) or (
+            self._opened_at is None and self.failures >= self.failure_threshold
+        ):
+            self._opened_at = time.monotonic()
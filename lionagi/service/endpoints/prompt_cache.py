@@ -0,0 +1,163 @@
+# Copyright (c) 2023 - 2024, HaiyangLi <quantocean.li at gmail dot com>
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Helpers that make chat payloads friendly to provider prompt caches.
+
+Providers cache the longest previously seen prefix of a request (tools,
+then system, then messages). Anthropic only caches up to explicit
+`cache_control` breakpoints; OpenAI caches automatically but routes by a
+hash of the prefix, so the prefix must be byte-stable between turns.
+"""
+
+import hashlib
+import json
+from typing import Any
+from urllib.parse import urlparse
+
+__all__ = (
+    "EPHEMERAL",
+    "estimate_tokens",
+    "is_openai_api",
+    "mark_anthropic_cache",
+    "stabilize_openai_prefix",
+)
+
+EPHEMERAL = {"type": "ephemeral"}
+
+# Anthropic accepts at most four cache breakpoints per request
+MAX_BREAKPOINTS = 4
+
+OPENAI_API_HOST = "api.openai.com"
+
+
+def estimate_tokens(content: Any) -> int:
+    """int: A cheap token estimate (about four characters per token)."""
+    if isinstance(content, str):
+        return len(content) // 4
+    if isinstance(content, list):
+        return sum(estimate_tokens(i) for i in content)
+    if isinstance(content, dict):
+        if "text" in content:
+            return estimate_tokens(content["text"])
+        if "content" in content:
+            return estimate_tokens(content["content"])
+        return 0
+    return len(str(content)) // 4
+
+
+def _with_breakpoint(content: Any) -> list:
+    """Returns `content` as blocks with `cache_control` on the last one.
+
+    The input is never mutated, since callers share message dicts with
+    cached conversation history.
+    """
+    if isinstance(content, str):
+        return [{"type": "text", "text": content, "cache_control": EPHEMERAL}]
+    blocks = list(content)
+    blocks[-1] = {**blocks[-1], "cache_control": EPHEMERAL}
+    return blocks
+
+
+def mark_anthropic_cache(payload: dict, min_tokens: int = 1024) -> int:
+    """Adds Anthropic `cache_control` breakpoints to a messages payload.
+
+    Breakpoints go, in prefix order, on the last tool schema, the system
+    prompt, the first message (which carries the system prompt when it is
+    folded into the first instruction) and the last message, so the next
+    turn reads the whole conversation so far from the cache. A breakpoint
+    is only placed once the prefix it closes reaches `min_tokens`, since
+    shorter prefixes cannot be cached and writes cost extra.
+
+    Args:
+        payload (dict): The request payload, updated in place.
+        min_tokens (int): Minimum estimated prefix size to cache.
+
+    Returns:
+        int: The number of breakpoints placed.
+    """
+    placed = 0
+    prefix = 0
+
+    tools = payload.get("tools")
+    if tools:
+        prefix += estimate_tokens(json.dumps(tools, default=str))
+        if prefix >= min_tokens:
+            tools = list(tools)
+            tools[-1] = {**tools[-1], "cache_control": EPHEMERAL}
+            payload["tools"] = tools
+            placed += 1
+
+    system = payload.get("system")
+    if system:
+        prefix += estimate_tokens(system)
+        if prefix >= min_tokens:
+            payload["system"] = _with_breakpoint(system)
+            placed += 1
+
+    messages = payload.get("messages")
+    if not messages:
+        return placed
+    messages = list(messages)
+    sizes = [estimate_tokens(m.get("content")) for m in messages]
+    targets = [0, len(messages) - 1] if len(messages) > 1 else [0]
+    for idx in targets:
+        if placed >= MAX_BREAKPOINTS:
+            break
+        msg = messages[idx]
+        if not msg.get("content"):
+            continue
+        if prefix + sum(sizes[: idx + 1]) < min_tokens:
+            continue
+        messages[idx] = {**msg, "content": _with_breakpoint(msg["content"])}
+        placed += 1
+    payload["messages"] = messages
+    return placed
+
+
+def is_openai_api(base_url: str | None) -> bool:
+    """bool: True if `base_url` is OpenAI's own API, as opposed to an
+    OpenAI-compatible server that may reject OpenAI-only fields."""
+    return bool(base_url) and urlparse(base_url).hostname == OPENAI_API_HOST
+
+
+def stabilize_openai_prefix(
+    payload: dict, add_cache_key: bool = True
+) -> str | None:
+    """Makes an OpenAI chat payload's cacheable prefix deterministic.
+
+    Tool schemas are sorted by name, so registration order does not
+    change the prefix, and `prompt_cache_key` (unless given) is set to a
+    hash of the model, tools and leading system messages, so requests
+    sharing that prefix are routed to the same cache.
+
+    Args:
+        payload (dict): The request payload, updated in place.
+        add_cache_key (bool): Whether to add `prompt_cache_key`; only
+            OpenAI's own API accepts it.
+
+    Returns:
+        str | None: The prompt cache key in use, if any.
+    """
+    tools = payload.get("tools")
+    if tools:
+        payload["tools"] = sorted(
+            tools, key=lambda t: str(t.get("function", {}).get("name", ""))
+        )
+    if payload.get("prompt_cache_key") or not add_cache_key:
+        return payload.get("prompt_cache_key")
+
+    head = []
+    for msg in payload.get("messages") or []:
+        if msg.get("role") not in ("system", "developer"):
+            break
+        head.append(msg.get("content"))
+    canonical = json.dumps(
+        [payload.get("model"), payload.get("tools"), head],
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    key = hashlib.sha256(canonical.encode()).hexdigest()[:32]
+    payload["prompt_cache_key"] = key
+    return key
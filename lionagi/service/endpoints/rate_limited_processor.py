@@ -3,21 +3,127 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import asyncio
-import logging
-from typing import Self
+import contextlib
+import time
 
 from typing_extensions import override
 
-from ...protocols.types import Executor, Processor
-from .base import APICalling
+from ...protocols.types import Event, Executor, Processor, Tracer
+from .base import APICalling, EndPoint
+from .deadline import time_left
 
 __all__ = (
+    "TokenBucket",
     "RateLimitedAPIProcessor",
     "RateLimitedAPIExecutor",
 )
 
 
+class TokenBucket:
+    """A continuously refilling budget (token-bucket algorithm).
+
+    The bucket holds at most `capacity` units and refills at
+    `capacity / interval` units per second, so the budget recovers
+    smoothly instead of resetting once per window. The balance may go
+    negative when an over-estimate is corrected upward, which simply
+    delays the next grant until the debt has been refilled.
+
+    Attributes:
+        capacity (float): Maximum number of units the bucket can hold.
+        interval (float): Seconds needed to refill an empty bucket.
+        tokens (float): Units currently available.
+    """
+
+    __slots__ = ("capacity", "interval", "tokens", "_last_refill")
+
+    def __init__(self, capacity: float, interval: float) -> None:
+        """Initializes a full bucket.
+
+        Args:
+            capacity (float): Maximum number of units per `interval`.
+            interval (float): Length of the rate-limit window in seconds.
+
+        Raises:
+            ValueError: If `capacity` or `interval` is not positive.
+        """
+        if capacity <= 0:
+            raise ValueError("Bucket capacity must be greater than 0.")
+        if interval <= 0:
+            raise ValueError("Bucket interval must be greater than 0.")
+        self.capacity = float(capacity)
+        self.interval = float(interval)
+        self.tokens = float(capacity)
+        self._last_refill = time.monotonic()
+
+    @property
+    def refill_rate(self) -> float:
+        """float: Units restored per second."""
+        return self.capacity / self.interval
+
+    def refill(self) -> None:
+        """Adds the units accrued since the last refill, up to capacity."""
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        if elapsed > 0:
+            self.tokens = min(
+                self.capacity, self.tokens + elapsed * self.refill_rate
+            )
+
+    def can_consume(self, amount: float) -> bool:
+        """Checks whether `amount` units could be taken right now.
+
+        A request larger than the whole bucket is granted once the bucket
+        is full, otherwise it could never be served.
+        """
+        self.refill()
+        return self.tokens >= min(amount, self.capacity)
+
+    def consume(self, amount: float) -> None:
+        """Takes `amount` units without checking the balance."""
+        self.tokens -= amount
+
+    def try_consume(self, amount: float) -> bool:
+        """Takes `amount` units if available.
+
+        Returns:
+            bool: True if the units were reserved, False otherwise.
+        """
+        if self.can_consume(amount):
+            self.consume(amount)
+            return True
+        return False
+
+    def refund(self, amount: float) -> None:
+        """Returns `amount` units (negative values charge extra units)."""
+        self.refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+    def wait_time(self, amount: float) -> float:
+        """float: Seconds until `amount` units are expected to be free."""
+        self.refill()
+        deficit = min(amount, self.capacity) - self.tokens
+        if deficit <= 0:
+            return 0.0
+        return deficit / self.refill_rate
+
+
 class RateLimitedAPIProcessor(Processor):
+    """Processor enforcing requests-per-interval and tokens-per-interval.
+
+    Both limits are tracked with a `TokenBucket` that refills
+    continuously. Each event reserves one request and its estimated
+    tokens when permission is granted; once the call completes, the
+    difference between the estimate and the usage reported by the
+    provider is refunded (or charged) to the token bucket. Prompt-cache
+    reads are excluded from that usage for providers that do not count
+    them, and are totalled in `cache_read_tokens`. Remaining budgets
+    reported in the provider's rate-limit headers cap both buckets.
+
+    While tracing is on, each call records `processor.queue_wait`,
+    `processor.permission_wait` and `api.call` spans under the span that
+    was active when it was enqueued.
+    """
 
     event_type = APICalling
 
@@ -28,93 +134,183 @@ class RateLimitedAPIProcessor(Processor):
         interval: float | None = None,
         limit_requests: int = None,
         limit_tokens: int = None,
+        num_workers: int | None = None,
     ):
-        super().__init__(queue_capacity, capacity_refresh_time)
+        super().__init__(
+            queue_capacity, capacity_refresh_time, num_workers=num_workers
+        )
         self.limit_tokens = limit_tokens
         self.limit_requests = limit_requests
         self.interval = interval or self.capacity_refresh_time
-        self.available_request = self.limit_requests
-        self.available_token = self.limit_tokens
-        self._rate_limit_replenisher_task: asyncio.Task | None = None
+        self.request_bucket: TokenBucket | None = (
+            TokenBucket(limit_requests, self.interval)
+            if limit_requests
+            else None
+        )
+        self.token_bucket: TokenBucket | None = (
+            TokenBucket(limit_tokens, self.interval) if limit_tokens else None
+        )
         self._lock: asyncio.Lock = asyncio.Lock()
+        self.cache_read_tokens = 0
+        # event id -> (span active at enqueue, enqueue time in ns)
+        self._trace_marks: dict = {}
+
+    @property
+    def available_request(self) -> int | None:
+        """int | None: Requests that can be issued right now, if limited."""
+        if self.request_bucket is None:
+            return None
+        self.request_bucket.refill()
+        return int(self.request_bucket.tokens)
+
+    @property
+    def available_token(self) -> int | None:
+        """int | None: Tokens that can be spent right now, if limited."""
+        if self.token_bucket is None:
+            return None
+        self.token_bucket.refill()
+        return int(self.token_bucket.tokens)
+
+    def wait_time(self, required_tokens: int | None = None) -> float:
+        """Estimates how long until a request of this size may proceed.
 
-    async def start_replenishing(self):
-        """Start replenishing rate limit capacities at regular intervals."""
-        await self.start()
-        try:
-            while not self.is_stopped():
-                await asyncio.sleep(delay=self.interval)
-                async with self._lock:
-                    if self.limit_requests is not None:
-                        self.available_request = (
-                            self.limit_requests - self.queue.qsize()
-                        )
-                    if self.limit_tokens is not None:
-                        self.available_token = self.limit_tokens
-
-        except asyncio.CancelledError:
-            logging.info("Rate limit replenisher task cancelled.")
-        except Exception as e:
-            logging.error(f"Error in rate limit replenisher: {e}")
+        Args:
+            required_tokens (int | None): Estimated tokens of the request.
+
+        Returns:
+            float: Seconds to wait; 0 if the request could go now.
+        """
+        wait = 0.0
+        if self.request_bucket is not None:
+            wait = self.request_bucket.wait_time(1)
+        if self.token_bucket is not None and required_tokens:
+            wait = max(wait, self.token_bucket.wait_time(required_tokens))
+        return wait
 
     @override
-    async def stop(self) -> None:
-        """Stop the replenishment task."""
-        if self._rate_limit_replenisher_task:
-            self._rate_limit_replenisher_task.cancel()
-            await self._rate_limit_replenisher_task
-        await super().stop()
+    def permission_wait_time(self, required_tokens: int = None) -> float:
+        # never spin: re-check no sooner than 10ms from now
+        return max(self.wait_time(required_tokens), 0.01)
 
     @override
-    @classmethod
-    async def create(
-        cls,
-        queue_capacity: int,
-        capacity_refresh_time: float,
-        interval: float | None = None,
-        limit_requests: int = None,
-        limit_tokens: int = None,
-    ) -> Self:
-        self = cls(
-            interval=interval,
-            queue_capacity=queue_capacity,
-            capacity_refresh_time=capacity_refresh_time,
-            limit_requests=limit_requests,
-            limit_tokens=limit_tokens,
-        )
-        self._rate_limit_replenisher_task = asyncio.create_task(
-            self.start_replenishing()
-        )
-        return self
+    async def enqueue(self, event: Event) -> None:
+        if Tracer.default().enabled:
+            self._trace_marks[event.id] = (Tracer.current(), time.time_ns())
+        await super().enqueue(event)
+
+    @override
+    async def acquire_permission(self, event: Event) -> None:
+        """Waits for permission until the event's deadline or abort.
+
+        An event that gives up reserves nothing; its `invoke` then fails
+        immediately without calling the provider.
+        """
+        if not isinstance(event, APICalling):
+            return await super().acquire_permission(event)
+
+        tracer = Tracer.default()
+        parent, queued_at = self._trace_marks.get(event.id, (None, None))
+        if queued_at is not None:
+            tracer.span(
+                "processor.queue_wait", parent=parent, start_ns=queued_at
+            ).end()
+
+        with tracer.span("processor.permission_wait", parent=parent) as span:
+            permit = asyncio.ensure_future(super().acquire_permission(event))
+            try:
+                await asyncio.wait(
+                    {permit, event.aborted},
+                    timeout=time_left(event.deadline),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+            finally:
+                if not permit.done():
+                    permit.cancel()
+                    span.set_attribute("granted", False)
+                    with contextlib.suppress(asyncio.CancelledError):
+                        await permit
 
     @override
     async def request_permission(self, required_tokens: int = None) -> bool:
         async with self._lock:
-            if self.limit_requests is None and self.limit_tokens is None:
-                if self.queue.qsize() < self.queue_capacity:
-                    return True
-
-            if self.limit_requests is not None:
-                if self.available_request > 0:
-                    self.available_request -= 1
-                if required_tokens is None:
-                    return True
-                else:
-                    if self.limit_tokens >= required_tokens:
-                        self.limit_tokens -= required_tokens
-                        return True
-
-            if self.limit_tokens is not None:
-                if required_tokens is None:
-                    return True
-                if self.limit_tokens >= required_tokens:
-                    self.limit_tokens -= required_tokens
-                    return True
-
-            return False
+            if self.request_bucket is not None:
+                if not self.request_bucket.can_consume(1):
+                    return False
+            if self.token_bucket is not None and required_tokens:
+                if not self.token_bucket.can_consume(required_tokens):
+                    return False
+
+            if self.request_bucket is not None:
+                self.request_bucket.consume(1)
+            if self.token_bucket is not None and required_tokens:
+                self.token_bucket.consume(required_tokens)
+            return True
+
+    def sync_with_provider(self, info) -> None:
+        """Lowers the buckets to the budget the provider reports.
+
+        The provider's `x-ratelimit-remaining-*` counts include traffic
+        from other clients sharing the key, so they are authoritative when
+        lower than the local estimate.
+        """
+        if not info:
+            return
+        for bucket, remaining in (
+            (self.request_bucket, info.remaining_requests),
+            (self.token_bucket, info.remaining_tokens),
+        ):
+            if bucket is not None and remaining is not None:
+                bucket.refill()
+                bucket.tokens = min(bucket.tokens, float(remaining))
+
+    @override
+    async def process_event(self, event: Event) -> None:
+        """Invokes the event, then settles its token reservation."""
+        tracer, parent = Tracer.default(), None
+        if self._trace_marks:
+            parent, _ = self._trace_marks.pop(event.id, (None, None))
+        with tracer.span("api.call", parent=parent) as span:
+            await super().process_event(event)
+            if span:
+                _trace_call(span, event)
+        self.cache_read_tokens += getattr(event, "cached_tokens", None) or 0
+        self.sync_with_provider(getattr(event, "rate_limit", None))
+        if self.token_bucket is None:
+            return
+
+        reserved = event.request.get("required_tokens") or 0
+        used = getattr(
+            event, "rate_limited_tokens", getattr(event, "used_tokens", None)
+        )
+        if used is None:
+            return
+        async with self._lock:
+            self.token_bucket.refund(reserved - used)
+        if reserved > used:
+            await self.notify_capacity()
+
+
+def _trace_call(span, event: Event) -> None:
+    endpoint = getattr(event, "endpoint", None)
+    payload = getattr(event, "payload", None) or {}
+    span.set_attributes(
+        provider=getattr(getattr(endpoint, "config", None), "provider", None),
+        model=payload.get("model"),
+        required_tokens=event.request.get("required_tokens"),
+        used_tokens=getattr(event, "used_tokens", None),
+        cached_tokens=getattr(event, "cached_tokens", None),
+        status=event.status.value,
+    )
+    if event.execution.error:
+        span.record_error(event.execution.error)
 
 
 class RateLimitedAPIExecutor(Executor):
+    """Executor for `APICalling` events with rate-limited processing.
+
+    Keeps track of the endpoints whose calls it has executed so that
+    `stop()` also closes their pooled HTTP connections.
+    """
 
     processor_type = RateLimitedAPIProcessor
 
@@ -125,7 +321,10 @@ class RateLimitedAPIExecutor(Executor):
         interval: float | None = None,
         limit_requests: int = None,
         limit_tokens: int = None,
+        num_workers: int | None = None,
         strict_event_type: bool = False,
+        max_finished_events: int | None = None,
+        finished_event_ttl: float | None = None,
     ):
         config = {
             "queue_capacity": queue_capacity,
@@ -133,6 +332,7 @@ class RateLimitedAPIExecutor(Executor):
             "interval": interval,
             "limit_requests": limit_requests,
             "limit_tokens": limit_tokens,
+            "num_workers": num_workers,
         }
 
         self.config = config
@@ -141,5 +341,22 @@ class RateLimitedAPIExecutor(Executor):
         self.limit_tokens = limit_tokens
 
         super().__init__(
-            processor_config=config, strict_event_type=strict_event_type
+            processor_config=config,
+            strict_event_type=strict_event_type,
+            max_finished_events=max_finished_events,
+            finished_event_ttl=finished_event_ttl,
         )
+        self._endpoints: dict[int, EndPoint] = {}
+
+    @override
+    async def append(self, event: APICalling) -> None:
+        await super().append(event)
+        self._endpoints.setdefault(id(event.endpoint), event.endpoint)
+
+    @override
+    async def stop(self) -> None:
+        """Stops the processor and closes pooled endpoint connections."""
+        await super().stop()
+        endpoints, self._endpoints = self._endpoints, {}
+        for endpoint in endpoints.values():
+            await endpoint.close()
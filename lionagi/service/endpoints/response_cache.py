@@ -0,0 +1,410 @@
+# Copyright (c) 2023 - 2024, HaiyangLi <quantocean.li at gmail dot com>
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import hashlib
+import json
+import logging
+import pickle
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from lionagi.settings import Settings
+from lionagi.utils import UNDEFINED
+
+__all__ = (
+    "CacheMetrics",
+    "CacheBackend",
+    "MemoryCacheBackend",
+    "SQLiteCacheBackend",
+    "RedisCacheBackend",
+    "ResponseCache",
+)
+
+# headers that identify the caller rather than the request
+AUTH_HEADERS = frozenset(
+    {"authorization", "x-api-key", "api-key", "proxy-authorization"}
+)
+
+
+class CacheMetrics:
+    """Hit/miss counters for a `ResponseCache`.
+
+    Attributes:
+        hits (int): Lookups that returned a cached response.
+        misses (int): Lookups that found nothing (or an expired entry).
+        sets (int): Responses written to the cache.
+        evictions (int): Entries dropped to respect a size budget.
+    """
+
+    __slots__ = ("hits", "misses", "sets", "evictions")
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.evictions = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """float: Fraction of lookups served from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "sets": self.sets,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+        }
+
+    def __str__(self) -> str:
+        return (
+            f"CacheMetrics(hits={self.hits}, misses={self.misses}, "
+            f"sets={self.sets}, evictions={self.evictions})"
+        )
+
+
+class CacheBackend(ABC):
+    """Storage interface for cached responses.
+
+    `get` returns `UNDEFINED` on a miss so that falsy responses (e.g. an
+    empty dict) can still be cached.
+    """
+
+    metrics: CacheMetrics
+
+    @abstractmethod
+    async def get(self, key: str) -> Any: ...
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: float | None) -> None: ...
+
+    @abstractmethod
+    async def delete(self, key: str) -> None: ...
+
+    @abstractmethod
+    async def clear(self) -> None: ...
+
+    async def close(self) -> None:
+        """Releases any resources held by the backend."""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """In-process LRU cache bounded by entry count and/or byte budget.
+
+    Values are kept pickled, like in the other backends, so every hit is a
+    fresh copy that callers may mutate freely, and entry sizes are exact.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int | None = 64 * 1024 * 1024,
+        max_entries: int | None = None,
+    ) -> None:
+        """Initializes the backend.
+
+        Args:
+            max_bytes (int | None): Total size budget, None for unbounded.
+            max_entries (int | None): Entry budget, None for unbounded.
+        """
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.metrics = CacheMetrics()
+        self._data: OrderedDict[str, tuple[bytes, float | None]] = (
+            OrderedDict()
+        )
+        self._bytes = 0
+
+    @property
+    def size_bytes(self) -> int:
+        """int: Estimated bytes currently held."""
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _drop(self, key: str) -> None:
+        blob, _ = self._data.pop(key)
+        self._bytes -= len(blob)
+
+    async def get(self, key: str) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return UNDEFINED
+        blob, expires_at = entry
+        if expires_at is not None and expires_at <= time.time():
+            self._drop(key)
+            return UNDEFINED
+        self._data.move_to_end(key)
+        return pickle.loads(blob)
+
+    async def set(self, key: str, value: Any, ttl: float | None) -> None:
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if self.max_bytes is not None and len(blob) > self.max_bytes:
+            return
+        if key in self._data:
+            self._drop(key)
+        expires_at = time.time() + ttl if ttl else None
+        self._data[key] = (blob, expires_at)
+        self._bytes += len(blob)
+        while (
+            self.max_bytes is not None and self._bytes > self.max_bytes
+        ) or (
+            self.max_entries is not None and len(self._data) > self.max_entries
+        ):
+            self._drop(next(iter(self._data)))
+            self.metrics.evictions += 1
+
+    async def delete(self, key: str) -> None:
+        if key in self._data:
+            self._drop(key)
+
+    async def clear(self) -> None:
+        self._data.clear()
+        self._bytes = 0
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """On-disk cache stored in a single SQLite file.
+
+    Values are pickled. Database access runs in a worker thread so the
+    event loop is never blocked on disk I/O.
+    """
+
+    def __init__(self, path: str | Path = "./data/cache/responses.db"):
+        """Initializes the backend, creating the database if needed.
+
+        Args:
+            path (str | Path): Location of the SQLite database file.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.metrics = CacheMetrics()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value BLOB, expires_at REAL)"
+            )
+            self._conn.commit()
+
+    def _get(self, key: str) -> Any:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return UNDEFINED
+            if row[1] is not None and row[1] <= time.time():
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return UNDEFINED
+        return pickle.loads(row[0])
+
+    def _set(self, key: str, value: Any, ttl: float | None) -> None:
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        expires_at = time.time() + ttl if ttl else None
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache VALUES (?, ?, ?)",
+                (key, blob, expires_at),
+            )
+            self._conn.commit()
+
+    def _execute(self, sql: str, params: tuple = ()) -> None:
+        with self._lock:
+            self._conn.execute(sql, params)
+            self._conn.commit()
+
+    async def get(self, key: str) -> Any:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: Any, ttl: float | None) -> None:
+        await asyncio.to_thread(self._set, key, value, ttl)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(
+            self._execute, "DELETE FROM cache WHERE key = ?", (key,)
+        )
+
+    async def clear(self) -> None:
+        await asyncio.to_thread(self._execute, "DELETE FROM cache")
+
+    async def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class RedisCacheBackend(CacheBackend):
+    """Cache stored in Redis (or any server speaking its protocol).
+
+    Accepts any client exposing the `redis.asyncio` methods `get`,
+    `set(..., ex=...)`, `delete` and `scan_iter`. If no client is given,
+    one is created from `url`, which requires the `redis` package.
+    """
+
+    def __init__(
+        self,
+        client: Any = None,
+        url: str = "redis://localhost:6379/0",
+        prefix: str = "lionagi:response:",
+    ) -> None:
+        """Initializes the backend.
+
+        Args:
+            client: An async Redis-compatible client.
+            url (str): Connection URL used when `client` is None.
+            prefix (str): Namespace prepended to every key.
+        """
+        if client is None:
+            try:
+                from redis import asyncio as aioredis
+            except ImportError as e:
+                raise ImportError(
+                    "RedisCacheBackend requires the `redis` package. "
+                    "Install it with `pip install 'lionagi[redis]'`."
+                ) from e
+            client = aioredis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+        self.metrics = CacheMetrics()
+
+    async def get(self, key: str) -> Any:
+        blob = await self.client.get(self.prefix + key)
+        if blob is None:
+            return UNDEFINED
+        return pickle.loads(blob)
+
+    async def set(self, key: str, value: Any, ttl: float | None) -> None:
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        ex = max(1, int(ttl)) if ttl else None
+        await self.client.set(self.prefix + key, blob, ex=ex)
+
+    async def delete(self, key: str) -> None:
+        await self.client.delete(self.prefix + key)
+
+    async def clear(self) -> None:
+        keys = [k async for k in self.client.scan_iter(f"{self.prefix}*")]
+        if keys:
+            await self.client.delete(*keys)
+
+    async def close(self) -> None:
+        if hasattr(self.client, "aclose"):
+            await self.client.aclose()
+
+
+class ResponseCache:
+    """Caches API responses under a canonical hash of the request.
+
+    The key is derived from the endpoint, the payload and the
+    non-credential headers, serialized as canonical JSON, so identical
+    requests share an entry regardless of dict ordering or API key.
+
+    Attributes:
+        backend (CacheBackend): Where entries are stored.
+        ttl (float | None): Default time-to-live in seconds.
+    """
+
+    _default: "ResponseCache | None" = None
+
+    def __init__(
+        self,
+        backend: CacheBackend | None = None,
+        ttl: float | None = None,
+    ) -> None:
+        """Initializes the cache.
+
+        Args:
+            backend (CacheBackend | None): Defaults to `MemoryCacheBackend`.
+            ttl (float | None): Default TTL; defaults to the `ttl` in
+                `Settings.API.CACHED_CONFIG`.
+        """
+        self.backend = backend if backend is not None else MemoryCacheBackend()
+        self.ttl = (
+            ttl if ttl is not None else Settings.API.CACHED_CONFIG.get("ttl")
+        )
+
+    @classmethod
+    def default(cls) -> "ResponseCache":
+        """ResponseCache: The process-wide cache used when none is given."""
+        if cls._default is None:
+            cls._default = cls()
+        return cls._default
+
+    @property
+    def metrics(self) -> CacheMetrics:
+        """CacheMetrics: Hit/miss counters of the backend."""
+        return self.backend.metrics
+
+    @staticmethod
+    def make_key(
+        scope: str, payload: dict, headers: dict | None = None
+    ) -> str:
+        """Builds the canonical cache key for a request.
+
+        Args:
+            scope (str): Identifies the endpoint (provider, URL, path).
+            payload (dict): The request body.
+            headers (dict | None): Request headers; auth headers are ignored.
+
+        Returns:
+            str: A hex SHA-256 digest.
+        """
+        headers = {
+            k.lower(): v
+            for k, v in (headers or {}).items()
+            if k.lower() not in AUTH_HEADERS
+        }
+        canonical = json.dumps(
+            {"scope": scope, "payload": payload, "headers": headers},
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str,
+        )
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    async def get(self, key: str) -> Any:
+        """Looks up `key`, recording a hit or miss.
+
+        Returns:
+            Any: The cached response, or `UNDEFINED` on a miss.
+        """
+        value = await self.backend.get(key)
+        if value is UNDEFINED:
+            self.metrics.misses += 1
+        else:
+            self.metrics.hits += 1
+        return value
+
+    async def set(self, key: str, value: Any, ttl: float | None = None):
+        """Stores `value` under `key` (`ttl` overrides the default).
+
+        Failures (e.g. an unpicklable response) are logged rather than
+        raised, since caching must never fail the call itself.
+        """
+        try:
+            await self.backend.set(
+                key, value, ttl if ttl is not None else self.ttl
+            )
+            self.metrics.sets += 1
+        except Exception as e:
+            logging.warning(f"Failed to cache response {key}: {e}")
+
+    async def delete(self, key: str) -> None:
+        await self.backend.delete(key)
+
+    async def clear(self) -> None:
+        await self.backend.clear()
+
+    async def close(self) -> None:
+        await self.backend.close()
@@ -0,0 +1,189 @@
+# Copyright (c) 2023 - 2024, HaiyangLi <quantocean.li at gmail dot com>
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator
+from typing import Any, TypeVar
+
+from .deadline import DeadlineExceeded, time_left
+
+__all__ = (
+    "ChunkAssembler",
+    "buffered",
+    "chunk_text",
+    "until_deadline",
+)
+
+T = TypeVar("T")
+
+
+def _get(obj: Any, key: str) -> Any:
+    if obj is None:
+        return None
+    if isinstance(obj, dict):
+        return obj.get(key)
+    return getattr(obj, key, None)
+
+
+def chunk_text(chunk: Any) -> str | None:
+    """Extracts the text delta carried by a streamed chunk.
+
+    Understands OpenAI-style chunks (`choices[0].delta.content`, as
+    objects or dicts) and Anthropic-style `content_block_delta` events
+    (`delta.text`).
+
+    Returns:
+        str | None: The new text, or None if the chunk carries none.
+    """
+    choices = _get(chunk, "choices")
+    if choices:
+        return _get(_get(choices[0], "delta"), "content") or None
+    return _get(_get(chunk, "delta"), "text") or None
+
+
+class ChunkAssembler:
+    """Folds streamed chat-completion chunks into one response.
+
+    Only the text deltas and a few scalar fields are kept, so memory does
+    not grow with the number of chunks. `to_response` returns a dict in
+    the non-streaming chat-completion shape, which `AssistantResponse`
+    and `APICalling.used_tokens` already understand.
+    """
+
+    __slots__ = (
+        "_parts",
+        "id",
+        "model",
+        "created",
+        "finish_reason",
+        "usage",
+        "chunks",
+    )
+
+    def __init__(self) -> None:
+        self._parts: list[str] = []
+        self.id = None
+        self.model = None
+        self.created = None
+        self.finish_reason = None
+        self.usage = None
+        self.chunks = 0
+
+    @property
+    def text(self) -> str:
+        """str: The text assembled so far."""
+        if len(self._parts) > 1:
+            self._parts = ["".join(self._parts)]
+        return self._parts[0] if self._parts else ""
+
+    def add(self, chunk: Any) -> str | None:
+        """Folds `chunk` into the response.
+
+        Returns:
+            str | None: The chunk's text delta, if any.
+        """
+        self.chunks += 1
+        for attr in ("id", "model", "created"):
+            if (value := _get(chunk, attr)) is not None:
+                setattr(self, attr, value)
+        if (usage := _get(chunk, "usage")) is not None:
+            self.usage = (
+                usage.model_dump() if hasattr(usage, "model_dump") else usage
+            )
+        choices = _get(chunk, "choices")
+        if choices and (reason := _get(choices[0], "finish_reason")):
+            self.finish_reason = reason
+        text = chunk_text(chunk)
+        if text:
+            self._parts.append(text)
+        return text
+
+    def to_response(self) -> dict:
+        """dict: The assembled response in chat-completion form."""
+        response = {
+            "id": self.id,
+            "object": "chat.completion",
+            "created": self.created,
+            "model": self.model,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": self.text},
+                    "finish_reason": self.finish_reason,
+                }
+            ],
+        }
+        if self.usage is not None:
+            response["usage"] = self.usage
+        return response
+
+
+async def buffered(source: AsyncIterator[T], maxsize: int) -> AsyncIterator[T]:
+    """Reads `source` ahead of the consumer into a bounded buffer.
+
+    A background task pulls up to `maxsize` items ahead; once the buffer
+    is full it waits for the consumer, so a slow consumer throttles the
+    network read instead of growing memory. Errors from `source` are
+    re-raised to the consumer, and closing the iterator early cancels the
+    reader.
+
+    Args:
+        source (AsyncIterator): The stream to read.
+        maxsize (int): Buffer capacity, at least 1.
+    """
+    queue: asyncio.Queue = asyncio.Queue(max(1, maxsize))
+    end = object()
+
+    async def _pump() -> None:
+        try:
+            async for item in source:
+                await queue.put((item, None))
+        except Exception as e:
+            await queue.put((end, e))
+        else:
+            await queue.put((end, None))
+
+    task = asyncio.create_task(_pump())
+    try:
+        while True:
+            item, error = await queue.get()
+            if error is not None:
+                raise error
+            if item is end:
+                return
+            yield item
+    finally:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+
+async def until_deadline(
+    source: AsyncIterator[T], deadline: float
+) -> AsyncIterator[T]:
+    """Yields from `source` until `deadline` (a `time.monotonic()` time).
+
+    Each read waits only for the time left, so a stalled stream is
+    cancelled once the deadline passes.
+
+    Raises:
+        DeadlineExceeded: If the deadline passes before the stream ends.
+    """
+    try:
+        while True:
+            try:
+                item = await asyncio.wait_for(
+                    anext(source), time_left(deadline)
+                )
+            except StopAsyncIteration:
+                return
+            except asyncio.TimeoutError:
+                raise DeadlineExceeded(
+                    "Deadline exceeded while streaming"
+                ) from None
+            yield item
+    finally:
+        if hasattr(source, "aclose"):
+            await source.aclose()
@@ -3,7 +3,9 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import base64
+from collections import OrderedDict
 from collections.abc import Callable
+from functools import lru_cache
 from io import BytesIO
 
 import tiktoken
@@ -80,11 +82,17 @@ def calculate_image_token_usage_from_base64(
     return token_cost
 
 
+@lru_cache(maxsize=256)
 def get_encoding_name(value: str) -> str:
+    """Resolves a model or encoding name to a tiktoken encoding name.
+
+    Memoized, since `encoding_for_model` raises (and is retried) for most
+    non-OpenAI model names.
+    """
     try:
         enc = tiktoken.encoding_for_model(value)
         return enc.name
-    except:
+    except Exception:
         try:
             tiktoken.get_encoding(value)
             return value
@@ -92,6 +100,45 @@ def get_encoding_name(value: str) -> str:
             return "o200k_base"
 
 
+@lru_cache(maxsize=32)
+def get_encoding(name: str) -> tiktoken.Encoding:
+    """Returns the (memoized) tiktoken encoder for a model or encoding."""
+    return tiktoken.get_encoding(get_encoding_name(name))
+
+
+class TokenCountCache:
+    """LRU cache of token counts keyed by (encoding name, text).
+
+    Conversation history is resent on every turn, so caching by content
+    means only new or edited messages are tokenized again.
+    """
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        self.maxsize = maxsize
+        self._data: OrderedDict[tuple[str, str], int] = OrderedDict()
+
+    def get(self, key: tuple[str, str]) -> int | None:
+        count = self._data.get(key)
+        if count is not None:
+            self._data.move_to_end(key)
+        return count
+
+    def set(self, key: tuple[str, str], count: int) -> None:
+        self._data[key] = count
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+token_count_cache = TokenCountCache()
+
+
 def get_image_pricing(model: str) -> dict:
     if "gpt-4o-mini" in model:
         return GPT4O_MINI_IMAGE_PRICING
@@ -109,27 +156,63 @@ class TokenCalculator:
     def calculate_message_tokens(messages: list[dict], /, **kwargs) -> int:
 
         model = kwargs.get("model", "gpt-4o")
-        tokenizer = tiktoken.get_encoding(get_encoding_name(model)).encode
+        encoding_name = get_encoding_name(model)
 
         num_tokens = 0
+        texts = []
         for msg in messages:
             num_tokens += 4
             _c = msg.get("content")
-            num_tokens += TokenCalculator._calculate_chatitem(
-                _c, tokenizer=tokenizer, model_name=model
+            num_tokens += TokenCalculator._collect_chatitem(
+                _c, texts=texts, model_name=model
             )
+        num_tokens += sum(TokenCalculator.count_batch(texts, encoding_name))
         return num_tokens  # buffer for chat
 
+    @staticmethod
+    def count_batch(texts: list[str], encoding_name: str) -> list[int]:
+        """Counts tokens for many strings, encoding only uncached ones.
+
+        Cache misses are encoded together with `encode_ordinary_batch`.
+
+        Args:
+            texts (list[str]): The strings to count.
+            encoding_name (str): A tiktoken encoding (or model) name.
+
+        Returns:
+            list[int]: Token counts in the same order as `texts`.
+        """
+        encoding_name = get_encoding_name(encoding_name)
+        counts: list[int | None] = []
+        missing: dict[str, list[int]] = {}
+        for idx, text in enumerate(texts):
+            count = token_count_cache.get((encoding_name, text))
+            if count is None:
+                missing.setdefault(text, []).append(idx)
+            counts.append(count)
+
+        if missing:
+            pending = list(missing)
+            try:
+                encoded = get_encoding(encoding_name).encode_ordinary_batch(
+                    pending
+                )
+            except Exception:
+                encoded = [[] for _ in pending]
+            for text, tokens in zip(pending, encoded):
+                token_count_cache.set((encoding_name, text), len(tokens))
+                for idx in missing[text]:
+                    counts[idx] = len(tokens)
+        return counts
+
     @staticmethod
     def calcualte_embed_token(inputs: list[str], /, **kwargs) -> int:
         try:
             if not "inputs" in kwargs:
                 raise ValueError("Missing 'inputs' field in payload")
 
-            tokenizer = tiktoken.get_encoding(
-                get_encoding_name(
-                    kwargs.get("model", "text-embedding-3-small")
-                )
+            tokenizer = get_encoding(
+                kwargs.get("model", "text-embedding-3-small")
             ).encode
 
             return sum(
@@ -152,8 +235,7 @@ class TokenCalculator:
             return 0
 
         if not callable(tokenizer):
-            encoding_name = get_encoding_name(encoding_name)
-            tokenizer = tiktoken.get_encoding(encoding_name).encode
+            tokenizer = get_encoding(encoding_name or "o200k_base").encode
         try:
             if return_tokens:
                 return tokenizer(s_)
@@ -162,16 +244,17 @@ class TokenCalculator:
             return 0
 
     @staticmethod
-    def _calculate_chatitem(i_, tokenizer: Callable, model_name: str) -> int:
+    def _collect_chatitem(i_, texts: list[str], model_name: str) -> int:
+        """Appends text parts to `texts`; returns the cost of other parts."""
         try:
             if isinstance(i_, str):
-                return TokenCalculator.tokenize(
-                    i_, encoding_name=model_name, tokenizer=tokenizer
-                )
+                texts.append(i_)
+                return 0
 
             if isinstance(i_, dict):
                 if "text" in i_:
-                    return TokenCalculator._calculate_chatitem(str(i_["text"]))
+                    texts.append(str(i_["text"]))
+                    return 0
                 elif "image_url" in i_:
                     a: str = i_["image_url"].get("url", "")
                     if "data:image/jpeg;base64," in a:
@@ -186,13 +269,12 @@ class TokenCalculator:
 
             if isinstance(i_, list):
                 return sum(
-                    TokenCalculator._calculate_chatitem(
-                        x, tokenizer, model_name
-                    )
+                    TokenCalculator._collect_chatitem(x, texts, model_name)
                     for x in i_
                 )
         except Exception:
-            return 0
+            pass
+        return 0
 
     @staticmethod
     def _calculate_embed_item(s_, tokenizer: Callable) -> int:
@@ -2,12 +2,29 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 
+import asyncio
+import contextlib
+import functools
+import hashlib
 import os
 import warnings
+from collections import deque
+from collections.abc import AsyncIterator
+from typing import Any
+
+from lionagi._errors import ItemNotFoundError
+from lionagi.protocols.types import EventStatus, Tracer
 
 from .endpoints.base import APICalling, EndPoint
+from .endpoints.batch import BatchBackend, BatchRunner, match_batch_backend
+from .endpoints.coalesce import RequestCoalescer
+from .endpoints.deadline import DeadlineExceeded, resolve_deadline, time_left
 from .endpoints.match_endpoint import match_endpoint
 from .endpoints.rate_limited_processor import RateLimitedAPIExecutor
+from .endpoints.response_cache import ResponseCache
+
+# latencies needed before `hedge_percentile` is trusted
+MIN_HEDGE_SAMPLES = 20
 
 warnings.filterwarnings(
     "ignore",
@@ -38,6 +55,24 @@ class iModel:
         executor (RateLimitedAPIExecutor):
             The rate-limited executor that queues and runs API calls in a
             controlled fashion.
+        cache (ResponseCache | None):
+            The response cache used for calls made with `is_cached=True`;
+            None uses the process-wide default cache.
+        coalesce_requests (bool):
+            Whether identical concurrent `invoke` calls made with the same
+            credentials share one request.
+        hedge_after (float | None):
+            Seconds after which a slow call is duplicated (hedged).
+        hedge_percentile (float | None):
+            Latency percentile of recent calls used as the hedge delay.
+        hedge_to (iModel | None):
+            The model hedges are sent to; None sends them to this model.
+        latencies (deque[float]):
+            Durations of recently completed calls.
+        hedges (int):
+            Hedge requests sent.
+        hedge_wins (int):
+            Calls answered by their hedge rather than the original.
     """
 
     def __init__(
@@ -52,7 +87,14 @@ class iModel:
         interval: float | None = None,
         limit_requests: int = None,
         limit_tokens: int = None,
+        num_workers: int | None = None,
+        max_finished_events: int | None = None,
         invoke_with_endpoint: bool = True,
+        cache: ResponseCache | None = None,
+        coalesce_requests: bool = False,
+        hedge_after: float | None = None,
+        hedge_percentile: float | None = None,
+        hedge_to: "iModel | None" = None,
         **kwargs,
     ) -> None:
         """Initializes the iModel instance.
@@ -83,9 +125,39 @@ class iModel:
                 Maximum number of requests allowed per cycle, if any.
             limit_tokens (int | None, optional):
                 Maximum number of tokens allowed per cycle, if any.
+            num_workers (int | None, optional):
+                If set, requests are consumed by this many long-lived
+                worker tasks as soon as the rate limits allow, instead of
+                being processed in batches.
+            max_finished_events (int | None, optional):
+                How many finished (e.g. failed) calls the executor keeps
+                for inspection; None keeps all of them.
             invoke_with_endpoint (bool, optional):
                 If True, the endpoint is actually invoked. If False,
                 calls might be mocked or cached.
+            cache (ResponseCache | None, optional):
+                Response cache for requests made with `is_cached=True`.
+                Defaults to the process-wide `ResponseCache.default()`.
+            coalesce_requests (bool, optional):
+                If True, an `invoke` whose payload is identical to one
+                already in flight (from any iModel using the same API key)
+                waits for that call and gets a copy of its result instead
+                of sending its own request. Off by default, since callers
+                repeating a sampled prompt usually want distinct answers;
+                `invoke(coalesce=...)` overrides it per call.
+            hedge_after (float | None, optional):
+                If set, a call still unanswered after this many seconds is
+                sent a second time and whichever copy answers first is
+                used; the other is cancelled. Hedges are queued like any
+                call, so they count against the rate limit, and are
+                skipped when the target has no budget left.
+            hedge_percentile (float | None, optional):
+                Hedge after this percentile (e.g. 95) of recent call
+                latencies instead, once enough calls have been seen;
+                `hedge_after` applies until then.
+            hedge_to (iModel | None, optional):
+                Send hedges to this model (e.g. another deployment)
+                instead of this one.
             **kwargs:
                 Additional keyword arguments, such as `model`, or any other
                 provider-specific fields.
@@ -131,8 +203,20 @@ class iModel:
             self.endpoint.config.provider = provider
         if base_url:
             self.endpoint.config.base_url = base_url
+        if self.endpoint.config.initial_concurrency is None:
+            # start as wide as the executor's queue, as before adaptive
+            # concurrency; throttling then shrinks the limit
+            self.endpoint.config.initial_concurrency = queue_capacity
 
         self.should_invoke_endpoint = invoke_with_endpoint
+        self.cache = cache
+        self.coalesce_requests = coalesce_requests
+        self.hedge_after = hedge_after
+        self.hedge_percentile = hedge_percentile
+        self.hedge_to = hedge_to
+        self.latencies: deque[float] = deque(maxlen=256)
+        self.hedges = 0
+        self.hedge_wins = 0
         self.kwargs = kwargs
         self.executor = RateLimitedAPIExecutor(
             queue_capacity=queue_capacity,
@@ -140,6 +224,8 @@ class iModel:
             interval=interval,
             limit_requests=limit_requests,
             limit_tokens=limit_tokens,
+            num_workers=num_workers,
+            max_finished_events=max_finished_events,
         )
 
     def create_api_calling(self, **kwargs) -> APICalling:
@@ -148,13 +234,15 @@ class iModel:
         Args:
             **kwargs:
                 Additional arguments used to generate the payload (merged
-                with self.kwargs).
+                with self.kwargs). `cache_ttl` sets a per-request cache
+                time-to-live.
 
         Returns:
             APICalling:
                 An `APICalling` instance with the constructed payload,
                 headers, and the selected endpoint.
         """
+        cache_ttl = kwargs.pop("cache_ttl", None)
         kwargs.update(self.kwargs)
         payload = self.endpoint.create_payload(**kwargs)
         return APICalling(
@@ -162,6 +250,8 @@ class iModel:
             headers=payload["headers"],
             endpoint=self.endpoint,
             is_cached=payload.get("is_cached", False),
+            cache=self.cache,
+            cache_ttl=cache_ttl,
             should_invoke_endpoint=self.should_invoke_endpoint,
         )
 
@@ -177,6 +267,47 @@ class iModel:
         """
         pass
 
+    async def iter_stream(
+        self,
+        api_call: APICalling | None = None,
+        /,
+        buffer_size: int | None = None,
+        **kwargs,
+    ) -> AsyncIterator[Any]:
+        """Streams an API call, yielding chunks as they arrive.
+
+        Nothing is printed or retained per chunk; the assembled response is
+        available as `api_call.response` once the iterator is exhausted.
+        Each chunk also goes through `process_chunk`.
+
+        Args:
+            api_call (APICalling | None, optional):
+                A call created with `create_api_calling(stream=True, ...)`,
+                for callers that need the record; built from `kwargs`
+                otherwise.
+            buffer_size (int | None, optional):
+                Maximum chunks read ahead of the consumer. None reads a
+                chunk only when the consumer asks for it.
+            **kwargs:
+                Arguments for the request, merged with self.kwargs.
+                `timeout` bounds the stream in seconds (within any
+                enclosing `deadline_scope`).
+
+        Yields:
+            The provider's stream chunks.
+
+        Raises:
+            DeadlineExceeded: If the stream outlives its deadline.
+        """
+        if api_call is None:
+            kwargs["stream"] = True
+            timeout = kwargs.pop("timeout", None)
+            api_call = self.create_api_calling(**kwargs)
+            api_call.deadline = resolve_deadline(timeout)
+        async for i in api_call.stream(buffer_size=buffer_size):
+            await self.process_chunk(i)
+            yield i
+
     async def stream(self, **kwargs) -> APICalling | None:
         """Performs a streaming API call with the given arguments.
 
@@ -191,10 +322,14 @@ class iModel:
         """
         try:
             kwargs["stream"] = True
+            timeout = kwargs.pop("timeout", None)
             api_call = self.create_api_calling(**kwargs)
-            async for i in api_call.stream():
-                await self.process_chunk(i)
+            api_call.deadline = resolve_deadline(timeout)
+            async for _ in self.iter_stream(api_call):
+                pass
             return api_call
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             raise ValueError(f"Failed to stream API call: {e}")
 
@@ -204,6 +339,11 @@ class iModel:
         Args:
             **kwargs:
                 Arguments for the request, merged with self.kwargs.
+                `coalesce` overrides `coalesce_requests` for this call;
+                `timeout` bounds it in seconds (within any enclosing
+                `deadline_scope`); `hedge=False` turns hedging off for
+                this call (hedging only applies when `hedge_after` or
+                `hedge_percentile` is set).
 
         Returns:
             APICalling | None:
@@ -211,24 +351,189 @@ class iModel:
                 completed; otherwise None.
 
         Raises:
+            DeadlineExceeded:
+                If the call did not finish before its deadline.
             ValueError:
                 If the call fails or if an error occurs during invocation.
         """
+        with Tracer.default().span(
+            "imodel.invoke",
+            provider=self.endpoint.config.provider,
+            model=kwargs.get("model", self.kwargs.get("model")),
+        ):
+            try:
+                kwargs.pop("stream", None)
+                coalesce = kwargs.pop("coalesce", self.coalesce_requests)
+                timeout = kwargs.pop("timeout", None)
+                hedge = kwargs.pop("hedge", None)
+                api_call = self.create_api_calling(**kwargs)
+                api_call.deadline = resolve_deadline(timeout)
+
+                invoke = self._invoke
+                if hedge is not False and self.hedge_delay() is not None:
+                    invoke = functools.partial(
+                        self._hedged_invoke, kwargs=kwargs
+                    )
+
+                if not coalesce:
+                    result = await invoke(api_call)
+                else:
+                    result = await RequestCoalescer.default().run(
+                        self.coalesce_key(api_call), api_call, invoke
+                    )
+                if result is None and api_call.deadline_exceeded:
+                    raise DeadlineExceeded(api_call.execution.error)
+                return result
+            except DeadlineExceeded:
+                raise
+            except Exception as e:
+                raise ValueError(f"Failed to invoke API call: {e}")
+
+    def coalesce_key(self, api_call: APICalling) -> str:
+        """Returns the key identical in-flight calls are coalesced on.
+
+        The endpoint's canonical request hash ignores auth headers, so it
+        is prefixed with a fingerprint of the API key: calls made with
+        different credentials never share a response.
+        """
+        key = self.endpoint.cache_key(api_call.payload, api_call.headers)
+        return f"{self._credential_fingerprint()}:{key}"
+
+    def _credential_fingerprint(self) -> str:
+        api_key = str(self.kwargs.get("api_key"))
+        return hashlib.sha256(api_key.encode()).hexdigest()[:16]
+
+    async def _invoke(self, api_call: APICalling) -> APICalling | None:
+        if (
+            self.executor.processor is None
+            or self.executor.processor.is_stopped()
+        ):
+            await self.executor.start()
+
+        await self.executor.append(api_call)
+        await self.executor.forward()
+        await self.executor.wait_for(api_call)
+        if api_call.id in self.executor.store.ids(EventStatus.COMPLETED):
+            self.latencies.append(api_call.execution.duration)
+            return self.executor.pop(api_call.id)
+
+    def hedge_delay(self) -> float | None:
+        """float | None: Seconds to wait before hedging; None disables it."""
+        if (
+            self.hedge_percentile is not None
+            and len(self.latencies) >= MIN_HEDGE_SAMPLES
+        ):
+            ordered = sorted(self.latencies)
+            idx = int(len(ordered) * self.hedge_percentile / 100)
+            return ordered[min(idx, len(ordered) - 1)]
+        return self.hedge_after
+
+    def _has_budget(self, required_tokens: int | None) -> bool:
+        processor = self.executor.processor
+        if processor is None or not hasattr(processor, "wait_time"):
+            return True
+        return processor.wait_time(required_tokens) == 0
+
+    async def _hedged_invoke(
+        self, api_call: APICalling, kwargs: dict
+    ) -> APICalling | None:
+        """Runs `api_call`, racing a duplicate against it if it is slow.
+
+        The loser is aborted and dropped from its executor, so the
+        request is held once, under `api_call`; the winner's outcome is
+        recorded there, which coalesced followers copy from.
+        """
+        primary = asyncio.ensure_future(self._invoke(api_call))
+        delay = self.hedge_delay()
+        remaining = time_left(api_call.deadline)
+        if remaining is not None and remaining <= delay:
+            return await primary
+
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        target = self.hedge_to or self
+        if done or not target._has_budget(api_call.required_tokens):
+            return await primary
+
+        backup_call = target.create_api_calling(**kwargs)
+        backup_call.deadline = api_call.deadline
+        backup = asyncio.ensure_future(target._invoke(backup_call))
+        self.hedges += 1
+        calls = {primary: api_call, backup: backup_call}
+
+        winner, pending = None, {primary, backup}
         try:
+            while pending and winner is None:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if winner is None and task.result() is not None:
+                        winner = task.result()
+        finally:
+            for task in pending:
+                calls[task].abort(
+                    "Cancelled: a hedged duplicate answered first"
+                )
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        loser, executor = backup_call, target.executor
+        if winner is backup_call:
+            self.hedge_wins += 1
+            api_call.execution = backup_call.execution
+            loser, executor = api_call, self.executor
+        with contextlib.suppress(ItemNotFoundError):
+            executor.pop(loser.id)
+        return winner
+
+    async def batch_invoke(
+        self,
+        requests: list[dict],
+        /,
+        poll_interval: float = 30,
+        timeout: float | None = None,
+        backend: BatchBackend | None = None,
+    ) -> list[APICalling]:
+        """Runs many requests through the provider's batch API.
+
+        Each request is built exactly like an `invoke` call, but instead of
+        going through the rate-limited executor the payloads are submitted
+        as one batch job (split if it exceeds the provider's size limit),
+        polled until finished and mapped back to their calls. Suited to
+        large offline jobs where latency matters less than throughput.
+
+        Args:
+            requests (list[dict]):
+                Keyword arguments for each request, merged with
+                self.kwargs (e.g. `{"messages": [...]}`).
+            poll_interval (float, optional):
+                Seconds between status checks.
+            timeout (float | None, optional):
+                Seconds to wait before failing unfinished calls.
+            backend (BatchBackend | None, optional):
+                Batch API client; chosen from the provider by default.
+
+        Returns:
+            list[APICalling]:
+                One call per request, in order, each COMPLETED with its
+                response or FAILED with the provider's error.
+
+        Raises:
+            ValueError: If the provider has no supported batch API.
+        """
+        api_calls = []
+        for kwargs in requests:
+            kwargs = dict(kwargs)
             kwargs.pop("stream", None)
-            api_call = self.create_api_calling(**kwargs)
-            if (
-                self.executor.processor is None
-                or self.executor.processor.is_stopped()
-            ):
-                await self.executor.start()
-
-            await self.executor.append(api_call)
-            await self.executor.forward()
-            if api_call.id in self.executor.completed_events:
-                return self.executor.pile.pop(api_call.id)
-        except Exception as e:
-            raise ValueError(f"Failed to invoke API call: {e}")
+            api_calls.append(self.create_api_calling(**kwargs))
+        if not api_calls:
+            return []
+        if backend is None:
+            backend = match_batch_backend(self.endpoint, api_calls[0].headers)
+        runner = BatchRunner(
+            backend, poll_interval=poll_interval, timeout=timeout
+        )
+        return await runner.run(api_calls)
 
     @property
     def allowed_roles(self) -> set[str]:
@@ -266,11 +571,19 @@ class iModel:
             ),
             "processor_config": self.executor.config,
             "invoke_with_endpoint": self.should_invoke_endpoint,
+            "coalesce_requests": self.coalesce_requests,
+            "hedge_after": self.hedge_after,
+            "hedge_percentile": self.hedge_percentile,
             **{k: v for k, v in kwargs.items() if k != "api_key"},
         }
 
     @classmethod
     def from_dict(cls, data: dict):
+        if "pool" in data:
+            from .pool import iModelPool
+
+            return iModelPool.from_dict(data)
+
         provider = data.pop("provider", None)
         base_url = data.pop("base_url", None)
         api_key = data.pop("api_key", None)
@@ -7,6 +7,7 @@ from lionagi.utils import is_same_dtype
 from ..protocols._concepts import Manager
 from .endpoints.chat_completion import ChatCompletionEndPoint
 from .imodel import iModel
+from .pool import iModelPool
 
 
 class iModelManager(Manager):
@@ -33,13 +34,21 @@ class iModelManager(Manager):
     def parse(self) -> iModel | None:
         return self.registry.get("parse", None)
 
-    def register_imodel(self, name: str, model: iModel):
+    def register_imodel(self, name: str, model: iModel | list[iModel]):
+        """Registers a model under `name`.
+
+        A list of models serving the same model (e.g. one per API key or
+        deployment) is registered as a single `iModelPool` that balances
+        calls across them.
+        """
+        if isinstance(model, list | tuple):
+            model = iModelPool(*model)
+        if not isinstance(model, iModel):
+            raise TypeError("Input model is not an instance of iModel")
         if isinstance(model.endpoint, ChatCompletionEndPoint):
             if name != "parse":
                 self.registry["chat"] = model
             else:
                 self.registry["parse"] = model
-        elif isinstance(model, iModel):
-            self.registry[name] = model
         else:
-            raise TypeError("Input model is not an instance of iModel")
+            self.registry[name] = model
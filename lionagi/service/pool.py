@@ -0,0 +1,319 @@
+# Copyright (c) 2023 - 2024, HaiyangLi <quantocean.li at gmail dot com>
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import random
+import time
+from collections.abc import AsyncIterator
+from typing import Any, Literal
+
+from .endpoints.base import APICalling
+from .endpoints.coalesce import RequestCoalescer
+from .endpoints.deadline import DeadlineExceeded, resolve_deadline
+from .imodel import iModel
+
+__all__ = ("iModelPool",)
+
+RoutingStrategy = Literal["least_loaded", "weighted"]
+
+
+class iModelPool(iModel):
+    """Spreads calls for one model across several keys or deployments.
+
+    Each member is an ordinary `iModel` with its own endpoint, API key and
+    rate-limited executor; the pool routes every call to one of them and
+    behaves like an `iModel` otherwise, so it can be registered as a
+    branch's chat model. Aggregate throughput is the sum of the members'
+    limits.
+
+    Routing uses each member's remaining request/token budget (the
+    fraction left in its buckets), its configured weight and the calls it
+    currently has in flight. With `"least_loaded"` the member with the
+    most headroom per in-flight call is chosen; with `"weighted"` a member
+    is drawn at random in proportion to weight times headroom. A member
+    whose call is throttled (a `RateLimitError` or HTTP 429) is benched
+    for `cooldown` seconds and the call moves to the next member at once,
+    rather than after the member's own retries; only the last member left
+    retries throttles itself. Members paused by their provider's
+    `Retry-After` are skipped too.
+
+    Attributes:
+        members (list[iModel]): The pooled models.
+        weights (list[float]): Relative share of traffic per member.
+        strategy (str): `"least_loaded"` or `"weighted"`.
+        cooldown (float): Seconds a throttled member is skipped.
+        failovers (int): Calls retried on another member.
+    """
+
+    def __init__(
+        self,
+        *members: iModel,
+        weights: list[float] | None = None,
+        strategy: RoutingStrategy = "least_loaded",
+        cooldown: float = 5,
+        coalesce_requests: bool = False,
+    ) -> None:
+        """Initializes the pool.
+
+        Args:
+            *members (iModel): Models serving the same model, e.g. one per
+                API key, deployment or base URL.
+            weights (list[float] | None): One positive weight per member;
+                equal weights by default.
+            strategy (str): `"least_loaded"` or `"weighted"`.
+            cooldown (float): Seconds to skip a member after it reports a
+                rate-limit error.
+            coalesce_requests (bool): Whether identical concurrent
+                `invoke` calls to the pool share one request.
+
+        Raises:
+            ValueError: If no members are given or the weights do not
+                match them.
+        """
+        if not members:
+            raise ValueError("iModelPool requires at least one iModel.")
+        if not all(isinstance(m, iModel) for m in members):
+            raise TypeError("Pool members must be instances of iModel")
+        if weights is None:
+            weights = [1.0] * len(members)
+        if len(weights) != len(members) or any(w <= 0 for w in weights):
+            raise ValueError("Provide one positive weight per pool member.")
+        if strategy not in ("least_loaded", "weighted"):
+            raise ValueError(f"Unknown routing strategy {strategy!r}.")
+
+        # the first member stands in for the pool wherever a single
+        # endpoint is expected (allowed roles, chat payloads, ...);
+        # failover takes the place of hedging within a pool
+        primary = members[0]
+        super().__init__(
+            provider=primary.endpoint.config.provider,
+            endpoint=primary.endpoint,
+            invoke_with_endpoint=primary.should_invoke_endpoint,
+            cache=primary.cache,
+            coalesce_requests=coalesce_requests,
+            **primary.kwargs,
+        )
+        self.executor = primary.executor
+
+        self.members = list(members)
+        self.weights = [float(w) for w in weights]
+        self.strategy = strategy
+        self.cooldown = cooldown
+        self.failovers = 0
+        self._inflight = [0] * len(members)
+        self._benched_until = [0.0] * len(members)
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+    @staticmethod
+    def headroom(model: iModel) -> float:
+        """float: Fraction (0-1) of the model's rate budget still free."""
+        processor = model.executor.processor
+        if processor is None:
+            return 1.0
+        fractions = [1.0]
+        if processor.request_bucket is not None:
+            fractions.append(
+                processor.available_request / processor.limit_requests
+            )
+        if processor.token_bucket is not None:
+            fractions.append(
+                processor.available_token / processor.limit_tokens
+            )
+        return max(0.0, min(fractions))
+
+    def _candidates(self) -> list[int]:
+        now = time.monotonic()
+        ready = [
+            i
+            for i, t in enumerate(self._benched_until)
+            if t <= now and self.members[i].endpoint.flow.resume_at <= now
+        ]
+        if ready:
+            return ready
+        # everyone is benched: use whoever recovers first
+        return [min(range(len(self)), key=self._benched_until.__getitem__)]
+
+    def select(self, exclude: set[int] = frozenset()) -> int:
+        """Picks the member for the next call.
+
+        Args:
+            exclude (set[int]): Indices already tried for this call.
+
+        Returns:
+            int: Index into `members`.
+        """
+        indices = [i for i in self._candidates() if i not in exclude]
+        if not indices:
+            indices = [i for i in range(len(self)) if i not in exclude]
+        if len(indices) == 1:
+            return indices[0]
+
+        headroom = {i: self.headroom(self.members[i]) for i in indices}
+        if self.strategy == "weighted":
+            shares = [self.weights[i] * headroom[i] for i in indices]
+            if not any(shares):
+                shares = [self.weights[i] for i in indices]
+            return random.choices(indices, weights=shares)[0]
+
+        return max(
+            indices,
+            key=lambda i: (
+                self.weights[i] * headroom[i] / (1 + self._inflight[i]),
+                -self._inflight[i],
+            ),
+        )
+
+    def bench(self, index: int) -> None:
+        """Skips member `index` for `cooldown` seconds."""
+        self._benched_until[index] = time.monotonic() + self.cooldown
+
+    async def invoke(self, **kwargs) -> APICalling | None:
+        """Invokes the call on the best member, failing over when throttled.
+
+        Args:
+            **kwargs:
+                Arguments for the request, merged with the chosen member's
+                kwargs. `coalesce` overrides `coalesce_requests`;
+                `timeout` bounds the call, failovers included.
+
+        Returns:
+            APICalling | None:
+                The completed call, or None if it failed.
+
+        Raises:
+            DeadlineExceeded:
+                If the call did not finish before its deadline.
+            ValueError:
+                If an error occurs during invocation.
+        """
+        try:
+            kwargs.pop("stream", None)
+            kwargs.pop("hedge", None)
+            coalesce = kwargs.pop("coalesce", self.coalesce_requests)
+            deadline = resolve_deadline(kwargs.pop("timeout", None))
+            index = self.select()
+            api_call = self.members[index].create_api_calling(**dict(kwargs))
+            api_call.deadline = deadline
+
+            async def route(api_call: APICalling) -> APICalling | None:
+                return await self._route(index, api_call, kwargs)
+
+            if not coalesce:
+                result = await route(api_call)
+            else:
+                result = await RequestCoalescer.default().run(
+                    self.coalesce_key(api_call), api_call, route
+                )
+            if result is None and api_call.deadline_exceeded:
+                raise DeadlineExceeded(api_call.execution.error)
+            return result
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            raise ValueError(f"Failed to invoke API call: {e}")
+
+    async def _route(
+        self, index: int, api_call: APICalling, kwargs: dict
+    ) -> APICalling | None:
+        tried = set()
+        call = api_call
+        while True:
+            tried.add(index)
+            # hand a throttled call to the next member instead of
+            # backing off, unless this is the last one to try
+            call.retry_throttled = len(tried) == len(self)
+            self._inflight[index] += 1
+            try:
+                result = await self.members[index]._invoke(call)
+            finally:
+                self._inflight[index] -= 1
+            if result is not None or not call.throttled:
+                break
+            self.bench(index)
+            if len(tried) == len(self):
+                break
+            self.failovers += 1
+            index = self.select(exclude=tried)
+            call = self.members[index].create_api_calling(**dict(kwargs))
+            call.deadline = api_call.deadline
+
+        if call is not api_call:
+            # coalesced followers copy the outcome from the first record
+            api_call.execution = call.execution
+            api_call._deadline_exceeded = call.deadline_exceeded
+            api_call._error_kind = call._error_kind
+        return result
+
+    def _credential_fingerprint(self) -> str:
+        # a pooled call may be served with any member's key
+        return ",".join(m._credential_fingerprint() for m in self.members)
+
+    def create_api_calling(self, **kwargs) -> APICalling:
+        """Builds the call on the member that would serve it next."""
+        return self.members[self.select()].create_api_calling(**kwargs)
+
+    async def iter_stream(
+        self,
+        api_call: APICalling | None = None,
+        /,
+        buffer_size: int | None = None,
+        **kwargs,
+    ) -> AsyncIterator[Any]:
+        """Streams from the best member, failing over before the first
+        chunk if the member is throttled."""
+        if api_call is not None:
+            async for i in super().iter_stream(
+                api_call, buffer_size=buffer_size
+            ):
+                yield i
+            return
+
+        kwargs["stream"] = True
+        deadline = resolve_deadline(kwargs.pop("timeout", None))
+        tried = set()
+        while True:
+            index = self.select(exclude=tried)
+            tried.add(index)
+            member = self.members[index]
+            api_call = member.create_api_calling(**dict(kwargs))
+            api_call.deadline = deadline
+            started = False
+            self._inflight[index] += 1
+            try:
+                async for i in member.iter_stream(
+                    api_call, buffer_size=buffer_size
+                ):
+                    started = True
+                    yield i
+                return
+            except Exception:
+                if started or not api_call.throttled:
+                    raise
+                self.bench(index)
+                if len(tried) == len(self):
+                    raise
+                self.failovers += 1
+            finally:
+                self._inflight[index] -= 1
+
+    async def batch_invoke(self, requests: list[dict], /, **kwargs):
+        """Runs the batch on the member with the most headroom."""
+        member = self.members[self.select()]
+        return await member.batch_invoke(requests, **kwargs)
+
+    def to_dict(self):
+        return {
+            "pool": [m.to_dict() for m in self.members],
+            "weights": self.weights,
+            "strategy": self.strategy,
+            "cooldown": self.cooldown,
+            "coalesce_requests": self.coalesce_requests,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        data = dict(data)
+        members = [iModel.from_dict(m) for m in data.pop("pool")]
+        return cls(*members, **data)
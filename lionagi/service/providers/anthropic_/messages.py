@@ -3,6 +3,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from lionagi.service.endpoints.chat_completion import ChatCompletionEndPoint
+from lionagi.service.endpoints.prompt_cache import mark_anthropic_cache
 
 CHAT_COMPLETION_CONFIG = {
     "provider": "anthropic",
@@ -31,6 +32,8 @@ CHAT_COMPLETION_CONFIG = {
         "top_k",
     },
     "allowed_roles": ["user", "assistant"],
+    "prompt_caching": True,
+    "cache_reads_count_toward_limit": False,
 }
 
 
@@ -44,7 +47,7 @@ class AnthropicChatCompletionEndPoint(ChatCompletionEndPoint):
 
     def create_payload(self, **kwargs) -> dict:
         payload = {}
-        cached = kwargs.get("cached", False)
+        is_cached = kwargs.get("is_cached", False)
         headers = kwargs.get("headers", {})
         for k, v in kwargs.items():
             if k in self.acceptable_kwargs:
@@ -56,9 +59,11 @@ class AnthropicChatCompletionEndPoint(ChatCompletionEndPoint):
         )
         if "content-type" not in kwargs:
             headers["content-type"] = "application/json"
+        if kwargs.get("prompt_caching", self.config.prompt_caching):
+            mark_anthropic_cache(payload, self.config.prompt_cache_min_tokens)
 
         return {
             "payload": payload,
             "headers": headers,
-            "cached": cached,
+            "is_cached": is_cached,
         }
@@ -3,6 +3,10 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from lionagi.service.endpoints.chat_completion import ChatCompletionEndPoint
+from lionagi.service.endpoints.prompt_cache import (
+    is_openai_api,
+    stabilize_openai_prefix,
+)
 
 CHAT_COMPLETION_CONFIG = {
     "provider": "openai",
@@ -47,9 +51,11 @@ CHAT_COMPLETION_CONFIG = {
         "tools",
         "tool_choice",
         "parallel_tool_calls",
+        "prompt_cache_key",
         "user",
     },
     "allowed_roles": ["user", "assistant", "system"],
+    "prompt_caching": True,
 }
 
 
@@ -60,3 +66,14 @@ class OpenAIChatCompletionEndPoint(ChatCompletionEndPoint):
 
     def __init__(self, config: dict = CHAT_COMPLETION_CONFIG):
         super().__init__(config)
+
+    def create_payload(self, **kwargs) -> dict:
+        payload = super().create_payload(**kwargs)
+        if kwargs.get("prompt_caching", self.config.prompt_caching):
+            # compatible servers reached through a custom base_url may
+            # reject the OpenAI-only `prompt_cache_key`
+            stabilize_openai_prefix(
+                payload["payload"],
+                add_cache_key=is_openai_api(self.config.base_url),
+            )
+        return payload
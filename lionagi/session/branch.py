@@ -2,7 +2,10 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 
+import contextlib
 import logging
+from collections.abc import AsyncIterator
+from pathlib import Path
 from typing import Any, Literal
 
 import pandas as pd
@@ -30,6 +33,7 @@ from lionagi.protocols.types import (
     ActionResponse,
     AssistantResponse,
     Communicatable,
+    DiskStore,
     Element,
     IDType,
     Instruction,
@@ -49,8 +53,14 @@ from lionagi.protocols.types import (
     RoledMessage,
     SenderRecipient,
     System,
+    Tracer,
 )
 from lionagi.service import iModel, iModelManager
+from lionagi.service.endpoints.deadline import (
+    resolve_deadline,
+    with_deadline,
+)
+from lionagi.service.endpoints.streaming import chunk_text
 from lionagi.settings import Settings
 from lionagi.utils import (
     UNDEFINED,
@@ -271,6 +281,7 @@ class Branch(Element, Communicatable, Relational):
         async with self.msgs.messages:
             return self.clone(sender)
 
+    @with_deadline
     async def operate(
         self,
         *,
@@ -352,6 +363,10 @@ class Branch(Element, Communicatable, Relational):
                 Settings for fuzzy validation if used.
             operative_kwargs (dict, optional):
                 Additional arguments for creating an Operative if none is given.
+            timeout (float, optional):
+                Deadline in seconds for the whole operation. Every model
+                call it makes (chat, parse retries) is bounded by what is
+                left of it, and `DeadlineExceeded` is raised once it passes.
             **kwargs: Additional arguments passed to the model invocation.
 
         Returns:
@@ -535,37 +550,50 @@ class Branch(Element, Communicatable, Relational):
             max_retries = operative.max_retries
             request_type = operative.request_type
 
-        while (
-            _should_try
-            and num_try < max_retries
-            and not isinstance(response_model, BaseModel)
-        ):
-            num_try += 1
-            _, res = await self.invoke_chat(
-                instruction="reformat text into specified model",
-                guidane="follow the required response format, using the model schema as a guide",
-                context=[{"text_to_format": text}],
-                response_format=request_type,
-                sender=self.user,
-                recipient=self.id,
-                imodel=self.parse_model,
-            )
-            if operative is not None:
-                response_model = operative.update_response_model(res.response)
-            else:
-                response_model = fuzzy_validate_mapping(
-                    res.response,
-                    breakdown_pydantic_annotation(request_type),
-                    similarity_algo=similarity_algo,
-                    similarity_threshold=similarity_threshold,
-                    fuzzy_match=fuzzy_match,
-                    handle_unmatched=handle_unmatched,
-                    fill_value=fill_value,
-                    fill_mapping=fill_mapping,
-                    strict=strict,
-                    suppress_conversion_errors=suppress_conversion_errors,
+        with Tracer.default().span(
+            "branch.parse",
+            **{"branch.id": str(self.id)},
+            request_type=getattr(request_type, "__name__", None),
+        ) as span:
+            while (
+                _should_try
+                and num_try < max_retries
+                and not isinstance(response_model, BaseModel)
+            ):
+                num_try += 1
+                _, res = await self.invoke_chat(
+                    instruction="reformat text into specified model",
+                    guidane="follow the required response format, using the model schema as a guide",
+                    context=[{"text_to_format": text}],
+                    response_format=request_type,
+                    sender=self.user,
+                    recipient=self.id,
+                    imodel=self.parse_model,
                 )
-                response_model = request_type.model_validate(response_model)
+                if operative is not None:
+                    response_model = operative.update_response_model(
+                        res.response
+                    )
+                else:
+                    response_model = fuzzy_validate_mapping(
+                        res.response,
+                        breakdown_pydantic_annotation(request_type),
+                        similarity_algo=similarity_algo,
+                        similarity_threshold=similarity_threshold,
+                        fuzzy_match=fuzzy_match,
+                        handle_unmatched=handle_unmatched,
+                        fill_value=fill_value,
+                        fill_mapping=fill_mapping,
+                        strict=strict,
+                        suppress_conversion_errors=suppress_conversion_errors,
+                    )
+                    response_model = request_type.model_validate(
+                        response_model
+                    )
+            span.set_attributes(
+                attempts=num_try,
+                success=isinstance(response_model, BaseModel),
+            )
 
         if not isinstance(response_model, BaseModel):
             match handle_validation:
@@ -580,6 +608,7 @@ class Branch(Element, Communicatable, Relational):
 
         return response_model
 
+    @with_deadline
     async def communicate(
         self,
         instruction: Instruction | JsonValue = None,
@@ -645,6 +674,9 @@ class Branch(Element, Communicatable, Relational):
                 Settings passed to the fuzzy validation function.
             clear_messages (bool, optional):
                 If True, clears previously stored messages.
+            timeout (float, optional):
+                Deadline in seconds for the whole exchange, parse retries
+                included; `DeadlineExceeded` is raised once it passes.
             **kwargs:
                 Additional arguments for the LLM call.
 
@@ -721,6 +753,124 @@ class Branch(Element, Communicatable, Relational):
 
         return res.response
 
+    async def communicate_stream(
+        self,
+        instruction: Instruction | JsonValue = None,
+        guidance: JsonValue = None,
+        context: JsonValue = None,
+        sender: SenderRecipient = None,
+        recipient: SenderRecipient = None,
+        progression: ID.IDSeq = None,
+        imodel: iModel = None,  # alias of chat_model
+        chat_model: iModel = None,
+        images: list = None,
+        image_detail: Literal["low", "high", "auto"] = None,
+        buffer_size: int | None = None,
+        clear_messages: bool = False,
+        operative: Operative = None,
+        **kwargs,
+    ) -> AsyncIterator[str]:
+        """Streaming form of `communicate`, yielding text as it arrives.
+
+        The reply is assembled while streaming; once the iterator is
+        exhausted the instruction and the complete `AssistantResponse`
+        are added to the conversation, as `communicate` would.
+
+        With an `operative`, its `request_type` is requested as the
+        response format and every delta is fed to `Operative.feed`, so
+        fields are validated as soon as they complete (see
+        `operative.partial_response`). A malformed reply or an invalid
+        field stops the stream at once, and a reply cut off before its
+        JSON closed is not accepted; in both cases `ValueError` is raised
+        and nothing is added to the conversation. Otherwise the validated
+        result is in `operative.response_model` once the iterator ends.
+
+        Args:
+            instruction (Instruction | JsonValue, optional):
+                The main user query or context.
+            guidance (JsonValue, optional):
+                Additional LLM instructions.
+            context (JsonValue, optional):
+                Context data to pass to the LLM.
+            sender (SenderRecipient, optional):
+                The sender of this message.
+            recipient (SenderRecipient, optional):
+                The recipient of this message.
+            progression (ID.IDSeq, optional):
+                A custom progression of conversation messages.
+            imodel (iModel, optional):
+                Deprecated, alias for chat_model.
+            chat_model (iModel, optional):
+                Model used for the conversation.
+            images (list, optional):
+                Additional images if relevant to the LLM context.
+            image_detail (Literal["low","high","auto"], optional):
+                Level of image detail if used.
+            buffer_size (int | None, optional):
+                Maximum chunks read ahead of the consumer; None reads a
+                chunk only when the next one is requested.
+            clear_messages (bool, optional):
+                If True, clears previously stored messages.
+            operative (Operative, optional):
+                Parses and validates the reply while it streams.
+            timeout (float, optional):
+                Deadline in seconds for the whole stream (within any
+                enclosing `deadline_scope`); `DeadlineExceeded` is raised
+                once it passes, and nothing is added to the conversation.
+            **kwargs:
+                Additional arguments for the LLM call.
+
+        Yields:
+            str: Text deltas of the assistant's reply.
+
+        Raises:
+            ValueError: If the `operative` rejects the reply.
+        """
+        imodel = imodel or chat_model or self.chat_model
+        if clear_messages:
+            self.msgs.clear_messages()
+
+        ins: Instruction = self.msgs.create_instruction(
+            instruction=instruction,
+            guidance=guidance,
+            context=context,
+            sender=sender or self.user or "user",
+            recipient=recipient or self.id,
+            images=images,
+            image_detail=image_detail,
+            response_format=operative.request_type if operative else None,
+        )
+        kwargs["messages"] = self._chat_messages(ins, imodel, progression)
+        kwargs["stream"] = True
+        timeout = kwargs.pop("timeout", None)
+        api_call = imodel.create_api_calling(**kwargs)
+        api_call.deadline = resolve_deadline(timeout)
+
+        # closing the stream on the way out ends the request at once,
+        # e.g. when the operative rejects the reply part way through
+        async with contextlib.aclosing(
+            imodel.iter_stream(api_call, buffer_size=buffer_size)
+        ) as chunks:
+            async for chunk in chunks:
+                if text := chunk_text(chunk):
+                    if operative is not None:
+                        operative.feed(text)
+                    yield text
+
+        if operative is not None:
+            operative.finish_stream()
+            if operative.truncated:
+                raise ValueError("Reply was truncated before it completed.")
+
+        self._log_manager.log(Log.create(api_call))
+        res = AssistantResponse.create(
+            assistant_response=api_call.response,
+            sender=self.id,
+            recipient=self.user,
+        )
+        self.msgs.add_message(instruction=ins)
+        self.msgs.add_message(assistant_response=res)
+
     async def invoke_action(
         self,
         action_request: list | ActionRequest | BaseModel | dict,
@@ -873,127 +1023,98 @@ class Branch(Element, Communicatable, Relational):
                 The instruction object (with context) and the final
                 AssistantResponse from the model call.
         """
-        ins: Instruction = self.msgs.create_instruction(
-            instruction=instruction,
-            guidance=guidance,
-            context=context,
-            sender=sender or self.user or "user",
-            recipient=recipient or self.id,
-            response_format=response_format,
-            request_fields=request_fields,
-            images=images,
-            image_detail=image_detail,
-            tool_schemas=tool_schemas,
-        )
-
-        progression = progression or self.msgs.progression
-        messages: list[RoledMessage] = [
-            self.msgs.messages[i] for i in progression
-        ]
-
-        use_ins = None
-        _to_use = []
-        _action_responses: set[ActionResponse] = set()
-
-        for i in messages:
-            if isinstance(i, ActionResponse):
-                _action_responses.add(i)
-            if isinstance(i, AssistantResponse):
-                j = AssistantResponse(
-                    role=i.role,
-                    content=copy(i.content),
-                    sender=i.sender,
-                    recipient=i.recipient,
-                    template=i.template,
+        tracer = Tracer.default()
+        imodel = imodel or self.chat_model
+        with tracer.span(
+            "branch.invoke_chat",
+            **{"branch.id": str(self.id)},
+            model=kwargs.get("model", imodel.kwargs.get("model")),
+        ) as span:
+            with tracer.span("branch.build_messages") as build:
+                ins: Instruction = self.msgs.create_instruction(
+                    instruction=instruction,
+                    guidance=guidance,
+                    context=context,
+                    sender=sender or self.user or "user",
+                    recipient=recipient or self.id,
+                    response_format=response_format,
+                    request_fields=request_fields,
+                    images=images,
+                    image_detail=image_detail,
+                    tool_schemas=tool_schemas,
                 )
-                _to_use.append(j)
-            if isinstance(i, Instruction):
-                j = Instruction(
-                    role=i.role,
-                    content=copy(i.content),
-                    sender=i.sender,
-                    recipient=i.recipient,
-                    template=i.template,
+                kwargs["messages"] = self._chat_messages(
+                    ins, imodel, progression
                 )
-                j.tool_schemas = None
-                j.respond_schema_info = None
-                j.request_response_format = None
-
-                if _action_responses:
-                    d_ = [k.content for k in _action_responses]
-                    for z in d_:
-                        if z not in j.context:
-                            j.context.append(z)
-
-                    _to_use.append(j)
-                    _action_responses = set()
-                else:
-                    _to_use.append(j)
+                build.set_attribute("messages", len(kwargs["messages"]))
+
+            api_call = await imodel.invoke(**kwargs)
+            self._log_manager.log(Log.create(api_call))
+            span.set_attributes(
+                required_tokens=api_call.required_tokens,
+                used_tokens=api_call.used_tokens,
+            )
+
+            res = AssistantResponse.create(
+                assistant_response=api_call.response,
+                sender=self.id,
+                recipient=self.user,
+            )
 
-        messages = _to_use
-        if _action_responses:
+        return ins, res
+
+    def _chat_messages(
+        self,
+        ins: Instruction,
+        imodel: iModel,
+        progression: Progression | None = None,
+    ) -> list[dict]:
+        """Builds the chat payload: rendered history plus `ins`."""
+        history = self.msgs.rendered_history(
+            progression or self.msgs.progression
+        )
+
+        use_ins = None
+        if history.pending:
             j = ins.model_copy()
-            d_ = [k.content for k in _action_responses]
+            d_ = [k.content for k in history.pending.values()]
             for z in d_:
                 if z not in j.context:
                     j.context.append(z)
             use_ins = j
 
-        if messages and len(messages) > 1:
-            _msgs = [messages[0]]
-
-            for i in messages[1:]:
-                if isinstance(i, AssistantResponse):
-                    if isinstance(_msgs[-1], AssistantResponse):
-                        _msgs[-1].response = (
-                            f"{_msgs[-1].response}\n\n{i.response}"
-                        )
-                    else:
-                        _msgs.append(i)
-                else:
-                    if isinstance(_msgs[-1], AssistantResponse):
-                        _msgs.append(i)
-            messages = _msgs
+        chat_msgs = [{**i} for i in history.chat_msgs]
 
         if self.msgs.system and imodel.sequential_exchange:
-            messages = [msg for msg in messages if msg.role != "system"]
-            first_instruction = None
-
-            if len(messages) == 0:
+            if not history.entries:
                 first_instruction = ins.model_copy()
                 first_instruction.guidance = self.msgs.system.rendered + (
                     first_instruction.guidance or ""
                 )
-                messages.append(first_instruction)
-            elif len(messages) >= 1:
-                first_instruction = messages[0]
+                chat_msgs = [first_instruction.chat_msg]
+            else:
+                first_instruction = history.entries[0]
                 if not isinstance(first_instruction, Instruction):
                     raise ValueError(
                         "First message in progression must be an Instruction or System"
                     )
-                first_instruction = first_instruction.model_copy()
+                first_instruction = Instruction(
+                    role=first_instruction.role,
+                    content=copy(first_instruction.content),
+                    sender=first_instruction.sender,
+                    recipient=first_instruction.recipient,
+                    template=first_instruction.template,
+                )
                 first_instruction.guidance = self.msgs.system.rendered + (
                     first_instruction.guidance or ""
                 )
-                messages[0] = first_instruction
-                messages.append(use_ins or ins)
+                chat_msgs[0] = first_instruction.chat_msg
+                chat_msgs.append((use_ins or ins).chat_msg)
 
         else:
-            messages.append(use_ins or ins)
-
-        kwargs["messages"] = [i.chat_msg for i in messages]
-        imodel = imodel or self.chat_model
+            chat_msgs.append((use_ins or ins).chat_msg)
 
-        api_call = await imodel.invoke(**kwargs)
-        self._log_manager.log(Log.create(api_call))
-
-        res = AssistantResponse.create(
-            assistant_response=api_call.response,
-            sender=self.id,
-            recipient=self.user,
-        )
-
-        return ins, res
+        return chat_msgs
 
     def clone(self, sender: ID.Ref = None) -> "Branch":
         """Clones this Branch, creating a new instance with the same data.
@@ -1029,6 +1150,11 @@ class Branch(Element, Communicatable, Relational):
         for message in branch_clone.msgs.messages:
             message.sender = sender or self.id
             message.recipient = branch_clone.id
+        store = self.msgs.messages.collections
+        if isinstance(store, DiskStore):
+            branch_clone.msgs.messages.spill(
+                hot_size=store.hot_size, segment_size=store.segment_size
+            )
         return branch_clone
 
     def to_df(self, *, progression: Progression = None) -> pd.DataFrame:
@@ -1211,12 +1337,46 @@ class Branch(Element, Communicatable, Relational):
         async with self.mailbox.pile_:
             self.receive(sender, message, tool, imodel)
 
+    def to_snapshot(self, fp: str | Path) -> int:
+        """Writes a compact binary snapshot of the branch.
+
+        To checkpoint repeatedly at the cost of only what changed, use a
+        `Snapshotter` instead.
+
+        Returns:
+            int: Bytes written.
+        """
+        from .snapshot import dump_snapshot
+
+        return dump_snapshot(self, fp)
+
+    @classmethod
+    def from_snapshot(cls, fp: str | Path) -> "Branch":
+        """Restores a branch from a snapshot file, deltas included."""
+        from .snapshot import load_snapshot
+
+        branch = load_snapshot(fp)
+        if not isinstance(branch, cls):
+            raise ValueError(f"Snapshot file does not hold a Branch: {fp}")
+        return branch
+
     def receive_all(self) -> None:
         """Receives mail from all senders."""
         for key in list(self.mailbox.pending_ins.keys()):
             self.receive(key)
 
     def to_dict(self):
+        return self._to_dict()
+
+    def _to_json_data(self) -> dict:
+        # messages and logs make up most of a snapshot; left as piles,
+        # they are encoded straight to JSON in the same pass
+        dict_ = self._to_dict(collections=False)
+        dict_["messages"] = self.messages
+        dict_["logs"] = self.logs
+        return dict_
+
+    def _to_dict(self, collections: bool = True) -> dict:
         meta = {}
         if "clone_from" in self.metadata:
 
@@ -1234,8 +1394,9 @@ class Branch(Element, Communicatable, Relational):
         )
 
         dict_ = super().to_dict()
-        dict_["messages"] = self.messages.to_dict()
-        dict_["logs"] = self.logs.to_dict()
+        if collections:
+            dict_["messages"] = self.messages.to_dict()
+            dict_["logs"] = self.logs.to_dict()
         dict_["chat_model"] = self.chat_model.to_dict()
         dict_["parse_model"] = self.parse_model.to_dict()
         if self.system:
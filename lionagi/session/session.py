@@ -4,6 +4,7 @@
 
 from collections.abc import Callable
 from functools import partial
+from pathlib import Path
 from typing import Self
 
 import pandas as pd
@@ -220,6 +221,55 @@ class Session(Node, Communicatable, Relational):
         )
         return out.to_df(columns=MESSAGE_FIELDS)
 
+    def to_parquet_file(
+        self,
+        fp: str | Path,
+        branches: ID.RefSeq = None,
+        exclude_clone: bool = False,
+        exclude_load: bool = False,
+        **kwargs,
+    ) -> None:
+        """Streams the branches' messages to a Parquet file.
+
+        Unlike `to_df`, rows are converted one record batch at a time;
+        read them back lazily with `ParquetScan`.
+
+        Args:
+            fp: The file to write.
+            branches: Branches to export (all by default).
+            exclude_clone: Skip messages cloned from other branches.
+            exclude_load: Skip messages loaded into branches.
+            **kwargs: Options for `to_parquet` (batch_size, compression).
+        """
+        self.concat_messages(
+            branches=branches,
+            exclude_clone=exclude_clone,
+            exclude_load=exclude_load,
+        ).to_parquet_file(fp, **kwargs)
+
+    def to_snapshot(self, fp: str | Path) -> int:
+        """Writes a compact binary snapshot of the session and its branches.
+
+        To checkpoint repeatedly at the cost of only what changed, use a
+        `Snapshotter` instead.
+
+        Returns:
+            int: Bytes written.
+        """
+        from .snapshot import dump_snapshot
+
+        return dump_snapshot(self, fp)
+
+    @classmethod
+    def from_snapshot(cls, fp: str | Path) -> "Session":
+        """Restores a session from a snapshot file, deltas included."""
+        from .snapshot import load_snapshot
+
+        session = load_snapshot(fp)
+        if not isinstance(session, cls):
+            raise ValueError(f"Snapshot file does not hold a Session: {fp}")
+        return session
+
     def send(self, to_: ID.RefSeq = None):
         """
         Send mail to specified branches.
@@ -0,0 +1,496 @@
+# Copyright (c) 2023 - 2024, HaiyangLi <quantocean.li at gmail dot com>
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Compact binary snapshots of branches and sessions, with checkpoints.
+
+A snapshot file is a versioned header followed by length-prefixed
+msgpack frames. The first frame holds the full state; each later frame
+is a delta holding only what changed since the previous checkpoint:
+- new messages (and action requests answered by them, or messages
+  updated through `add_message`),
+- new logs,
+- the message order, as appended ids unless it was rearranged,
+- the branch settings (models, log config, metadata), if changed.
+
+So a `Snapshotter` that checkpoints a long-lived agent every turn costs
+O(new messages) per checkpoint rather than O(history).
+
+Ids are written once to a table of 16-byte UUIDs (or role strings) and
+referenced by index elsewhere; message classes likewise. Loading
+resolves each id and class once and validates messages directly
+against their class, without the per-message registry lookup of
+`from_dict`.
+
+Requires the `msgpack` package.
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+from uuid import UUID
+
+from lionagi._class_registry import get_class
+from lionagi.protocols.generic.element import IDType
+from lionagi.protocols.generic.log import Log
+from lionagi.protocols.generic.pile import Pile
+from lionagi.protocols.generic.serialization import json_default
+from lionagi.protocols.messages.action_response import ActionResponse
+from lionagi.protocols.messages.base import MessageFlag, MessageRole
+from lionagi.protocols.messages.message import RoledMessage
+
+if TYPE_CHECKING:
+    from .branch import Branch
+    from .session import Session
+
+__all__ = (
+    "SNAPSHOT_VERSION",
+    "Snapshotter",
+    "dump_snapshot",
+    "load_snapshot",
+)
+
+SNAPSHOT_MAGIC = b"LIONSNAP"
+SNAPSHOT_VERSION = 1
+_HEADER = struct.Struct(">8sH")
+# 4-byte big-endian payload length precedes each frame
+_LENGTH = struct.Struct(">I")
+_ROLES = {r.value: r for r in (*MessageRole, *MessageFlag)}
+
+
+def _msgpack():
+    try:
+        import msgpack
+    except ImportError as e:
+        raise ImportError(
+            "Binary snapshots require the `msgpack` package. Install it "
+            "with `pip install 'lionagi[snapshot]'`."
+        ) from e
+    return msgpack
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, IDType | UUID):
+        return str(value)
+    return json_default(value)
+
+
+class _Tables:
+    """The id and class tables shared by the frames of one file."""
+
+    def __init__(self) -> None:
+        self.refs: dict[Any, int] = {}
+        self.classes: dict[str, int] = {}
+        self.new_ids: list[bytes | str] = []
+        self.new_classes: list[str] = []
+
+    def ref(self, value: Any) -> int | None:
+        if value is None:
+            return None
+        if (ref := self.refs.get(value)) is None:
+            ref = self.refs[value] = len(self.refs)
+            key = str(getattr(value, "value", value))
+            try:
+                self.new_ids.append(UUID(key).bytes)
+            except ValueError:
+                self.new_ids.append(key)
+        return ref
+
+    def class_ref(self, name: str) -> int:
+        if (ref := self.classes.get(name)) is None:
+            ref = self.classes[name] = len(self.classes)
+            self.new_classes.append(name)
+        return ref
+
+    def flush(self) -> tuple[list, list]:
+        ids, classes = self.new_ids, self.new_classes
+        self.new_ids, self.new_classes = [], []
+        return ids, classes
+
+
+class _BranchState:
+    """What has been checkpointed of one branch."""
+
+    __slots__ = (
+        "written",
+        "size",
+        "first",
+        "last",
+        "edits",
+        "last_log",
+        "header",
+    )
+
+    def __init__(self) -> None:
+        self.written: set[IDType] = set()
+        self.size = 0
+        self.first: IDType | None = None
+        self.last: IDType | None = None
+        self.edits = 0
+        self.last_log: IDType | None = None
+        self.header: dict | None = None
+
+
+def _encode_message(msg: RoledMessage, tables: _Tables) -> list:
+    d = msg.to_dict()
+    metadata = d.pop("metadata")
+    lion_class = metadata.pop("lion_class")
+    rest = {
+        k: v
+        for k, v in d.items()
+        if k
+        not in ("id", "created_at", "role", "sender", "recipient", "content")
+        and v
+    }
+    if metadata:
+        rest["metadata"] = metadata
+    return [
+        tables.class_ref(lion_class),
+        tables.ref(msg.id),
+        d["created_at"],
+        d["role"],
+        tables.ref(msg.sender),
+        tables.ref(msg.recipient),
+        d["content"],
+        rest,
+    ]
+
+
+def _new_logs(logs: Pile, state: _BranchState) -> list:
+    order = logs.progression.order
+    start = len(order)
+    # logs are only appended, so scanning back to the last one written
+    # touches only the new ones; if it is gone (the logs were cleared
+    # after a dump), everything present is new
+    while start and order[start - 1] != state.last_log:
+        start -= 1
+    if order:
+        state.last_log = order[-1]
+    return [logs[i].to_dict() for i in order[start:]]
+
+
+def _branch_frame(
+    branch: Branch, tables: _Tables, state: _BranchState, full: bool
+) -> dict:
+    messages = branch.msgs.messages
+    order = messages.progression.order
+    edited = branch.msgs.edits_since(state.edits)
+
+    appended = (
+        not full
+        and len(order) >= state.size
+        and (state.size == 0 or order[state.size - 1] == state.last)
+        and (not order or state.first is None or order[0] == state.first)
+    )
+    if appended:
+        new = order[state.size :]
+    else:
+        new = [i for i in order if i not in state.written]
+
+    # messages already written that were changed in place: requests
+    # answered by a new response, and those re-added via `add_message`
+    # (all of them, if more edits were made than the manager keeps)
+    changed = dict.fromkeys(order if edited is None else edited)
+    for id_ in new:
+        msg = messages[id_]
+        if isinstance(msg, ActionResponse):
+            request_id = msg.content.get("action_request_id")
+            if request_id is not None:
+                changed[IDType.validate(request_id)] = None
+    changed = [
+        i
+        for i in changed
+        if i in state.written and i not in new and i in messages
+    ]
+
+    header = branch._to_dict(collections=False)
+    header.pop("system", None)
+    header.pop("id")
+    frame = {
+        "id": tables.ref(branch.id),
+        "system": tables.ref(branch.system.id) if branch.system else None,
+        "messages": [
+            _encode_message(messages[i], tables) for i in (*changed, *new)
+        ],
+        "logs": _new_logs(branch._log_manager.logs, state),
+    }
+    if header != state.header:
+        frame["header"] = state.header = header
+    if appended:
+        frame["append"] = [tables.ref(i) for i in new]
+    else:
+        frame["order"] = [tables.ref(i) for i in order]
+
+    state.written.update(new)
+    state.size = len(order)
+    state.first = order[0] if order else None
+    state.last = order[-1] if order else None
+    state.edits = branch.msgs.edit_count
+    return frame
+
+
+class Snapshotter:
+    """Checkpoints a Branch or Session to a snapshot file.
+
+    The first `checkpoint` writes the full state; later ones append a
+    delta frame with only what changed since. `compact` rewrites the
+    file as a single full frame.
+
+    Messages edited in place after they were checkpointed, other than
+    through `add_message` or by answering an action request, are not
+    detected; call `compact` after such edits.
+
+    Example:
+        >>> snap = Snapshotter("agent.lsnap")
+        >>> snap.checkpoint(branch)  # after every turn
+        >>> branch = Branch.from_snapshot("agent.lsnap")
+    """
+
+    def __init__(self, fp: str | Path) -> None:
+        self.path = Path(fp)
+        self.frames = 0
+        self._msgpack = _msgpack()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._tables = _Tables()
+        self._states: dict[IDType, _BranchState] = {}
+
+    def checkpoint(self, obj: Branch | Session) -> int:
+        """Writes the changes since the last checkpoint.
+
+        Returns:
+            int: Bytes written.
+        """
+        return self._write(obj, full=self.frames == 0)
+
+    def compact(self, obj: Branch | Session) -> int:
+        """Rewrites the file with the full current state only.
+
+        Returns:
+            int: Bytes written.
+        """
+        self.frames = 0
+        self._reset()
+        return self._write(obj, full=True)
+
+    def _write(self, obj: Branch | Session, full: bool) -> int:
+        from .session import Session
+
+        tables = self._tables
+        if isinstance(obj, Session):
+            branches = list(obj.branches)
+            root = {
+                "kind": "session",
+                "session": obj.model_dump(
+                    exclude={"branches", "mail_transfer", "id"}
+                ),
+                "session_id": tables.ref(obj.id),
+                "branch_ids": [tables.ref(b.id) for b in branches],
+                "default_branch": tables.ref(obj.default_branch.id),
+            }
+        else:
+            branches = [obj]
+            root = {"kind": "branch"}
+
+        frame_branches = []
+        for branch in branches:
+            if (state := self._states.get(branch.id)) is None:
+                state = self._states[branch.id] = _BranchState()
+            frame_branches.append(
+                _branch_frame(branch, tables, state, full=full)
+            )
+
+        ids, classes = tables.flush()
+        payload = self._msgpack.packb(
+            {
+                "full": full,
+                "seq": self.frames,
+                "ids": ids,
+                "classes": classes,
+                **root,
+                "branches": frame_branches,
+            },
+            default=_default,
+            use_bin_type=True,
+        )
+        data = _LENGTH.pack(len(payload)) + payload
+        if full:
+            # written aside and swapped in, so a crash mid-write leaves
+            # the previous snapshot intact
+            data = _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION) + data
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, self.path)
+        else:
+            with self.path.open("ab") as f:
+                f.write(data)
+        self.frames += 1
+        return len(data)
+
+
+def dump_snapshot(obj: Branch | Session, fp: str | Path) -> int:
+    """Writes a full snapshot of a Branch or Session.
+
+    Returns:
+        int: Bytes written.
+    """
+    return Snapshotter(fp).checkpoint(obj)
+
+
+def _iter_frames(fp: str | Path):
+    msgpack = _msgpack()
+    with Path(fp).open("rb") as f:
+        header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise ValueError(f"Not a snapshot file: {fp}")
+        magic, version = _HEADER.unpack(header)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError(f"Not a snapshot file: {fp}")
+        if version > SNAPSHOT_VERSION:
+            raise ValueError(
+                f"Snapshot version {version} is newer than the supported "
+                f"version {SNAPSHOT_VERSION}."
+            )
+        while size := f.read(_LENGTH.size):
+            if len(size) < _LENGTH.size:
+                return
+            (size,) = _LENGTH.unpack(size)
+            data = f.read(size)
+            if len(data) < size:
+                # a checkpoint torn by a crash; the ones before it stand
+                return
+            yield msgpack.unpackb(data, raw=False, strict_map_key=False)
+
+
+def _resolve_class(name: str) -> type:
+    try:
+        return get_class(name.split(".")[-1])
+    except Exception:
+        from lionagi.libs.package.imports import import_module
+
+        mod, imp = name.rsplit(".", 1)
+        return import_module(mod, import_name=imp)
+
+
+class _Loader:
+    """Replays the frames of a snapshot file."""
+
+    def __init__(self) -> None:
+        self.ids: list[IDType | MessageRole | MessageFlag | str] = []
+        self.classes: list[type] = []
+        self.branches: dict[int, dict] = {}
+        self.root: dict = {}
+
+    def add(self, frame: dict) -> None:
+        for value in frame["ids"]:
+            if isinstance(value, bytes):
+                self.ids.append(IDType(UUID(bytes=value)))
+            else:
+                self.ids.append(_ROLES.get(value, value))
+        self.classes.extend(_resolve_class(c) for c in frame["classes"])
+        if frame["full"]:
+            self.branches = {}
+        self.root = frame
+
+        for b in frame["branches"]:
+            state = self.branches.setdefault(
+                b["id"], {"messages": {}, "order": [], "logs": {}}
+            )
+            if "header" in b:
+                state["header"] = b["header"]
+            state["system"] = b["system"]
+            for m in b["messages"]:
+                state["messages"][m[1]] = m
+            if "order" in b:
+                state["order"] = b["order"]
+            else:
+                state["order"].extend(b["append"])
+            for log in b["logs"]:
+                state["logs"][log["id"]] = log
+
+    def message(self, m: list) -> RoledMessage:
+        cls_ref, id_, created_at, role, sender, recipient, content, rest = m
+        cls = self.classes[cls_ref]
+        data = {
+            "id": self.ids[id_],
+            "created_at": created_at,
+            "role": role,
+            "content": content,
+            **rest,
+        }
+        data = {k: v for k, v in data.items() if v}
+        # kept even when None, which validation would turn into "unset"
+        data["sender"] = self.ids[sender] if sender is not None else None
+        data["recipient"] = (
+            self.ids[recipient] if recipient is not None else None
+        )
+        if cls.from_dict.__func__ is not RoledMessage.from_dict.__func__:
+            data.setdefault("metadata", {})["lion_class"] = cls.class_name(
+                full=True
+            )
+            return cls.from_dict(data)
+        msg = cls.model_validate(data)
+        msg._flag = MessageFlag.MESSAGE_LOAD
+        return msg
+
+    def branch(self, ref: int) -> Branch:
+        from .branch import Branch
+
+        state = self.branches[ref]
+        messages = {}
+        for m in state["messages"].values():
+            msg = self.message(m)
+            messages[m[1]] = msg
+
+        branch = Branch.from_dict(
+            {"id": str(self.ids[ref]), **state["header"]}
+        )
+        branch.msgs.messages = Pile(
+            collections=[messages[i] for i in state["order"]],
+            item_type={RoledMessage},
+            strict_type=False,
+        )
+        if state["system"] is not None:
+            branch.msgs.system = messages[state["system"]]
+        branch.msgs.invalidate_rendered_history()
+        branch._log_manager.logs = Pile(
+            collections=[Log.from_dict(d) for d in state["logs"].values()],
+            item_type=Log,
+            strict_type=True,
+        )
+        return branch
+
+
+def load_snapshot(fp: str | Path) -> Branch | Session:
+    """Restores the Branch or Session from a snapshot file.
+
+    The full frame and every delta after it are replayed in order.
+
+    Raises:
+        ValueError: If the file is not a snapshot or holds no frame.
+    """
+    loader = _Loader()
+    for frame in _iter_frames(fp):
+        loader.add(frame)
+    root = loader.root
+    if not root:
+        raise ValueError(f"Snapshot file holds no checkpoint: {fp}")
+
+    if root["kind"] == "branch":
+        return loader.branch(root["branches"][0]["id"])
+
+    from .branch import Branch
+    from .session import Session
+
+    branches = {ref: loader.branch(ref) for ref in root["branch_ids"]}
+    return Session(
+        id=loader.ids[root["session_id"]],
+        branches=Pile(collections=list(branches.values()), item_type=Branch),
+        default_branch=branches[root["default_branch"]],
+        **root["session"],
+    )
@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+from lionagi.libs.schema.stream_json import (
+    StreamingJSONParser,
+    parse_json_stream,
+)
+
+DOC = {
+    "title": 'quote " slash \\ unicode é 😀',
+    "items": [1, 2.5, -3e2, True, None, {"nested": []}],
+    "empty": {},
+    "last": "x",
+}
+
+
+@pytest.mark.parametrize("ensure_ascii", [True, False])
+@pytest.mark.parametrize("step", [1, 2, 3, 7, 1000])
+def test_chunked_parse_matches_json_loads(ensure_ascii, step):
+    text = "Here you go:\n```json\n"
+    text += json.dumps(DOC, ensure_ascii=ensure_ascii) + "\n```"
+    seen = []
+    parser = StreamingJSONParser(on_field=lambda k, v: seen.append(k))
+    for i in range(0, len(text), step):
+        parser.feed(text[i : i + step])
+    assert parser.done
+    assert parser.finish() == DOC
+    assert seen == list(DOC)
+    assert parser.repairs == []
+
+
+def test_fields_complete_before_the_document():
+    parser = StreamingJSONParser()
+    parser.feed('{"a": [1, 2], "b": "par')
+    assert parser.fields == {"a": [1, 2]}
+    parser.feed('tial", "c": 3')
+    assert parser.fields == {"a": [1, 2], "b": "partial"}
+    assert not parser.done
+
+
+def test_repairs_common_slips_and_truncation():
+    parser = StreamingJSONParser()
+    parser.feed('{\'a\': 1, b: True, "c": [1, 2,], "d": 1 "e": "cut')
+    assert parser.finish() == {
+        "a": 1,
+        "b": True,
+        "c": [1, 2],
+        "d": 1,
+        "e": "cut",
+    }
+    assert "missing comma" in parser.repairs
+    assert "closed unterminated string" in parser.repairs
+
+
+def test_malformed_input_fails_at_the_offending_character():
+    parser = StreamingJSONParser()
+    parser.feed('{"a": 1, ')
+    with pytest.raises(ValueError, match="position 14"):
+        parser.feed('"b": @}')
+    with pytest.raises(ValueError):
+        parser.finish()
+
+
+def test_missing_document_is_reported():
+    with pytest.raises(ValueError):
+        parse_json_stream("no json here")
+    parser = StreamingJSONParser(max_preamble=5)
+    with pytest.raises(ValueError):
+        parser.feed("a long preamble {")
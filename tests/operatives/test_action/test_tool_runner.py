@@ -0,0 +1,120 @@
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+from lionagi.operatives.types import (
+    ActionManager,
+    FunctionCalling,
+    Tool,
+    ToolRunner,
+)
+from lionagi.protocols.types import ActionRequest, EventStatus
+
+
+def blocking_tool(delay: float = 0.1) -> str:
+    """Sleeps without yielding to the event loop."""
+    time.sleep(delay)
+    return threading.current_thread().name
+
+
+def process_tool(x: int) -> int:
+    """Returns the worker's pid, shifted by x."""
+    return os.getpid() + x
+
+
+@pytest.fixture
+def runner():
+    runner = ToolRunner(max_threads=4, max_processes=1)
+    yield runner
+    runner.shutdown()
+
+
+async def test_thread_mode_keeps_loop_responsive(runner):
+    tool = Tool(func_callable=blocking_tool, execution_mode="thread")
+    call = FunctionCalling(
+        func_tool=tool, arguments={"delay": 0.2}, runner=runner
+    )
+
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while call.status != EventStatus.COMPLETED:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(call.invoke(), ticker())
+    assert call.execution.response.startswith("lionagi-tool")
+    assert ticks > 5
+
+
+async def test_max_concurrency_bounds_parallel_calls(runner):
+    active = peak = 0
+    lock = threading.Lock()
+
+    def tracked() -> None:
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+
+    tool = Tool(
+        func_callable=tracked, execution_mode="thread", max_concurrency=2
+    )
+    calls = [
+        FunctionCalling(func_tool=tool, arguments={}, runner=runner)
+        for _ in range(6)
+    ]
+    await asyncio.gather(*(c.invoke() for c in calls))
+    assert all(c.status == EventStatus.COMPLETED for c in calls)
+    assert peak == 2
+
+
+async def test_timeout_fails_the_call(runner):
+    tool = Tool(
+        func_callable=blocking_tool, execution_mode="thread", timeout=0.05
+    )
+    call = FunctionCalling(
+        func_tool=tool, arguments={"delay": 0.3}, runner=runner
+    )
+    await call.invoke()
+    assert call.status == EventStatus.FAILED
+    assert "timed out" in call.execution.error
+
+
+async def test_process_mode_runs_in_worker_process(runner):
+    tool = Tool(func_callable=process_tool, execution_mode="process")
+    call = FunctionCalling(func_tool=tool, arguments={"x": 0}, runner=runner)
+    await call.invoke()
+    assert call.status == EventStatus.COMPLETED
+    assert call.execution.response != os.getpid()
+
+
+def test_process_mode_requires_picklable_callable():
+    def local_tool(x: int) -> int:
+        return x
+
+    with pytest.raises(ValueError):
+        Tool(func_callable=local_tool, execution_mode="process")
+
+
+async def test_manager_calls_use_its_runner():
+    runner = ToolRunner(max_threads=1)
+    manager = ActionManager(
+        Tool(func_callable=blocking_tool, execution_mode="thread"),
+        runner=runner,
+    )
+    request = ActionRequest.create(
+        function="blocking_tool", arguments={"delay": 0}
+    )
+    call = await manager.invoke(request)
+    assert call.runner is runner
+    assert call.execution.response.startswith("lionagi-tool")
+    manager.shutdown()
+    assert runner._thread_pool is None
@@ -189,3 +189,50 @@ class TestOperative:
             operative.response_type.model_fields["name"].description
             == "Test name field"
         )
+
+
+class TestOperativeStreaming:
+    def test_feed_validates_fields_as_they_complete(self):
+        operative = Operative(
+            request_params=ModelParams(base_type=SampleModel)
+        )
+        assert operative.feed('```json\n{"value": "4') == {}
+        assert operative.feed('2", "na') == {"value": 42}
+        assert operative.feed('me": "streamed"}') == {"name": "streamed"}
+        assert operative.partial_response == {"value": 42, "name": "streamed"}
+
+        result = operative.finish_stream()
+        assert isinstance(result, BaseModel)
+        assert result.value == 42 and result.name == "streamed"
+        assert operative._should_retry is False
+
+    def test_feed_raises_early_on_invalid_field(self):
+        operative = Operative(
+            request_params=ModelParams(base_type=SampleModel)
+        )
+        with pytest.raises(ValueError):
+            operative.feed('{"value": "not a number", "name": ')
+
+    def test_malformed_reply_is_repaired_without_retry(self):
+        operative = Operative(
+            request_params=ModelParams(base_type=SampleModel)
+        )
+        result = operative.update_response_model(
+            text="{'name': 'slipped', value: 7,}"
+        )
+        assert isinstance(result, BaseModel)
+        assert result.name == "slipped" and result.value == 7
+        assert not operative.truncated
+
+    def test_truncated_reply_is_not_validated(self):
+        operative = Operative(
+            request_params=ModelParams(base_type=SampleModel)
+        )
+        operative.update_response_model(text='{"value": 7, "name": "cut')
+        assert operative.response_model is None
+        assert operative.truncated and operative._should_retry
+
+        operative.feed('{"value": 42, "name": "cut')
+        assert operative.finish_stream() == {"value": 42, "name": "cut"}
+        assert operative.response_model is None
+        assert operative.truncated and operative._should_retry
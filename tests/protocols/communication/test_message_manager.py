@@ -1,6 +1,7 @@
 import pytest
 from pydantic import BaseModel
 
+from lionagi.protocols.messages.manager import RenderedHistory
 from lionagi.protocols.types import (
     ActionRequest,
     ActionResponse,
@@ -279,3 +280,123 @@ def test_message_manager_metadata(message_manager):
     )
 
     assert msg.metadata["extra"] == metadata
+
+
+def _full_render(manager):
+    """Render the history from scratch for comparison"""
+    history = RenderedHistory()
+    history.sync(manager.progression, manager.messages)
+    return history.chat_msgs
+
+
+def test_rendered_history_is_incremental(message_manager):
+    """Test that only newly appended messages are processed"""
+    message_manager.add_message(
+        instruction="First", sender="user", recipient="assistant"
+    )
+    message_manager.add_message(
+        assistant_response="Answer", sender="assistant", recipient="user"
+    )
+    history = message_manager.rendered_history()
+    first_entry = history.entries[0]
+    assert len(history.chat_msgs) == 2
+
+    message_manager.add_message(
+        instruction="Second", sender="user", recipient="assistant"
+    )
+    history = message_manager.rendered_history()
+    assert history is message_manager.rendered_history()
+    assert history.entries[0] is first_entry
+    assert history.chat_msgs == _full_render(message_manager)
+    assert len(history.chat_msgs) == 3
+
+
+def test_rendered_history_merges_responses(message_manager):
+    """Test merging of consecutive responses and action outputs"""
+    message_manager.add_message(
+        instruction="Question", sender="user", recipient="assistant"
+    )
+    message_manager.add_message(
+        assistant_response="Part 1", sender="assistant", recipient="user"
+    )
+    message_manager.rendered_history()
+    message_manager.add_message(
+        assistant_response="Part 2", sender="assistant", recipient="user"
+    )
+    request = ActionRequest.create(
+        function="f", arguments={}, sender="assistant", recipient="user"
+    )
+    message_manager.add_message(action_request=request)
+    message_manager.add_message(
+        action_request=request, action_output={"result": 1}
+    )
+
+    history = message_manager.rendered_history()
+    assert len(history.entries) == 2
+    assert history.entries[1].response == "Part 1\n\nPart 2"
+    assert len(history.pending) == 1
+
+    message_manager.add_message(
+        instruction="Next", sender="user", recipient="assistant"
+    )
+    history = message_manager.rendered_history()
+    assert not history.pending
+    context = history.entries[-1].context[-1]
+    assert context["action_response"]["output"] == {"result": 1}
+    assert history.chat_msgs == _full_render(message_manager)
+
+
+def test_rendered_history_rebuilds_after_edits(message_manager):
+    """Test that non-append changes invalidate the cached history"""
+    instruction = message_manager.add_message(
+        instruction="Original", sender="user", recipient="assistant"
+    )
+    message_manager.rendered_history()
+
+    message_manager.add_message(
+        instruction=instruction, guidance="Edited guidance"
+    )
+    history = message_manager.rendered_history()
+    assert "Edited guidance" in history.chat_msgs[0]["content"]
+
+    message_manager.clear_messages()
+    assert not message_manager.rendered_history().chat_msgs
+
+
+def test_rendered_history_rebuilds_after_reordering(message_manager):
+    """Test that moving earlier messages invalidates the cached history"""
+    for i in range(3):
+        message_manager.add_message(
+            instruction=f"Question {i}", sender="user", recipient="assistant"
+        )
+        message_manager.add_message(
+            assistant_response=f"Answer {i}",
+            sender="assistant",
+            recipient="user",
+        )
+    message_manager.rendered_history()
+
+    order = message_manager.progression.order
+    order[0], order[2] = order[2], order[0]
+    assert message_manager.rendered_history().chat_msgs == _full_render(
+        message_manager
+    )
+    assert "Question 1" in _full_render(message_manager)[0]["content"]
+
+
+def test_rendered_history_accepts_a_list_of_ids(message_manager):
+    """Test rendering a plain list of message ids"""
+    first = message_manager.add_message(
+        instruction="First", sender="user", recipient="assistant"
+    )
+    response = message_manager.add_message(
+        assistant_response="Answer", sender="assistant", recipient="user"
+    )
+    message_manager.add_message(
+        instruction="Second", sender="user", recipient="assistant"
+    )
+
+    history = message_manager.rendered_history([first.id, str(response.id)])
+    assert history is not message_manager.rendered_history()
+    assert len(history.chat_msgs) == 2
+    assert history.entries[1].response == "Answer"
@@ -0,0 +1,96 @@
+from datetime import datetime, timezone
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+import pyarrow.parquet as pq
+
+from lionagi.protocols.generic.columnar import to_parquet
+from lionagi.protocols.types import (
+    AssistantResponse,
+    Instruction,
+    Log,
+    LogManager,
+    ParquetScan,
+    Pile,
+)
+
+
+def make_messages(n: int) -> list:
+    out = []
+    for i in range(n):
+        if i % 2:
+            msg = AssistantResponse.create(
+                assistant_response=f"answer {i}", sender="a", recipient="u"
+            )
+        else:
+            msg = Instruction.create(
+                instruction=f"question {i}", sender="u", recipient="a"
+            )
+        d = msg.to_dict() | {"created_at": 1_700_000_000 + i}
+        out.append(type(msg).from_dict(d))
+    return out
+
+
+@pytest.fixture
+def messages():
+    return make_messages(10)
+
+
+def test_export_writes_one_row_group_per_batch(tmp_path, messages):
+    fp = tmp_path / "messages.parquet"
+    assert to_parquet(messages, fp, batch_size=4) == 10
+
+    meta = pq.ParquetFile(fp).metadata
+    assert meta.num_rows == 10
+    assert meta.num_row_groups == 3
+
+
+def test_pile_roundtrip_through_adapter(tmp_path, messages):
+    pile = Pile(collections=messages)
+    fp = tmp_path / "pile.parquet"
+    pile.to_parquet_file(fp)
+
+    restored = Pile.adapt_from(fp, ".parquet")
+    assert list(restored.keys()) == list(pile.keys())
+    assert restored[0].content == messages[0].content
+
+
+def test_scan_filters_lazily(tmp_path, messages):
+    fp = tmp_path / "pile.parquet"
+    to_parquet(messages, fp, batch_size=3)
+
+    scan = ParquetScan(fp, role="assistant")
+    assert scan.count() == 5
+    assert all(d["role"] == "assistant" for d in scan)
+
+    scan = ParquetScan(fp, lion_class=Instruction, since=1_700_000_004)
+    assert [d["content"]["instruction"] for d in scan] == [
+        "question 4",
+        "question 6",
+        "question 8",
+    ]
+
+    until = datetime.fromtimestamp(1_700_000_002, tz=timezone.utc)
+    df = ParquetScan(fp, lion_class="AssistantResponse", until=until)
+    frame = df.to_pandas()
+    assert list(frame["role"]) == ["assistant"]
+    assert "data" not in frame.columns
+
+
+def test_log_dump_and_scan_by_wrapped_class(tmp_path, messages):
+    manager = LogManager(
+        persist_dir=tmp_path,
+        extension=".parquet",
+        auto_save_on_exit=False,
+    )
+    for msg in messages:
+        manager.log(Log.create(msg))
+    manager.dump()
+
+    (fp,) = tmp_path.glob("*.parquet")
+    scan = ParquetScan(tmp_path, lion_class="Instruction")
+    assert scan.count() == 5
+    assert all(d["content"]["role"] == "user" for d in scan)
+    assert ParquetScan(fp, lion_class=Log).count() == 10
@@ -0,0 +1,154 @@
+import pytest
+
+from lionagi.operatives.action.tool import Tool
+from lionagi.protocols.types import (
+    ActionRequest,
+    ActionResponse,
+    DiskStore,
+    Instruction,
+    MessageFlag,
+    Pile,
+)
+from lionagi.session.branch import Branch
+
+
+def make_messages(n: int) -> list[Instruction]:
+    return [
+        Instruction.create(instruction=f"question {i}", context={"i": i})
+        for i in range(n)
+    ]
+
+
+def double(x: int) -> int:
+    return 2 * x
+
+
+def test_spilled_pile_keeps_only_the_hot_tail(tmp_path):
+    messages = make_messages(20)
+    pile = Pile(messages)
+    expected = [m.to_dict() for m in messages]
+    del messages
+
+    store = pile.spill(tmp_path, hot_size=4)
+    assert isinstance(store, DiskStore) and pile.spill() is store
+    assert store.resident == 4 and len(pile) == 20
+    assert list(tmp_path.glob("segment_*.bin"))
+
+    assert [m.to_dict() for m in pile] == expected
+    assert store.resident == 4
+    first = pile[0]
+    assert first.content["instruction"] == "question 0"
+    assert pile[first.id] is first
+
+
+def test_spilled_pile_supports_edits(tmp_path):
+    pile = Pile(make_messages(10))
+    store = pile.spill(tmp_path, hot_size=2)
+
+    msg = pile[0]
+    msg.content["instruction"] = "edited"
+    extra = make_messages(3)
+    pile.include(extra)
+    assert pile[0].content["instruction"] == "edited"
+
+    removed = pile.pop(1)
+    assert removed.content["instruction"] == "question 1"
+    assert len(pile) == 12 and removed.id not in pile
+    assert pile[-1] == extra[-1]
+
+    pile.clear()
+    assert len(pile) == 0 and store.resident == 0
+
+
+def test_reading_does_not_rewrite(tmp_path):
+    pile = Pile(make_messages(10))
+    store = pile.spill(tmp_path, hot_size=2)
+    list(pile)  # the hot tail is written the first time it is evicted
+    writes = store.page_outs
+
+    for _ in range(3):
+        list(pile)
+    assert store.page_ins >= 30
+    assert store.page_outs == writes == 10
+
+
+def test_paged_in_messages_keep_state_and_class_defaults(tmp_path):
+    request = ActionRequest.create(function="f", arguments={"x": 1})
+    response = ActionResponse.create(action_request=request, output=2)
+    loaded = Instruction.from_dict(make_messages(1)[0].to_dict())
+    pile = Pile([request, response, loaded, *make_messages(3)])
+
+    pile.spill(tmp_path, hot_size=1, segment_size=256)
+    assert len(list(tmp_path.glob("segment_*.bin"))) > 1
+
+    assert pile[request.id].is_responded()
+    assert (
+        pile[response.id].template
+        is ActionResponse.model_fields["template"].default
+    )
+    assert pile[loaded.id]._flag == MessageFlag.MESSAGE_LOAD
+
+
+def test_touch_saves_an_edit_made_through_a_reference(tmp_path):
+    pile = Pile(make_messages(4))
+    store = pile.spill(tmp_path, hot_size=1)
+    msg = pile[0]
+    key = msg.id
+    pile[-1]  # page `msg` out while it is still referenced
+    assert store.resident == 1 and pile[key] is msg
+
+    pile[-1]
+    msg.content["instruction"] = "edited"
+    pile.touch(msg)
+    del msg
+    assert pile[key].content["instruction"] == "edited"
+
+
+def test_items_that_override_to_dict_stay_resident(tmp_path):
+    tool = Tool(func_callable=double)
+    pile = Pile([tool, *make_messages(3)])
+    store = pile.spill(tmp_path, hot_size=1)
+
+    assert store.resident == 2
+    assert pile[tool.id] is tool
+
+
+def test_cloning_a_spilled_branch(tmp_path):
+    branch = Branch()
+    for i in range(10):
+        branch.msgs.add_message(instruction=f"q{i}", sender="user")
+    branch.msgs.messages.spill(tmp_path, hot_size=3)
+
+    clone = branch.clone()
+    store = clone.msgs.messages.collections
+    assert isinstance(store, DiskStore) and store.resident == 3
+    assert [m.content for m in clone.messages] == [
+        m.content for m in branch.messages
+    ]
+
+
+def test_store_rejects_an_empty_hot_tail():
+    with pytest.raises(ValueError):
+        DiskStore(hot_size=0)
+
+
+def test_responding_to_a_paged_out_request(tmp_path):
+    branch = Branch(system="be brief")
+    request = branch.msgs.add_message(
+        action_function="double",
+        action_arguments={"x": 1},
+        sender=branch.id,
+        recipient=branch.id,
+    )
+    branch.msgs.messages.spill(tmp_path, hot_size=1)
+    branch.msgs.add_message(instruction="q", sender="user")
+    assert branch.messages[branch.system.id] is branch.system
+
+    response = branch.msgs.add_message(action_request=request, action_output=2)
+    request_id = request.id
+    del request
+    branch.msgs.add_message(instruction="next", sender="user")
+
+    request = branch.messages[request_id]
+    assert request.is_responded()
+    assert str(request.action_response_id) == str(response.id)
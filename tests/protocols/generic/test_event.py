@@ -89,3 +89,19 @@ def test_event_duration():
 
     assert event.execution.duration == 1.5
     assert event.created_at >= start
+
+
+def test_execution_observer():
+    import copy
+
+    changes = []
+    execution = Execution()
+    execution.observe(lambda old, new: changes.append((old, new)))
+    execution.status = EventStatus.PROCESSING
+    execution.status = EventStatus.PROCESSING
+    assert changes == [(EventStatus.PENDING, EventStatus.PROCESSING)]
+
+    clone = copy.deepcopy(execution)
+    clone.status = EventStatus.COMPLETED
+    assert clone.status == EventStatus.COMPLETED
+    assert len(changes) == 1
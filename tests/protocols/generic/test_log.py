@@ -1,7 +1,11 @@
+import asyncio
+import time
+
 import pytest
 
 from lionagi.protocols.generic.element import Element
 from lionagi.protocols.generic.log import Log, LogManager, LogManagerConfig
+from lionagi.protocols.generic.log_sink import LogSink, iter_log_file
 
 
 # Test LogManagerConfig
@@ -168,3 +172,98 @@ class TestLogManager:
         assert len(manager.logs) == 1
         assert manager.logs[0].content == {"key2": "value2"}
         assert len(list(temp_dir.glob("*.json"))) == 1
+
+    def test_sink_streams_without_dumping(self, temp_dir):
+        manager = LogManager(
+            persist_dir=temp_dir,
+            capacity=2,
+            sink="jsonl",
+            auto_save_on_exit=False,
+        )
+        for i in range(5):
+            manager.log(Log(content={"i": i}))
+        # only the most recent logs stay in memory
+        assert [log.content["i"] for log in manager.logs] == [3, 4]
+
+        manager.dump(clear=False)
+        (file,) = temp_dir.glob("*.jsonl")
+        assert [r["content"]["i"] for r in iter_log_file(file)] == list(
+            range(5)
+        )
+        assert not list(temp_dir.glob("*.json"))
+        manager.sink.close()
+
+    @pytest.mark.asyncio
+    async def test_sink_async_dump_flushes(self, temp_dir):
+        manager = LogManager(
+            persist_dir=temp_dir, sink="binary", auto_save_on_exit=False
+        )
+        await manager.alog(Log(content={"text": "multi\nline"}))
+        await manager.adump()
+        assert len(manager.logs) == 0
+
+        records = list(iter_log_file(manager.sink.path))
+        assert records[0]["content"] == {"text": "multi\nline"}
+        manager.sink.close()
+
+
+class TestLogSink:
+    def test_rotates_by_size(self, tmp_path):
+        sink = LogSink(tmp_path, max_bytes=200, use_timestamp=False)
+        for i in range(20):
+            sink.write({"i": i, "pad": "x" * 20})
+        sink.close()
+
+        assert len(sink.files) > 1
+        assert all(f.stat().st_size <= 200 for f in sink.files)
+        records = [r for f in sink.files for r in iter_log_file(f)]
+        assert [r["i"] for r in records] == list(range(20))
+
+    def test_rotates_by_age(self, tmp_path):
+        sink = LogSink(tmp_path, max_age=0.01, fsync_interval=None)
+        sink.write({"i": 0})
+        sink.flush()
+        time.sleep(0.02)
+        sink.write({"i": 1})
+        sink.close()
+        assert len(sink.files) == 2
+
+    def test_reader_skips_a_torn_record(self, tmp_path):
+        for format in ("jsonl", "binary"):
+            sink = LogSink(tmp_path / format, format=format)
+            sink.write({"i": 0})
+            sink.write({"i": 1})
+            sink.close()
+            data = sink.path.read_bytes()
+            sink.path.write_bytes(data[:-3])
+            assert [r["i"] for r in iter_log_file(sink.path)] == [0]
+
+    def test_drop_overflow_never_blocks(self, tmp_path):
+        sink = LogSink(tmp_path, queue_size=1, overflow="drop")
+        sink._ensure_started = lambda: None  # keep the writer from draining
+        sink.write({"i": 0})
+        sink.write({"i": 1})
+        assert sink.dropped == 1
+        assert sink.pending == 1
+
+    @pytest.mark.asyncio
+    async def test_full_queue_never_blocks_the_event_loop(self, tmp_path):
+        sink = LogSink(tmp_path, queue_size=1)
+        sink._ensure_started = lambda: None  # keep the writer from draining
+        sink.write({"i": 0})
+        sink.write({"i": 1})
+        assert sink.dropped == 1
+
+        waiting = asyncio.create_task(sink.awrite({"i": 2}))
+        await asyncio.sleep(0.01)
+        assert not waiting.done()
+        assert sink._queue.get_nowait() == {"i": 0}
+        await asyncio.wait_for(waiting, 1)
+        assert sink._queue.get_nowait() == {"i": 2}
+        assert sink.dropped == 1
+
+    def test_closed_sink_rejects_writes(self, tmp_path):
+        sink = LogSink(tmp_path)
+        sink.close()
+        with pytest.raises(RuntimeError):
+            sink.write({"i": 0})
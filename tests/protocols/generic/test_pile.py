@@ -10,7 +10,8 @@ from typing import Any
 
 import pytest
 
-from lionagi._errors import ItemNotFoundError
+from lionagi._errors import ItemExistsError, ItemNotFoundError
+from lionagi.protocols.generic.pile import RWLock
 from lionagi.protocols.types import ID, Element, Node, Pile, Progression, pile
 
 
@@ -699,3 +700,99 @@ async def test_async_type_checking():
         await p.ainclude("not an Node")
 
     assert len(p) == 1
+
+
+def test_bulk_load_matches_constructor(sample_elements):
+    p = Pile.bulk_load(sample_elements, item_type={MockElement})
+    assert p.values() == Pile(collections=sample_elements).values()
+    assert list(p.progression) == [e.id for e in sample_elements]
+
+
+def test_bulk_load_checks_item_type(sample_elements):
+    with pytest.raises(TypeError):
+        Pile.bulk_load(sample_elements, item_type={Node})
+
+
+def test_extend_trusted_rejects_duplicates(sample_pile, sample_elements):
+    new = MockElement(value=10)
+    with pytest.raises(ItemExistsError):
+        sample_pile.extend_trusted([new, sample_elements[0]])
+    assert new not in sample_pile
+    assert len(sample_pile) == 5
+
+    sample_pile.extend_trusted([new])
+    assert sample_pile[-1] is new
+
+
+@pytest.mark.parametrize("construct", [False, True])
+def test_bulk_load_from_dicts(construct):
+    nodes = [Node(content={"i": i}) for i in range(100)]
+    p = Pile.bulk_load([n.to_dict() for n in nodes], construct=construct)
+
+    assert len(p) == 100
+    assert all(isinstance(n, Node) for n in p)
+    assert [n.id for n in p] == [n.id for n in nodes]
+    assert p[nodes[5].id].content == {"i": 5}
+
+
+def test_from_dict_round_trip(sample_pile):
+    restored = Pile.from_dict(sample_pile.to_dict())
+    assert restored.id == sample_pile.id
+    assert [i.value for i in restored] == [i.value for i in sample_pile]
+
+
+def test_iteration_uses_shared_snapshot(sample_pile):
+    snap = sample_pile.snapshot()
+    assert sample_pile.snapshot() is snap
+
+    seen = []
+    for i in sample_pile:
+        seen.append(i)
+        sample_pile.include(MockElement(value=len(seen) + 100))
+    assert seen == list(snap)
+    assert len(sample_pile) == 10
+    assert sample_pile.snapshot() is not snap
+
+
+def test_rwlock_readers_share_writers_exclude():
+    import threading
+
+    lock = RWLock()
+    both_reading = threading.Barrier(2, timeout=2)
+
+    def reader():
+        with lock.read():
+            both_reading.wait()
+
+    threads = [threading.Thread(target=reader) for _ in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    with lock:
+        with lock.read():  # the writer may also read
+            pass
+        t = threading.Thread(target=lock.acquire_read)
+        t.start()
+        t.join(timeout=0.1)
+        assert t.is_alive()
+    t.join(timeout=1)
+    assert not t.is_alive()
+    lock.release_read()
+
+
+@pytest.mark.asyncio
+async def test_async_readers_do_not_block_each_other(sample_pile):
+    lock = sample_pile.async_lock
+    async with lock.read():
+        item = await asyncio.wait_for(sample_pile.aget(0), timeout=1)
+        assert item.value == 0
+
+        writer = asyncio.create_task(
+            sample_pile.ainclude(MockElement(value=9))
+        )
+        await asyncio.sleep(0.01)
+        assert not writer.done()
+    await asyncio.wait_for(writer, timeout=1)
+    assert len(sample_pile) == 6
@@ -0,0 +1,157 @@
+import asyncio
+
+import pytest
+
+from lionagi.protocols.generic.event import Event, EventStatus
+from lionagi.protocols.generic.pile import Pile
+from lionagi.protocols.generic.processor import (
+    EventStore,
+    Executor,
+    Processor,
+)
+
+
+class SleepEvent(Event):
+    delay: float = 0.0
+
+    async def invoke(self) -> None:
+        await asyncio.sleep(self.delay)
+        self.status = EventStatus.COMPLETED
+
+
+class SleepProcessor(Processor):
+    event_type = SleepEvent
+
+
+class SleepExecutor(Executor):
+    processor_type = SleepProcessor
+
+
+class GatedProcessor(SleepProcessor):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.open = False
+
+    async def request_permission(self, **kwargs) -> bool:
+        return self.open
+
+
+def test_invalid_num_workers():
+    with pytest.raises(ValueError):
+        SleepProcessor(
+            queue_capacity=1, capacity_refresh_time=1, num_workers=0
+        )
+
+
+async def test_batch_mode_processes_queue():
+    executor = SleepExecutor(
+        processor_config={"queue_capacity": 5, "capacity_refresh_time": 1}
+    )
+    await executor.start()
+    events = [SleepEvent() for _ in range(3)]
+    for e in events:
+        await executor.append(e)
+    await executor.forward()
+    assert all(e.status == EventStatus.COMPLETED for e in events)
+
+
+async def test_worker_mode_avoids_head_of_line_blocking():
+    executor = SleepExecutor(
+        processor_config={
+            "queue_capacity": 10,
+            "capacity_refresh_time": 60,
+            "num_workers": 2,
+        }
+    )
+    await executor.start()
+    slow, fast = SleepEvent(delay=5), SleepEvent(delay=0)
+    await executor.append(slow)
+    await executor.append(fast)
+    await executor.forward()
+
+    await asyncio.wait_for(executor.wait_for(fast), timeout=1)
+    assert fast.status == EventStatus.COMPLETED
+    assert slow.status == EventStatus.PROCESSING
+
+    await executor.stop()
+    assert executor.processor._workers == []
+
+
+async def test_permission_wait_is_woken_by_notify():
+    processor = GatedProcessor(
+        queue_capacity=1, capacity_refresh_time=60, num_workers=1
+    )
+    await processor.start()
+    event = SleepEvent()
+    await processor.enqueue(event)
+    await asyncio.sleep(0.01)
+    assert event.status == EventStatus.PENDING
+
+    processor.open = True
+    await processor.notify_capacity()
+    await asyncio.wait_for(processor.wait_for(event), timeout=1)
+    assert event.status == EventStatus.COMPLETED
+    await processor.stop()
+
+
+class FailingEvent(SleepEvent):
+    async def invoke(self) -> None:
+        self.status = EventStatus.FAILED
+
+
+async def test_store_indexes_follow_status_transitions():
+    executor = SleepExecutor(
+        processor_config={"queue_capacity": 5, "capacity_refresh_time": 1}
+    )
+    await executor.start()
+    ok, bad = SleepEvent(), FailingEvent()
+    await executor.append(ok)
+    await executor.append(bad)
+    assert set(executor.store.ids(EventStatus.PENDING)) == {ok.id, bad.id}
+
+    await executor.forward()
+    assert ok.id in executor.store.ids(EventStatus.COMPLETED)
+    assert bad.id in executor.store.ids(EventStatus.FAILED)
+    assert executor.store.count(EventStatus.PENDING) == 0
+    assert list(executor.completed_events) == [ok]
+    assert list(executor.failed_events) == [bad]
+
+    assert executor.pop(ok.id) is ok
+    assert ok not in executor
+    assert executor.store.count(EventStatus.COMPLETED) == 0
+    ok.status = EventStatus.PENDING  # no longer tracked
+    assert executor.store.count(EventStatus.PENDING) == 0
+
+
+async def test_store_evicts_oldest_finished_events():
+    executor = SleepExecutor(
+        processor_config={"queue_capacity": 10, "capacity_refresh_time": 1},
+        max_finished_events=2,
+    )
+    await executor.start()
+    events = [SleepEvent() for _ in range(4)]
+    for e in events:
+        await executor.append(e)
+    await executor.forward()
+
+    assert list(executor.completed_events) == events[2:]
+    assert len(executor.pile) == 2
+    assert events[0] not in executor
+
+
+def test_store_expires_finished_events(monkeypatch):
+    from lionagi.protocols.generic import processor as processor_module
+
+    now = [100.0]
+    monkeypatch.setattr(processor_module.time, "monotonic", lambda: now[0])
+    store = EventStore(Pile(item_type={Event}), finished_ttl=10)
+    old, new = SleepEvent(), SleepEvent()
+    store.add(old)
+    store.add(new)
+    old.status = EventStatus.COMPLETED
+    now[0] = 105.0
+    new.status = EventStatus.COMPLETED
+
+    now[0] = 112.0
+    assert list(store.ids(EventStatus.COMPLETED)) == [new.id]
+    assert old not in store
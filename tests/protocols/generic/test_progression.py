@@ -383,3 +383,70 @@ def test_progression_serialization_advanced():
         isinstance(elem, IDType) for elem in deserialized
     )  # IDs are IDTypes
     assert p == deserialized
+
+
+def test_progression_index_matches_list_semantics():
+    ids = [IDType.create() for _ in range(20)]
+    p = Progression()
+    shadow = []
+    rng = random.Random(0)
+
+    for _ in range(500):
+        op = rng.choice(["append", "include", "exclude", "popleft", "pop"])
+        ref = rng.choice(ids)
+        if op == "append":
+            p.append(ref)
+            shadow.append(ref)
+        elif op == "include":
+            p.include(ref)
+            if ref not in shadow:
+                shadow.append(ref)
+        elif op == "exclude":
+            p.exclude(ref)
+            shadow = [x for x in shadow if x != ref]
+        elif shadow:
+            assert (p.popleft() if op == "popleft" else p.pop()) == (
+                shadow.pop(0) if op == "popleft" else shadow.pop()
+            )
+
+        assert p.order == shadow
+        probe = rng.choice(ids)
+        assert (probe in p) == (probe in shadow)
+        assert p.count(probe) == shadow.count(probe)
+        if probe in shadow:
+            assert p.index(probe) == shadow.index(probe)
+
+
+def test_progression_index_survives_external_order_changes():
+    ids = [IDType.create() for _ in range(3)]
+    p = Progression(order=ids[:2])
+    assert ids[2] not in p
+
+    p.order.append(ids[2])
+    assert ids[2] in p
+    p.order = [ids[1]]
+    assert ids[0] not in p
+    assert p.index(ids[1]) == 0
+
+
+def test_progression_large_scale_performance():
+    import time
+
+    n = 1_000_000
+    ids = [IDType.create() for _ in range(n)]
+    p = Progression()
+
+    start_time = time.perf_counter()
+    for i in ids:
+        p.include(i)
+    assert all(i in p for i in ids[-1000:])
+    assert p.index(ids[-1]) == n - 1
+    for _ in range(1000):
+        p.popleft()
+    assert p.index(ids[-1]) == n - 1001
+    p.exclude(ids[-1])
+    elapsed = time.perf_counter() - start_time
+
+    assert len(p) == n - 1001
+    # a linear scan per include would take minutes at this size
+    assert elapsed < 30
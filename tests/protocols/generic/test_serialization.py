@@ -0,0 +1,117 @@
+import json
+from enum import Enum
+from uuid import uuid4
+
+import pytest
+
+from lionagi.operatives.action.tool import Tool
+from lionagi.protocols.generic.serialization import (
+    json_dumpb,
+    json_dumps,
+    json_loads,
+)
+from lionagi.protocols.types import (
+    ActionRequest,
+    AssistantResponse,
+    Element,
+    IDType,
+    Instruction,
+    Pile,
+)
+from lionagi.session.branch import Branch
+
+
+def as_json(d: dict):
+    """The stdlib round trip `to_json` is expected to match."""
+
+    def default(o):
+        return list(o) if isinstance(o, set) else str(o)
+
+    return json.loads(json.dumps(d, default=default))
+
+
+class Color(Enum):
+    RED = "red"
+
+
+def double(x: int) -> int:
+    return 2 * x
+
+
+def make_branch(n: int = 5) -> Branch:
+    branch = Branch(system="be brief")
+    for i in range(n):
+        branch.msgs.add_message(
+            instruction=f"question {i}",
+            context={"i": i},
+            sender=branch.user or "user",
+            recipient=branch.id,
+        )
+        branch.msgs.add_message(
+            assistant_response=f"answer {i}", sender=branch.id
+        )
+    return branch
+
+
+def test_json_dumpb_handles_element_values():
+    id_ = IDType(uuid4())
+    data = {"id": id_, "tags": {"a"}, "color": Color.RED, 1: "one"}
+    assert json_loads(json_dumpb(data)) == {
+        "id": str(id_),
+        "tags": ["a"],
+        "color": "red",
+        "1": "one",
+    }
+    element = Element()
+    assert json_loads(json_dumps(element)) == as_json(element.to_dict())
+
+
+def test_json_dumpb_falls_back_for_big_integers():
+    assert json_loads(json_dumpb({"n": 2**70})) == {"n": 2**70}
+    assert json_dumps([1], indent=True) == "[\n  1\n]"
+
+
+@pytest.mark.parametrize(
+    "element",
+    [
+        Element(metadata={"k": "v"}),
+        Instruction.create(
+            instruction="hi", context={"x": 1}, sender="user", recipient="a"
+        ),
+        AssistantResponse.create(assistant_response="hello", sender="a"),
+        ActionRequest.create(function="f", arguments={"x": 1}),
+        Tool(func_callable=double),
+    ],
+)
+def test_to_json_matches_to_dict(element):
+    assert json.loads(element.to_json()) == as_json(element.to_dict())
+
+
+def test_pile_to_json_matches_to_dict():
+    pile = Pile(
+        [
+            Instruction.create(instruction="q", sender="user"),
+            AssistantResponse.create(assistant_response="a"),
+            Tool(func_callable=double),
+        ]
+    )
+    assert json.loads(pile.to_json()) == as_json(pile.to_dict())
+
+    pile.exclude(pile[-1])
+    assert list(Pile.from_dict(json.loads(pile.to_json())).keys()) == list(
+        pile.keys()
+    )
+
+
+def test_branch_to_json_matches_to_dict():
+    branch = make_branch()
+    data = json.loads(branch.to_json(indent=True))
+    assert data == as_json(branch.to_dict())
+    assert len(data["messages"]["collections"]) == 11
+
+
+def test_to_json_leaves_to_dict_unchanged():
+    msg = Instruction.create(instruction="q", sender="user")
+    msg.to_json()
+    assert "lion_class" not in msg.metadata
+    assert msg.to_dict()["metadata"]["lion_class"].endswith("Instruction")
@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+from lionagi.protocols.types import InMemorySpanExporter, Span, Tracer
+
+
+@pytest.fixture
+def exporter():
+    tracer = Tracer()
+    exporter = tracer.add_exporter(InMemorySpanExporter())
+    return tracer, exporter
+
+
+def test_disabled_tracer_returns_noop_span():
+    tracer = Tracer()
+    span = tracer.span("anything", model="x")
+    assert not tracer.enabled
+    assert not isinstance(span, Span)
+    with span as s:
+        s.set_attribute("tokens", 3)
+        s.record_error("ignored")
+    assert Tracer.current() is None
+
+
+def test_nested_spans_share_trace_and_parent(exporter):
+    tracer, exporter = exporter
+    with tracer.span("outer", model="m") as outer:
+        assert Tracer.current() is outer
+        with tracer.span("inner", tokens=None) as inner:
+            inner.set_attribute("tokens", 12)
+    assert Tracer.current() is None
+
+    assert [s.name for s in exporter.spans] == ["inner", "outer"]
+    assert inner.trace_id == outer.trace_id
+    assert inner.parent_id == outer.span_id
+    assert exporter.children(outer) == [inner]
+    assert inner.attributes == {"tokens": 12}
+    assert outer.status == "ok" and outer.duration >= 0
+    assert outer.to_dict()["trace_id"] == f"{outer.trace_id:032x}"
+
+
+def test_errors_mark_the_span(exporter):
+    tracer, exporter = exporter
+    with pytest.raises(KeyError):
+        with tracer.span("boom"):
+            raise KeyError("missing")
+    (span,) = exporter.find("boom")
+    assert span.status == "error"
+    assert "missing" in span.error
+
+
+async def test_tasks_inherit_the_active_span(exporter):
+    tracer, exporter = exporter
+
+    async def child():
+        with tracer.span("child"):
+            await asyncio.sleep(0)
+
+    with tracer.span("root") as root:
+        await asyncio.gather(child(), child())
+
+    children = exporter.children(root)
+    assert len(children) == 2
+    assert exporter.summary()["child"]["count"] == 2
+
+
+def test_explicit_parent_and_start_time(exporter):
+    tracer, exporter = exporter
+    root = tracer.span("root")
+    tracer.span("waited", parent=root, start_ns=root.start_ns).end()
+    root.end()
+    root.end()
+
+    waited = exporter.find("waited")[0]
+    assert waited.parent_id == root.span_id
+    assert waited.start_ns == root.start_ns
+    assert len(exporter.spans) == 2
@@ -0,0 +1,79 @@
+import asyncio
+from collections.abc import Callable
+
+from lionagi.service.endpoints.base import EndPoint
+from lionagi.service.imodel import iModel
+
+
+def chat_completion(content: str, **extra) -> dict:
+    return {
+        "choices": [{"message": {"role": "assistant", "content": content}}],
+        **extra,
+    }
+
+
+class StubEndPoint(EndPoint):
+    """In-process chat endpoint for service tests.
+
+    The i-th call (1-based) waits `delays[i - 1]` seconds, the last delay
+    repeating, then returns `respond(i, payload)`; by default a chat
+    completion answering "done" with the call number under "call".
+    Keyword arguments override the endpoint config.
+    """
+
+    def __init__(
+        self,
+        respond: Callable[[int, dict], dict] | None = None,
+        *,
+        delays: tuple[float, ...] = (0,),
+        **config,
+    ):
+        super().__init__(
+            {
+                "provider": "stub",
+                "base_url": "http://stub",
+                "endpoint": "chat",
+                "is_invokeable": True,
+                "is_streamable": True,
+                "optional_kwargs": {"messages", "model", "stream"},
+                **config,
+            }
+        )
+        self.respond = respond
+        self.delays = list(delays)
+        self.calls = 0
+        self.cancelled = 0
+
+    async def _invoke(self, payload, headers, **kwargs):
+        self.calls += 1
+        delay = self.delays[min(self.calls, len(self.delays)) - 1]
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.respond is not None:
+            return self.respond(self.calls, payload)
+        return chat_completion("done", call=self.calls)
+
+    async def _stream(self, payload, headers, **kwargs):
+        yield {"choices": [{"index": 0, "delta": {"content": "part"}}]}
+        await self._invoke(payload, headers)
+        yield {"choices": [{"index": 0, "delta": {"content": "done"}}]}
+
+
+def make_model(endpoint: EndPoint | None = None, **kwargs) -> iModel:
+    """An iModel on `endpoint` (a default stub) that never queues calls."""
+    config = {
+        "api_key": "test",
+        "queue_capacity": 100,
+        "capacity_refresh_time": 0.01,
+        **kwargs,
+    }
+    if endpoint is None:
+        endpoint = StubEndPoint()
+    return iModel(endpoint=endpoint, **config)
+
+
+def messages(text: str = "hi") -> list[dict]:
+    return [{"role": "user", "content": text}]
@@ -0,0 +1,269 @@
+import json
+
+import pytest
+from aiohttp import web
+
+from lionagi.protocols.types import EventStatus
+from lionagi.service.endpoints.batch import OpenAIBatchBackend
+from lionagi.service.imodel import iModel
+
+from .conftest import messages
+
+
+class BatchStandIn:
+    """Local stand-in for the OpenAI and Anthropic batch APIs.
+
+    Each request is answered by echoing its last user message; a message
+    of "fail" yields a per-request error. Batches finish after `polls`
+    status checks.
+    """
+
+    def __init__(self, polls: int = 2):
+        self.polls = polls
+        self.files: dict[str, str] = {}
+        self.batches: dict[str, dict] = {}
+        self.cancelled: list[str] = []
+        self.base = ""
+
+    @staticmethod
+    def reply(body: dict) -> str | None:
+        text = body["messages"][-1]["content"]
+        if isinstance(text, list):
+            text = text[-1]["text"]
+        return None if text == "fail" else text.upper()
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/v1/files", self.upload)
+        app.router.add_get("/v1/files/{id}/content", self.download)
+        app.router.add_post("/v1/batches", self.create_openai)
+        app.router.add_get("/v1/batches/{id}", self.status_openai)
+        app.router.add_post("/v1/messages/batches", self.create_anthropic)
+        app.router.add_get("/v1/messages/batches/{id}", self.status_anthropic)
+        app.router.add_post("/v1/batches/{id}/cancel", self.cancel)
+        app.router.add_post("/v1/messages/batches/{id}/cancel", self.cancel)
+        return app
+
+    def _tick(self, batch_id: str) -> bool:
+        batch = self.batches[batch_id]
+        batch["polls"] += 1
+        return batch["polls"] >= self.polls
+
+    async def cancel(self, request: web.Request):
+        batch_id = request.match_info["id"]
+        self.cancelled.append(batch_id)
+        return web.json_response({"id": batch_id, "status": "cancelling"})
+
+    async def upload(self, request: web.Request):
+        form = await request.post()
+        assert form["purpose"] == "batch"
+        file_id = f"file-{len(self.files)}"
+        self.files[file_id] = form["file"].file.read().decode()
+        return web.json_response({"id": file_id})
+
+    async def download(self, request: web.Request):
+        return web.Response(text=self.files[request.match_info["id"]])
+
+    async def create_openai(self, request: web.Request):
+        body = await request.json()
+        assert body["endpoint"] == "/v1/chat/completions"
+        lines = [
+            json.loads(x)
+            for x in self.files[body["input_file_id"]].splitlines()
+        ]
+        out, errors = [], []
+        for line in lines:
+            assert line["url"] == "/v1/chat/completions"
+            text = self.reply(line["body"])
+            if text is None:
+                errors.append(
+                    {
+                        "custom_id": line["custom_id"],
+                        "response": {
+                            "status_code": 400,
+                            "body": {"error": {"message": "bad request"}},
+                        },
+                    }
+                )
+                continue
+            out.append(
+                {
+                    "custom_id": line["custom_id"],
+                    "response": {
+                        "status_code": 200,
+                        "body": {
+                            "choices": [
+                                {
+                                    "message": {
+                                        "role": "assistant",
+                                        "content": text,
+                                    }
+                                }
+                            ],
+                            "usage": {"total_tokens": 3},
+                        },
+                    },
+                }
+            )
+        batch_id = f"batch-{len(self.batches)}"
+        self.files[f"{batch_id}-out"] = "\n".join(json.dumps(x) for x in out)
+        self.files[f"{batch_id}-err"] = "\n".join(
+            json.dumps(x) for x in errors
+        )
+        self.batches[batch_id] = {"polls": 0, "size": len(lines)}
+        return web.json_response({"id": batch_id, "status": "validating"})
+
+    async def status_openai(self, request: web.Request):
+        batch_id = request.match_info["id"]
+        if not self._tick(batch_id):
+            return web.json_response({"id": batch_id, "status": "in_progress"})
+        return web.json_response(
+            {
+                "id": batch_id,
+                "status": "completed",
+                "output_file_id": f"{batch_id}-out",
+                "error_file_id": f"{batch_id}-err",
+            }
+        )
+
+    async def create_anthropic(self, request: web.Request):
+        assert request.headers["x-api-key"] == "test"
+        body = await request.json()
+        results = []
+        for item in body["requests"]:
+            text = self.reply(item["params"])
+            result = (
+                {"type": "errored", "error": {"type": "invalid_request_error"}}
+                if text is None
+                else {
+                    "type": "succeeded",
+                    "message": {
+                        "id": "msg",
+                        "model": item["params"]["model"],
+                        "content": [{"type": "text", "text": text}],
+                        "stop_reason": "end_turn",
+                        "usage": {"input_tokens": 2, "output_tokens": 1},
+                    },
+                }
+            )
+            results.append({"custom_id": item["custom_id"], "result": result})
+        batch_id = f"msgbatch-{len(self.batches)}"
+        self.files[batch_id] = "\n".join(json.dumps(x) for x in results)
+        self.batches[batch_id] = {"polls": 0, "size": len(results)}
+        return web.json_response(
+            {"id": batch_id, "processing_status": "in_progress"}
+        )
+
+    async def status_anthropic(self, request: web.Request):
+        batch_id = request.match_info["id"]
+        if not self._tick(batch_id):
+            return web.json_response(
+                {"id": batch_id, "processing_status": "in_progress"}
+            )
+        return web.json_response(
+            {
+                "id": batch_id,
+                "processing_status": "ended",
+                "results_url": f"{self.base}/v1/files/{batch_id}/content",
+            }
+        )
+
+
+@pytest.fixture
+async def stand_in():
+    server = BatchStandIn()
+    runner = web.AppRunner(server.app())
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    server.base = f"http://127.0.0.1:{port}"
+    yield server
+    await runner.cleanup()
+
+
+def prompts(*texts: str) -> list[dict]:
+    return [{"messages": messages(t)} for t in texts]
+
+
+@pytest.mark.parametrize("provider", ["openai", "anthropic"])
+async def test_batch_invoke_maps_results_to_calls(stand_in, provider):
+    kwargs = {"max_tokens": 16} if provider == "anthropic" else {}
+    model = iModel(
+        provider=provider,
+        model="m",
+        api_key="test",
+        base_url=f"{stand_in.base}/v1",
+        **kwargs,
+    )
+
+    calls = await model.batch_invoke(
+        prompts("a", "fail", "c"), poll_interval=0.01, timeout=5
+    )
+
+    assert [c.status for c in calls] == [
+        EventStatus.COMPLETED,
+        EventStatus.FAILED,
+        EventStatus.COMPLETED,
+    ]
+    assert calls[0].response["choices"][0]["message"]["content"] == "A"
+    assert calls[2].response["choices"][0]["message"]["content"] == "C"
+    assert calls[0].used_tokens == 3
+    assert calls[1].execution.error
+    assert len(stand_in.batches) == 1
+    assert next(iter(stand_in.batches.values()))["polls"] == 2
+    await model.endpoint.close()
+
+
+@pytest.mark.parametrize("provider", ["openai", "anthropic"])
+async def test_timed_out_batch_is_cancelled(stand_in, provider):
+    stand_in.polls = 1000
+    kwargs = {"max_tokens": 16} if provider == "anthropic" else {}
+    model = iModel(
+        provider=provider,
+        model="m",
+        api_key="test",
+        base_url=f"{stand_in.base}/v1",
+        **kwargs,
+    )
+
+    calls = await model.batch_invoke(
+        prompts("a", "b"), poll_interval=0.01, timeout=0.05
+    )
+
+    assert all(c.status == EventStatus.FAILED for c in calls)
+    assert "did not finish" in calls[0].execution.error
+    assert stand_in.cancelled == list(stand_in.batches)
+    await model.endpoint.close()
+
+
+async def test_batches_are_split_at_provider_limit(stand_in):
+    model = iModel(
+        provider="openai",
+        model="m",
+        api_key="test",
+        base_url=f"{stand_in.base}/v1",
+    )
+    backend = OpenAIBatchBackend(model.endpoint)
+    backend.max_requests = 2
+
+    calls = await model.batch_invoke(
+        prompts("a", "b", "c", "d", "e"), poll_interval=0.01, backend=backend
+    )
+
+    assert len(stand_in.batches) == 3
+    assert all(c.status == EventStatus.COMPLETED for c in calls)
+    assert [c.response["choices"][0]["message"]["content"] for c in calls] == [
+        "A",
+        "B",
+        "C",
+        "D",
+        "E",
+    ]
+    await model.endpoint.close()
+
+
+async def test_unsupported_provider_is_rejected():
+    model = iModel(provider="groq", model="m", api_key="test")
+    with pytest.raises(ValueError):
+        await model.batch_invoke(prompts("a"))
@@ -0,0 +1,85 @@
+import asyncio
+
+from lionagi.protocols.types import EventStatus
+from lionagi.service.endpoints.coalesce import RequestCoalescer
+from lionagi.service.imodel import iModel
+
+from .conftest import StubEndPoint, make_model, messages
+
+
+def slow_endpoint() -> StubEndPoint:
+    """Answers with its call count after 50ms."""
+    return StubEndPoint(lambda n, _: {"answer": n}, delays=(0.05,))
+
+
+def coalescing_model(endpoint: StubEndPoint, **kwargs) -> iModel:
+    kwargs.setdefault("coalesce_requests", True)
+    return make_model(endpoint, **kwargs)
+
+
+async def test_identical_calls_share_one_request():
+    endpoint = slow_endpoint()
+    models = [coalescing_model(endpoint) for _ in range(3)]
+    before = RequestCoalescer.default().coalesced
+
+    calls = await asyncio.gather(
+        *(m.invoke(messages=messages("hi")) for m in models * 2)
+    )
+
+    assert endpoint.calls == 1
+    assert len({c.id for c in calls}) == 6
+    assert all(c.status == EventStatus.COMPLETED for c in calls)
+    assert all(c.execution.response == {"answer": 1} for c in calls)
+    assert calls[0].execution.response is not calls[1].execution.response
+    assert RequestCoalescer.default().coalesced - before == 5
+    assert len(RequestCoalescer.default()) == 0
+
+
+async def test_distinct_or_opted_out_calls_are_not_coalesced():
+    endpoint = slow_endpoint()
+    model = coalescing_model(endpoint)
+    await asyncio.gather(
+        model.invoke(messages=messages("a")),
+        model.invoke(messages=messages("b")),
+    )
+    assert endpoint.calls == 2
+
+    await asyncio.gather(
+        *(model.invoke(messages=messages("a"), coalesce=False) for _ in "xy")
+    )
+    assert endpoint.calls == 4
+
+    other = coalescing_model(endpoint, coalesce_requests=False)
+    await asyncio.gather(*(other.invoke(messages=messages("c")) for _ in "xy"))
+    assert endpoint.calls == 6
+
+
+async def test_coalescing_is_opt_in_and_scoped_to_the_api_key():
+    endpoint = slow_endpoint()
+    default = iModel(endpoint=endpoint, api_key="test")
+    assert not default.coalesce_requests
+    await asyncio.gather(
+        *(default.invoke(messages=messages("d")) for _ in "xy")
+    )
+    assert endpoint.calls == 2
+
+    other_key = coalescing_model(endpoint, api_key="other")
+    await asyncio.gather(
+        coalescing_model(endpoint).invoke(messages=messages("e")),
+        other_key.invoke(messages=messages("e")),
+    )
+    assert endpoint.calls == 4
+
+
+async def test_followers_retry_when_leader_is_cancelled():
+    endpoint = slow_endpoint()
+    model = coalescing_model(endpoint)
+    leader = asyncio.create_task(model.invoke(messages=messages("z")))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(model.invoke(messages=messages("z")))
+    await asyncio.sleep(0.01)
+    leader.cancel()
+
+    call = await follower
+    assert call.status == EventStatus.COMPLETED
+    assert endpoint.calls == 2
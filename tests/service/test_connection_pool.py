@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from lionagi.service.endpoints.base import APICalling, EndPoint
+from lionagi.service.endpoints.rate_limited_processor import (
+    RateLimitedAPIExecutor,
+)
+
+from .conftest import StubEndPoint
+
+
+@pytest.fixture
+async def stub_server():
+    peers = set()
+
+    async def handler(request: web.Request):
+        peers.add(request.transport.get_extra_info("peername"))
+        return web.json_response({"ok": True})
+
+    app = web.Application()
+    app.router.add_post("/echo", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    yield f"http://127.0.0.1:{port}", peers
+    await runner.cleanup()
+
+
+def make_endpoint(base_url: str, **kwargs) -> StubEndPoint:
+    return StubEndPoint(
+        base_url=base_url,
+        endpoint="echo",
+        is_invokeable=False,
+        is_streamable=False,
+        optional_kwargs={"x"},
+        **kwargs,
+    )
+
+
+def make_call(endpoint: EndPoint, x: int) -> APICalling:
+    return APICalling(
+        payload={"x": x},
+        headers={},
+        endpoint=endpoint,
+        should_invoke_endpoint=False,
+    )
+
+
+async def test_calls_reuse_pooled_connections(stub_server):
+    base_url, peers = stub_server
+    endpoint = make_endpoint(base_url, connection_limit=4)
+
+    calls = [make_call(endpoint, i) for i in range(50)]
+    await asyncio.gather(*(c.invoke() for c in calls))
+
+    assert all(c.execution.response == {"ok": True} for c in calls)
+    assert len(peers) <= 4
+    await endpoint.close()
+
+
+async def test_executor_stop_closes_endpoint_session(stub_server):
+    base_url, _ = stub_server
+    endpoint = make_endpoint(base_url)
+    executor = RateLimitedAPIExecutor(
+        queue_capacity=10, capacity_refresh_time=1
+    )
+    await executor.start()
+
+    call = make_call(endpoint, 1)
+    await executor.append(call)
+    await executor.forward()
+    session = endpoint.get_session()
+    assert not session.closed
+
+    await executor.stop()
+    assert session.closed
+    assert endpoint._session is None
+
+
+def test_session_of_a_finished_loop_is_closed_on_replacement():
+    endpoint = make_endpoint("http://stub")
+
+    async def open_session():
+        return endpoint.get_session()
+
+    async def reopen_session():
+        session = endpoint.get_session()
+        await asyncio.sleep(0)
+        await endpoint.close()
+        return session
+
+    old = asyncio.run(open_session())
+    assert not old.closed
+    new = asyncio.run(reopen_session())
+    assert new is not old
+    assert old.closed and new.closed
@@ -0,0 +1,149 @@
+import asyncio
+import time
+
+import pytest
+
+from lionagi.protocols.types import EventStatus
+from lionagi.service.endpoints.deadline import (
+    DeadlineExceeded,
+    current_deadline,
+    deadline_scope,
+    with_deadline,
+)
+from lionagi.service.imodel import iModel
+from lionagi.session.branch import Branch
+
+from .conftest import StubEndPoint, make_model, messages
+
+
+def stalling_model(*delays: float, **kwargs) -> iModel:
+    """A model whose i-th call answers after `delays[i]` seconds."""
+    return make_model(StubEndPoint(delays=delays), **kwargs)
+
+
+async def test_scopes_only_shorten_the_deadline():
+    assert current_deadline() is None
+    with deadline_scope(10) as outer:
+        with deadline_scope(100) as inner:
+            assert inner == outer
+        with deadline_scope(1) as inner:
+            assert inner < outer
+    assert current_deadline() is None
+
+    @with_deadline
+    async def probe():
+        return current_deadline()
+
+    assert await probe() is None
+    assert await probe(timeout=5) == pytest.approx(time.monotonic() + 5, 0.1)
+
+
+async def test_invoke_timeout_cancels_a_stalled_call():
+    model = stalling_model(5)
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        await model.invoke(messages=messages(), timeout=0.05)
+
+    assert time.monotonic() - start < 1
+    assert model.endpoint.cancelled == 1
+    failed = list(model.executor.failed_events)
+    assert failed[0].deadline_exceeded
+    assert failed[0].status == EventStatus.FAILED
+
+
+async def test_expired_queued_call_spends_no_budget():
+    model = stalling_model(0, limit_requests=1, capacity_refresh_time=60)
+    await model.invoke(messages=messages())
+
+    with pytest.raises(DeadlineExceeded):
+        await model.invoke(messages=messages("again"), timeout=0.05)
+    assert model.endpoint.calls == 1
+
+
+async def test_slow_call_is_hedged_and_the_loser_cancelled():
+    model = stalling_model(5, 0.01, hedge_after=0.05)
+
+    start = time.monotonic()
+    call = await model.invoke(messages=messages())
+
+    assert time.monotonic() - start < 1
+    assert call.response["call"] == 2
+    assert model.hedges == 1 and model.hedge_wins == 1
+    await asyncio.sleep(0)
+    assert model.endpoint.cancelled == 1
+    assert len(model.executor.store.pile) == 0
+
+    fast = await model.invoke(messages=messages("fast"), hedge=False)
+    assert fast.response["call"] == 3
+    assert model.hedges == 1
+
+
+async def test_hedges_go_to_an_alternate_model():
+    backup = stalling_model(0.01)
+    model = stalling_model(5, hedge_after=0.02, hedge_to=backup)
+
+    call = await model.invoke(messages=messages())
+
+    assert call.endpoint is backup.endpoint
+    assert backup.endpoint.calls == 1
+
+
+def test_hedge_delay_follows_latency_percentile():
+    model = stalling_model(0, hedge_after=2, hedge_percentile=90)
+    assert model.hedge_delay() == 2
+    model.latencies.extend(i / 100 for i in range(1, 101))
+    assert model.hedge_delay() == pytest.approx(0.91)
+
+
+async def test_coalesced_follower_keeps_its_own_deadline():
+    model = stalling_model(5, coalesce_requests=True)
+    leader = asyncio.create_task(model.invoke(messages=messages()))
+    await asyncio.sleep(0.01)
+
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        await model.invoke(messages=messages(), timeout=0.05)
+    assert time.monotonic() - start < 1
+    assert not leader.done()
+
+    leader.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+
+async def test_coalesced_follower_outlives_the_leaders_deadline():
+    model = stalling_model(5, 0.01, coalesce_requests=True)
+    leader = asyncio.create_task(
+        model.invoke(messages=messages(), timeout=0.05)
+    )
+    await asyncio.sleep(0.01)
+    follower = asyncio.create_task(model.invoke(messages=messages()))
+
+    with pytest.raises(DeadlineExceeded):
+        await leader
+    call = await follower
+    assert call.status == EventStatus.COMPLETED
+    assert call.response["call"] == 2
+
+
+async def test_branch_operation_deadline_reaches_the_call():
+    branch = Branch(chat_model=stalling_model(5))
+    with pytest.raises(DeadlineExceeded):
+        await branch.communicate("hi", timeout=0.05)
+
+
+async def test_stream_deadline_cancels_a_stalled_stream():
+    branch = Branch(chat_model=stalling_model(5))
+    before = len(branch.messages)
+    received = []
+    with pytest.raises(DeadlineExceeded):
+        async for text in branch.communicate_stream("hi", timeout=0.05):
+            received.append(text)
+
+    assert received == ["part"]
+    assert branch.chat_model.endpoint.cancelled == 1
+    assert len(branch.messages) == before
+
+    model = stalling_model(0.01)
+    chunks = [c async for c in model.iter_stream(messages=messages())]
+    assert len(chunks) == 2
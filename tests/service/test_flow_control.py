@@ -0,0 +1,302 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from lionagi._errors import CircuitOpenError, ExecutionError, RateLimitError
+from lionagi.protocols.types import EventStatus
+from lionagi.service.endpoints.base import APICalling, EndPoint
+from lionagi.service.endpoints.flow_control import (
+    AdaptiveLimiter,
+    RateLimitInfo,
+    backoff_delay,
+    classify_error,
+)
+from lionagi.service.endpoints.rate_limited_processor import (
+    RateLimitedAPIProcessor,
+)
+
+from .conftest import StubEndPoint
+
+
+def test_parses_openai_headers():
+    info = RateLimitInfo.from_headers(
+        {
+            "x-ratelimit-remaining-requests": "0",
+            "x-ratelimit-remaining-tokens": "1500",
+            "x-ratelimit-reset-requests": "1m30s",
+            "x-ratelimit-reset-tokens": "20ms",
+        }
+    )
+    assert info.remaining_requests == 0
+    assert info.remaining_tokens == 1500
+    assert info.reset_requests == 90
+    assert info.reset_tokens == pytest.approx(0.02)
+    assert info.exhausted_for == 90
+
+
+def test_parses_anthropic_and_retry_after_headers():
+    reset = datetime.now(timezone.utc) + timedelta(seconds=30)
+    info = RateLimitInfo.from_headers(
+        {
+            "Retry-After": "7",
+            "anthropic-ratelimit-tokens-remaining": "0",
+            "anthropic-ratelimit-tokens-reset": reset.isoformat(),
+        }
+    )
+    assert info.retry_after == 7
+    assert info.remaining_tokens == 0
+    assert 28 < info.reset_tokens <= 30
+
+    passthrough = RateLimitInfo.from_headers(
+        {"llm_provider-retry-after-ms": "250"}
+    )
+    assert passthrough.retry_after == 0.25
+    assert not RateLimitInfo.from_headers({"content-type": "json"})
+
+
+def test_backoff_is_jittered_and_honors_retry_after():
+    delays = [backoff_delay(3, base=1, cap=5) for _ in range(200)]
+    assert all(0 <= d <= 5 for d in delays)
+    assert len(set(delays)) > 1
+    assert 2 <= backoff_delay(0, base=0.5, retry_after=2) <= 2.5
+
+
+def test_classify_error():
+    throttled = ExecutionError("slow down")
+    throttled.status_code = 429
+    server = ExecutionError("boom")
+    server.status_code = 503
+    assert classify_error(RateLimitError("x")) == "throttle"
+    assert classify_error(throttled) == "throttle"
+    assert classify_error(server) == "transient"
+    assert classify_error(aiohttp.ClientConnectionError()) == "transient"
+    assert classify_error(ValueError("bad request")) == "fatal"
+
+
+async def test_limiter_caps_concurrency_and_applies_aimd():
+    flow = AdaptiveLimiter(initial=2)
+    active, peak = 0, 0
+
+    async def work():
+        nonlocal active, peak
+        async with flow.slot():
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            flow.success()
+
+    await asyncio.gather(*(work() for _ in range(6)))
+    assert peak == 2
+    assert flow.limit > 2
+
+    before = flow.limit
+    flow.throttle()
+    assert flow.limit == pytest.approx(before / 2)
+    flow.throttle(RateLimitInfo(retry_after=10))
+    flow.throttle()
+    # throttles during a pause count as one congestion event
+    assert flow.limit == pytest.approx(max(1, before / 4))
+
+
+async def test_circuit_opens_and_recovers_through_a_probe():
+    flow = AdaptiveLimiter(failure_threshold=2, recovery_time=0.05)
+    flow.failure()
+    flow.failure()
+    assert flow.state == "open"
+    with pytest.raises(CircuitOpenError):
+        async with flow.slot():
+            pass
+
+    await asyncio.sleep(0.06)
+    assert flow.state == "half_open"
+    async with flow.slot() as probe:
+        assert probe is not None
+        with pytest.raises(CircuitOpenError):
+            async with flow.slot():
+                pass
+        flow.success()
+        assert flow.state == "half_open"
+        flow.success(probe=probe)
+    assert flow.state == "closed"
+
+
+async def test_cancelled_probe_frees_the_next_probe():
+    flow = AdaptiveLimiter(failure_threshold=1, recovery_time=0.05)
+    flow.failure()
+    await asyncio.sleep(0.06)
+
+    async def probe():
+        async with flow.slot():
+            pass
+
+    flow.resume_at = float("inf")  # the probe waits for its slot
+    task = asyncio.create_task(probe())
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert flow.inflight == 0
+
+    flow.resume_at = 0.0
+    async with flow.slot() as probe:
+        flow.success(probe=probe)
+    assert flow.state == "closed"
+
+
+async def test_only_the_probe_releases_the_half_open_circuit():
+    flow = AdaptiveLimiter(failure_threshold=1, recovery_time=0.05)
+
+    async def hold(release: asyncio.Event):
+        async with flow.slot():
+            await release.wait()
+
+    release_earlier, release_probe = asyncio.Event(), asyncio.Event()
+    earlier = asyncio.create_task(hold(release_earlier))
+    await asyncio.sleep(0)
+    flow.failure()
+    await asyncio.sleep(0.06)
+    probe = asyncio.create_task(hold(release_probe))
+    await asyncio.sleep(0)
+
+    # a request admitted before the circuit opened ends first
+    release_earlier.set()
+    await earlier
+    with pytest.raises(CircuitOpenError):
+        async with flow.slot():
+            pass
+
+    release_probe.set()
+    await probe
+    assert flow._probe is None
+
+
+@pytest.mark.parametrize("outcome", ["throttle", "failure"])
+async def test_stale_outcomes_do_not_decide_the_half_open_circuit(outcome):
+    flow = AdaptiveLimiter(failure_threshold=1, recovery_time=0.05)
+    flow.failure()
+    await asyncio.sleep(0.06)
+
+    async with flow.slot() as probe:
+        # a request sent before the circuit opened reports late
+        getattr(flow, outcome)()
+        assert flow.state == "half_open"
+        with pytest.raises(CircuitOpenError):
+            async with flow.slot():
+                pass
+        flow.success(probe=probe)
+    assert flow.state == "closed"
+
+
+def test_processor_buckets_follow_provider_budget():
+    processor = RateLimitedAPIProcessor(
+        queue_capacity=10,
+        capacity_refresh_time=60,
+        limit_requests=100,
+        limit_tokens=10_000,
+    )
+    processor.sync_with_provider(
+        RateLimitInfo(remaining_requests=3, remaining_tokens=50_000)
+    )
+    assert processor.available_request == 3
+    assert processor.available_token == 10_000
+
+
+@pytest.fixture
+async def flaky_server():
+    state = {"hits": 0, "script": []}
+
+    async def handler(request: web.Request):
+        state["hits"] += 1
+        status, headers = (
+            state["script"].pop(0) if state["script"] else (200, {})
+        )
+        if status == 200:
+            return web.json_response({"ok": True}, headers=headers)
+        return web.json_response(
+            {"error": {"message": "nope"}}, status=status, headers=headers
+        )
+
+    app = web.Application()
+    app.router.add_post("/chat", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    yield f"http://127.0.0.1:{port}", state
+    await runner.cleanup()
+
+
+def make_endpoint(base_url: str, **kwargs) -> StubEndPoint:
+    return StubEndPoint(
+        base_url=base_url,
+        is_invokeable=False,
+        is_streamable=False,
+        optional_kwargs={"x"},
+        retry_base_delay=0.01,
+        **kwargs,
+    )
+
+
+def make_call(endpoint: EndPoint) -> APICalling:
+    return APICalling(
+        payload={"x": 1},
+        headers={},
+        endpoint=endpoint,
+        should_invoke_endpoint=False,
+    )
+
+
+async def test_throttled_call_waits_for_retry_after(flaky_server):
+    base_url, state = flaky_server
+    endpoint = make_endpoint(base_url)
+    state["script"] = [
+        (429, {"retry-after-ms": "100"}),
+        (200, {"x-ratelimit-remaining-requests": "41"}),
+    ]
+
+    call = make_call(endpoint)
+    start = asyncio.get_running_loop().time()
+    await call.invoke()
+
+    assert call.status == EventStatus.COMPLETED
+    assert asyncio.get_running_loop().time() - start >= 0.1
+    assert state["hits"] == 2
+    assert call.rate_limit.remaining_requests == 41
+    assert endpoint.flow.throttled == 1
+    await endpoint.close()
+
+
+async def test_client_errors_fail_without_retry(flaky_server):
+    base_url, state = flaky_server
+    endpoint = make_endpoint(base_url)
+    state["script"] = [(400, {})]
+
+    call = make_call(endpoint)
+    await call.invoke()
+
+    assert call.status == EventStatus.FAILED
+    assert state["hits"] == 1
+    await endpoint.close()
+
+
+async def test_server_errors_open_the_circuit(flaky_server):
+    base_url, state = flaky_server
+    endpoint = make_endpoint(
+        base_url, max_retries=1, circuit_failure_threshold=2
+    )
+    state["script"] = [(503, {}), (502, {})]
+
+    first = make_call(endpoint)
+    await first.invoke()
+    second = make_call(endpoint)
+    await second.invoke()
+
+    assert first.status == EventStatus.FAILED
+    assert "Circuit open" in second.execution.error
+    assert state["hits"] == 2
+    await endpoint.close()
@@ -0,0 +1,142 @@
+import asyncio
+
+import pytest
+
+from lionagi._errors import RateLimitError
+from lionagi.protocols.types import EventStatus
+from lionagi.service import iModel, iModelManager, iModelPool
+
+from .conftest import StubEndPoint, make_model, messages
+
+
+class TooManyRequests(Exception):
+    status = 429
+
+
+def member(
+    name: str, throttled: bool | str = False, max_retries: int = 0, **kwargs
+) -> iModel:
+    """A pool member reporting its name, or failing as `throttled` says."""
+
+    def respond(n: int, payload: dict) -> dict:
+        if throttled == "status":
+            raise TooManyRequests("slow down")
+        if throttled == "message":
+            raise ValueError("invalid 'rate_limit' field (code 429)")
+        if throttled:
+            raise RateLimitError("Rate limit exceeded for this key")
+        return {"served_by": name}
+
+    endpoint = StubEndPoint(
+        respond,
+        delays=(0.01,),
+        base_url=f"http://{name}",
+        optional_kwargs={"messages", "n"},
+        max_retries=max_retries,
+        retry_base_delay=0.01,
+    )
+    return make_model(endpoint, **kwargs)
+
+
+def request(i: int) -> dict:
+    return {"messages": messages(), "n": i}
+
+
+async def test_calls_are_spread_across_members():
+    pool = iModelPool(member("a"), member("b"), member("c"))
+
+    calls = await asyncio.gather(
+        *(pool.invoke(**request(i)) for i in range(9))
+    )
+
+    assert all(c.status == EventStatus.COMPLETED for c in calls)
+    assert [m.endpoint.calls for m in pool.members] == [3, 3, 3]
+
+
+async def test_least_loaded_prefers_remaining_budget():
+    busy = member("busy", limit_requests=10)
+    idle = member("idle", limit_requests=10)
+    pool = iModelPool(busy, idle)
+    await busy.executor.start()
+    busy.executor.processor.request_bucket.consume(8)
+
+    assert pool.headroom(busy) == pytest.approx(0.2, abs=0.05)
+    assert pool.members[pool.select()] is idle
+
+
+async def test_weighted_routing_follows_weights():
+    pool = iModelPool(
+        member("a"), member("b"), weights=[9, 1], strategy="weighted"
+    )
+    picks = [pool.select() for _ in range(2000)]
+    assert 0.85 < picks.count(0) / len(picks) < 0.95
+
+
+async def test_rate_limited_member_fails_over_and_is_benched():
+    throttled = member("throttled", throttled=True)
+    healthy = member("healthy")
+    pool = iModelPool(throttled, healthy, cooldown=60)
+
+    first = await pool.invoke(coalesce=False, **request(0))
+    assert first.response == {"served_by": "healthy"}
+    assert pool.failovers == 1
+    assert throttled.endpoint.calls == 1
+
+    await pool.invoke(coalesce=False, **request(1))
+    assert throttled.endpoint.calls == 1
+    assert healthy.endpoint.calls == 2
+
+
+async def test_failover_does_not_wait_for_member_retries():
+    throttled = member("throttled", throttled="status", max_retries=3)
+    healthy = member("healthy", max_retries=3)
+    pool = iModelPool(throttled, healthy)
+    pool.select = lambda exclude=frozenset(): 1 if 0 in exclude else 0
+
+    call = await pool.invoke(**request(0))
+    assert call.response == {"served_by": "healthy"}
+    assert throttled.endpoint.calls == 1
+    assert pool.failovers == 1
+
+
+async def test_errors_that_only_mention_rate_limits_do_not_fail_over():
+    pool = iModelPool(member("bad", throttled="message"), member("b"))
+    pool.select = lambda exclude=frozenset(): 1 if 0 in exclude else 0
+
+    assert await pool.invoke(**request(0)) is None
+    assert pool.failovers == 0
+
+
+async def test_all_members_throttled_returns_none():
+    pool = iModelPool(member("a", True), member("b", True))
+    assert await pool.invoke(**request(0)) is None
+    assert [m.endpoint.calls for m in pool.members] == [1, 1]
+
+
+def test_manager_registers_a_list_as_a_pool():
+    pool_members = [member("a"), member("b")]
+    manager = iModelManager()
+    manager.register_imodel("stub", pool_members)
+
+    pool = manager.registry["stub"]
+    assert isinstance(pool, iModelPool)
+    assert pool.members == pool_members
+
+    with pytest.raises(ValueError):
+        iModelPool(member("a"), weights=[1, 2])
+    with pytest.raises(ValueError):
+        iModelPool()
+
+
+def test_members_built_from_provider_and_model():
+    keys = [
+        iModel(provider="openai", model="gpt-4o-mini", api_key=key)
+        for key in ("key-a", "key-b")
+    ]
+    pool = iModelPool(*keys)
+    assert pool.endpoint.config.provider == "openai"
+    assert pool.kwargs["model"] == "gpt-4o-mini"
+
+    manager = iModelManager()
+    manager.register_imodel("gpt", keys)
+    assert manager.registry["chat"].members == keys
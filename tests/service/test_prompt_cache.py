@@ -0,0 +1,179 @@
+import copy
+
+import pytest
+
+from lionagi.service.endpoints.base import APICalling
+from lionagi.service.endpoints.prompt_cache import (
+    EPHEMERAL,
+    mark_anthropic_cache,
+    stabilize_openai_prefix,
+)
+from lionagi.service.endpoints.rate_limited_processor import (
+    RateLimitedAPIProcessor,
+)
+from lionagi.service.providers.anthropic_.messages import (
+    AnthropicChatCompletionEndPoint,
+)
+from lionagi.service.providers.openai_.chat_completions import (
+    OpenAIChatCompletionEndPoint,
+)
+
+LONG = "x" * 8000  # ~2000 estimated tokens
+
+
+def conversation(n: int) -> list[dict]:
+    msgs = [{"role": "user", "content": LONG}]
+    for i in range(n):
+        msgs.append({"role": "assistant", "content": f"reply {i}"})
+        msgs.append({"role": "user", "content": f"question {i}"})
+    return msgs
+
+
+def test_anthropic_payload_marks_stable_prefix_without_mutating_input():
+    messages = conversation(2)
+    original = copy.deepcopy(messages)
+    endpoint = AnthropicChatCompletionEndPoint()
+
+    payload = endpoint.create_payload(
+        messages=messages, model="claude", max_tokens=10
+    )["payload"]
+
+    first, last = payload["messages"][0], payload["messages"][-1]
+    assert first["content"] == [
+        {"type": "text", "text": LONG, "cache_control": EPHEMERAL}
+    ]
+    assert last["content"][-1]["cache_control"] == EPHEMERAL
+    assert "cache_control" not in str(payload["messages"][1:-1])
+    assert messages == original
+
+
+def test_anthropic_short_prompts_and_opt_out_are_left_alone():
+    endpoint = AnthropicChatCompletionEndPoint()
+    short = [{"role": "user", "content": "hi"}]
+    payload = endpoint.create_payload(messages=short, model="c", max_tokens=1)
+    assert payload["payload"]["messages"] == short
+
+    payload = endpoint.create_payload(
+        messages=conversation(1),
+        model="c",
+        max_tokens=1,
+        prompt_caching=False,
+    )
+    assert "cache_control" not in str(payload["payload"])
+
+
+def test_anthropic_marks_tools_and_system_within_breakpoint_budget():
+    payload = {
+        "tools": [{"name": "b", "description": LONG}, {"name": "a"}],
+        "system": "be brief",
+        "messages": conversation(3),
+    }
+    placed = mark_anthropic_cache(payload)
+    assert placed == 4
+    assert payload["tools"][-1]["cache_control"] == EPHEMERAL
+    assert payload["system"][0]["cache_control"] == EPHEMERAL
+
+
+def test_openai_prefix_key_is_stable_across_turns_and_tool_order():
+    endpoint = OpenAIChatCompletionEndPoint()
+    tools = [
+        {"type": "function", "function": {"name": "search"}},
+        {"type": "function", "function": {"name": "add"}},
+    ]
+    system = {"role": "system", "content": "You are terse."}
+
+    turn1 = endpoint.create_payload(
+        model="gpt-4o",
+        tools=tools,
+        messages=[system, {"role": "user", "content": "a"}],
+    )["payload"]
+    turn2 = endpoint.create_payload(
+        model="gpt-4o",
+        tools=tools[::-1],
+        messages=[system, {"role": "user", "content": "b"}],
+    )["payload"]
+
+    assert [t["function"]["name"] for t in turn1["tools"]] == ["add", "search"]
+    assert turn1["tools"] == turn2["tools"]
+    assert turn1["prompt_cache_key"] == turn2["prompt_cache_key"]
+
+    explicit = {"model": "m", "prompt_cache_key": "mine", "messages": []}
+    assert stabilize_openai_prefix(explicit) == "mine"
+
+
+def test_openai_cache_key_is_only_sent_to_openai():
+    endpoint = OpenAIChatCompletionEndPoint()
+    endpoint.config.base_url = "http://localhost:11434/v1"
+    payload = endpoint.create_payload(
+        model="llama",
+        tools=[{"type": "function", "function": {"name": "b"}}],
+        messages=[{"role": "user", "content": "a"}],
+    )["payload"]
+    assert "prompt_cache_key" not in payload
+    assert payload["tools"][0]["function"]["name"] == "b"
+
+
+class CompletedCall(APICalling):
+    async def invoke(self) -> None:
+        pass
+
+
+@pytest.mark.parametrize(
+    "endpoint_cls, usage, expected",
+    [
+        (
+            AnthropicChatCompletionEndPoint,
+            {
+                "total_tokens": 1100,
+                "prompt_tokens_details": {"cached_tokens": 1000},
+            },
+            100,
+        ),
+        (
+            OpenAIChatCompletionEndPoint,
+            {
+                "total_tokens": 1100,
+                "prompt_tokens_details": {"cached_tokens": 1000},
+            },
+            1100,
+        ),
+        (
+            AnthropicChatCompletionEndPoint,
+            {
+                "input_tokens": 50,
+                "output_tokens": 50,
+                "cache_read_input_tokens": 1000,
+            },
+            100,
+        ),
+        (
+            AnthropicChatCompletionEndPoint,
+            {
+                "input_tokens": 50,
+                "output_tokens": 50,
+                "cache_creation_input_tokens": 300,
+                "cache_read_input_tokens": 1000,
+            },
+            400,
+        ),
+    ],
+)
+async def test_rate_limiter_settles_without_free_cache_reads(
+    endpoint_cls, usage, expected
+):
+    call = CompletedCall(payload={}, headers={}, endpoint=endpoint_cls())
+    call.execution.response = {"usage": usage}
+    call._required_tokens = 1500
+    assert call.cached_tokens == 1000
+    assert call.rate_limited_tokens == expected
+
+    processor = RateLimitedAPIProcessor(
+        queue_capacity=10,
+        capacity_refresh_time=1,
+        interval=3600,
+        limit_tokens=2000,
+    )
+    assert await processor.request_permission(required_tokens=1500)
+    await processor.process_event(call)
+    assert processor.available_token == 2000 - expected
+    assert processor.cache_read_tokens == 1000
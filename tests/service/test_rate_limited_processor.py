@@ -0,0 +1,96 @@
+import time
+
+import pytest
+
+from lionagi.service.endpoints.rate_limited_processor import (
+    RateLimitedAPIProcessor,
+    TokenBucket,
+)
+
+
+def test_token_bucket_refills_continuously(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+
+    bucket = TokenBucket(capacity=60, interval=60)
+    assert bucket.try_consume(60)
+    assert not bucket.try_consume(1)
+
+    now[0] += 1.5
+    assert bucket.try_consume(1)
+    assert bucket.wait_time(10) == pytest.approx(9.5)
+
+
+def test_token_bucket_never_exceeds_capacity(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+
+    bucket = TokenBucket(capacity=10, interval=1)
+    now[0] += 100
+    bucket.refill()
+    assert bucket.tokens == 10
+    bucket.refund(5)
+    assert bucket.tokens == 10
+
+
+def test_token_bucket_oversized_request_waits_for_full_bucket():
+    bucket = TokenBucket(capacity=10, interval=60)
+    assert bucket.try_consume(50)
+    assert bucket.tokens == -40
+    assert not bucket.can_consume(50)
+
+
+def test_token_bucket_invalid_config():
+    with pytest.raises(ValueError):
+        TokenBucket(capacity=0, interval=1)
+    with pytest.raises(ValueError):
+        TokenBucket(capacity=1, interval=0)
+
+
+@pytest.mark.asyncio
+async def test_permission_reserves_from_available_budget():
+    processor = RateLimitedAPIProcessor(
+        queue_capacity=10,
+        capacity_refresh_time=1,
+        interval=60,
+        limit_requests=2,
+        limit_tokens=100,
+    )
+    assert await processor.request_permission(required_tokens=60)
+    assert processor.available_request == 1
+    assert processor.available_token == 40
+    assert processor.limit_tokens == 100
+
+    assert not await processor.request_permission(required_tokens=60)
+    # a denied request must not consume the request budget
+    assert processor.available_request == 1
+
+
+@pytest.mark.asyncio
+async def test_process_event_refunds_overestimate():
+    class FakeCall:
+        request = {"required_tokens": 80}
+        used_tokens = 30
+
+        async def invoke(self):
+            pass
+
+    processor = RateLimitedAPIProcessor(
+        queue_capacity=10,
+        capacity_refresh_time=1,
+        interval=3600,
+        limit_tokens=100,
+    )
+    assert await processor.request_permission(required_tokens=80)
+    await processor.process_event(FakeCall())
+    assert processor.available_token == 70
+
+
+@pytest.mark.asyncio
+async def test_unlimited_processor_always_grants():
+    processor = RateLimitedAPIProcessor(
+        queue_capacity=1, capacity_refresh_time=1
+    )
+    assert processor.available_token is None
+    for _ in range(5):
+        assert await processor.request_permission(required_tokens=10**6)
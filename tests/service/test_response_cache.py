@@ -0,0 +1,119 @@
+import fnmatch
+
+import pytest
+
+from lionagi.service.endpoints.base import APICalling
+from lionagi.service.endpoints.response_cache import (
+    MemoryCacheBackend,
+    RedisCacheBackend,
+    ResponseCache,
+    SQLiteCacheBackend,
+)
+from lionagi.utils import UNDEFINED
+
+from .conftest import StubEndPoint, messages
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for a redis.asyncio client."""
+
+    def __init__(self):
+        self.store = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.store[key] = value
+
+    async def delete(self, *keys):
+        for k in keys:
+            self.store.pop(k, None)
+
+    async def scan_iter(self, pattern):
+        for k in list(self.store):
+            if fnmatch.fnmatch(k, pattern):
+                yield k
+
+
+def test_key_ignores_auth_headers_and_ordering():
+    k1 = ResponseCache.make_key(
+        "s", {"a": 1, "b": [1, 2]}, {"Authorization": "Bearer one"}
+    )
+    k2 = ResponseCache.make_key(
+        "s", {"b": [1, 2], "a": 1}, {"authorization": "Bearer two"}
+    )
+    assert k1 == k2
+    assert k1 != ResponseCache.make_key("s", {"a": 2, "b": [1, 2]})
+
+
+async def test_memory_backend_respects_byte_budget():
+    backend = MemoryCacheBackend(max_bytes=300)
+    cache = ResponseCache(backend)
+    for i in range(10):
+        await cache.set(str(i), "x" * 50)
+    assert backend.size_bytes <= 300
+    assert backend.metrics.evictions > 0
+    assert await cache.get("0") is UNDEFINED
+    assert await cache.get("9") == "x" * 50
+
+
+async def test_per_request_ttl_expires(monkeypatch):
+    import lionagi.service.endpoints.response_cache as rc
+
+    now = [1000.0]
+    monkeypatch.setattr(rc.time, "time", lambda: now[0])
+    cache = ResponseCache(MemoryCacheBackend(), ttl=100)
+    await cache.set("short", 1, ttl=5)
+    await cache.set("long", 2)
+    now[0] += 10
+    assert await cache.get("short") is UNDEFINED
+    assert await cache.get("long") == 2
+    assert cache.metrics.hits == 1 and cache.metrics.misses == 1
+
+
+@pytest.mark.parametrize("backend_name", ["memory", "sqlite", "redis"])
+async def test_backends_roundtrip_copies(tmp_path, backend_name):
+    if backend_name == "memory":
+        backend = MemoryCacheBackend()
+    elif backend_name == "sqlite":
+        backend = SQLiteCacheBackend(tmp_path / "cache.db")
+    else:
+        backend = RedisCacheBackend(client=FakeRedis())
+    cache = ResponseCache(backend)
+
+    value = {"content": [1, 2, 3]}
+    await cache.set("k", value)
+    value["content"].append(4)
+    hit = await cache.get("k")
+    assert hit == {"content": [1, 2, 3]}
+    hit["content"].append(5)
+    assert await cache.get("k") == {"content": [1, 2, 3]}
+    await cache.delete("k")
+    assert await cache.get("k") is UNDEFINED
+    await cache.set("k", {})
+    assert await cache.get("k") == {}
+    await cache.clear()
+    assert await cache.get("k") is UNDEFINED
+    await cache.close()
+
+
+async def test_api_calling_hits_cache_across_api_keys():
+    endpoint = StubEndPoint(lambda n, _: {"answer": n})
+    cache = ResponseCache(MemoryCacheBackend())
+
+    def make_call(key: str) -> APICalling:
+        return APICalling(
+            payload={"messages": messages()},
+            headers={"Authorization": f"Bearer {key}"},
+            endpoint=endpoint,
+            is_cached=True,
+            cache=cache,
+        )
+
+    first, second = make_call("a"), make_call("b")
+    await first.invoke()
+    await second.invoke()
+    assert endpoint.calls == 1
+    assert second.execution.response == {"answer": 1}
+    assert cache.metrics.hits == 1
@@ -0,0 +1,125 @@
+import asyncio
+
+import pytest
+
+from lionagi.protocols.types import EventStatus
+from lionagi.service.endpoints.base import APICalling, EndPoint
+from lionagi.service.endpoints.streaming import (
+    ChunkAssembler,
+    buffered,
+    chunk_text,
+)
+
+
+def make_chunk(text, finish_reason=None, usage=None) -> dict:
+    chunk = {
+        "id": "chatcmpl-1",
+        "model": "stub",
+        "choices": [
+            {"index": 0, "delta": {"content": text}, "finish_reason": None}
+        ],
+    }
+    if finish_reason:
+        chunk["choices"][0]["finish_reason"] = finish_reason
+    if usage:
+        chunk["usage"] = usage
+    return chunk
+
+
+class StreamingEndPoint(EndPoint):
+    def __init__(self, pieces, fail_after=None):
+        super().__init__(
+            {
+                "provider": "stub",
+                "base_url": "http://stub",
+                "endpoint": "chat",
+                "is_streamable": True,
+                "optional_kwargs": {"messages", "stream"},
+            }
+        )
+        self.pieces = pieces
+        self.fail_after = fail_after
+        self.produced = 0
+
+    async def _stream(self, payload, headers, **kwargs):
+        for i, piece in enumerate(self.pieces):
+            if self.fail_after is not None and i == self.fail_after:
+                raise RuntimeError("connection reset")
+            self.produced += 1
+            yield make_chunk(piece)
+        yield make_chunk(
+            None,
+            finish_reason="stop",
+            usage={
+                "prompt_tokens": 3,
+                "completion_tokens": 2,
+                "total_tokens": 5,
+            },
+        )
+
+
+def test_assembler_folds_chunks_into_chat_completion():
+    assembler = ChunkAssembler()
+    for piece in ["Hel", None, "lo"]:
+        assembler.add(make_chunk(piece))
+    assembler.add(make_chunk(None, "stop", {"total_tokens": 5}))
+
+    response = assembler.to_response()
+    assert response["choices"][0]["message"]["content"] == "Hello"
+    assert response["choices"][0]["finish_reason"] == "stop"
+    assert response["usage"] == {"total_tokens": 5}
+    assert assembler.chunks == 4
+    assert chunk_text({"type": "content_block_delta", "delta": {"text": "x"}})
+
+
+async def test_api_calling_stream_assembles_without_printing(capsys):
+    endpoint = StreamingEndPoint(["a", "b", "c"])
+    call = APICalling(payload={}, headers={}, endpoint=endpoint)
+
+    texts = [chunk_text(c) async for c in call.stream()]
+
+    assert texts == ["a", "b", "c", None]
+    assert capsys.readouterr().out == ""
+    assert call.status == EventStatus.COMPLETED
+    assert call.response["choices"][0]["message"]["content"] == "abc"
+    assert call.used_tokens == 5
+
+
+async def test_api_calling_stream_records_failure():
+    endpoint = StreamingEndPoint(["a", "b"], fail_after=1)
+    call = APICalling(payload={}, headers={}, endpoint=endpoint)
+    with pytest.raises(RuntimeError):
+        async for _ in call.stream(buffer_size=4):
+            pass
+    assert call.status == EventStatus.FAILED
+    assert "connection reset" in call.execution.error
+
+
+async def test_api_calling_stream_closed_early_fails():
+    endpoint = StreamingEndPoint(["a", "b", "c"])
+    call = APICalling(payload={}, headers={}, endpoint=endpoint)
+    stream = call.stream()
+    await stream.__anext__()
+    await stream.aclose()
+
+    assert call.status == EventStatus.FAILED
+    assert call.execution.duration is not None
+    assert "closed before completion" in call.execution.error
+    assert endpoint.flow.inflight == 0
+
+
+async def test_buffered_bounds_read_ahead():
+    produced = 0
+
+    async def source():
+        nonlocal produced
+        for i in range(100):
+            produced += 1
+            yield i
+
+    stream = buffered(source(), 3)
+    assert await anext(stream) == 0
+    await asyncio.sleep(0.01)
+    # one item consumed, three buffered, one blocked on a full queue
+    assert produced <= 5
+    await stream.aclose()
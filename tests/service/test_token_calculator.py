@@ -0,0 +1,74 @@
+import pytest
+
+from lionagi.service.endpoints import token_calculator as tc
+from lionagi.service.endpoints.base import APICalling
+from lionagi.service.endpoints.token_calculator import (
+    TokenCalculator,
+    token_count_cache,
+)
+
+from .conftest import StubEndPoint
+
+
+class FakeEncoding:
+    """Whitespace tokenizer recording which texts it encoded."""
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, text):
+        return text.split()
+
+    def encode_ordinary_batch(self, texts):
+        self.encoded.extend(texts)
+        return [t.split() for t in texts]
+
+
+@pytest.fixture
+def fake_encoding(monkeypatch):
+    enc = FakeEncoding()
+    monkeypatch.setattr(tc, "get_encoding", lambda name: enc)
+    monkeypatch.setattr(tc, "get_encoding_name", lambda name: "fake")
+    token_count_cache.clear()
+    yield enc
+    token_count_cache.clear()
+
+
+def test_message_tokens_count_text_parts(fake_encoding):
+    messages = [
+        {"role": "system", "content": "You are a helpful assistant."},
+        {"role": "user", "content": [{"type": "text", "text": "Hello there"}]},
+    ]
+    assert TokenCalculator.calculate_message_tokens(messages) == 4 + 5 + 4 + 2
+
+
+def test_history_is_not_retokenized(fake_encoding):
+    history = [{"role": "user", "content": f"turn {i}"} for i in range(20)]
+    TokenCalculator.calculate_message_tokens(history)
+    assert len(fake_encoding.encoded) == 20
+
+    fake_encoding.encoded.clear()
+    history.append({"role": "user", "content": "a new question"})
+    TokenCalculator.calculate_message_tokens(history)
+    assert fake_encoding.encoded == ["a new question"]
+
+
+def test_count_batch_preserves_order_and_duplicates(fake_encoding):
+    counts = TokenCalculator.count_batch(["a b c", "", "a b c"], "fake")
+    assert counts == [3, 0, 3]
+    assert fake_encoding.encoded == ["a b c", ""]
+
+
+def test_required_tokens_computed_once(monkeypatch):
+    endpoint = StubEndPoint(requires_tokens=True)
+    calls = []
+
+    def fake_calculate(payload):
+        calls.append(payload)
+        return 42
+
+    monkeypatch.setattr(endpoint, "calculate_tokens", fake_calculate)
+    api_call = APICalling(payload={}, headers={}, endpoint=endpoint)
+    assert api_call.required_tokens == 42
+    assert api_call.request == {"required_tokens": 42}
+    assert len(calls) == 1
@@ -0,0 +1,88 @@
+import pytest
+from pydantic import BaseModel
+
+from lionagi.operatives.types import FunctionCalling, Tool
+from lionagi.protocols.types import InMemorySpanExporter, Tracer
+from lionagi.session.branch import Branch
+
+from .conftest import StubEndPoint, chat_completion, make_model
+
+
+class Answer(BaseModel):
+    n: int
+
+
+def add(a: int, b: int) -> int:
+    return a + b
+
+
+@pytest.fixture
+def spans():
+    exporter = Tracer.default().add_exporter(InMemorySpanExporter())
+    yield exporter
+    Tracer.default().remove_exporter(exporter)
+
+
+def make_branch() -> Branch:
+    endpoint = StubEndPoint(
+        lambda n, _: chat_completion(
+            '{"n": 4}', usage={"prompt_tokens": 9, "total_tokens": 12}
+        ),
+        requires_tokens=True,
+    )
+    model = make_model(endpoint, provider="stub", model="stub-1")
+    return Branch(chat_model=model, parse_model=model)
+
+
+async def test_chat_call_produces_a_span_tree(spans):
+    branch = make_branch()
+    await branch.communicate("add two and two")
+
+    (chat,) = spans.find("branch.invoke_chat")
+    assert chat.attributes["branch.id"] == str(branch.id)
+    assert chat.attributes["model"] == "stub-1"
+    assert chat.attributes["used_tokens"] == 12
+
+    names = {s.name: s for s in spans.spans}
+    for name in (
+        "branch.build_messages",
+        "imodel.invoke",
+        "processor.queue_wait",
+        "processor.permission_wait",
+        "endpoint.count_tokens",
+        "api.call",
+        "api.attempt",
+    ):
+        assert name in names
+        assert names[name].trace_id == chat.trace_id
+
+    assert names["imodel.invoke"].parent_id == chat.span_id
+    call = names["api.call"]
+    assert call.parent_id == names["imodel.invoke"].span_id
+    assert call.attributes["used_tokens"] == 12
+    assert call.attributes["required_tokens"] > 0
+    assert names["api.attempt"].parent_id == call.span_id
+    assert names["endpoint.count_tokens"].attributes["tokens"] > 0
+
+
+async def test_parse_and_tool_spans(spans):
+    branch = make_branch()
+    result = await branch.parse('{"n": "4"}', request_type=Answer)
+    assert result == Answer(n=4)
+    (parse,) = spans.find("branch.parse")
+    assert parse.attributes["success"] is True
+
+    call = FunctionCalling(
+        func_tool=Tool(func_callable=add), arguments={"a": 1, "b": 2}
+    )
+    await call.invoke()
+    (tool,) = spans.find("tool.invoke")
+    assert tool.attributes["tool"] == "add"
+    assert tool.status == "ok"
+
+
+async def test_no_spans_without_an_exporter():
+    branch = make_branch()
+    await branch.communicate("hi")
+    assert not Tracer.default().enabled
+    assert Tracer.current() is None
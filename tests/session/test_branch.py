@@ -431,3 +431,86 @@ async def test_instruct_calls_operate_when_actions_true(
     )
     assert result == """{"foo": "mocked_response", "bar": 123}"""
     assert len(branch_with_mock_imodel.messages) == 2
+
+
+@pytest.mark.asyncio
+async def test_communicate_stream_yields_text_and_records_reply():
+    branch = Branch(user="user", name="StreamBranch")
+    model = iModel(provider="groq", model="llama-3.3-70b-versatile")
+
+    async def fake_stream(payload, headers, **kwargs):
+        for piece in ["Hello", ", ", "world"]:
+            yield {"choices": [{"index": 0, "delta": {"content": piece}}]}
+
+    model.endpoint._stream = fake_stream
+    branch.mdls.register_imodel("chat", model)
+
+    pieces = [t async for t in branch.communicate_stream("Hi", buffer_size=2)]
+
+    assert pieces == ["Hello", ", ", "world"]
+    assert isinstance(branch.messages[-2], Instruction)
+    assert isinstance(branch.messages[-1], AssistantResponse)
+    assert branch.messages[-1].response == "Hello, world"
+
+
+class StreamedAnswer(BaseModel):
+    value: int
+    name: str
+
+
+def streaming_branch(pieces: list[str]) -> tuple[Branch, list[str]]:
+    """A branch whose model streams `pieces`, recording those sent."""
+    branch = Branch(user="user", name="StreamBranch")
+    model = iModel(provider="groq", model="llama-3.3-70b-versatile")
+    sent = []
+
+    async def fake_stream(payload, headers, **kwargs):
+        for piece in pieces:
+            sent.append(piece)
+            yield {"choices": [{"index": 0, "delta": {"content": piece}}]}
+
+    model.endpoint._stream = fake_stream
+    branch.mdls.register_imodel("chat", model)
+    return branch, sent
+
+
+@pytest.mark.asyncio
+async def test_communicate_stream_validates_fields_as_they_complete():
+    branch, _ = streaming_branch(['{"value": 7,', ' "name": "x"}'])
+    operative = Operative(name="answer", request_type=StreamedAnswer)
+
+    partials = []
+    async for _ in branch.communicate_stream("Hi", operative=operative):
+        partials.append(operative.partial_response)
+
+    assert partials == [{"value": 7}, {"value": 7, "name": "x"}]
+    assert operative.response_model == StreamedAnswer(value=7, name="x")
+    assert branch.messages[-2].content["request_model"] is StreamedAnswer
+    assert isinstance(branch.messages[-1], AssistantResponse)
+
+
+@pytest.mark.asyncio
+async def test_communicate_stream_stops_on_an_invalid_field():
+    pieces = ['{"value": "seven",', ' "name": "x"', "}"]
+    branch, sent = streaming_branch(pieces)
+    operative = Operative(name="answer", request_type=StreamedAnswer)
+
+    with pytest.raises(ValueError):
+        async for _ in branch.communicate_stream("Hi", operative=operative):
+            pass
+
+    assert sent == pieces[:1]
+    assert len(branch.messages) == 0
+
+
+@pytest.mark.asyncio
+async def test_communicate_stream_rejects_a_truncated_reply():
+    branch, _ = streaming_branch(['{"value": 7,', ' "name": "cu'])
+    operative = Operative(name="answer", request_type=StreamedAnswer)
+
+    with pytest.raises(ValueError):
+        async for _ in branch.communicate_stream("Hi", operative=operative):
+            pass
+
+    assert operative.truncated and operative.response_model is None
+    assert len(branch.messages) == 0
@@ -0,0 +1,165 @@
+import pytest
+
+pytest.importorskip("msgpack")
+
+from lionagi.protocols.messages.manager import MessageManager
+from lionagi.protocols.types import ActionRequest, Log
+from lionagi.session.branch import Branch
+from lionagi.session.session import Session
+from lionagi.session.snapshot import Snapshotter, load_snapshot
+
+
+def make_branch(turns: int = 3) -> Branch:
+    branch = Branch(user="tester", name="agent", system="be brief")
+    for i in range(turns):
+        add_turn(branch, i)
+    return branch
+
+
+def add_turn(branch: Branch, i: int) -> None:
+    branch.msgs.add_message(
+        instruction=f"question {i}",
+        context={"i": i},
+        sender=branch.user,
+        recipient=branch.id,
+    )
+    branch.msgs.add_message(
+        assistant_response=f"answer {i}",
+        sender=branch.id,
+        recipient=branch.user,
+    )
+
+
+def dicts(branch: Branch) -> list[dict]:
+    return [m.to_dict() for m in branch.messages]
+
+
+def test_branch_round_trip(tmp_path):
+    branch = make_branch()
+    branch._log_manager.log(Log(content={"event": "turn"}))
+    fp = tmp_path / "branch.lsnap"
+
+    assert branch.to_snapshot(fp) == fp.stat().st_size
+    restored = Branch.from_snapshot(fp)
+
+    assert restored.id == branch.id
+    assert restored.user == branch.user and restored.name == "agent"
+    assert dicts(restored) == dicts(branch)
+    assert restored.system is restored.messages[branch.system.id]
+    assert [log.content for log in restored.logs] == [{"event": "turn"}]
+    assert restored.chat_model.kwargs == branch.chat_model.kwargs
+    assert restored.msgs.last_response.response == "answer 2"
+
+
+def test_checkpoints_write_only_new_messages(tmp_path):
+    fp = tmp_path / "branch.lsnap"
+    branch = make_branch(turns=50)
+    snap = Snapshotter(fp)
+    full = snap.checkpoint(branch)
+
+    add_turn(branch, 50)
+    delta = snap.checkpoint(branch)
+    assert delta < full / 20
+    assert snap.checkpoint(branch) < 100
+
+    restored = load_snapshot(fp)
+    assert dicts(restored) == dicts(branch)
+
+
+def test_checkpoint_records_answered_requests_and_reordering(tmp_path):
+    fp = tmp_path / "branch.lsnap"
+    branch = make_branch(turns=1)
+    request = branch.msgs.add_message(
+        action_function="lookup",
+        action_arguments={"q": "x"},
+        sender=branch.id,
+        recipient=branch.id,
+    )
+    snap = Snapshotter(fp)
+    snap.checkpoint(branch)
+
+    branch.msgs.add_message(action_request=request, action_output="found")
+    snap.checkpoint(branch)
+    restored = load_snapshot(fp)
+    assert restored.messages[request.id].is_responded()
+    assert isinstance(restored.messages[request.id], ActionRequest)
+
+    branch.msgs.clear_messages()
+    add_turn(branch, 1)
+    snap.checkpoint(branch)
+    assert dicts(load_snapshot(fp)) == dicts(branch)
+
+    snap.compact(branch)
+    assert dicts(load_snapshot(fp)) == dicts(branch)
+
+
+def test_checkpoint_catches_edits_beyond_the_kept_ones(tmp_path, monkeypatch):
+    monkeypatch.setattr(MessageManager, "max_edits", 2)
+    fp = tmp_path / "branch.lsnap"
+    branch = make_branch(turns=3)
+    snap = Snapshotter(fp)
+    snap.checkpoint(branch)
+
+    instructions = [m for m in branch.messages if m.role == "user"]
+    before = branch.msgs.edit_count
+    for i, msg in enumerate(instructions):
+        branch.msgs.add_message(instruction=msg, guidance=f"edit {i}")
+    assert len(branch.msgs.edited) == 2
+    assert branch.msgs.edit_count == before + 3
+    assert branch.msgs.edits_since(before) is None
+    assert branch.msgs.edits_since(before + 1) == [
+        m.id for m in instructions[1:]
+    ]
+
+    snap.checkpoint(branch)
+    assert dicts(load_snapshot(fp)) == dicts(branch)
+
+    branch.msgs.add_message(instruction=instructions[0], guidance="again")
+    snap.checkpoint(branch)
+    assert dicts(load_snapshot(fp)) == dicts(branch)
+
+
+def test_torn_checkpoint_is_ignored(tmp_path):
+    fp = tmp_path / "branch.lsnap"
+    branch = make_branch(turns=1)
+    snap = Snapshotter(fp)
+    snap.checkpoint(branch)
+    expected = dicts(branch)
+
+    add_turn(branch, 1)
+    size = snap.checkpoint(branch)
+    with fp.open("r+b") as f:
+        f.truncate(fp.stat().st_size - size // 2)
+
+    assert dicts(load_snapshot(fp)) == expected
+
+
+def test_session_round_trip(tmp_path):
+    fp = tmp_path / "session.lsnap"
+    session = Session()
+    add_turn(session.default_branch, 0)
+    other = session.new_branch(system="other", name="other")
+    snap = Snapshotter(fp)
+    snap.checkpoint(session)
+
+    add_turn(other, 1)
+    third = session.new_branch(name="third")
+    add_turn(third, 2)
+    snap.checkpoint(session)
+
+    restored = Session.from_snapshot(fp)
+    assert restored.id == session.id
+    assert restored.default_branch.id == session.default_branch.id
+    assert list(restored.branches.keys()) == list(session.branches.keys())
+    for branch in session.branches:
+        assert dicts(restored.branches[branch.id]) == dicts(branch)
+
+    with pytest.raises(ValueError):
+        Branch.from_snapshot(fp)
+
+
+def test_rejects_other_files(tmp_path):
+    fp = tmp_path / "not.lsnap"
+    fp.write_bytes(b"{}")
+    with pytest.raises(ValueError):
+        load_snapshot(fp)